@@ -25,7 +25,22 @@ def _repo_root() -> Path:
     return Path(__file__).resolve().parents[2]
 
 
+def _engine_server() -> str:
+    return os.getenv("OPENCLAW_ENGINE_SERVER", "").strip()
+
+
+def _post_engine_server(path: str, payload: dict) -> dict:
+    from openclaw_automation.server import request_server
+
+    status, result = request_server(_engine_server(), path, payload)
+    if status != 200:
+        raise RuntimeError(result.get("error") or f"engine server returned HTTP {status}")
+    return result
+
+
 def _run_query(query: str) -> dict:
+    if _engine_server():
+        return _post_engine_server("/run-query", {"query": query})
     root = _repo_root()
     cmd = [
         sys.executable,
@@ -42,6 +57,8 @@ def _run_query(query: str) -> dict:
 
 
 def _run_script(script_dir: str, inputs: dict) -> dict:
+    if _engine_server():
+        return _post_engine_server("/run", {"script_dir": script_dir, "inputs": inputs})
     root = _repo_root()
     cmd = [
         sys.executable,
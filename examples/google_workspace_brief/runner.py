@@ -3,14 +3,17 @@ from __future__ import annotations
 import base64
 import json
 import os
+from concurrent.futures import ThreadPoolExecutor
 from datetime import date, datetime, time, timedelta, timezone
 from email.utils import parsedate_to_datetime
 from pathlib import Path
-from typing import Any, Dict, List
-from urllib.parse import quote
+from typing import Any, Dict, List, Tuple
 
 import requests
 
+from openclaw_automation import google_workspace as workspace
+from openclaw_automation.oauth_tokens import shared_token_manager
+
 TOKEN_URI_DEFAULT = "https://oauth2.googleapis.com/token"
 CALENDAR_SCOPE = "https://www.googleapis.com/auth/calendar.readonly"
 GMAIL_SCOPE = "https://www.googleapis.com/auth/gmail.readonly"
@@ -161,66 +164,31 @@ def _access_token(config: GoogleAuthConfig) -> str:
             "Set OPENCLAW_GOOGLE_TOKEN_FILE or OPENCLAW_GOOGLE_TOKEN_DIR."
         )
 
-    token_data = _load_json(config.token_file)
-    if not token_data.get("token"):
-        raise RuntimeError("Google token file does not contain an access token")
-
-    expiry_raw = str(token_data.get("expiry", "")).strip()
-    is_expired = True
-    if expiry_raw:
-        try:
-            expiry_dt = _parse_rfc3339(expiry_raw)
-            is_expired = expiry_dt <= datetime.now(timezone.utc)
-        except Exception:
-            is_expired = True
-
-    if not is_expired:
-        return str(token_data["token"])
-
-    if not config.client_secret_file.exists():
-        raise FileNotFoundError(
-            f"Google client secret file not found: {config.client_secret_file}. "
-            "Set OPENCLAW_GOOGLE_CLIENT_SECRET_PATH or pass client_secret_file input."
-        )
-
-    secret_data = _load_json(config.client_secret_file)
-    refreshed = _refresh_access_token(token_data, secret_data)
-    config.token_file.write_text(json.dumps(refreshed, indent=2))
-    return str(refreshed["token"])
-
+    def _refresh(token_data: Dict[str, Any]) -> Dict[str, Any]:
+        if not config.client_secret_file.exists():
+            raise FileNotFoundError(
+                f"Google client secret file not found: {config.client_secret_file}. "
+                "Set OPENCLAW_GOOGLE_CLIENT_SECRET_PATH or pass client_secret_file input."
+            )
+        return _refresh_access_token(token_data, _load_json(config.client_secret_file))
 
-def _bearer_headers(access_token: str) -> Dict[str, str]:
-    return {
-        "Authorization": f"Bearer {access_token}",
-        "Accept": "application/json",
-        "User-Agent": "OpenClawAutomationKit/0.1",
-    }
+    # Cached in memory across runs and refreshed in the background before expiry.
+    return shared_token_manager().get(config.token_file, _refresh)
 
 
 def _list_meetings(access_token: str, target_date: date, max_results: int, calendar_id: str) -> List[Dict[str, str]]:
     time_min = datetime.combine(target_date, time.min, tzinfo=timezone.utc)
     time_max = datetime.combine(target_date + timedelta(days=1), time.min, tzinfo=timezone.utc)
 
-    cal_id = quote(calendar_id, safe="")
-    url = f"https://www.googleapis.com/calendar/v3/calendars/{cal_id}/events"
-    resp = requests.get(
-        url,
-        headers=_bearer_headers(access_token),
-        params={
-            "timeMin": time_min.isoformat().replace("+00:00", "Z"),
-            "timeMax": time_max.isoformat().replace("+00:00", "Z"),
-            "singleEvents": "true",
-            "orderBy": "startTime",
-            "maxResults": str(max_results),
-        },
-        timeout=20,
+    items = workspace.list_events(
+        access_token,
+        calendar_id,
+        time_min.isoformat().replace("+00:00", "Z"),
+        time_max.isoformat().replace("+00:00", "Z"),
+        max_results,
     )
-    if resp.status_code >= 400:
-        raise RuntimeError(f"Google Calendar API failed: HTTP {resp.status_code}")
-
-    data = resp.json()
     out: List[Dict[str, str]] = []
-    for item in data.get("items", []):
+    for item in items:
         start = item.get("start", {}).get("dateTime") or item.get("start", {}).get("date") or ""
         end = item.get("end", {}).get("dateTime") or item.get("end", {}).get("date") or ""
         out.append(
@@ -256,35 +224,15 @@ def _decode_header_value(raw: str) -> str:
 
 
 def _list_emails(access_token: str, max_results: int, query: str) -> List[Dict[str, str]]:
-    list_resp = requests.get(
-        "https://gmail.googleapis.com/gmail/v1/users/me/messages",
-        headers=_bearer_headers(access_token),
-        params={"maxResults": str(max_results), "q": query},
-        timeout=20,
-    )
-    if list_resp.status_code >= 400:
-        raise RuntimeError(f"Gmail API list failed: HTTP {list_resp.status_code}")
-
-    list_data = list_resp.json()
+    # One list call, then one batch request for every message's metadata.
+    message_ids = workspace.list_message_ids(access_token, max_results, query)
     out: List[Dict[str, str]] = []
-    for item in list_data.get("messages", []):
-        msg_id = str(item.get("id") or "")
-        if not msg_id:
-            continue
-        msg_resp = requests.get(
-            f"https://gmail.googleapis.com/gmail/v1/users/me/messages/{msg_id}",
-            headers=_bearer_headers(access_token),
-            params={"format": "metadata", "metadataHeaders": ["Subject", "From", "Date"]},
-            timeout=20,
-        )
-        if msg_resp.status_code >= 400:
-            continue
-        msg = msg_resp.json()
+    for msg in workspace.get_messages_metadata(access_token, message_ids):
         headers = msg.get("payload", {}).get("headers", [])
         header_map = {str(h.get("name", "")).lower(): str(h.get("value", "")) for h in headers}
         out.append(
             {
-                "id": msg_id,
+                "id": str(msg.get("id") or ""),
                 "from": header_map.get("from", ""),
                 "subject": _decode_header_value(header_map.get("subject", "")),
                 "date": header_map.get("date", ""),
@@ -334,29 +282,35 @@ def run(context: Dict[str, Any], inputs: Dict[str, Any]) -> Dict[str, Any]:
     target_accounts = _target_accounts(inputs)
     account_errors: Dict[str, str] = {}
 
-    try:
-        for account_email in target_accounts:
-            per_inputs = dict(inputs)
-            per_inputs["account_email"] = account_email
-            config = _resolve_auth_config(per_inputs)
-            try:
-                token = _access_token(config)
-                if task in {"meetings", "brief"}:
-                    per_meetings = _list_meetings(
-                        token, target_date, max_results=max_results, calendar_id=calendar_id
-                    )
-                    for item in per_meetings:
-                        item["account_email"] = account_email
-                    meetings.extend(per_meetings)
-
-                if task in {"emails", "brief"}:
-                    per_emails = _list_emails(token, max_results=max_results, query=gmail_query)
-                    for item in per_emails:
-                        item["account_email"] = account_email
-                    emails.extend(per_emails)
-            except Exception as exc:  # noqa: BLE001
-                account_errors[account_email] = str(exc)
+    def _fetch_account(account_email: str) -> Tuple[List[Dict[str, str]], List[Dict[str, str]]]:
+        per_inputs = dict(inputs)
+        per_inputs["account_email"] = account_email
+        token = _access_token(_resolve_auth_config(per_inputs))
+        # Calendar and Gmail for one account run side by side.
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            per_meetings = (
+                pool.submit(_list_meetings, token, target_date, max_results=max_results, calendar_id=calendar_id)
+                if task in {"meetings", "brief"}
+                else None
+            )
+            per_emails = (
+                pool.submit(_list_emails, token, max_results=max_results, query=gmail_query)
+                if task in {"emails", "brief"}
+                else None
+            )
+            found_meetings = per_meetings.result() if per_meetings else []
+            found_emails = per_emails.result() if per_emails else []
+        for item in found_meetings + found_emails:
+            item["account_email"] = account_email
+        return found_meetings, found_emails
 
+    try:
+        for account_email, outcome in workspace.for_accounts(target_accounts, _fetch_account).items():
+            if isinstance(outcome, BaseException):
+                account_errors[account_email] = str(outcome)
+                continue
+            meetings.extend(outcome[0])
+            emails.extend(outcome[1])
     except Exception as exc:  # noqa: BLE001
         errors.append(str(exc))
 
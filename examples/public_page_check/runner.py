@@ -1,62 +1,12 @@
 from __future__ import annotations
 
-import html
-import re
-from typing import Any, Dict, List
-from urllib.request import Request, urlopen
+from typing import Any, Dict, Iterable
 
+from openclaw_automation.html_extract import extract, iter_text
 
-def _fetch_html(url: str) -> str:
-    req = Request(
-        url=url,
-        headers={
-            "User-Agent": "OpenClawAutomationKit/0.1 (+https://github.com/marcosathanasoulis/openclaw-automation-kit)"
-        },
-    )
-    with urlopen(req, timeout=20) as response:
-        return response.read().decode("utf-8", errors="ignore")
 
-
-def _extract_title(page_html: str) -> str:
-    match = re.search(r"<title[^>]*>(.*?)</title>", page_html, flags=re.IGNORECASE | re.DOTALL)
-    if not match:
-        return "Untitled page"
-    return html.unescape(re.sub(r"\s+", " ", match.group(1))).strip()
-
-
-def _visible_text(page_html: str) -> str:
-    no_script = re.sub(r"<(script|style)[^>]*>.*?</\1>", " ", page_html, flags=re.IGNORECASE | re.DOTALL)
-    no_tags = re.sub(r"<[^>]+>", " ", no_script)
-    return html.unescape(re.sub(r"\s+", " ", no_tags)).strip()
-
-
-def _sentence_highlights(text: str, keyword: str, max_items: int = 3) -> List[str]:
-    pieces = re.split(r"(?<=[.!?])\s+", text)
-    out: List[str] = []
-    key = keyword.lower()
-    for piece in pieces:
-        if key in piece.lower():
-            out.append(piece.strip())
-        if len(out) >= max_items:
-            break
-    return out
-
-
-def _extract_headlines(page_html: str, max_items: int = 8) -> List[str]:
-    headlines: List[str] = []
-    for level in ("h1", "h2", "h3"):
-        pattern = rf"<{level}[^>]*>(.*?)</{level}>"
-        for match in re.finditer(pattern, page_html, flags=re.IGNORECASE | re.DOTALL):
-            raw = re.sub(r"<[^>]+>", " ", match.group(1))
-            text = html.unescape(re.sub(r"\s+", " ", raw)).strip()
-            if len(text) < 4:
-                continue
-            if text in headlines:
-                continue
-            headlines.append(text)
-            if len(headlines) >= max_items:
-                return headlines
-    return headlines
+def _fetch_html(url: str) -> Iterable[str]:
+    return iter_text(url)
 
 
 def run(context: Dict[str, Any], inputs: Dict[str, Any]) -> Dict[str, Any]:
@@ -66,12 +16,11 @@ def run(context: Dict[str, Any], inputs: Dict[str, Any]) -> Dict[str, Any]:
     task = str(inputs.get("task", "keyword_count")).strip().lower() or "keyword_count"
 
     try:
-        page_html = _fetch_html(url)
-        title = _extract_title(page_html)
-        text = _visible_text(page_html)
-        keyword_count = len(re.findall(re.escape(keyword), text, flags=re.IGNORECASE))
-        highlights = _sentence_highlights(text, keyword)
-        headlines = _extract_headlines(page_html)
+        page = extract(_fetch_html(url), keywords=[keyword], max_headlines=8)
+        title = page.title or "Untitled page"
+        keyword_count = page.keyword_counts[keyword]
+        highlights = page.highlights(keyword)
+        headlines = page.headlines
 
         if task == "headlines":
             if headlines:
@@ -376,6 +376,7 @@ def _run_agent_only(context: Dict[str, Any], inputs: Dict[str, Any], observation
         max_attempts=1,
         trace=True,
         use_vision=True,
+        cdp_url=context.get("cdp_url"),
     )
 
     if agent_run["ok"]:
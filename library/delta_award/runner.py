@@ -1,18 +1,23 @@
 from __future__ import annotations
 
-import os
 import re
 import sys
 import threading
 import time
 from datetime import date, timedelta
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Mapping
 from urllib.parse import urlencode
 
 from openclaw_automation.browser_agent_adapter import browser_agent_enabled
 from openclaw_automation.adaptive import adaptive_run
+from openclaw_automation.cancellation import cancel_event_of, join_thread
+from openclaw_automation.browser_pool import on_login_page, playwright_available, shared_browser_pool
+from openclaw_automation.fanout import SubSearch, fan_out, merge_matches, site_concurrency, split_searches
+from openclaw_automation.page_ready import wait_for_any, wait_for_dom_quiet, wait_for_network_quiet, wait_ready
+from openclaw_automation.telemetry import phase
 
 DELTA_URL = "https://www.delta.com"
+DELTA_SITE = "delta.com"
 
 CABIN_MAP = {
     "economy": "Main Cabin",
@@ -60,6 +65,17 @@ def _login_goal() -> str:
     ])
 
 
+# Result-page elements that mean the search has rendered (plain CSS for wait_for_any).
+RESULT_SELECTORS = [
+    ".offering-cell",
+    ".flex-dates-cell",
+    "[class*='flight-card']",
+    "[class*='FlightCard']",
+    ".bound-content",
+]
+NO_RESULT_TEXTS = ["No flights found", "no results", "try a different date"]
+
+
 def _extract_results_js():
     """JS to extract flight results from the Delta results page."""
     return """() => {
@@ -267,190 +283,151 @@ def _parse_matches(result_text: str, inputs: Dict[str, Any]) -> List[Dict[str, A
     return matches
 
 
-def _run_hybrid(inputs: Dict[str, Any], observations: List[str]) -> Dict[str, Any]:
-    """Hybrid: BrowserAgent for login, Playwright for search + extraction."""
+def _search_destination(
+    pool: Any, sub: SubSearch, slot: int, tag: bool = False, context: Mapping[str, Any] | None = None
+) -> Dict[str, List[Any]]:
+    """Phase 2 for one destination/date on the pool's ``slot`` page."""
+    inputs = sub.inputs
     origin = inputs["from"]
-    dest = inputs["to"][0]
+    dest = sub.destination
     travelers = int(inputs["travelers"])
     cabin = str(inputs.get("cabin", "economy"))
-    days_ahead = int(inputs["days_ahead"])
-    depart_date = date.today() + timedelta(days=days_ahead)
-
+    depart_date = date.today() + timedelta(days=sub.days_ahead)
     search_url = _booking_url(origin, dest, depart_date, cabin, travelers)
-
-    # Phase 1: BrowserAgent login (in thread to avoid asyncio loop contamination)
-    observations.append("Phase 1: BrowserAgent login to Delta")
-    _phase1_result = [None]
-
-    def _phase1_worker():
-        _phase1_result[0] = adaptive_run(
-            goal=_login_goal(),
-            url=DELTA_URL,
-            max_steps=20,
-            airline="delta",
-            inputs=inputs,
-            max_attempts=1,
-            trace=True,
-            use_vision=True,
-        )
-
-    _t1 = threading.Thread(target=_phase1_worker, daemon=True)
-    _t1.start()
-    _t1.join(timeout=600)
-    login_result = _phase1_result[0] or {"ok": False, "error": "Phase 1 thread timed out"}
-
-    if not login_result["ok"]:
-        observations.append(f"Login failed: {login_result['error']}")
-        # Continue anyway - Delta search works without login, just heavier
-        observations.append("Continuing without login (results may be heavier)")
-
-    login_info = login_result.get("result") or {}
-    observations.append(f"Login status: {login_info.get('status', 'unknown')}")
-
-    # Phase 2: Playwright navigation + extraction
-    observations.append("Phase 2: Playwright search + extraction")
-    cdp_url = os.getenv("OPENCLAW_CDP_URL", "http://127.0.0.1:9222")
-
-    try:
-        from playwright.sync_api import sync_playwright
-    except ImportError:
-        observations.append("Playwright not available, falling back to agent-only")
-        return _run_agent_only(inputs, observations)
-
+    screenshot_path = f"/tmp/delta_hybrid_results_{dest}.png" if tag else "/tmp/delta_hybrid_results.png"
+    observations: List[str] = []
     matches: List[Dict[str, Any]] = []
     errors: List[str] = []
     result_text_parts: List[str] = []
+    session_expired: List[bool] = []
 
-    # Run sync_playwright in a separate thread to avoid asyncio loop conflicts
-    def _pw_worker():
+    # The pool runs this on its delta.com lane thread for ``slot``. The page
+    # stays open between runs so the next search skips reconnecting and re-warming.
+    def _pw_worker(page):
         try:
-            with sync_playwright() as p:
-                browser = p.chromium.connect_over_cdp(cdp_url)
-                contexts = browser.contexts
-                if not contexts:
-                    errors.append("No browser contexts")
-                    return _run_agent_only(inputs, observations)
-
-                context = contexts[0]
-
-                # Always create a new page to avoid using pages closed by Phase 1
-                page = context.new_page()
-
-
-                # Navigate to search URL
-                observations.append(f"Navigating to: {search_url}")
-                try:
-                    page.goto(search_url, wait_until="domcontentloaded", timeout=30000)
-                except Exception as e:
-                    observations.append(f"Nav warning: {e}")
-
-                # Wait for form to load
-                time.sleep(5)
-
-                # Verify Shop with Miles is enabled via JS (don't click - URL should set it)
-                try:
-                    miles_checked = page.evaluate("""() => {
-                        const cb = document.querySelector('[id*="shopWithMiles"], input[name*="shopWithMiles"]');
-                        if (cb) return cb.checked;
-                        // Check for toggle state
-                        const toggle = document.querySelector('[class*="shopWithMiles"]');
-                        if (toggle) return toggle.classList.contains('active') || toggle.classList.contains('checked');
-                        return null;
-                    }""")
-                    observations.append(f"Shop with Miles checked: {miles_checked}")
-
-                    if miles_checked is False:
-                        # Need to click it
-                        page.evaluate("""() => {
-                            const cb = document.querySelector('[id*="shopWithMiles"], input[name*="shopWithMiles"]');
-                            if (cb) { cb.click(); return; }
-                            const labels = Array.from(document.querySelectorAll('label, span'));
-                            const match = labels.find(l => /shop.*miles/i.test(l.textContent));
-                            if (match) match.click();
-                        }""")
-                        time.sleep(2)
-                        observations.append("Clicked Shop with Miles toggle")
-                except Exception as e:
-                    observations.append(f"Miles toggle check error: {e}")
-
-                # Click Find Flights
-                try:
+            # Navigate to search URL
+            observations.append(f"Navigating to: {search_url}")
+            try:
+                page.goto(search_url, wait_until="domcontentloaded", timeout=30000)
+            except Exception as e:
+                observations.append(f"Nav warning: {e}")
+
+            # Wait for the booking form (Find Flights button) to render
+            wait_ready(page, timeout_ms=10000)
+            form = wait_for_any(page, selectors=["#btn-book-submit", "button[type='submit']"],
+                                texts=["Find Flights"], timeout_ms=10000)
+            if on_login_page(page) or not form:
+                # The pooled session expired: Delta bounced us to login or never showed the form.
+                session_expired.append(True)
+                errors.append("Redirected to Delta login" if form else "Booking form not found")
+                return
+
+            # Verify Shop with Miles is enabled via JS (don't click - URL should set it)
+            try:
+                miles_checked = page.evaluate("""() => {
+                    const cb = document.querySelector('[id*="shopWithMiles"], input[name*="shopWithMiles"]');
+                    if (cb) return cb.checked;
+                    // Check for toggle state
+                    const toggle = document.querySelector('[class*="shopWithMiles"]');
+                    if (toggle) return toggle.classList.contains('active') || toggle.classList.contains('checked');
+                    return null;
+                }""")
+                observations.append(f"Shop with Miles checked: {miles_checked}")
+
+                if miles_checked is False:
+                    # Need to click it
                     page.evaluate("""() => {
-                        const btns = Array.from(document.querySelectorAll('button'));
-                        const find = btns.find(b => /find.*flight/i.test(b.textContent));
-                        if (find) find.click();
+                        const cb = document.querySelector('[id*="shopWithMiles"], input[name*="shopWithMiles"]');
+                        if (cb) { cb.click(); return; }
+                        const labels = Array.from(document.querySelectorAll('label, span'));
+                        const match = labels.find(l => /shop.*miles/i.test(l.textContent));
+                        if (match) match.click();
                     }""")
-                    observations.append("Clicked Find Flights")
-                except Exception as e:
-                    observations.append(f"Find Flights click error: {e}")
-
-                # Wait for results - use longer wait since this is the heavy part
-                observations.append("Waiting 25s for results to load...")
-                time.sleep(25)
-
-                # Extract data via JS (no screenshots - avoids crash)
+                    wait_for_dom_quiet(page, quiet_ms=300, timeout_ms=3000)
+                    observations.append("Clicked Shop with Miles toggle")
+            except Exception as e:
+                observations.append(f"Miles toggle check error: {e}")
+
+            # Click Find Flights
+            try:
+                page.evaluate("""() => {
+                    const btns = Array.from(document.querySelectorAll('button'));
+                    const find = btns.find(b => /find.*flight/i.test(b.textContent));
+                    if (find) find.click();
+                }""")
+                observations.append("Clicked Find Flights")
+            except Exception as e:
+                observations.append(f"Find Flights click error: {e}")
+
+            # Wait for results: first result element or miles text, then the
+            # XHRs that fill in the rest of the grid.
+            started = time.monotonic()
+            ready = wait_for_any(page, selectors=RESULT_SELECTORS, texts=NO_RESULT_TEXTS, timeout_ms=45000)
+            wait_for_network_quiet(page, quiet_ms=1000, timeout_ms=15000, max_inflight=2)
+            observations.append(f"Results ready after {time.monotonic() - started:.1f}s (signal: {ready})")
+
+            # Extract data via JS (no screenshots - avoids crash)
+            try:
+                data = page.evaluate(_extract_results_js())
+
+                observations.append(f"Page URL: {data.get('url', '?')}")
+                observations.append(f"Page title: {data.get('title', '?')}")
+                observations.append(f"Calendar entries: {len(data.get('calendar', []))}")
+                observations.append(f"Flight entries: {len(data.get('flights', []))}")
+                observations.append(f"Miles lines: {len(data.get('milesLines', []))}")
+                observations.append(f"Price elements: {len(data.get('fromPrices', []))}")
+
+                # Combine all text for parsing
+                for item in data.get("calendar", []):
+                    result_text_parts.append(f"CALENDAR: {item}")
+                for item in data.get("flights", []):
+                    result_text_parts.append(f"FLIGHT: {item}")
+                for item in data.get("milesLines", []):
+                    result_text_parts.append(item)
+                for item in data.get("fromPrices", []):
+                    result_text_parts.append(f"PRICE: {item}")
+
+            except Exception as e:
+                observations.append(f"JS extraction error: {e}")
+                errors.append(f"JS extraction: {e}")
+
+            # Try a second extraction after more time
+            if not result_text_parts:
+                observations.append("First extraction empty, waiting for the page to settle...")
+                wait_for_network_quiet(page, quiet_ms=2000, timeout_ms=15000, max_inflight=2)
+                wait_for_dom_quiet(page, quiet_ms=1000, timeout_ms=5000)
                 try:
                     data = page.evaluate(_extract_results_js())
-
-                    observations.append(f"Page URL: {data.get('url', '?')}")
-                    observations.append(f"Page title: {data.get('title', '?')}")
-                    observations.append(f"Calendar entries: {len(data.get('calendar', []))}")
-                    observations.append(f"Flight entries: {len(data.get('flights', []))}")
-                    observations.append(f"Miles lines: {len(data.get('milesLines', []))}")
-                    observations.append(f"Price elements: {len(data.get('fromPrices', []))}")
-
-                    # Combine all text for parsing
                     for item in data.get("calendar", []):
                         result_text_parts.append(f"CALENDAR: {item}")
                     for item in data.get("flights", []):
                         result_text_parts.append(f"FLIGHT: {item}")
                     for item in data.get("milesLines", []):
                         result_text_parts.append(item)
-                    for item in data.get("fromPrices", []):
-                        result_text_parts.append(f"PRICE: {item}")
-
+                    observations.append(f"Second extraction: {len(result_text_parts)} lines")
                 except Exception as e:
-                    observations.append(f"JS extraction error: {e}")
-                    errors.append(f"JS extraction: {e}")
-
-                # Try a second extraction after more time
-                if not result_text_parts:
-                    observations.append("First extraction empty, waiting 15s more...")
-                    time.sleep(15)
-                    try:
-                        data = page.evaluate(_extract_results_js())
-                        for item in data.get("calendar", []):
-                            result_text_parts.append(f"CALENDAR: {item}")
-                        for item in data.get("flights", []):
-                            result_text_parts.append(f"FLIGHT: {item}")
-                        for item in data.get("milesLines", []):
-                            result_text_parts.append(item)
-                        observations.append(f"Second extraction: {len(result_text_parts)} lines")
-                    except Exception as e:
-                        observations.append(f"Second extraction error: {e}")
-
-                # Save debug screenshot (safe since we're not rendering it in agent)
-                try:
-                    page.screenshot(path="/tmp/delta_hybrid_results.png")
-                except Exception:
-                    pass
+                    observations.append(f"Second extraction error: {e}")
 
-                # Clean up - close the page to free memory
-                try:
-                    page.close()
-                except Exception:
-                    pass
+            # Save debug screenshot (safe since we're not rendering it in agent)
+            try:
+                page.screenshot(path=screenshot_path)
+            except Exception:
+                pass
 
         except Exception as exc:
             errors.append(f"Playwright phase error: {exc}")
             observations.append(f"Playwright error: {exc}")
 
-    _pw_thread = threading.Thread(target=_pw_worker, daemon=True)
-    _pw_thread.start()
-    _pw_thread.join(timeout=300)
-    if _pw_thread.is_alive():
+    try:
+        pool.run_on_page(
+            DELTA_SITE, _pw_worker, slot=slot, timeout_seconds=300, cancel_event=cancel_event_of(context)
+        )
+    except TimeoutError:
         errors.append("Playwright phase timed out after 300s")
         observations.append("Playwright phase timed out")
+    except Exception as exc:
+        errors.append(f"Playwright phase error: {exc}")
+        observations.append(f"Playwright error: {exc}")
 
     # Parse results
     combined_text = "\n".join(result_text_parts)
@@ -463,7 +440,114 @@ def _run_hybrid(inputs: Dict[str, Any], observations: List[str]) -> Dict[str, An
         if "booking_url" not in m:
             m["booking_url"] = book_url
 
-    summary_parts = [f"Delta hybrid search: {len(matches)} flight(s) found for {origin}-{dest}"]
+    if tag:
+        observations = [f"[{dest}] {line}" for line in observations]
+    return {
+        "matches": matches,
+        "errors": errors,
+        "observations": observations,
+        "session_expired": bool(session_expired),
+    }
+
+
+def _run_hybrid(
+    inputs: Dict[str, Any], observations: List[str], context: Mapping[str, Any] | None = None
+) -> Dict[str, Any]:
+    """Hybrid: BrowserAgent for login, Playwright for search + extraction.
+
+    Login happens once; each destination is then searched on its own pooled
+    page, concurrently up to the site's fan-out limit. If a reused session
+    turns out to have expired, it logs in again and searches once more.
+    """
+    origin = inputs["from"]
+    dest = inputs["to"][0]
+    travelers = int(inputs["travelers"])
+    cabin = str(inputs.get("cabin", "economy"))
+    days_ahead = int(inputs["days_ahead"])
+    depart_date = date.today() + timedelta(days=days_ahead)
+
+    cdp_url = (context or {}).get("cdp_url")
+    pool = shared_browser_pool(cdp_url)
+
+    def _login() -> None:
+        # Phase 1: BrowserAgent login (in thread to avoid asyncio loop contamination)
+        observations.append("Phase 1: BrowserAgent login to Delta")
+        _phase1_result = [None]
+
+        def _phase1_worker():
+            _phase1_result[0] = adaptive_run(
+                goal=_login_goal(),
+                url=DELTA_URL,
+                max_steps=20,
+                airline="delta",
+                inputs=inputs,
+                max_attempts=1,
+                trace=True,
+                use_vision=True,
+                cdp_url=cdp_url,
+            )
+
+        _t1 = threading.Thread(target=_phase1_worker, daemon=True)
+        _t1.start()
+        join_thread(_t1, 600, cancel_event_of(context))
+        login_result = _phase1_result[0] or {"ok": False, "error": "Phase 1 thread timed out"}
+
+        if login_result["ok"]:
+            pool.mark_logged_in(DELTA_SITE)
+        else:
+            observations.append(f"Login failed: {login_result['error']}")
+            # Continue anyway - Delta search works without login, just heavier
+            observations.append("Continuing without login (results may be heavier)")
+
+        login_info = login_result.get("result") or {}
+        observations.append(f"Login status: {login_info.get('status', 'unknown')}")
+
+    reused_session = pool.logged_in_recently(DELTA_SITE)
+    if reused_session:
+        observations.append("Phase 1: skipped, pooled session logged in recently")
+    else:
+        _login()
+
+    # Phase 2: Playwright navigation + extraction
+    observations.append("Phase 2: Playwright search + extraction")
+
+    if not playwright_available():
+        observations.append("Playwright not available, falling back to agent-only")
+        return _run_agent_only(inputs, observations, context)
+
+    searches = split_searches(inputs)
+    if len(searches) > 1:
+        observations.append(
+            f"Fanning out {len(searches)} searches over up to {site_concurrency(DELTA_SITE)} pooled pages"
+        )
+
+    def _search_all():
+        return fan_out(
+            lambda sub, slot: _search_destination(pool, sub, slot, tag=len(searches) > 1, context=context),
+            searches,
+            site=DELTA_SITE,
+            cancel_event=cancel_event_of(context),
+        )
+
+    results = _search_all()
+    if any(res.value and res.value.get("session_expired") for res in results):
+        pool.invalidate_login(DELTA_SITE)
+        if reused_session:
+            observations.append("Pooled session expired (login page or no form); logging in again")
+            _login()
+            results = _search_all()
+    errors: List[str] = []
+    for res in results:
+        if res.error:
+            errors.append(f"{res.search.destination}: {res.error}")
+            continue
+        observations.extend(res.value["observations"])
+        errors.extend(res.value["errors"])
+    matches = merge_matches(res.value["matches"] for res in results if res.value)
+
+    book_url = _booking_url(origin, dest, depart_date, cabin, travelers)
+    route = f"{origin}-{'/'.join(s.destination for s in searches)}"
+    summary_parts = [f"Delta hybrid search: {len(matches)} flight(s) found for {route}"]
     if matches:
         best = min(m["miles"] for m in matches)
         summary_parts.append(f"Best: {best:,} miles")
@@ -479,7 +563,9 @@ def _run_hybrid(inputs: Dict[str, Any], observations: List[str]) -> Dict[str, An
     }
 
 
-def _run_agent_only(inputs: Dict[str, Any], observations: List[str]) -> Dict[str, Any]:
+def _run_agent_only(
+    inputs: Dict[str, Any], observations: List[str], context: Mapping[str, Any] | None = None
+) -> Dict[str, Any]:
     """Fallback: pure BrowserAgent approach. Supports multiple destinations."""
     origin = inputs["from"]
     destinations = inputs["to"]  # may be a list of airports
@@ -564,11 +650,12 @@ def _run_agent_only(inputs: Dict[str, Any], observations: List[str]) -> Dict[str
             max_attempts=1,
             trace=True,
             use_vision=True,
+            cdp_url=(context or {}).get("cdp_url"),
         )
 
     _t = threading.Thread(target=_agent_worker, daemon=True)
     _t.start()
-    _t.join(timeout=600)
+    join_thread(_t, 600, cancel_event_of(context))
     agent_run = _agent_result[0] or {"ok": False, "error": "Agent thread timed out"}
     if agent_run["ok"]:
         run_result = agent_run.get("result") or {}
@@ -622,9 +709,21 @@ def run(context: Dict[str, Any], inputs: Dict[str, Any]) -> Dict[str, Any]:
         observations.append("Credential refs unresolved; run would require manual auth flow.")
 
     if browser_agent_enabled():
+        if playwright_available() and (
+            len(destinations) > 1
+            or shared_browser_pool(context.get("cdp_url")).logged_in_recently(DELTA_SITE)
+        ):
+            # One agent run walks every destination in turn and logs in each
+            # time; the hybrid path searches them concurrently on pooled pages
+            # and skips the login while the pool's session is fresh.
+            result = _run_hybrid(inputs, observations, context)
+            if result.get("matches"):
+                return result
+            observations.append("Hybrid approach failed or returned no matches, trying agent-only")
         # Playwright Phase 2 is unreliable (page crashes, JS extraction fails).
         # Go straight to agent-only which uses the improved multi-date calendar goal.
-        return _run_agent_only(inputs, observations)
+        with phase(context, "agent_search"):
+            return _run_agent_only(inputs, observations, context)
 
     print(
         "WARNING: BrowserAgent not enabled. Results are placeholder data.",
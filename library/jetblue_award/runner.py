@@ -271,6 +271,7 @@ def run(context: Dict[str, Any], inputs: Dict[str, Any]) -> Dict[str, Any]:
             max_attempts=1,
             trace=True,
             use_vision=True,
+            cdp_url=context.get("cdp_url"),
         )
         if agent_run["ok"]:
             run_result = agent_run.get("result") or {}
@@ -1,18 +1,22 @@
 from __future__ import annotations
 
 import json
-import os
 import re
 import sys
 import threading
-import time
 from datetime import date, timedelta
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Mapping
 
 from openclaw_automation.browser_agent_adapter import browser_agent_enabled, run_browser_agent_goal
 from openclaw_automation.adaptive import adaptive_run
+from openclaw_automation.cancellation import cancel_event_of, join_thread
+from openclaw_automation.browser_pool import on_login_page, playwright_available, shared_browser_pool
+from openclaw_automation.fanout import SubSearch, fan_out, merge_matches, site_concurrency, split_searches
+from openclaw_automation.page_ready import wait_for_any, wait_for_dom_quiet, wait_for_network_quiet, wait_ready
+from openclaw_automation.telemetry import phase
 
 SIA_URL = "https://www.singaporeair.com"
+SIA_SITE = "singaporeair.com"
 SIA_LOGIN_URL = "https://www.singaporeair.com/en_UK/us/ppsclub-krisflyer/login/"
 SIA_REDEEM_URL = "https://www.singaporeair.com/en_UK/us/home#/book/redeemflight"
 
@@ -59,6 +63,11 @@ def _login_goal() -> str:
     ])
 
 
+def _settle(page: Any, quiet_ms: int = 200, timeout_ms: int = 1500) -> None:
+    """Let the form react to the last input: returns once the DOM stops changing."""
+    wait_for_dom_quiet(page, quiet_ms=quiet_ms, timeout_ms=timeout_ms)
+
+
 def _click_suggest_item(page: Any, text: str, timeout: int = 5000) -> bool:
     """Click a suggest-item containing the given text."""
     try:
@@ -98,7 +107,7 @@ def _fill_form_and_search(
             let overlay = document.querySelector('.dwc--SiaCookie__Popup, .cookie-overlay, .cookie-banner');
             if (overlay) overlay.remove();
         }""")
-        time.sleep(1)
+        _settle(page)
     except Exception:
         pass
 
@@ -106,13 +115,13 @@ def _fill_form_and_search(
         accept_btn = page.locator("text=ACCEPT").first
         if accept_btn.is_visible(timeout=2000):
             accept_btn.click(timeout=3000)
-            time.sleep(1)
+            _settle(page)
     except Exception:
         pass
 
     try:
         page.keyboard.press("Escape")
-        time.sleep(0.5)
+        _settle(page)
     except Exception:
         pass
 
@@ -122,57 +131,51 @@ def _fill_form_and_search(
         current_origin = origin_input.input_value(timeout=10000)
         if origin.upper() not in current_origin.upper():
             origin_input.click()
-            time.sleep(0.5)
             origin_input.click(click_count=3)
-            time.sleep(0.3)
             origin_input.type(origin_name[:8], delay=120)
-            time.sleep(3)
+            # _click_suggest_item waits for the suggestion list itself
             if not _click_suggest_item(page, origin_name):
                 page.keyboard.press("ArrowDown")
-                time.sleep(0.3)
+                _settle(page)
                 page.keyboard.press("Enter")
-            time.sleep(1)
+            _settle(page)
 
         page.keyboard.press("Escape")
-        time.sleep(0.5)
+        _settle(page)
 
         # --- Destination field ---
         dest_input = page.locator("input[name='redeemFlightDestination']")
         dest_input.click(timeout=10000)
-        time.sleep(0.5)
         dest_input.click(click_count=3)
-        time.sleep(0.3)
         dest_input.type(dest_name, delay=100)
-        time.sleep(4)
         if not _click_suggest_item(page, dest_name):
             page.keyboard.press("ArrowDown")
-            time.sleep(0.3)
+            _settle(page)
             page.keyboard.press("Enter")
         page.keyboard.press("Escape")
-        time.sleep(2)
+        _settle(page, quiet_ms=300, timeout_ms=3000)
 
         # --- Class dropdown ---
         class_input = page.locator("input[name='flightClass']")
         current_class = class_input.input_value()
         if cabin_display.lower() not in current_class.lower():
             class_input.click()
-            time.sleep(2)
             if not _click_suggest_item(page, cabin_display):
                 errors.append(f"Class suggestion '{cabin_display}' not found")
-            time.sleep(1)
+            _settle(page)
 
         # --- Passengers ---
         if travelers > 1:
             pax_input = page.locator("input[name='flightPassengers']")
             pax_input.click()
-            time.sleep(1)
+            wait_for_any(page, selectors=["button[aria-label='Add Adult Count']"], timeout_ms=3000)
             for _ in range(travelers - 1):
                 add_btn = page.locator("button[aria-label='Add Adult Count']")
                 if add_btn.count() > 0:
                     add_btn.first.click()
-                    time.sleep(0.5)
+                    _settle(page)
             page.keyboard.press("Escape")
-            time.sleep(1)
+            _settle(page)
 
         # --- Calendar / Date ---
         # Try direct fill first (Vue.js native setter trick)
@@ -190,7 +193,7 @@ def _fill_form_and_search(
                     return true;
                 }}
             """)
-            time.sleep(1)
+            _settle(page)
             if date_set:
                 errors.append(f"Date set via JS setter to {date_iso}")
         except Exception as e:
@@ -200,7 +203,7 @@ def _fill_form_and_search(
         date_input = page.locator("input[name='departDate']")
         try:
             date_input.click(timeout=5000)
-            time.sleep(2)
+            wait_for_any(page, selectors=[".calendar_days li", ".calendar-root"], timeout_ms=5000)
         except Exception:
             pass
 
@@ -209,7 +212,7 @@ def _fill_form_and_search(
         if oneway_label.count() > 0:
             try:
                 oneway_label.first.click()
-                time.sleep(1)
+                _settle(page)
             except Exception:
                 pass
 
@@ -220,7 +223,7 @@ def _fill_form_and_search(
             if day_cell.count() > 0:
                 try:
                     day_cell.first.click()
-                    time.sleep(1)
+                    _settle(page)
                     day_clicked = True
                     break
                 except Exception:
@@ -238,7 +241,7 @@ def _fill_form_and_search(
                     if text.strip() == day_num:
                         cell.click()
                         day_clicked = True
-                        time.sleep(1)
+                        _settle(page)
                         break
                 except Exception:
                     pass
@@ -248,7 +251,7 @@ def _fill_form_and_search(
                 if count > 0:
                     try:
                         day_cells.nth(min(6, count - 1)).click()
-                        time.sleep(1)
+                        _settle(page)
                         errors.append(f"Day {day_num} not found, clicked alternate")
                     except Exception:
                         errors.append("Could not click any day cell")
@@ -261,13 +264,13 @@ def _fill_form_and_search(
             if done_btn.count() > 0:
                 try:
                     done_btn.first.click()
-                    time.sleep(2)
+                    _settle(page, quiet_ms=300, timeout_ms=3000)
                     break
                 except Exception:
                     pass
 
         # --- Click Search ---
-        time.sleep(3)
+        _settle(page, quiet_ms=500, timeout_ms=3000)
         search_btn = page.locator("form.redeem-flight button[type='submit']")
         if search_btn.count() > 0:
             search_btn.first.click()
@@ -275,7 +278,13 @@ def _fill_form_and_search(
             errors.append("Search button not found")
             return {"ok": False, "error": "Search button not found", "errors": errors}
 
-        time.sleep(15)
+        # Results page: the seven-day calendar or flight list, or a no-flights notice
+        wait_for_any(
+            page,
+            selectors=[".viewcell:not(.loading)", ".FlightDisplay", ".FlightSelections"],
+            texts=["no flights available", "no seats available"],
+            timeout_ms=45000,
+        )
 
         try:
             page.screenshot(path="/tmp/sia_after_search.png")
@@ -332,6 +341,11 @@ def _scrape_results(page: Any, target_month: int, target_year: int) -> List[Dict
         except Exception:
             return []
 
+    def _wait_week_loaded():
+        # Flipping the week re-fetches fares; cells show .loading until they land.
+        wait_for_network_quiet(page, quiet_ms=500, timeout_ms=8000, max_inflight=2)
+        wait_for_dom_quiet(page, quiet_ms=300, timeout_ms=3000, selector=".SevenDayCalendar")
+
     try:
         try:
             page.locator(".viewcell:not(.loading)").first.wait_for(
@@ -339,7 +353,7 @@ def _scrape_results(page: Any, target_month: int, target_year: int) -> List[Dict
             )
         except Exception:
             pass
-        time.sleep(3)
+        wait_for_network_quiet(page, quiet_ms=1000, timeout_ms=10000, max_inflight=2)
 
         results.extend(_extract_via_js())
 
@@ -350,7 +364,7 @@ def _scrape_results(page: Any, target_month: int, target_year: int) -> List[Dict
             for _ in range(3):
                 try:
                     left_btn.first.click()
-                    time.sleep(3)
+                    _wait_week_loaded()
                     results.extend(_extract_via_js())
                 except Exception:
                     break
@@ -359,7 +373,7 @@ def _scrape_results(page: Any, target_month: int, target_year: int) -> List[Dict
             for _ in range(7):
                 try:
                     right_btn.first.click()
-                    time.sleep(3)
+                    _wait_week_loaded()
                     results.extend(_extract_via_js())
                 except Exception:
                     break
@@ -416,148 +430,216 @@ def _scrape_results(page: Any, target_month: int, target_year: int) -> List[Dict
     return parsed
 
 
-def _run_hybrid(inputs: Dict[str, Any], observations: List[str]) -> Dict[str, Any]:
-    """Hybrid approach: BrowserAgent for login, Playwright for form + scraping."""
+def _search_destination(
+    pool: Any, sub: SubSearch, slot: int, tag: bool = False, context: Mapping[str, Any] | None = None
+) -> Dict[str, List[Any]]:
+    """Phase 2+3 for one destination/date on the pool's ``slot`` page."""
+    inputs = sub.inputs
     origin = inputs["from"]
-    destinations = inputs["to"]
-    dest = destinations[0]
+    dest = sub.destination
     travelers = int(inputs["travelers"])
     cabin = str(inputs.get("cabin", "economy"))
-    days_ahead = int(inputs["days_ahead"])
-    mid_days = days_ahead
-    depart_date = date.today() + timedelta(days=mid_days)
-    # Phase 1: BrowserAgent login (in thread to avoid asyncio loop contamination)
-    observations.append("Phase 1: BrowserAgent login")
-    _phase1_result = [None]
-
-    def _phase1_worker():
-        _phase1_result[0] = adaptive_run(
-            goal=_login_goal(),
-            url=SIA_LOGIN_URL,
-            max_steps=20,
-            airline="singapore",
-            inputs=inputs,
-            max_attempts=1,
-            trace=True,
-            use_vision=True,
-        )
-
-    _t1 = threading.Thread(target=_phase1_worker, daemon=True)
-    _t1.start()
-    _t1.join(timeout=300)
-    login_result = _phase1_result[0] or {"ok": False, "error": "Phase 1 thread timed out"}
-
-    if not login_result["ok"]:
-        observations.append(f"Login failed: {login_result['error']}")
-        return {
-            "mode": "live",
-            "real_data": False,
-            "matches": [],
-            "summary": f"SIA login failed: {login_result['error']}",
-            "raw_observations": observations,
-            "errors": [login_result["error"]],
-        }
-
-    login_info = login_result.get("result") or {}
-    observations.append(f"Login status: {login_info.get('status', 'unknown')}")
-    observations.append(f"Login steps: {login_info.get('steps', 'n/a')}")
-
-    # Phase 2: Playwright form fill
-    observations.append("Phase 2: Playwright form fill (hybrid)")
-    cdp_url = os.getenv("OPENCLAW_CDP_URL", "http://127.0.0.1:9222")
-
-    try:
-        from playwright.sync_api import sync_playwright
-    except ImportError:
-        observations.append("Playwright not available")
-        return _run_agent_only(inputs, observations)
-
+    depart_date = date.today() + timedelta(days=sub.days_ahead)
     matches: List[Dict[str, Any]] = []
     errors: List[str] = []
+    observations: List[str] = []
+    session_expired: List[bool] = []
 
-    # Run sync_playwright in a separate thread to avoid asyncio loop conflicts
-    def _pw_worker():
+    # The pool runs this on its singaporeair.com lane thread for ``slot``,
+    # reusing the CDP connection and page from earlier runs.
+    def _pw_worker(page):
         try:
-            with sync_playwright() as p:
-                browser = p.chromium.connect_over_cdp(cdp_url)
-                contexts = browser.contexts
-                if not contexts:
-                    errors.append("No browser contexts found after login")
-                    return {
-                        "mode": "live",
-                        "real_data": False,
-                        "matches": [],
-                        "summary": "No browser context available after BrowserAgent login",
-                        "raw_observations": observations,
-                        "errors": errors,
-                    }
-
-                context = contexts[0]
-                page = None
-                for p_page in context.pages:
-                    if "singaporeair" in p_page.url:
-                        page = p_page
-                        break
-
-                if page is None:
-                    page = context.new_page()
-
-                # Two-step navigation: homepage first (loads Angular), then redeem hash
-                homepage = "https://www.singaporeair.com/en_UK/us/home"
+            # Two-step navigation: homepage first (loads Angular), then redeem hash
+            homepage = "https://www.singaporeair.com/en_UK/us/home"
+            with phase(context, "navigate", destination=dest):
                 page.goto(homepage, wait_until="domcontentloaded", timeout=30000)
-                time.sleep(6)
+                wait_ready(page, timeout_ms=10000)
                 page.goto(SIA_REDEEM_URL, wait_until="domcontentloaded", timeout=30000)
-                time.sleep(5)
+                wait_for_any(page, selectors=["form.redeem-flight"], timeout_ms=15000)
 
-                observations.append(f"Playwright connected, page URL: {page.url}")
+            observations.append(f"Playwright connected, page URL: {page.url}")
+            if on_login_page(page):
+                session_expired.append(True)
+                errors.append("Redirected to KrisFlyer login")
+                return
 
+            with phase(context, "form_fill", destination=dest):
                 form_result = _fill_form_and_search(
                     page, origin, dest, cabin, travelers, depart_date,
                 )
-                if form_result.get("errors"):
-                    errors.extend(form_result["errors"])
-                    for e in form_result["errors"]:
-                        observations.append(f"Form note: {e}")
+            if form_result.get("errors"):
+                errors.extend(form_result["errors"])
+                for e in form_result["errors"]:
+                    observations.append(f"Form note: {e}")
 
-                if form_result["ok"]:
-                    observations.append("Form filled and search submitted")
+            if form_result["ok"]:
+                observations.append("Form filled and search submitted")
 
-                    # Phase 3: Scrape results
-                    observations.append("Phase 3: Scraping results")
+                # Phase 3: Scrape results
+                observations.append("Phase 3: Scraping results")
+                with phase(context, "scrape", destination=dest):
                     raw_results = _scrape_results(page, depart_date.month, depart_date.year)
-                    observations.append(f"Scraped {len(raw_results)} date entries")
-
-                    book_url = _booking_url(origin, dest, depart_date)
-                    for r in raw_results:
-                        if r["miles"] > 0:
-                            matches.append({
-                                "route": f"{origin}-{dest}",
-                                "date": r["date"],
-                                "miles": r["miles"],
-                                "travelers": travelers,
-                                "cabin": cabin,
-                                "mixed_cabin": False,
-                                "booking_url": book_url,
-                                "notes": f"raw: {r['raw']}",
-                            })
-
-                    observations.append(f"Found {len(matches)} date entries with availability")
-                else:
-                    observations.append(f"Form fill failed: {form_result.get('error', 'unknown')}")
+                observations.append(f"Scraped {len(raw_results)} date entries")
+
+                book_url = _booking_url(origin, dest, depart_date)
+                for r in raw_results:
+                    if r["miles"] > 0:
+                        matches.append({
+                            "route": f"{origin}-{dest}",
+                            "date": r["date"],
+                            "miles": r["miles"],
+                            "travelers": travelers,
+                            "cabin": cabin,
+                            "mixed_cabin": False,
+                            "booking_url": book_url,
+                            "notes": f"raw: {r['raw']}",
+                        })
+
+                observations.append(f"Found {len(matches)} date entries with availability")
+            else:
+                observations.append(f"Form fill failed: {form_result.get('error', 'unknown')}")
+                if form_result.get("error") == "Form not found after login":
+                    session_expired.append(True)
 
         except Exception as exc:
             errors.append(f"Playwright phase error: {exc}")
             observations.append(f"Playwright error: {exc}")
 
-    _pw_thread = threading.Thread(target=_pw_worker, daemon=True)
-    _pw_thread.start()
-    _pw_thread.join(timeout=300)
-    if _pw_thread.is_alive():
+    try:
+        pool.run_on_page(
+            SIA_SITE, _pw_worker, slot=slot, timeout_seconds=300, cancel_event=cancel_event_of(context)
+        )
+    except TimeoutError:
         errors.append("Playwright phase timed out after 300s")
         observations.append("Playwright phase timed out")
+    except Exception as exc:
+        errors.append(f"Playwright phase error: {exc}")
+        observations.append(f"Playwright error: {exc}")
+
+    if tag:
+        observations = [f"[{dest}] {line}" for line in observations]
+    return {
+        "matches": matches,
+        "errors": errors,
+        "observations": observations,
+        "session_expired": bool(session_expired),
+    }
+
+
+def _run_hybrid(
+    inputs: Dict[str, Any], observations: List[str], context: Mapping[str, Any] | None = None
+) -> Dict[str, Any]:
+    """Hybrid approach: BrowserAgent for login, Playwright for form + scraping.
+
+    Login happens once; each destination is then searched on its own pooled
+    page, concurrently up to the site's fan-out limit. If a reused session
+    turns out to have expired, it logs in again and searches once more.
+    """
+    origin = inputs["from"]
+    destinations = inputs["to"]
+    dest = destinations[0]
+    days_ahead = int(inputs["days_ahead"])
+    mid_days = days_ahead
+    depart_date = date.today() + timedelta(days=mid_days)
+    cdp_url = (context or {}).get("cdp_url")
+    pool = shared_browser_pool(cdp_url)
+
+    def _login() -> str | None:
+        """Phase 1: BrowserAgent login; returns the error if it failed."""
+        # In a thread to avoid asyncio loop contamination.
+        observations.append("Phase 1: BrowserAgent login")
+        _phase1_result = [None]
+
+        def _phase1_worker():
+            _phase1_result[0] = adaptive_run(
+                goal=_login_goal(),
+                url=SIA_LOGIN_URL,
+                max_steps=20,
+                airline="singapore",
+                inputs=inputs,
+                max_attempts=1,
+                trace=True,
+                use_vision=True,
+                cdp_url=cdp_url,
+            )
+
+        with phase(context, "login"):
+            _t1 = threading.Thread(target=_phase1_worker, daemon=True)
+            _t1.start()
+            join_thread(_t1, 300, cancel_event_of(context))
+        login_result = _phase1_result[0] or {"ok": False, "error": "Phase 1 thread timed out"}
+
+        if not login_result["ok"]:
+            pool.invalidate_login(SIA_SITE)
+            observations.append(f"Login failed: {login_result['error']}")
+            return login_result["error"]
+
+        pool.mark_logged_in(SIA_SITE)
+        login_info = login_result.get("result") or {}
+        observations.append(f"Login status: {login_info.get('status', 'unknown')}")
+        observations.append(f"Login steps: {login_info.get('steps', 'n/a')}")
+        return None
+
+    def _login_failed(error: str) -> Dict[str, Any]:
+        return {
+            "mode": "live",
+            "real_data": False,
+            "matches": [],
+            "summary": f"SIA login failed: {error}",
+            "raw_observations": observations,
+            "errors": [error],
+        }
+
+    reused_session = pool.logged_in_recently(SIA_SITE)
+    if reused_session:
+        observations.append("Phase 1: skipped, pooled session logged in recently")
+    else:
+        login_error = _login()
+        if login_error is not None:
+            return _login_failed(login_error)
+
+    # Phase 2: Playwright form fill
+    observations.append("Phase 2: Playwright form fill (hybrid)")
+
+    if not playwright_available():
+        observations.append("Playwright not available")
+        return _run_agent_only(inputs, observations, context)
+
+    searches = split_searches(inputs)
+    if len(searches) > 1:
+        observations.append(
+            f"Fanning out {len(searches)} searches over up to {site_concurrency(SIA_SITE)} pooled pages"
+        )
+
+    def _search_all():
+        return fan_out(
+            lambda sub, slot: _search_destination(pool, sub, slot, tag=len(searches) > 1, context=context),
+            searches,
+            site=SIA_SITE,
+            cancel_event=cancel_event_of(context),
+        )
+
+    results = _search_all()
+    if any(res.value and res.value.get("session_expired") for res in results):
+        pool.invalidate_login(SIA_SITE)
+        if reused_session:
+            observations.append("Pooled session expired (login page or no form); logging in again")
+            login_error = _login()
+            if login_error is not None:
+                return _login_failed(login_error)
+            results = _search_all()
+    errors: List[str] = []
+    for res in results:
+        if res.error:
+            errors.append(f"{res.search.destination}: {res.error}")
+            continue
+        observations.extend(res.value["observations"])
+        errors.extend(res.value["errors"])
+    matches = merge_matches(res.value["matches"] for res in results if res.value)
 
     book_url_final = _booking_url(origin, dest, depart_date)
-    summary_parts = [f"SIA hybrid search: {len(matches)} flights found for {origin}-{dest}"]
+    route = f"{origin}-{'/'.join(s.destination for s in searches)}"
+    summary_parts = [f"SIA hybrid search: {len(matches)} flights found for {route}"]
     if matches:
         best = min(m["miles"] for m in matches)
         summary_parts.append(f"Best: {best:,} miles")
@@ -572,7 +654,9 @@ def _run_hybrid(inputs: Dict[str, Any], observations: List[str]) -> Dict[str, An
     }
 
 
-def _run_agent_only(inputs: Dict[str, Any], observations: List[str]) -> Dict[str, Any]:
+def _run_agent_only(
+    inputs: Dict[str, Any], observations: List[str], context: Mapping[str, Any] | None = None
+) -> Dict[str, Any]:
     """Fallback: agent-only approach."""
     _agent_result = [None]
 
@@ -583,11 +667,12 @@ def _run_agent_only(inputs: Dict[str, Any], observations: List[str]) -> Dict[str
             max_steps=90,
             trace=True,
             use_vision=True,
+            cdp_url=(context or {}).get("cdp_url"),
         )
 
     _t = threading.Thread(target=_agent_worker, daemon=True)
     _t.start()
-    _t.join(timeout=600)
+    join_thread(_t, 600, cancel_event_of(context))
     agent_run = _agent_result[0] or {"ok": False, "error": "Agent thread timed out"}
     if agent_run["ok"]:
         run_result = agent_run.get("result") or {}
@@ -708,10 +793,11 @@ def run(context: Dict[str, Any], inputs: Dict[str, Any]) -> Dict[str, Any]:
 
     if browser_agent_enabled():
         # Try hybrid first, fall back to agent-only if it fails
-        result = _run_hybrid(inputs, observations)
+        result = _run_hybrid(inputs, observations, context)
         if not result.get("matches"):
             observations.append("Hybrid approach failed or returned no matches, trying agent-only")
-            return _run_agent_only(inputs, observations)
+            with phase(context, "agent_search"):
+                return _run_agent_only(inputs, observations, context)
         return result
 
     print(
@@ -1,24 +1,14 @@
 from __future__ import annotations
 
-import re
-import urllib.request
-from typing import Any, Dict, List
+from typing import Any, Dict, Iterable, List
 
+from openclaw_automation.html_extract import extract, iter_text
 
-def _fetch_text(url: str) -> str:
-    req = urllib.request.Request(
-        url,
-        headers={"User-Agent": "Mozilla/5.0 (OpenClawAutomationKit/1.0)"},
-    )
-    with urllib.request.urlopen(req, timeout=20) as resp:
-        page_html = resp.read().decode("utf-8", errors="ignore")
-    return re.sub(r"\s+", " ", re.sub(r"<[^>]+>", " ", page_html)).strip()
+USER_AGENT = "Mozilla/5.0 (OpenClawAutomationKit/1.0)"
 
 
-def _contains(haystack: str, needle: str, case_sensitive: bool) -> bool:
-    if case_sensitive:
-        return needle in haystack
-    return needle.lower() in haystack.lower()
+def _fetch_text(url: str) -> Iterable[str]:
+    return iter_text(url, headers={"User-Agent": USER_AGENT})
 
 
 def run(context: Dict[str, Any], inputs: Dict[str, Any]) -> Dict[str, Any]:
@@ -29,10 +19,16 @@ def run(context: Dict[str, Any], inputs: Dict[str, Any]) -> Dict[str, Any]:
     case_sensitive = bool(inputs.get("case_sensitive", False))
 
     try:
-        page_text = _fetch_text(url)
-        present_required: List[str] = [x for x in must_include if _contains(page_text, x, case_sensitive)]
+        page = extract(
+            _fetch_text(url),
+            keywords=must_include + must_not_include,
+            case_sensitive=case_sensitive,
+            max_text_chars=0,
+        )
+        counts = page.keyword_counts
+        present_required: List[str] = [x for x in must_include if counts.get(x)]
         missing_required: List[str] = [x for x in must_include if x not in present_required]
-        forbidden_found: List[str] = [x for x in must_not_include if _contains(page_text, x, case_sensitive)]
+        forbidden_found: List[str] = [x for x in must_not_include if counts.get(x)]
         all_required_present = len(missing_required) == 0
 
         summary = (
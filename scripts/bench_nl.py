@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""Benchmark NL query parsing for chat-log replays.
+
+Replays a query log (one query per line, or JSONL with a "query" field)
+through parse_queries and prints throughput plus the routing histogram.
+Without --log, a synthetic log is built from typical chat queries.
+
+Usage:
+    python scripts/bench_nl.py [--log PATH] [--size 200000]
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import time
+from collections import Counter
+from pathlib import Path
+from typing import List
+
+from openclaw_automation.nl import parse_queries
+
+SAMPLE_QUERIES = [
+    "Search United award travel business from SFO to AMS,LIS,FCO for 2 travelers in next 30 days under 120k miles",
+    "Search Singapore Airlines business SFO to SIN in March for 2 travelers",
+    "search delta award to europe in june for two people",
+    "ANA economy SFO HND during dec under 90k miles",
+    "what meetings do I have tomorrow and any emails from bob@example.com",
+    "last time alice emailed me",
+    "weather in San Francisco in celsius",
+    "check https://www.yahoo.com for mentions of OpenAI",
+    "top stories on the homepage",
+    "github signin check",
+]
+
+
+def _parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark NL query parsing")
+    parser.add_argument("--log", type=Path, help="Query log: plain text or JSONL with a 'query' field")
+    parser.add_argument("--size", type=int, default=200000, help="Synthetic log size")
+    return parser.parse_args()
+
+
+def _load(path: Path | None, size: int) -> List[str]:
+    if path is None:
+        rnd = random.Random(0)
+        # Real logs repeat a lot, but include some unique tails too.
+        return [
+            rnd.choice(SAMPLE_QUERIES) + ("" if rnd.random() < 0.7 else f" #{rnd.randint(0, 10**6)}")
+            for _ in range(size)
+        ]
+    queries = []
+    for line in path.read_text().splitlines():
+        if not line.strip():
+            continue
+        if line.lstrip().startswith("{"):
+            queries.append(str(json.loads(line).get("query", "")))
+        else:
+            queries.append(line)
+    return queries
+
+
+def main() -> int:
+    args = _parse_args()
+    queries = _load(args.log, args.size)
+    t0 = time.perf_counter()
+    parsed = parse_queries(queries)
+    elapsed = time.perf_counter() - t0
+    print(f"queries: {len(queries)}  unique: {len(set(queries))}")
+    print(f"total: {elapsed:.2f} s  per query: {elapsed / max(len(queries), 1) * 1e6:.2f} us")
+    for script_dir, count in Counter(p.script_dir for p in parsed).most_common():
+        print(f"  {script_dir:<36} {count}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
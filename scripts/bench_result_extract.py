@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""Benchmark award-text extraction over a corpus of agent transcripts.
+
+The built-in corpus mirrors the output formats the award runners ask
+BrowserAgent for (MATCH lines, FLIGHT/CALENDAR strips, Delta month-name
+calendars, cabin lines, United Money+Miles, summaries) plus the noisy
+"no results" transcripts that make up most stored runs. Point --corpus at
+a JSONL file (one {"text": ...} per line) or a directory of .txt files to
+benchmark real stored transcripts instead.
+
+Usage:
+    python scripts/bench_result_extract.py [--corpus PATH] [--copies 2000]
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import time
+from collections import Counter
+from pathlib import Path
+from typing import List
+
+from openclaw_automation.result_extract import (
+    extract_award_matches_batch,
+    extract_award_matches_with_rule,
+)
+
+SAMPLE_OUTPUTS = [
+    "Search complete.\nMATCH|2026-03-02|80000|29.50|1 stop|Lufthansa|overnight\n"
+    "MATCH|2026-03-03|130000|5.60|nonstop|United|over budget\n",
+    "CALENDAR: Fri 2/27: 200k miles + $5.60 | Mon 3/2: 80k miles + $5.60 | Tue 3/3: 80k miles + $29.50",
+    "Date strip results:\n- Fri 2/20: 39.8k miles\n- Sat 2/21: 41.2k miles\n"
+    "Mon 2/23: 47.1k miles (selected date)\n",
+    "Delta calendar: Fri Mar 1: 499,900 miles, Sat Mar 2: 300,400 miles, Sun Mar 3: 185,000 miles",
+    "FLIGHT: 10:35-06:10+1 | Economy: 39.8k miles + $5.60 | nonstop\n"
+    "Business: 250k miles + $21.50 (mixed cabin)\n",
+    "Money + Miles pricing shown. Basic Economy: $250 + 9k miles. Economy: $984 + 96k miles\n"
+    "$1,760 + 192k miles (Business)",
+    "I found several options. Cheapest economy: 39.8k miles on Feb 22. "
+    "Lowest business: 185,000 miles on Mar 4.",
+    "The results page showed a fare of 130,000 miles for the nonstop and 95,000 miles with one stop.",
+    "Logged in successfully. Navigated to award search. The page shows 'No flights found for the "
+    "selected dates'. Tried adjacent dates via the calendar; all showed 'Not available'.",
+    "Step 14: clicked 'Find flights'. Waiting for results to load... Page title: Book a flight | "
+    "United Airlines. The session expired and the site asked to sign in again.",
+]
+
+
+def _parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark award text extraction")
+    parser.add_argument("--corpus", type=Path, help="JSONL file or directory of .txt transcripts")
+    parser.add_argument("--copies", type=int, default=2000, help="Copies of the built-in corpus")
+    return parser.parse_args()
+
+
+def _load_corpus(path: Path | None, copies: int) -> List[str]:
+    if path is None:
+        return SAMPLE_OUTPUTS * copies
+    if path.is_dir():
+        return [p.read_text(errors="replace") for p in sorted(path.glob("**/*.txt"))]
+    texts = []
+    for line in path.read_text().splitlines():
+        if line.strip():
+            record = json.loads(line)
+            texts.append(record["text"] if isinstance(record, dict) else str(record))
+    return texts
+
+
+def main() -> int:
+    args = _parse_args()
+    texts = _load_corpus(args.corpus, args.copies)
+    if not texts:
+        print("empty corpus")
+        return 1
+
+    settings = dict(route="SFO-AMS", cabin="business", travelers=2, max_miles=250000)
+    t0 = time.perf_counter()
+    results = extract_award_matches_batch(texts, **settings)
+    elapsed = time.perf_counter() - t0
+
+    rules = Counter(extract_award_matches_with_rule(text, **settings)[0] or "none" for text in texts)
+    rows = sum(len(r) for r in results)
+    print(f"transcripts: {len(texts)}  rows: {rows}")
+    print(f"total: {elapsed * 1000:.1f} ms  per transcript: {elapsed / len(texts) * 1e6:.1f} us")
+    print("rule that fired:")
+    for name, count in rules.most_common():
+        print(f"  {name:<20} {count}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -8,12 +8,29 @@ Uses the kit's runners (library/*/runner.py) to search each airline.
 Usage:
     cd ~/openclaw-automation-kit
     set -a && source .env && set +a
-    python scripts/daily_award_scan.py --send-report [--only delta,sia] [--skip united]
+    python scripts/daily_award_scan.py --send-report [--only delta,sia] [--skip united] [--workers 2]
+    python scripts/daily_award_scan.py --incremental --days 1,8,15,22,29
+
+Live results are recorded in the award observation store
+(OPENCLAW_AWARD_STORE_PATH, default ~/.openclaw/award_observations.sqlite3)
+and each section notes availability that is new since the previous scan.
+
+Airlines run concurrently, each on its own browser from OPENCLAW_CDP_URLS;
+cooldowns and rate-limit backoff only delay further searches on the same
+airline. Each airline's section is printed and written to --report-file as
+it finishes.
+
+With --incremental, each (airline, target day) window is re-checked only when
+the award store says it is due: never scanned, last scan failed, near-term,
+availability changed between its last two good scans, or stable but past its
+refresh interval (2 days up to 60 days out, weekly beyond). Due windows run
+first, nearest departure first; the rest are listed as unchanged.
 
 Environment:
     OPENCLAW_USE_BROWSER_AGENT=true
     OPENCLAW_BROWSER_AGENT_PATH=~/athanasoulis-ai-assistant/src/browser
     OPENCLAW_CDP_URL=http://127.0.0.1:9222
+    OPENCLAW_CDP_URLS=http://127.0.0.1:9222,http://127.0.0.1:9223  (optional, one airline per browser)
     ANTHROPIC_API_KEY=...
     AUTOMATION_KEYCHAIN_PASSWORD=...
 """
@@ -26,12 +43,12 @@ import importlib.util
 import json
 import logging
 import os
+import queue
 import re
 import sys
-import time
 from datetime import date, datetime
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import Any, Dict, Iterable, List
 
 # Ensure kit is importable
 _kit_root = Path(__file__).resolve().parent.parent
@@ -90,16 +107,19 @@ IMESSAGE_ALLOWED_RECIPIENTS_NORMALIZED = {
 # ── Search schedule ──────────────────────────────────────────────────────────
 # Target month — update this when you want to scan a different month
 TARGET_MONTH_NAME = "June"
+TARGET_MONTH = 6
 TARGET_YEAR = 2026
+# Days of the target month to search (override with --days)
+TARGET_DAYS = [15]
 
-def _days_to_mid_month():
-    """Calculate days_ahead to target the 15th of the target month."""
-    target = date(TARGET_YEAR, 6, 15)  # June 15
+def _days_to_target(day: int = 15) -> int:
+    """Calculate days_ahead to target ``day`` of the target month."""
+    target = date(TARGET_YEAR, TARGET_MONTH, day)
     delta = (target - date.today()).days
     return max(1, delta)
 
 # Each search maps to a kit runner via script_dir
-# Order: United LAST (to allow cooldown)
+# Order is start priority when there are fewer browser slots than airlines.
 SEARCHES: List[Dict[str, Any]] = [
     {
         "airline": "ana",
@@ -175,15 +195,24 @@ SEARCHES: List[Dict[str, Any]] = [
     },
 ]
 
-# Cooldowns (seconds)
+# Cooldowns (seconds), applied per airline between searches on that airline.
+# Repeated rate limits double the backoff up to COOLDOWN_MAX.
 COOLDOWN_NORMAL = 120
 COOLDOWN_RATE_LIMITED = 600
+COOLDOWN_MAX = 3600
+
+REPORT_FILE = Path("/tmp/daily_award_scan_report.txt")
 
 
 # ── Runner execution ─────────────────────────────────────────────────────────
 
-def run_one(script_dir: str, inputs: Dict[str, Any]) -> Dict[str, Any]:
-    """Import and run a kit runner directly."""
+def script_id_for(script_dir: str) -> str:
+    manifest = json.loads((_kit_root / script_dir / "manifest.json").read_text())
+    return manifest["id"]
+
+
+def run_one(script_dir: str, inputs: Dict[str, Any], cdp_url: str | None = None) -> Dict[str, Any]:
+    """Import and run a kit runner directly, on the browser at ``cdp_url`` if given."""
     runner_path = _kit_root / script_dir / "runner.py"
     if not runner_path.exists():
         return {"mode": "error", "matches": [], "summary": f"Runner not found: {runner_path}",
@@ -198,7 +227,9 @@ def run_one(script_dir: str, inputs: Dict[str, Any]) -> Dict[str, Any]:
         return {"mode": "error", "matches": [], "summary": f"Import error: {e}",
                 "errors": [str(e)]}
 
-    context = {"unresolved_credential_refs": []}
+    context: Dict[str, Any] = {"unresolved_credential_refs": []}
+    if cdp_url:
+        context["cdp_url"] = cdp_url
 
     try:
         result = module.run(context, inputs)
@@ -237,8 +268,70 @@ def format_matches(matches: List[Dict], max_show=15) -> str:
     return "\n".join(lines)
 
 
-def compile_report(all_results: Dict[str, Dict]) -> str:
-    """Build the final iMessage report."""
+def format_section(
+    search: Dict[str, Any],
+    result: Dict[str, Any] | None,
+    pending: bool = False,
+    new_count: int | None = None,
+    note: str | None = None,
+) -> List[str]:
+    """Report lines for one airline; ``new_count`` comes from the award store."""
+    name = search["name"]
+    dest = search["inputs"]["to"][0]
+    lines = [f"{'─'*35}", f"{name} — SFO → {dest}"]
+
+    if not result:
+        lines.append("  ⏳ Running" if pending else f"  ⏭ {note or 'Skipped'}")
+        lines.append("")
+        return lines
+
+    mode = result.get("mode", "unknown")
+    matches = result.get("matches", [])
+    summary = result.get("summary", "")
+    errors = result.get("errors", [])
+    real_data = result.get("real_data", False)
+
+    if mode == "error" or errors:
+        err_msg = errors[0][:120] if errors else "Unknown error"
+        lines.append(f"  ❌ {err_msg}")
+    elif not real_data and mode == "placeholder":
+        lines.append("  ⚠️ Placeholder data (browser agent not enabled?)")
+    elif matches:
+        # Group by cabin
+        econ = [m for m in matches if m.get("cabin", "").lower() in ("economy", "coach", "main", "blue", "")]
+        biz = [m for m in matches if m.get("cabin", "").lower() in ("business", "first", "delta_one", "polaris", "mint", "premier")]
+
+        if econ:
+            best_e = min(m["miles"] for m in econ if m.get("miles"))
+            lines.append(f"  Economy: {len(econ)} options, best {best_e:,} miles")
+        if biz:
+            best_b = min(m["miles"] for m in biz if m.get("miles"))
+            lines.append(f"  Business: {len(biz)} options, best {best_b:,} miles")
+        if not econ and not biz:
+            lines.append(f"  {len(matches)} results found")
+            for m in matches[:5]:
+                lines.append(f"    {m.get('date','?')}: {m.get('miles',0):,} miles")
+    elif summary:
+        lines.append(f"  {summary[:200]}")
+    else:
+        lines.append("  No results")
+
+    if new_count:
+        lines.append(f"  🆕 {new_count} new since last scan")
+    lines.append("")
+    return lines
+
+
+def compile_report(
+    all_results: Dict[str, Dict],
+    pending: Iterable[str] = (),
+    new_counts: Dict[str, int] | None = None,
+    notes: Dict[str, str] | None = None,
+) -> str:
+    """Build the iMessage report; airlines in ``pending`` show as still running."""
+    pending = set(pending)
+    new_counts = new_counts or {}
+    notes = notes or {}
     lines = []
     lines.append(f"✈️ Daily Award Scan — {TARGET_MONTH_NAME} {TARGET_YEAR}")
     lines.append(f"SFO | 2 pax | {datetime.now().strftime('%b %d %H:%M')}")
@@ -246,56 +339,29 @@ def compile_report(all_results: Dict[str, Dict]) -> str:
 
     for search in SEARCHES:
         airline = search["airline"]
-        name = search["name"]
-        dest = search["inputs"]["to"][0]
-        result = all_results.get(airline)
-
-        lines.append(f"{'─'*35}")
-        lines.append(f"{name} — SFO → {dest}")
-
-        if not result:
-            lines.append("  ⏭ Skipped")
-            lines.append("")
-            continue
-
-        mode = result.get("mode", "unknown")
-        matches = result.get("matches", [])
-        summary = result.get("summary", "")
-        errors = result.get("errors", [])
-        real_data = result.get("real_data", False)
-
-        if mode == "error" or errors:
-            err_msg = errors[0][:120] if errors else "Unknown error"
-            lines.append(f"  ❌ {err_msg}")
-        elif not real_data and mode == "placeholder":
-            lines.append("  ⚠️ Placeholder data (browser agent not enabled?)")
-        elif matches:
-            # Group by cabin
-            econ = [m for m in matches if m.get("cabin", "").lower() in ("economy", "coach", "main", "blue", "")]
-            biz = [m for m in matches if m.get("cabin", "").lower() in ("business", "first", "delta_one", "polaris", "mint", "premier")]
-
-            if econ:
-                best_e = min(m["miles"] for m in econ if m.get("miles"))
-                lines.append(f"  Economy: {len(econ)} options, best {best_e:,} miles")
-            if biz:
-                best_b = min(m["miles"] for m in biz if m.get("miles"))
-                lines.append(f"  Business: {len(biz)} options, best {best_b:,} miles")
-            if not econ and not biz:
-                lines.append(f"  {len(matches)} results found")
-                for m in matches[:5]:
-                    lines.append(f"    {m.get('date','?')}: {m.get('miles',0):,} miles")
-        elif summary:
-            lines.append(f"  {summary[:200]}")
-        else:
-            lines.append("  No results")
-
-        lines.append("")
+        lines.extend(format_section(
+            search, all_results.get(airline), pending=airline in pending,
+            new_count=new_counts.get(airline), note=notes.get(airline),
+        ))
 
     lines.append("─" * 35)
     lines.append("End of daily scan.")
     return "\n".join(lines)
 
 
+def merge_results(previous: Dict[str, Any] | None, result: Dict[str, Any]) -> Dict[str, Any]:
+    """Combine two windows of the same airline into one report entry."""
+    if not previous:
+        return result
+    merged = dict(previous)
+    merged["matches"] = list(previous.get("matches") or []) + list(result.get("matches") or [])
+    merged["errors"] = list(previous.get("errors") or []) + list(result.get("errors") or [])
+    merged["real_data"] = bool(previous.get("real_data")) or bool(result.get("real_data"))
+    if merged.get("mode") != result.get("mode") and result.get("mode") != "error":
+        merged["mode"] = result.get("mode")
+    return merged
+
+
 def send_imessage(text: str):
     """Send via iMessage bot, truncate if needed."""
     normalized_target = _normalize_handle(MY_PHONE)
@@ -325,12 +391,29 @@ def send_imessage(text: str):
 # ── Main ─────────────────────────────────────────────────────────────────────
 
 def main():
+    from openclaw_automation.award_store import airline_for_script, scan_failed, shared_award_store
+    from openclaw_automation.cdp_lock import CDPLock
+    from openclaw_automation.scan_planner import IncrementalPlanner
+    from openclaw_automation.scan_scheduler import ScanJob, ScanScheduler
+
     parser = argparse.ArgumentParser(description="Daily Award Scan")
     parser.add_argument("--send-report", action="store_true")
     parser.add_argument("--only", help="Only these airlines (comma-sep)")
     parser.add_argument("--skip", help="Skip these airlines (comma-sep)")
     parser.add_argument("--dry-run", action="store_true")
+    parser.add_argument("--workers", type=int, default=0,
+                        help="Airlines to run at once (default: one per browser in OPENCLAW_CDP_URLS)")
+    parser.add_argument("--report-file", type=Path, default=REPORT_FILE,
+                        help="Partial report, rewritten as each airline finishes")
+    parser.add_argument("--no-store", action="store_true", help="Do not record results in the award store")
+    parser.add_argument("--days", help=f"Days of {TARGET_MONTH_NAME} to search (comma-sep, default: "
+                        f"{','.join(str(d) for d in TARGET_DAYS)})")
+    parser.add_argument("--incremental", action="store_true",
+                        help="Only re-check windows the award store says are due")
     args = parser.parse_args()
+    if args.incremental and args.no_store:
+        parser.error("--incremental needs the award store")
+    target_days = [int(d) for d in args.days.split(",")] if args.days else TARGET_DAYS
 
     searches = SEARCHES[:]
     if args.only:
@@ -344,54 +427,122 @@ def main():
     log.info("Airlines: %s", ", ".join(s["name"] for s in searches))
     log.info("Kit root: %s", _kit_root)
 
+    offsets = list(dict.fromkeys(_days_to_target(day) for day in target_days))
+    log.info("Days ahead to %s %s: %s", TARGET_MONTH_NAME, ",".join(str(d) for d in target_days),
+             ",".join(str(n) for n in offsets))
+    windows = []
+    for search in searches:
+        for days_ahead in offsets:
+            inputs = dict(search["inputs"])
+            inputs["days_ahead"] = days_ahead
+            windows.append((search, inputs))
+
+    store = None if args.no_store else shared_award_store()
+    notes: Dict[str, str] = {}
+    if args.incremental:
+        by_airline: Dict[str, Dict[str, Any]] = {}
+        keyed = []
+        for search, inputs in windows:
+            script_id = script_id_for(search["script_dir"])
+            by_airline[airline_for_script(script_id)] = search
+            keyed.append((script_id, inputs))
+        plans = IncrementalPlanner(store).plan(keyed)
+        windows = []
+        for plan in plans:
+            search = by_airline[plan.airline]
+            if plan.due:
+                log.info("  Due: %s %s (%s)", search["name"], plan.depart_date, plan.reason)
+                windows.append((search, plan.inputs))
+            else:
+                log.info("  Unchanged: %s %s, next check %s", search["name"], plan.depart_date, plan.next_due)
+                notes.setdefault(search["airline"], f"Unchanged (next check {plan.next_due:%b %d})")
+        log.info("Incremental: %d of %d windows due", len(windows), len(plans))
+        for search, _ in windows:
+            notes.pop(search["airline"], None)
+
     if args.dry_run:
-        for s in searches:
-            log.info("  Would run: %s SFO → %s", s["name"], s["inputs"]["to"][0])
+        for s, inputs in windows:
+            log.info("  Would run: %s SFO → %s (+%dd)", s["name"], s["inputs"]["to"][0], inputs["days_ahead"])
         return
 
     if not os.environ.get("ANTHROPIC_API_KEY"):
         log.error("ANTHROPIC_API_KEY not set")
         sys.exit(1)
 
-    days_ahead = _days_to_mid_month()
-    log.info("Days ahead to mid-%s: %d", TARGET_MONTH_NAME, days_ahead)
-
-    all_results = {}
-
-    for i, search in enumerate(searches):
-        airline = search["airline"]
-        name = search["name"]
-        script_dir = search["script_dir"]
-        inputs = dict(search["inputs"])
-        inputs["days_ahead"] = days_ahead
-
-        log.info("Running %s: SFO → %s ...", name, inputs["to"][0])
-        start_t = time.time()
-
-        result = run_one(script_dir, inputs)
-        elapsed = time.time() - start_t
-
-        matches = result.get("matches", [])
-        mode = result.get("mode", "?")
-        real = result.get("real_data", False)
-        errors = result.get("errors", [])
-
+    cdp_urls = CDPLock.from_env().cdp_urls
+    workers = args.workers or len(cdp_urls)
+    if workers > len(cdp_urls):
+        log.warning("Only %d browser(s) in OPENCLAW_CDP_URLS; running %d airline(s) at once",
+                    len(cdp_urls), len(cdp_urls))
+        workers = len(cdp_urls)
+    log.info("Browser slots: %d", workers)
+
+    # Each running job has a browser to itself; runners get it as context["cdp_url"].
+    free_browsers: "queue.Queue[str]" = queue.Queue()
+    for url in cdp_urls:
+        free_browsers.put(url)
+
+    jobs = [ScanJob(key=search["airline"], payload=(search, inputs)) for search, inputs in windows]
+
+    def _run_job(job: ScanJob) -> Dict[str, Any]:
+        search, inputs = job.payload
+        cdp_url = free_browsers.get()
+        try:
+            log.info("Running %s: SFO → %s on %s ...", search["name"], inputs["to"][0], cdp_url)
+            return run_one(search["script_dir"], inputs, cdp_url=cdp_url)
+        finally:
+            free_browsers.put(cdp_url)
+
+    scheduler = ScanScheduler(
+        _run_job,
+        max_workers=workers,
+        cooldown_seconds=COOLDOWN_NORMAL,
+        rate_limited_cooldown_seconds=COOLDOWN_RATE_LIMITED,
+        max_backoff_seconds=COOLDOWN_MAX,
+        is_rate_limited=detect_rate_limit,
+    )
+
+    all_results: Dict[str, Dict] = {}
+    new_counts: Dict[str, int] = {}
+    pending_windows: Dict[str, int] = {}
+    for search, _ in windows:
+        pending_windows[search["airline"]] = pending_windows.get(search["airline"], 0) + 1
+    for outcome in scheduler.run(jobs):
+        search, inputs = outcome.job.payload
+        result = outcome.result
         log.info("  %s done in %.0fs: mode=%s real=%s matches=%d errors=%d",
-                 name, elapsed, mode, real, len(matches), len(errors))
+                 search["name"], outcome.elapsed_seconds, result.get("mode", "?"),
+                 result.get("real_data", False), len(result.get("matches", [])),
+                 len(result.get("errors", [])))
+        if outcome.rate_limited:
+            log.warning("  %s may be rate limited, backoff for this airline is now %ds",
+                        search["name"], scheduler.cooldown_for(outcome.job.key))
 
-        all_results[airline] = result
-
-        # Rate limit detection & cooldown
-        rate_limited = detect_rate_limit(result)
-        if rate_limited:
-            log.warning("  %s may be rate limited, cooling down %ds", name, COOLDOWN_RATE_LIMITED)
-            if i < len(searches) - 1:
-                time.sleep(COOLDOWN_RATE_LIMITED)
-        elif i < len(searches) - 1:
-            log.info("  Cooling down %ds...", COOLDOWN_NORMAL)
-            time.sleep(COOLDOWN_NORMAL)
-
-    report = compile_report(all_results)
+        airline = search["airline"]
+        all_results[airline] = merge_results(all_results.get(airline), result)
+        pending_windows[airline] -= 1
+        if store is not None:
+            try:
+                script_id = script_id_for(search["script_dir"])
+                # Failed scans are recorded so --incremental retries them, but have nothing new.
+                if store.record_result(script_id, inputs, result) is not None and not scan_failed(result):
+                    # Compared with the previous scan of this date window only.
+                    new = store.new_availability(airline_for_script(script_id), inputs)
+                    new_counts[airline] = new_counts.get(airline, 0) + len(new)
+                    log.info("  %s: %d new since last scan", search["name"], len(new))
+            except Exception as e:
+                log.warning("  Award store write failed: %s", e)
+        # Stream: show this airline now and keep the on-disk report current.
+        print("\n".join(format_section(search, result, new_count=new_counts.get(airline))), flush=True)
+        remaining = [a for a, n in pending_windows.items() if n > 0]
+        try:
+            args.report_file.write_text(compile_report(
+                all_results, pending=remaining, new_counts=new_counts, notes=notes,
+            ))
+        except OSError as e:
+            log.warning("Could not write %s: %s", args.report_file, e)
+
+    report = compile_report(all_results, new_counts=new_counts, notes=notes)
     print("\n" + report)
 
     if args.send_report:
@@ -78,7 +78,41 @@ def _find_repo_root() -> Path | None:
     return None
 
 
+def _load_json_arg(inline: str, file_path: str, env_name: str) -> dict:
+    if file_path:
+        raw = Path(file_path).read_text()
+    elif env_name:
+        raw = os.getenv(env_name, "{}")
+    else:
+        raw = inline or "{}"
+    data = json.loads(raw.strip() or "{}")
+    if not isinstance(data, dict):
+        raise ValueError("expected a JSON object")
+    return data
+
+
+def _run_query_on_server(server_url: str, query: str, args: argparse.Namespace) -> dict:
+    from openclaw_automation.server import request_server
+
+    payload = {
+        "query": query,
+        "credential_refs": _load_json_arg(
+            args.credential_refs, args.credential_refs_file, args.credential_refs_env
+        ),
+        "security_assertion": _load_json_arg(
+            args.security_assertion, args.security_assertion_file, args.security_assertion_env
+        ),
+    }
+    status, result = request_server(server_url, "/run-query", payload)
+    if status != 200:
+        raise RuntimeError(result.get("error") or f"engine server returned HTTP {status}")
+    return result
+
+
 def _run_query(root: Path, query: str, args: argparse.Namespace) -> dict:
+    server_url = os.getenv("OPENCLAW_ENGINE_SERVER", "").strip()
+    if server_url:
+        return _run_query_on_server(server_url, query, args)
     cmd = [
         sys.executable,
         "-m",
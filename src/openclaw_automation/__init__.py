@@ -2,9 +2,24 @@
 
 __all__ = [
     "engine",
+    "award_store",
     "contract",
     "browser_agent_adapter",
+    "browser_pool",
+    "cdp_health",
+    "cancellation",
     "cdp_lock",
+    "fanout",
+    "google_workspace",
+    "html_extract",
+    "http_fetch",
+    "oauth_tokens",
     "page_ready",
+    "result_cache",
+    "scan_planner",
+    "scan_scheduler",
     "security_gate",
+    "single_flight",
+    "telemetry",
+    "runner_registry",
 ]
@@ -20,6 +20,7 @@ def adaptive_run(
     max_attempts: int = 2,
     trace: bool = True,
     use_vision: bool = True,
+    cdp_url: str | None = None,
 ) -> Dict[str, Any]:
     """Run BrowserAgent goal with adaptive retry.
 
@@ -33,6 +34,7 @@ def adaptive_run(
             max_steps=max_steps,
             trace=trace,
             use_vision=use_vision,
+            cdp_url=cdp_url,
         )
         if result["ok"]:
             run_result = result.get("result") or {}
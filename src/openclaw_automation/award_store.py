@@ -0,0 +1,304 @@
+"""Persistent store of award availability observations (SQLite, WAL mode).
+
+Every live award run becomes one ``scans`` row plus one ``observations``
+row per match. Observations are indexed on (airline, route, date, cabin),
+so reports and alerts are indexed queries instead of re-scans:
+
+- ``cheapest_per_date``: lowest miles seen per departure date
+- ``new_availability``: matches in the latest scan that the previous
+  successful scan of the same search did not have
+- ``price_history``: lowest miles per scan for one route/date over time
+
+A search is keyed by its route, cabin, travelers and the departure date it
+resolved to (``days_ahead`` from the day it ran), so scans of different
+date windows are never compared. Runs that did not return real data, or
+returned only errors, are recorded as ``failed`` scans without
+observations. Placeholder results are never recorded. ``airline`` is the
+script id prefix (``delta`` for ``delta.award_search``).
+"""
+from __future__ import annotations
+
+import json
+import os
+import sqlite3
+import threading
+from datetime import date, datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Dict, List
+
+DEFAULT_STORE_PATH = Path.home() / ".openclaw" / "award_observations.sqlite3"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS scans (
+    id INTEGER PRIMARY KEY,
+    airline TEXT NOT NULL,
+    script_id TEXT NOT NULL,
+    search_key TEXT NOT NULL,
+    inputs TEXT NOT NULL,
+    mode TEXT NOT NULL,
+    match_count INTEGER NOT NULL,
+    errors TEXT NOT NULL,
+    failed INTEGER NOT NULL DEFAULT 0,
+    observed_at TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS observations (
+    id INTEGER PRIMARY KEY,
+    scan_id INTEGER NOT NULL REFERENCES scans(id),
+    airline TEXT NOT NULL,
+    route TEXT NOT NULL,
+    date TEXT NOT NULL,
+    cabin TEXT NOT NULL,
+    miles INTEGER NOT NULL,
+    travelers INTEGER,
+    mixed_cabin INTEGER NOT NULL DEFAULT 0,
+    notes TEXT,
+    booking_url TEXT,
+    observed_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_observations_key ON observations (airline, route, date, cabin, observed_at);
+CREATE INDEX IF NOT EXISTS idx_observations_scan ON observations (scan_id);
+CREATE INDEX IF NOT EXISTS idx_scans_search ON scans (airline, search_key, id);
+"""
+
+
+def airline_for_script(script_id: str) -> str:
+    return script_id.split(".", 1)[0]
+
+
+def target_date(inputs: Dict[str, Any], observed_at: str | None = None) -> str:
+    """Departure date ``inputs`` resolve to on the (local) day of ``observed_at``, default today."""
+    if "days_ahead" not in inputs:
+        return ""
+    day = datetime.fromisoformat(observed_at).astimezone().date() if observed_at else date.today()
+    return (day + timedelta(days=int(inputs["days_ahead"]))).isoformat()
+
+
+def search_key(inputs: Dict[str, Any], depart: str | None = None) -> str:
+    """Identity of a search window for "since last scan" comparisons.
+
+    ``depart`` is the resolved departure date; by default the one ``inputs``
+    resolve to today.
+    """
+    return json.dumps(
+        {
+            "from": str(inputs.get("from", "")).upper(),
+            "to": sorted(str(d).upper() for d in inputs.get("to", [])),
+            "cabin": str(inputs.get("cabin", "economy")).lower(),
+            "travelers": int(inputs.get("travelers", 1)),
+            "depart": target_date(inputs) if depart is None else depart,
+        },
+        sort_keys=True,
+    )
+
+
+def scan_failed(result: Dict[str, Any]) -> bool:
+    """No real data, or errors and no matches."""
+    return not result.get("real_data", True) or bool(result.get("errors") and not result.get("matches"))
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat(timespec="seconds")
+
+
+class AwardStore:
+    def __init__(self, path: Path | str = DEFAULT_STORE_PATH) -> None:
+        self.path = Path(path).expanduser()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.executescript(_SCHEMA)
+            self._migrate()
+
+    def _migrate(self) -> None:
+        """Bring stores written before scans were keyed by date and flagged as failed up to date."""
+        columns = {row["name"] for row in self._conn.execute("PRAGMA table_info(scans)")}
+        if "failed" in columns:
+            return
+        with self._conn:
+            self._conn.execute("ALTER TABLE scans ADD COLUMN failed INTEGER NOT NULL DEFAULT 0")
+            self._conn.execute("UPDATE scans SET failed = 1 WHERE match_count = 0 AND errors NOT IN ('', '[]')")
+            keys = []
+            for row in self._conn.execute("SELECT id, inputs, observed_at FROM scans").fetchall():
+                inputs = json.loads(row["inputs"])
+                keys.append((search_key(inputs, target_date(inputs, row["observed_at"])), row["id"]))
+            self._conn.executemany("UPDATE scans SET search_key = ? WHERE id = ?", keys)
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def _query(self, sql: str, params: tuple = ()) -> List[Dict[str, Any]]:
+        with self._lock:
+            return [dict(row) for row in self._conn.execute(sql, params)]
+
+    # ── writes ───────────────────────────────────────────────────────
+
+    def record_result(
+        self,
+        script_id: str,
+        inputs: Dict[str, Any],
+        result: Dict[str, Any],
+        observed_at: str | None = None,
+    ) -> int | None:
+        """Store one runner result; returns the scan id, or None for placeholders."""
+        mode = str(result.get("mode", "live"))
+        if mode == "placeholder":
+            return None
+        observed_at = observed_at or _now()
+        airline = airline_for_script(script_id)
+        failed = scan_failed(result)
+        matches = [] if failed else [m for m in result.get("matches") or [] if isinstance(m, dict)]
+        inputs = {k: v for k, v in inputs.items() if k not in ("credential_refs", "security_assertion")}
+        with self._lock, self._conn:
+            cur = self._conn.execute(
+                "INSERT INTO scans (airline, script_id, search_key, inputs, mode, match_count, errors, failed,"
+                " observed_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    airline,
+                    script_id,
+                    search_key(inputs, target_date(inputs, observed_at)),
+                    json.dumps(inputs, sort_keys=True, default=str),
+                    mode,
+                    len(matches),
+                    json.dumps(result.get("errors") or []),
+                    int(failed),
+                    observed_at,
+                ),
+            )
+            scan_id = int(cur.lastrowid)
+            self._conn.executemany(
+                "INSERT INTO observations (scan_id, airline, route, date, cabin, miles, travelers,"
+                " mixed_cabin, notes, booking_url, observed_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                [
+                    (
+                        scan_id,
+                        airline,
+                        str(m.get("route", "")),
+                        str(m.get("date", "")),
+                        str(m.get("cabin", "")).lower(),
+                        int(m.get("miles") or 0),
+                        m.get("travelers"),
+                        int(bool(m.get("mixed_cabin"))),
+                        m.get("notes"),
+                        m.get("booking_url"),
+                        observed_at,
+                    )
+                    for m in matches
+                ],
+            )
+        return scan_id
+
+    def record_envelope(self, envelope: Dict[str, Any]) -> int | None:
+        """Store an ``AutomationEngine.run`` envelope."""
+        if not envelope.get("ok") or not isinstance(envelope.get("result"), dict):
+            return None
+        return self.record_result(envelope["script_id"], envelope.get("inputs") or {}, envelope["result"])
+
+    # ── queries ──────────────────────────────────────────────────────
+
+    def cheapest_per_date(
+        self,
+        airline: str,
+        route: str,
+        cabin: str | None = None,
+        *,
+        since: str | None = None,
+        start_date: str | None = None,
+        end_date: str | None = None,
+    ) -> List[Dict[str, Any]]:
+        """Lowest miles seen for each (date, cabin), oldest date first."""
+        sql = (
+            "SELECT date, cabin, MIN(miles) AS miles, observed_at, COUNT(*) AS sightings"
+            " FROM observations WHERE airline = ? AND route = ? AND miles > 0"
+        )
+        params: List[Any] = [airline, route]
+        for clause, value in (
+            (" AND cabin = ?", cabin.lower() if cabin else None),
+            (" AND observed_at >= ?", since),
+            (" AND date >= ?", start_date),
+            (" AND date <= ?", end_date),
+        ):
+            if value is not None:
+                sql += clause
+                params.append(value)
+        sql += " GROUP BY date, cabin ORDER BY date, cabin"
+        return self._query(sql, tuple(params))
+
+    def latest_scans(
+        self, airline: str, key: str | None = None, limit: int = 2, *, include_failed: bool = True
+    ) -> List[Dict[str, Any]]:
+        """Most recent scans for ``airline`` (optionally one search), newest first."""
+        sql = "SELECT * FROM scans WHERE airline = ?"
+        params: List[Any] = [airline]
+        if key is not None:
+            sql += " AND search_key = ?"
+            params.append(key)
+        if not include_failed:
+            sql += " AND failed = 0"
+        sql += " ORDER BY id DESC LIMIT ?"
+        params.append(limit)
+        return self._query(sql, tuple(params))
+
+    def scan_observations(self, scan_id: int) -> List[Dict[str, Any]]:
+        return self._query(
+            "SELECT route, date, cabin, miles, notes, booking_url, observed_at FROM observations"
+            " WHERE scan_id = ? ORDER BY date, miles",
+            (scan_id,),
+        )
+
+    def new_availability(self, airline: str, inputs: Dict[str, Any] | None = None) -> List[Dict[str, Any]]:
+        """Matches in the latest scan whose (route, date, cabin) the previous successful scan lacked.
+
+        With ``inputs`` the comparison is limited to scans of that search
+        window (departing on the date ``inputs`` resolve to today); without,
+        it uses the airline's last two scans. A first scan reports everything
+        as new; a failed latest scan reports nothing.
+        """
+        key = search_key(inputs) if inputs is not None else None
+        latest_any = self.latest_scans(airline, key, limit=1)
+        if not latest_any or latest_any[0]["failed"]:
+            return []
+        scans = self.latest_scans(airline, key, include_failed=False)
+        latest = scans[0]["id"]
+        previous = scans[1]["id"] if len(scans) > 1 else -1
+        return self._query(
+            "SELECT route, date, cabin, miles, notes, booking_url, observed_at FROM observations AS cur"
+            " WHERE cur.scan_id = ? AND cur.miles > 0 AND NOT EXISTS ("
+            "  SELECT 1 FROM observations AS prev WHERE prev.scan_id = ? AND prev.airline = cur.airline"
+            "  AND prev.route = cur.route AND prev.date = cur.date AND prev.cabin = cur.cabin AND prev.miles > 0"
+            ") ORDER BY date, miles",
+            (latest, previous),
+        )
+
+    def price_history(
+        self, airline: str, route: str, date: str, cabin: str | None = None
+    ) -> List[Dict[str, Any]]:
+        """Lowest miles per scan for one route/date, oldest first."""
+        sql = (
+            "SELECT scan_id, observed_at, cabin, MIN(miles) AS miles FROM observations"
+            " WHERE airline = ? AND route = ? AND date = ? AND miles > 0"
+        )
+        params: List[Any] = [airline, route, date]
+        if cabin:
+            sql += " AND cabin = ?"
+            params.append(cabin.lower())
+        sql += " GROUP BY scan_id, cabin ORDER BY scan_id, cabin"
+        return self._query(sql, tuple(params))
+
+
+_SHARED_STORE: AwardStore | None = None
+_SHARED_STORE_LOCK = threading.Lock()
+
+
+def shared_award_store(path: Path | str | None = None) -> AwardStore:
+    """Process-wide store at ``path``, ``OPENCLAW_AWARD_STORE_PATH`` or the default."""
+    global _SHARED_STORE
+    with _SHARED_STORE_LOCK:
+        if _SHARED_STORE is None:
+            path = path or os.getenv("OPENCLAW_AWARD_STORE_PATH", "").strip() or DEFAULT_STORE_PATH
+            _SHARED_STORE = AwardStore(path)
+        return _SHARED_STORE
@@ -9,6 +9,8 @@ import urllib.request
 from pathlib import Path
 from typing import Any, Dict
 
+from .cdp_health import shared_health_probe
+
 
 def browser_agent_enabled() -> bool:
     return os.getenv("OPENCLAW_USE_BROWSER_AGENT", "").strip().lower() in {"1", "true", "yes", "on"}
@@ -60,41 +62,23 @@ def _restart_chrome(cdp_url: str) -> None:
 
 
 def _chrome_is_healthy(cdp_url: str) -> bool:
-    """Quick CDP health check via subprocess (isolated Playwright state).
+    """CDP health check: /json/version plus a Browser.getVersion round-trip.
 
-    Uses a short 8s timeout. Returns True if Chrome is responsive, False if frozen.
+    Runs in-process over plain HTTP/websocket (no Playwright), and healthy
+    results are cached for OPENCLAW_CDP_HEALTH_TTL_SECONDS.
     """
-    check_code = (
-        "import sys\n"
-        "from playwright.sync_api import sync_playwright\n"
-        "with sync_playwright() as p:\n"
-        "    try:\n"
-        f"        b = p.chromium.connect_over_cdp({repr(cdp_url)}, timeout=8000)\n"
-        "        b.close()\n"
-        "        sys.exit(0)\n"
-        "    except Exception:\n"
-        "        sys.exit(1)\n"
-    )
-    try:
-        r = subprocess.run(
-            [sys.executable, "-c", check_code],
-            capture_output=True,
-            timeout=15,
-        )
-        return r.returncode == 0
-    except Exception:
-        return False
+    result = shared_health_probe().check(cdp_url)
+    if not result.healthy:
+        print(f"[browser_agent_adapter] CDP probe: {result.error}", file=sys.stderr)
+    return result.healthy
 
 
 def _ensure_chrome_ready(cdp_url: str) -> None:
-    """If Chrome is frozen, restart it before running BrowserAgent.
-
-    Uses a subprocess health check so Playwright state in the main process
-    is never contaminated by a failed CDP connection.
-    """
+    """If Chrome is frozen, restart it before running BrowserAgent."""
     if not _chrome_is_healthy(cdp_url):
         print("[browser_agent_adapter] Chrome health check failed — restarting.", file=sys.stderr)
         _restart_chrome(cdp_url)
+        shared_health_probe().invalidate(cdp_url)
 
 
 def run_browser_agent_goal(
@@ -104,6 +88,7 @@ def run_browser_agent_goal(
     max_steps: int,
     trace: bool = True,
     use_vision: bool = True,
+    cdp_url: str | None = None,
 ) -> Dict[str, Any]:
     """Run an external BrowserAgent implementation, if available.
 
@@ -117,11 +102,12 @@ def run_browser_agent_goal(
     - OPENCLAW_BROWSER_AGENT_MODULE (default: browser_agent)
     Optional runtime env:
     - OPENCLAW_BROWSER_AGENT_PATH (directory to append to sys.path)
-    - OPENCLAW_CDP_URL (default: http://127.0.0.1:9222)
+    - OPENCLAW_CDP_URL (default: http://127.0.0.1:9222), unless ``cdp_url``
+      names the browser (runners pass ``context["cdp_url"]``)
     """
     module_name = os.getenv("OPENCLAW_BROWSER_AGENT_MODULE", "browser_agent").strip() or "browser_agent"
     module_path = os.getenv("OPENCLAW_BROWSER_AGENT_PATH", "").strip()
-    cdp_url = os.getenv("OPENCLAW_CDP_URL", "http://127.0.0.1:9222").strip() or "http://127.0.0.1:9222"
+    cdp_url = cdp_url or os.getenv("OPENCLAW_CDP_URL", "http://127.0.0.1:9222").strip() or "http://127.0.0.1:9222"
     trace_env = os.getenv("OPENCLAW_BROWSER_TRACE", "").strip().lower()
     if trace_env in {"0", "false", "no", "off"}:
         trace = False
@@ -140,8 +126,7 @@ def run_browser_agent_goal(
     if agent_cls is None:
         return {"ok": False, "error": f"BrowserAgent not found in module '{module_name}'", "result": None}
 
-    # Pre-flight: ensure Chrome is healthy before connecting (uses subprocess to
-    # avoid contaminating this process's Playwright state on failure)
+    # Pre-flight: ensure Chrome is healthy before connecting
     _ensure_chrome_ready(cdp_url)
 
     try:
@@ -0,0 +1,333 @@
+"""Persistent CDP browser sessions shared across runner invocations.
+
+Playwright's sync API binds every object to the thread that created it, so
+pages cannot simply be handed to runner threads. Instead the pool keeps one
+*lane* per (site, slot): a dedicated thread that owns its own CDP connection
+and a long-lived page, and executes callables against that page on behalf
+of runners. Back-to-back runs on the same site reuse the connection and the
+page (and therefore the signed-in session) instead of reconnecting.
+
+By default lanes use the browser's default context, i.e. the same cookie
+jar the BrowserAgent login phase writes into. ``isolated=True`` gives a site
+its own context whose storage state is persisted under ``storage_dir``.
+
+Idle lanes health-check their connection every ``health_interval_seconds``
+and drop dead connections/pages so the next job reconnects cleanly.
+
+``logged_in_recently`` only says a login ran lately; a pooled session can
+still expire server-side. Runners that find a page on a sign-in URL
+(``on_login_page``) or missing its form call ``invalidate_login`` and log in
+again once.
+"""
+from __future__ import annotations
+
+import os
+import queue
+import re
+import threading
+import time
+from concurrent.futures import Future
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, Tuple, TypeVar
+
+from .cancellation import wait_future
+
+T = TypeVar("T")
+
+DEFAULT_STORAGE_DIR = Path.home() / ".openclaw" / "browser_storage"
+
+_LOGIN_URL = re.compile(r"log-?in|sign-?in|/auth", re.IGNORECASE)
+
+
+def playwright_available() -> bool:
+    try:
+        import playwright.sync_api  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def on_login_page(page: Any) -> bool:
+    """True when ``page`` sits on a sign-in URL, e.g. after an expired session redirected it."""
+    try:
+        return bool(_LOGIN_URL.search(str(page.url)))
+    except Exception:  # noqa: BLE001
+        return False
+
+
+def _connect_over_cdp(cdp_url: str) -> Tuple[Any, Any]:
+    """Default connector: returns (playwright handle, browser)."""
+    from playwright.sync_api import sync_playwright
+
+    handle = sync_playwright().start()
+    try:
+        browser = handle.chromium.connect_over_cdp(cdp_url)
+    except Exception:
+        handle.stop()
+        raise
+    return handle, browser
+
+
+def _site_slug(site: str) -> str:
+    return re.sub(r"[^a-z0-9.\-]+", "_", site.lower()).strip("_") or "default"
+
+
+@dataclass
+class _Lane:
+    site: str
+    slot: int
+    isolated: bool
+    jobs: "queue.Queue[Tuple[Callable[[Any], Any], Future] | None]" = field(default_factory=queue.Queue)
+    lease_lock: threading.Lock = field(default_factory=threading.Lock)
+    thread: threading.Thread | None = None
+    handle: Any = None
+    browser: Any = None
+    context: Any = None
+    page: Any = None
+    jobs_run: int = 0
+    reconnects: int = 0
+    health_failures: int = 0
+
+
+class PageLease:
+    """Exclusive use of one lane; every ``run`` call sees the same page."""
+
+    def __init__(self, pool: BrowserPool, lane: _Lane) -> None:
+        self._pool = pool
+        self._lane = lane
+
+    @property
+    def site(self) -> str:
+        return self._lane.site
+
+    def run(
+        self,
+        fn: Callable[[Any], T],
+        timeout_seconds: float | None = None,
+        cancel_event: threading.Event | None = None,
+    ) -> T:
+        return wait_future(self._pool._submit(self._lane, fn), timeout_seconds, cancel_event)
+
+
+class BrowserPool:
+    def __init__(
+        self,
+        cdp_url: str | None = None,
+        *,
+        health_interval_seconds: float = 30.0,
+        login_ttl_seconds: float = 20 * 60,
+        storage_dir: Path | None = None,
+        connector: Callable[[str], Tuple[Any, Any]] = _connect_over_cdp,
+    ) -> None:
+        self.cdp_url = cdp_url or os.getenv("OPENCLAW_CDP_URL", "http://127.0.0.1:9222").strip()
+        self.health_interval_seconds = health_interval_seconds
+        self.login_ttl_seconds = login_ttl_seconds
+        self.storage_dir = storage_dir or DEFAULT_STORAGE_DIR
+        self._connector = connector
+        self._lanes: Dict[Tuple[str, int], _Lane] = {}
+        self._logins: Dict[str, float] = {}
+        self._lock = threading.Lock()
+        self._closed = False
+
+    # ── login bookkeeping ────────────────────────────────────────────
+
+    def mark_logged_in(self, site: str) -> None:
+        with self._lock:
+            self._logins[site] = time.monotonic()
+
+    def invalidate_login(self, site: str) -> None:
+        with self._lock:
+            self._logins.pop(site, None)
+
+    def logged_in_recently(self, site: str) -> bool:
+        with self._lock:
+            at = self._logins.get(site)
+        return at is not None and time.monotonic() - at < self.login_ttl_seconds
+
+    # ── lanes ────────────────────────────────────────────────────────
+
+    def _lane(self, site: str, slot: int, isolated: bool) -> _Lane:
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("browser pool is closed")
+            lane = self._lanes.get((site, slot))
+            if lane is None:
+                lane = _Lane(site=site, slot=slot, isolated=isolated)
+                lane.thread = threading.Thread(
+                    target=self._lane_main,
+                    args=(lane,),
+                    name=f"openclaw-browser-{_site_slug(site)}-{slot}",
+                    daemon=True,
+                )
+                self._lanes[(site, slot)] = lane
+                lane.thread.start()
+            return lane
+
+    def _storage_path(self, lane: _Lane) -> Path:
+        return self.storage_dir / f"{_site_slug(lane.site)}.json"
+
+    def _disconnect(self, lane: _Lane) -> None:
+        for closer in (
+            lambda: lane.context.close() if lane.isolated and lane.context is not None else None,
+            lambda: lane.browser.close() if lane.browser is not None else None,
+            lambda: lane.handle.stop() if lane.handle is not None else None,
+        ):
+            try:
+                closer()
+            except Exception:  # noqa: BLE001
+                pass
+        lane.handle = lane.browser = lane.context = lane.page = None
+
+    def _ensure_page(self, lane: _Lane) -> Any:
+        if lane.browser is not None and not lane.browser.is_connected():
+            self._disconnect(lane)
+        if lane.browser is None:
+            lane.handle, lane.browser = self._connector(self.cdp_url)
+            lane.reconnects += 1
+        if lane.context is None:
+            if lane.isolated:
+                storage = self._storage_path(lane)
+                lane.context = lane.browser.new_context(
+                    storage_state=str(storage) if storage.exists() else None
+                )
+            elif lane.browser.contexts:
+                lane.context = lane.browser.contexts[0]
+            else:
+                lane.context = lane.browser.new_context()
+        if lane.page is None or lane.page.is_closed():
+            lane.page = lane.context.new_page()
+        return lane.page
+
+    def _save_storage(self, lane: _Lane) -> None:
+        if not lane.isolated or lane.context is None:
+            return
+        path = self._storage_path(lane)
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            lane.context.storage_state(path=str(path))
+            os.chmod(path, 0o600)
+        except Exception:  # noqa: BLE001
+            pass
+
+    def _health_check(self, lane: _Lane) -> None:
+        if lane.browser is None:
+            return
+        try:
+            healthy = lane.browser.is_connected() and (lane.page is None or not lane.page.is_closed())
+            if healthy and lane.page is not None:
+                lane.page.evaluate("1")
+        except Exception:  # noqa: BLE001
+            healthy = False
+        if not healthy:
+            lane.health_failures += 1
+            self._disconnect(lane)
+
+    def _lane_main(self, lane: _Lane) -> None:
+        while True:
+            try:
+                job = lane.jobs.get(timeout=self.health_interval_seconds)
+            except queue.Empty:
+                self._health_check(lane)
+                continue
+            if job is None:
+                self._save_storage(lane)
+                self._disconnect(lane)
+                return
+            fn, future = job
+            if not future.set_running_or_notify_cancel():
+                continue
+            result: Any = None
+            error: BaseException | None = None
+            try:
+                page = self._ensure_page(lane)
+                result = fn(page)
+            except BaseException as exc:  # noqa: BLE001
+                error = exc
+            lane.jobs_run += 1
+            # Persist before resolving so callers always observe saved state.
+            self._save_storage(lane)
+            if error is not None:
+                future.set_exception(error)
+            else:
+                future.set_result(result)
+
+    def _submit(self, lane: _Lane, fn: Callable[[Any], T]) -> "Future[T]":
+        future: Future = Future()
+        lane.jobs.put((fn, future))
+        return future
+
+    # ── public API ───────────────────────────────────────────────────
+
+    @contextmanager
+    def lease(self, site: str, *, slot: int = 0, isolated: bool = False) -> Iterator[PageLease]:
+        """Hold the (site, slot) page exclusively for several ``run`` calls."""
+        lane = self._lane(site, slot, isolated)
+        with lane.lease_lock:
+            yield PageLease(self, lane)
+
+    def run_on_page(
+        self,
+        site: str,
+        fn: Callable[[Any], T],
+        *,
+        slot: int = 0,
+        isolated: bool = False,
+        timeout_seconds: float | None = None,
+        cancel_event: threading.Event | None = None,
+    ) -> T:
+        """Run ``fn(page)`` on the site's pooled page and return its result.
+
+        Raises RunCancelled once ``cancel_event`` is set; a job that has not
+        reached the page yet is dropped.
+        """
+        with self.lease(site, slot=slot, isolated=isolated) as lease:
+            return lease.run(fn, timeout_seconds=timeout_seconds, cancel_event=cancel_event)
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            lanes = list(self._lanes.values())
+        return {
+            f"{lane.site}#{lane.slot}": {
+                "connected": lane.browser is not None,
+                "jobs_run": lane.jobs_run,
+                "reconnects": lane.reconnects,
+                "health_failures": lane.health_failures,
+                "logged_in_recently": self.logged_in_recently(lane.site),
+            }
+            for lane in lanes
+        }
+
+    def close(self, timeout_seconds: float = 10.0) -> None:
+        with self._lock:
+            self._closed = True
+            lanes = list(self._lanes.values())
+            self._lanes.clear()
+        for lane in lanes:
+            lane.jobs.put(None)
+        for lane in lanes:
+            if lane.thread is not None:
+                lane.thread.join(timeout=timeout_seconds)
+
+
+_SHARED_POOLS: Dict[str, BrowserPool] = {}
+_SHARED_POOL_LOCK = threading.Lock()
+
+
+def shared_browser_pool(cdp_url: str | None = None) -> BrowserPool:
+    """Process-wide pool per browser, reused across runs by the engine's cached runners.
+
+    ``cdp_url`` defaults to ``OPENCLAW_CDP_URL``; runners pass ``context["cdp_url"]``
+    so callers that hand out browser slots get that browser's pool.
+    """
+    cdp_url = cdp_url or os.getenv("OPENCLAW_CDP_URL", "http://127.0.0.1:9222").strip()
+    with _SHARED_POOL_LOCK:
+        pool = _SHARED_POOLS.get(cdp_url)
+        if pool is None:
+            pool = _SHARED_POOLS[cdp_url] = BrowserPool(
+                cdp_url,
+                login_ttl_seconds=float(os.getenv("OPENCLAW_BROWSER_LOGIN_TTL_SECONDS", str(20 * 60))),
+                health_interval_seconds=float(os.getenv("OPENCLAW_BROWSER_HEALTH_INTERVAL_SECONDS", "30")),
+            )
+        return pool
@@ -0,0 +1,64 @@
+"""Cooperative cancellation for thread-mode runners.
+
+``AutomationEngine`` puts a ``threading.Event`` in ``context["cancel_event"]``
+and sets it when a run times out or its caller goes away. Threads cannot be
+killed, so an abandoned runner holds its engine worker until it returns.
+Runners therefore hand the event to their long waits -- ``fan_out``,
+``BrowserPool.run_on_page`` and agent threads via ``join_thread`` -- which
+give up within ``POLL_SECONDS`` of cancellation instead of running out their
+own timeouts.
+"""
+from __future__ import annotations
+
+import threading
+import time
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
+from typing import Any, Mapping, TypeVar
+
+T = TypeVar("T")
+
+POLL_SECONDS = 0.25
+
+
+class RunCancelled(RuntimeError):
+    """The run was cancelled while waiting."""
+
+
+def cancel_event_of(context: Mapping[str, Any] | None) -> threading.Event | None:
+    """The run's cancel event, or None when the caller passed none."""
+    event = context.get("cancel_event") if isinstance(context, Mapping) else None
+    return event if isinstance(event, threading.Event) else None
+
+
+def _slice(deadline: float | None) -> float:
+    if deadline is None:
+        return POLL_SECONDS
+    return max(0.0, min(POLL_SECONDS, deadline - time.monotonic()))
+
+
+def wait_future(future: "Future[T]", timeout_seconds: float | None = None, cancel_event: threading.Event | None = None) -> T:
+    """``future.result(timeout_seconds)`` that raises RunCancelled once ``cancel_event`` is set."""
+    if cancel_event is None:
+        return future.result(timeout=timeout_seconds)
+    deadline = None if timeout_seconds is None else time.monotonic() + timeout_seconds
+    while True:
+        if cancel_event.is_set():
+            future.cancel()
+            raise RunCancelled("run cancelled")
+        try:
+            return future.result(timeout=_slice(deadline))
+        except FutureTimeoutError:
+            if deadline is not None and time.monotonic() >= deadline:
+                raise
+
+
+def join_thread(thread: threading.Thread, timeout_seconds: float | None = None, cancel_event: threading.Event | None = None) -> bool:
+    """Join ``thread`` until it ends, the timeout passes or the run is cancelled; True if it ended."""
+    deadline = None if timeout_seconds is None else time.monotonic() + timeout_seconds
+    while thread.is_alive():
+        if cancel_event is not None and cancel_event.is_set():
+            return False
+        if deadline is not None and time.monotonic() >= deadline:
+            return False
+        thread.join(timeout=_slice(deadline) if cancel_event is not None else timeout_seconds)
+    return True
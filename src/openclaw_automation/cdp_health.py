@@ -0,0 +1,255 @@
+"""In-process Chrome DevTools health probe.
+
+A probe is two cheap round-trips: ``GET /json/version`` over HTTP, then a
+``Browser.getVersion`` command over the browser websocket that endpoint
+advertises. Both use the stdlib only, so a hung Chrome costs at most the
+probe timeout and never touches Playwright state in this process.
+
+Healthy results are cached per CDP URL for ``ttl_seconds``; failures are
+never cached so a restarted Chrome is picked up on the next check.
+"""
+from __future__ import annotations
+
+import base64
+import hashlib
+import json
+import os
+import socket
+import struct
+import threading
+import time
+import urllib.request
+from dataclasses import dataclass, replace
+from typing import Any, Dict
+from urllib.parse import urlsplit
+
+_WS_GUID = "258EAFA5-E914-47DA-95CA-C5AB0DC85B11"
+
+
+@dataclass(frozen=True)
+class ProbeResult:
+    healthy: bool
+    version_ms: float | None = None
+    websocket_ms: float | None = None
+    browser: str | None = None
+    error: str | None = None
+    checked_at: float = 0.0
+    cached: bool = False
+
+    @property
+    def latency_ms(self) -> float | None:
+        if self.version_ms is None:
+            return None
+        return self.version_ms + (self.websocket_ms or 0.0)
+
+
+def _recv_exact(sock: socket.socket, n: int) -> bytes:
+    buf = b""
+    while len(buf) < n:
+        chunk = sock.recv(n - len(buf))
+        if not chunk:
+            raise ConnectionError("websocket closed by peer")
+        buf += chunk
+    return buf
+
+
+def _send_frame(sock: socket.socket, payload: bytes, opcode: int = 0x1) -> None:
+    header = bytes([0x80 | opcode])
+    length = len(payload)
+    if length < 126:
+        header += bytes([0x80 | length])
+    elif length < 1 << 16:
+        header += bytes([0x80 | 126]) + struct.pack("!H", length)
+    else:
+        header += bytes([0x80 | 127]) + struct.pack("!Q", length)
+    mask = os.urandom(4)
+    sock.sendall(header + mask + bytes(b ^ mask[i % 4] for i, b in enumerate(payload)))
+
+
+def _recv_frame(sock: socket.socket) -> tuple[int, bytes]:
+    first, second = _recv_exact(sock, 2)
+    opcode = first & 0x0F
+    length = second & 0x7F
+    if length == 126:
+        (length,) = struct.unpack("!H", _recv_exact(sock, 2))
+    elif length == 127:
+        (length,) = struct.unpack("!Q", _recv_exact(sock, 8))
+    mask = _recv_exact(sock, 4) if second & 0x80 else b""
+    payload = _recv_exact(sock, length)
+    if mask:
+        payload = bytes(b ^ mask[i % 4] for i, b in enumerate(payload))
+    return opcode, payload
+
+
+def _websocket_command(ws_url: str, method: str, timeout_seconds: float) -> Dict[str, Any]:
+    """Send one CDP command over a fresh websocket and return its result."""
+    parts = urlsplit(ws_url)
+    host = parts.hostname or "127.0.0.1"
+    port = parts.port or 80
+    path = parts.path or "/"
+    key = base64.b64encode(os.urandom(16)).decode("ascii")
+    with socket.create_connection((host, port), timeout=timeout_seconds) as sock:
+        # No Origin header: Chrome only enforces --remote-allow-origins when one is sent.
+        sock.sendall(
+            (
+                f"GET {path} HTTP/1.1\r\n"
+                f"Host: {host}:{port}\r\n"
+                "Upgrade: websocket\r\n"
+                "Connection: Upgrade\r\n"
+                f"Sec-WebSocket-Key: {key}\r\n"
+                "Sec-WebSocket-Version: 13\r\n\r\n"
+            ).encode("ascii")
+        )
+        response = b""
+        while b"\r\n\r\n" not in response:
+            chunk = sock.recv(1024)
+            if not chunk:
+                raise ConnectionError("websocket handshake closed by peer")
+            response += chunk
+        head = response.split(b"\r\n\r\n", 1)[0].decode("latin-1")
+        status_line, *header_lines = head.split("\r\n")
+        if " 101 " not in f"{status_line} ":
+            raise ConnectionError(f"websocket handshake rejected: {status_line}")
+        headers = {
+            name.strip().lower(): value.strip()
+            for name, _, value in (line.partition(":") for line in header_lines)
+        }
+        expected = base64.b64encode(hashlib.sha1((key + _WS_GUID).encode("ascii")).digest()).decode("ascii")
+        if headers.get("sec-websocket-accept") != expected:
+            raise ConnectionError("websocket handshake returned a bad accept key")
+
+        _send_frame(sock, json.dumps({"id": 1, "method": method}).encode("utf-8"))
+        while True:
+            opcode, payload = _recv_frame(sock)
+            if opcode == 0x8:
+                raise ConnectionError("websocket closed before CDP response")
+            if opcode != 0x1:
+                continue
+            message = json.loads(payload.decode("utf-8"))
+            if message.get("id") != 1:
+                continue  # unsolicited CDP event
+            try:
+                _send_frame(sock, struct.pack("!H", 1000), opcode=0x8)
+            except OSError:
+                pass
+            if "error" in message:
+                raise RuntimeError(f"{method} failed: {message['error']}")
+            return message.get("result") or {}
+
+
+class CdpHealthProbe:
+    def __init__(self, ttl_seconds: float = 10.0, timeout_seconds: float = 3.0) -> None:
+        self.ttl_seconds = ttl_seconds
+        self.timeout_seconds = timeout_seconds
+        self._cache: Dict[str, ProbeResult] = {}
+        self._lock = threading.Lock()
+        self._probes = 0
+        self._cache_hits = 0
+        self._failures = 0
+        self._measured = 0
+        self._total_latency_ms = 0.0
+        self._max_latency_ms = 0.0
+        self._last: ProbeResult | None = None
+
+    def invalidate(self, cdp_url: str | None = None) -> None:
+        with self._lock:
+            if cdp_url is None:
+                self._cache.clear()
+            else:
+                self._cache.pop(cdp_url.rstrip("/"), None)
+
+    def _probe(self, cdp_url: str) -> ProbeResult:
+        started = time.perf_counter()
+        try:
+            with urllib.request.urlopen(cdp_url + "/json/version", timeout=self.timeout_seconds) as resp:
+                info = json.loads(resp.read().decode("utf-8"))
+        except Exception as exc:  # noqa: BLE001
+            return ProbeResult(healthy=False, error=f"/json/version failed: {exc}", checked_at=time.time())
+        version_ms = (time.perf_counter() - started) * 1000
+
+        ws_url = info.get("webSocketDebuggerUrl")
+        if not ws_url:
+            return ProbeResult(
+                healthy=False,
+                version_ms=version_ms,
+                error="/json/version has no webSocketDebuggerUrl",
+                checked_at=time.time(),
+            )
+        started = time.perf_counter()
+        try:
+            result = _websocket_command(ws_url, "Browser.getVersion", self.timeout_seconds)
+        except Exception as exc:  # noqa: BLE001
+            return ProbeResult(
+                healthy=False,
+                version_ms=version_ms,
+                error=f"Browser.getVersion failed: {exc}",
+                checked_at=time.time(),
+            )
+        return ProbeResult(
+            healthy=True,
+            version_ms=version_ms,
+            websocket_ms=(time.perf_counter() - started) * 1000,
+            browser=result.get("product") or info.get("Browser"),
+            checked_at=time.time(),
+        )
+
+    def check(self, cdp_url: str, *, use_cache: bool = True) -> ProbeResult:
+        key = cdp_url.rstrip("/")
+        now = time.time()
+        if use_cache:
+            with self._lock:
+                cached = self._cache.get(key)
+                if cached is not None and now - cached.checked_at < self.ttl_seconds:
+                    self._cache_hits += 1
+                    return replace(cached, cached=True)
+
+        result = self._probe(key)
+        with self._lock:
+            self._probes += 1
+            self._last = result
+            if result.latency_ms is not None:
+                self._measured += 1
+                self._total_latency_ms += result.latency_ms
+                self._max_latency_ms = max(self._max_latency_ms, result.latency_ms)
+            if result.healthy:
+                self._cache[key] = result
+            else:
+                self._failures += 1
+                self._cache.pop(key, None)
+        return result
+
+    def is_healthy(self, cdp_url: str) -> bool:
+        return self.check(cdp_url).healthy
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            measured = self._measured
+            last = self._last
+            return {
+                "probes": self._probes,
+                "cache_hits": self._cache_hits,
+                "failures": self._failures,
+                "avg_latency_ms": round(self._total_latency_ms / measured, 2) if measured else None,
+                "max_latency_ms": round(self._max_latency_ms, 2) if measured else None,
+                "last": None if last is None else {
+                    "healthy": last.healthy,
+                    "version_ms": last.version_ms,
+                    "websocket_ms": last.websocket_ms,
+                    "error": last.error,
+                },
+            }
+
+
+_SHARED_PROBE: CdpHealthProbe | None = None
+_SHARED_PROBE_LOCK = threading.Lock()
+
+
+def shared_health_probe() -> CdpHealthProbe:
+    global _SHARED_PROBE
+    with _SHARED_PROBE_LOCK:
+        if _SHARED_PROBE is None:
+            _SHARED_PROBE = CdpHealthProbe(
+                ttl_seconds=float(os.getenv("OPENCLAW_CDP_HEALTH_TTL_SECONDS", "10")),
+                timeout_seconds=float(os.getenv("OPENCLAW_CDP_HEALTH_TIMEOUT_SECONDS", "3")),
+            )
+        return _SHARED_PROBE
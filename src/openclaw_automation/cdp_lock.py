@@ -1,13 +1,38 @@
+"""File-based lock serializing access to shared Chrome CDP sessions.
+
+Ownership is still the O_EXCL lock file holding ``{"pid", "start_time"}``
+so existing tooling (and BrowserAgent copies of this lock) keep working.
+
+On POSIX, waiting no longer polls that file. Waiters join a FIFO queue of
+``flock``-ed node files in ``<lock_file>.queue/``: each waiter blocks in
+the kernel on its predecessor's node and wakes the moment it is released
+(or its process dies). Only the head of the queue contends for the browser
+slots, and it blocks on the current holders' flocks, so a release wakes the
+next waiter immediately. Holders that do not take part in the flock
+protocol are still polled every ``retry_seconds``.
+
+With several ``cdp_urls`` the lock manages one slot per Chrome instance;
+slot 0 uses ``lock_file`` and slot N uses ``<stem>.N<suffix>``. After
+``acquire`` returns, ``slot`` and ``cdp_url`` identify the browser to use.
+"""
 from __future__ import annotations
 
 import json
 import os
+import threading
 import time
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from datetime import datetime, timezone
 from pathlib import Path
+from typing import Any, Dict, List, Set
+
+try:
+    import fcntl
+except ImportError:  # Windows: fall back to polling the lock file.
+    fcntl = None  # type: ignore[assignment]
 
 DEFAULT_LOCK_PATH = Path.home() / ".openclaw" / "browser_cdp.lock"
+DEFAULT_CDP_URL = "http://127.0.0.1:9222"
 
 
 def _pid_alive(pid: int) -> bool:
@@ -21,54 +46,292 @@ def _pid_alive(pid: int) -> bool:
         return True
 
 
+def _try_flock(path: Path, create: bool = True) -> int | None:
+    """Open ``path`` and take an exclusive flock without blocking."""
+    fd = os.open(str(path), (os.O_CREAT | os.O_RDWR) if create else os.O_RDWR, 0o600)
+    try:
+        fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except BlockingIOError:
+        os.close(fd)
+        return None
+    return fd
+
+
+def _unlock(fd: int) -> None:
+    try:
+        fcntl.flock(fd, fcntl.LOCK_UN)
+    finally:
+        os.close(fd)
+
+
+@dataclass
+class _Watcher:
+    """One daemon thread blocked on a path's flock, shared by every waiter on it."""
+
+    listeners: Set[threading.Event] = field(default_factory=set)
+
+
+_WATCHERS: Dict[str, _Watcher] = {}
+_WATCHERS_LOCK = threading.Lock()
+
+
+def _watch(key: str, watcher: _Watcher) -> None:
+    try:
+        fd = os.open(key, os.O_RDWR)
+    except FileNotFoundError:
+        pass
+    else:
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX)
+        finally:
+            _unlock(fd)
+    with _WATCHERS_LOCK:
+        if _WATCHERS.get(key) is watcher:
+            del _WATCHERS[key]
+        for listener in watcher.listeners:
+            listener.set()
+
+
+def _wait_for_release(paths: List[Path], timeout_seconds: float) -> bool:
+    """Block until the flock on any of ``paths`` is released, or time out.
+
+    flock has no timeout, so each path gets a daemon thread that blocks in
+    the kernel. The thread outlives a timed-out wait and is reused by the
+    next wait on the same path, so retry loops do not pile up threads; it
+    drops the lock as soon as it gets it.
+    """
+    if timeout_seconds <= 0 or not paths:
+        return False
+    released = threading.Event()
+    watchers: List[_Watcher] = []
+    with _WATCHERS_LOCK:
+        for path in paths:
+            key = str(path)
+            watcher = _WATCHERS.get(key)
+            if watcher is None:
+                watcher = _WATCHERS[key] = _Watcher()
+                threading.Thread(
+                    target=_watch, args=(key, watcher), name="openclaw-cdp-lock-wait", daemon=True
+                ).start()
+            watcher.listeners.add(released)
+            watchers.append(watcher)
+    try:
+        return released.wait(timeout_seconds)
+    finally:
+        with _WATCHERS_LOCK:
+            for watcher in watchers:
+                watcher.listeners.discard(released)
+
+
 @dataclass
 class CDPLock:
     lock_file: Path
     timeout_seconds: int = 600
-    retry_seconds: int = 5
+    retry_seconds: float = 5
     owner_pid: int = os.getpid()
+    cdp_urls: List[str] = field(default_factory=lambda: [DEFAULT_CDP_URL])
+    slot: int | None = field(default=None, init=False)
+    _slot_fd: int | None = field(default=None, init=False, repr=False)
+
+    @classmethod
+    def from_env(cls) -> "CDPLock":
+        urls = [u.strip() for u in os.getenv("OPENCLAW_CDP_URLS", "").split(",") if u.strip()]
+        if not urls:
+            urls = [os.getenv("OPENCLAW_CDP_URL", DEFAULT_CDP_URL).strip() or DEFAULT_CDP_URL]
+        return cls(
+            lock_file=Path(os.getenv("OPENCLAW_CDP_LOCK_FILE", str(DEFAULT_LOCK_PATH))).expanduser(),
+            timeout_seconds=int(os.getenv("OPENCLAW_CDP_LOCK_TIMEOUT", "600")),
+            retry_seconds=float(os.getenv("OPENCLAW_CDP_LOCK_RETRY_SECONDS", "5")),
+            cdp_urls=urls,
+        )
+
+    @property
+    def cdp_url(self) -> str | None:
+        return None if self.slot is None else self.cdp_urls[self.slot]
+
+    @property
+    def queue_dir(self) -> Path:
+        return self.lock_file.with_name(self.lock_file.name + ".queue")
+
+    def slot_file(self, slot: int) -> Path:
+        if slot == 0:
+            return self.lock_file
+        return self.lock_file.with_name(f"{self.lock_file.stem}.{slot}{self.lock_file.suffix}")
+
+    def _slot_flock(self, slot: int) -> Path:
+        return self.queue_dir / f"slot{slot}.flock"
+
+    def __enter__(self) -> "CDPLock":
+        self.acquire()
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.release()
+
+    # ── acquire / release ────────────────────────────────────────────
 
     def acquire(self) -> None:
         self.lock_file.parent.mkdir(parents=True, exist_ok=True)
         deadline = time.monotonic() + max(1, self.timeout_seconds)
+        if fcntl is None:
+            self._acquire_polling(deadline)
+            return
 
-        while True:
-            try:
-                fd = os.open(str(self.lock_file), os.O_CREAT | os.O_EXCL | os.O_WRONLY, 0o600)
+        self.queue_dir.mkdir(parents=True, exist_ok=True)
+        ticket, node_fd = self._enqueue()
+        got_slot = False
+        try:
+            self._wait_turn(ticket, deadline)
+            while True:
+                busy: List[Path] = []
+                polled = False
+                for slot in range(len(self.cdp_urls)):
+                    state = self._try_claim(slot)
+                    if state == "claimed":
+                        got_slot = True
+                        return
+                    if state == "flock":
+                        busy.append(self._slot_flock(slot))
+                    else:
+                        polled = True
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise self._timeout_error()
+                if polled:
+                    remaining = min(remaining, max(0.05, self.retry_seconds))
+                _wait_for_release(busy, remaining)
+        finally:
+            # Hand the head of the queue to the next waiter. Only a waiter
+            # that got a slot marks its node done; an abandoned node tells
+            # the successor to keep waiting on our predecessor instead.
+            if got_slot:
+                self._write_node(node_fd, {"pid": self.owner_pid, "state": "done"})
+            _unlock(node_fd)
+
+    def release(self) -> None:
+        slot = self.slot or 0
+        lock_file = self.slot_file(slot)
+        try:
+            if lock_file.exists() and self._read_pid(lock_file) == self.owner_pid:
                 try:
-                    payload = {
-                        "pid": self.owner_pid,
-                        "start_time": datetime.now(timezone.utc).isoformat(),
-                    }
-                    os.write(fd, json.dumps(payload).encode("utf-8"))
-                finally:
-                    os.close(fd)
+                    lock_file.unlink()
+                except FileNotFoundError:
+                    pass
+        finally:
+            # Drop the flock only after the marker is gone, so woken waiters
+            # find the slot free.
+            if self._slot_fd is not None:
+                _unlock(self._slot_fd)
+                self._slot_fd = None
+            self.slot = None
+
+    # ── FIFO wait queue ──────────────────────────────────────────────
+
+    def _node_path(self, ticket: int) -> Path:
+        return self.queue_dir / f"{ticket}.node"
+
+    def _write_node(self, fd: int, payload: Dict[str, Any]) -> None:
+        os.ftruncate(fd, 0)
+        os.pwrite(fd, json.dumps(payload).encode("utf-8"), 0)
+
+    def _enqueue(self) -> tuple[int, int]:
+        """Take the next ticket and publish our (locked) node for successors."""
+        ticket_fd = os.open(str(self.queue_dir / "ticket"), os.O_CREAT | os.O_RDWR, 0o600)
+        try:
+            fcntl.flock(ticket_fd, fcntl.LOCK_EX)
+            raw = os.pread(ticket_fd, 32, 0).decode("ascii").strip()
+            ticket = int(raw) if raw.isdigit() else 0
+            node_fd = _try_flock(self._node_path(ticket))
+            if node_fd is None:  # leftover from a reset ticket file
+                raise RuntimeError(f"CDP lock queue node {ticket} is already held")
+            self._write_node(node_fd, {"pid": self.owner_pid, "state": "waiting"})
+            os.ftruncate(ticket_fd, 0)
+            os.pwrite(ticket_fd, str(ticket + 1).encode("ascii"), 0)
+        finally:
+            _unlock(ticket_fd)
+        return ticket, node_fd
+
+    def _wait_turn(self, ticket: int, deadline: float) -> None:
+        """Wait until every earlier waiter got a slot or left the queue."""
+        pred = ticket - 1
+        while pred >= 0:
+            path = self._node_path(pred)
+            try:
+                fd = _try_flock(path, create=False)
+            except FileNotFoundError:
+                return  # already cleaned up: predecessor finished
+            if fd is None:
+                if not _wait_for_release([path], deadline - time.monotonic()):
+                    raise self._timeout_error()
+                continue
+            try:
+                state = json.loads(os.pread(fd, 256, 0) or b"{}").get("state")
+            except ValueError:
+                state = None
+            try:
+                path.unlink()
+            except FileNotFoundError:
+                pass
+            _unlock(fd)
+            if state == "done":
                 return
-            except FileExistsError:
-                if self._reap_if_stale():
-                    continue
+            # Predecessor timed out or died while queued: inherit its place.
+            pred -= 1
 
-                if time.monotonic() >= deadline:
-                    raise TimeoutError(
-                        f"Timed out waiting for CDP lock: {self.lock_file} (timeout={self.timeout_seconds}s)"
-                    )
-                time.sleep(max(1, self.retry_seconds))
+    # ── slots ────────────────────────────────────────────────────────
 
-    def release(self) -> None:
-        if not self.lock_file.exists():
-            return
+    def _try_claim(self, slot: int) -> str:
+        """Return "claimed", "flock" (held by a flock-aware owner) or "poll"."""
+        flock_fd = _try_flock(self._slot_flock(slot))
+        if flock_fd is None:
+            return "flock"
+        while True:
+            if self._create_marker(slot):
+                self.slot = slot
+                self._slot_fd = flock_fd
+                return "claimed"
+            if not self._reap_if_stale(self.slot_file(slot)):
+                _unlock(flock_fd)
+                return "poll"
 
-        owner_pid = self._read_pid()
-        if owner_pid != self.owner_pid:
-            return
+    def _create_marker(self, slot: int) -> bool:
         try:
-            self.lock_file.unlink()
-        except FileNotFoundError:
-            return
+            fd = os.open(str(self.slot_file(slot)), os.O_CREAT | os.O_EXCL | os.O_WRONLY, 0o600)
+        except FileExistsError:
+            return False
+        try:
+            payload = {
+                "pid": self.owner_pid,
+                "start_time": datetime.now(timezone.utc).isoformat(),
+            }
+            if len(self.cdp_urls) > 1:
+                payload["cdp_url"] = self.cdp_urls[slot]
+            os.write(fd, json.dumps(payload).encode("utf-8"))
+        finally:
+            os.close(fd)
+        return True
+
+    def _acquire_polling(self, deadline: float) -> None:
+        while True:
+            for slot in range(len(self.cdp_urls)):
+                if self._create_marker(slot) or (
+                    self._reap_if_stale(self.slot_file(slot)) and self._create_marker(slot)
+                ):
+                    self.slot = slot
+                    return
+            if time.monotonic() >= deadline:
+                raise self._timeout_error()
+            time.sleep(max(0.05, self.retry_seconds))
+
+    def _timeout_error(self) -> TimeoutError:
+        return TimeoutError(
+            f"Timed out waiting for CDP lock: {self.lock_file} (timeout={self.timeout_seconds}s)"
+        )
 
-    def _read_pid(self) -> int | None:
+    def _read_pid(self, lock_file: Path | None = None) -> int | None:
+        lock_file = lock_file or self.lock_file
         try:
-            data = json.loads(self.lock_file.read_text())
+            data = json.loads(lock_file.read_text())
         except Exception:  # noqa: BLE001
             return None
         pid = data.get("pid")
@@ -79,11 +342,12 @@ class CDPLock:
         except Exception:  # noqa: BLE001
             return None
 
-    def _reap_if_stale(self) -> bool:
-        owner_pid = self._read_pid()
+    def _reap_if_stale(self, lock_file: Path | None = None) -> bool:
+        lock_file = lock_file or self.lock_file
+        owner_pid = self._read_pid(lock_file)
         if owner_pid is None:
             try:
-                self.lock_file.unlink()
+                lock_file.unlink()
                 return True
             except FileNotFoundError:
                 return True
@@ -92,7 +356,7 @@ class CDPLock:
 
         if not _pid_alive(owner_pid):
             try:
-                self.lock_file.unlink()
+                lock_file.unlink()
                 return True
             except FileNotFoundError:
                 return True
@@ -10,6 +10,7 @@ from typing import Any, Dict
 from .engine import AutomationEngine, pretty_json
 from .nl import parse_query_to_run, resolve_script_dir
 from .security_gate import create_signed_assertion, verify_totp_code
+from .server import DEFAULT_HOST, DEFAULT_PORT, request_server, serve
 
 
 def _parse_args() -> argparse.Namespace:
@@ -22,9 +23,19 @@ def _parse_args() -> argparse.Namespace:
     p_run = sub.add_parser("run", help="Validate and run a script")
     p_run.add_argument("--script-dir", required=True)
     p_run.add_argument("--input", required=True, help="JSON object string")
+    p_run.add_argument(
+        "--server",
+        default="",
+        help="Send the run to a resident engine server (e.g. http://127.0.0.1:8765)",
+    )
 
     p_query = sub.add_parser("run-query", help="Run from a plain-English query")
     p_query.add_argument("--query", required=True)
+    p_query.add_argument(
+        "--server",
+        default="",
+        help="Send the query to a resident engine server (e.g. http://127.0.0.1:8765)",
+    )
     cred_group = p_query.add_mutually_exclusive_group()
     cred_group.add_argument(
         "--credential-refs",
@@ -64,6 +75,15 @@ def _parse_args() -> argparse.Namespace:
         help="Read JSON security assertion from stdin",
     )
 
+    p_serve = sub.add_parser("serve", help="Run a resident engine server on localhost")
+    p_serve.add_argument("--host", default=DEFAULT_HOST)
+    p_serve.add_argument("--port", type=int, default=DEFAULT_PORT)
+    p_serve.add_argument(
+        "--preload",
+        action="store_true",
+        help="Import every runner module at startup, not just schemas",
+    )
+
     p_doctor = sub.add_parser("doctor", help="Run local environment preflight checks")
     p_doctor.add_argument(
         "--json",
@@ -193,8 +213,33 @@ def _detect_repo_root(script_dir: Path) -> Path:
     raise FileNotFoundError("Could not locate repository root with schemas/manifest.schema.json")
 
 
+def _print_server_result(status: int, result: Dict[str, Any]) -> None:
+    if status != 200:
+        print(pretty_json(result))
+        raise SystemExit(1)
+    if result.get("mode") == "placeholder":
+        print(
+            "WARNING: BrowserAgent not enabled. Results are placeholder data.",
+            file=sys.stderr,
+        )
+    print(pretty_json(result))
+
+
 def main() -> None:
     args = _parse_args()
+    if args.command == "run" and args.server:
+        payload = {"script_dir": str(Path(args.script_dir).resolve()), "inputs": _load_input(args.input)}
+        _print_server_result(*request_server(args.server, "/run", payload))
+        return
+    if args.command == "run-query" and args.server:
+        payload = {
+            "query": args.query,
+            "credential_refs": _load_credential_refs(args),
+            "security_assertion": _load_security_assertion(args),
+        }
+        _print_server_result(*request_server(args.server, "/run-query", payload))
+        return
+
     if args.command in {"validate", "run"}:
         script_dir = Path(args.script_dir).resolve()
         root = _detect_repo_root(script_dir)
@@ -285,6 +330,10 @@ def main() -> None:
         print(pretty_json({"ok": True, "security_assertion": assertion}))
         return
 
+    if args.command == "serve":
+        serve(root, host=args.host, port=args.port, preload=args.preload)
+        return
+
     if args.command == "doctor":
         result = _doctor(root)
         if args.json:
@@ -1,10 +1,20 @@
 from __future__ import annotations
 
+import copy
 import json
+import threading
 from pathlib import Path
-from typing import Any, Dict
+from typing import Any, Dict, Iterable, List, Tuple
 
 import jsonschema
+from jsonschema.exceptions import ValidationError, best_match
+from jsonschema.validators import validator_for
+
+# Compiled validators and validated manifests, keyed by resolved path and
+# invalidated whenever the file's mtime changes.
+_VALIDATORS: Dict[Path, Tuple[int, Any]] = {}
+_MANIFESTS: Dict[Tuple[Path, Path], Tuple[int, int, Dict[str, Any]]] = {}
+_CACHE_LOCK = threading.Lock()
 
 
 def _load_json(path: Path) -> Dict[str, Any]:
@@ -12,20 +22,65 @@ def _load_json(path: Path) -> Dict[str, Any]:
         return json.load(f)
 
 
+def compiled_validator(schema_path: Path) -> Any:
+    """Return a checked, reusable validator for ``schema_path``."""
+    path = schema_path.resolve()
+    mtime_ns = path.stat().st_mtime_ns
+    with _CACHE_LOCK:
+        cached = _VALIDATORS.get(path)
+        if cached is not None and cached[0] == mtime_ns:
+            return cached[1]
+
+    schema = _load_json(path)
+    cls = validator_for(schema, default=jsonschema.Draft202012Validator)
+    cls.check_schema(schema)
+    validator = cls(schema)
+    with _CACHE_LOCK:
+        _VALIDATORS[path] = (mtime_ns, validator)
+    return validator
+
+
+def clear_schema_cache() -> None:
+    with _CACHE_LOCK:
+        _VALIDATORS.clear()
+        _MANIFESTS.clear()
+
+
+def _raise_best_error(validator: Any, payload: Any) -> None:
+    # Same error selection as jsonschema.validate().
+    error = best_match(validator.iter_errors(payload))
+    if error is not None:
+        raise error
+
+
 def validate_manifest(script_dir: Path, manifest_schema_path: Path) -> Dict[str, Any]:
     manifest_path = script_dir / "manifest.json"
     if not manifest_path.exists():
         raise FileNotFoundError(f"manifest not found: {manifest_path}")
 
+    key = (manifest_path.resolve(), manifest_schema_path.resolve())
+    manifest_mtime = key[0].stat().st_mtime_ns
+    schema_mtime = key[1].stat().st_mtime_ns
+    with _CACHE_LOCK:
+        cached = _MANIFESTS.get(key)
+    if cached is not None and cached[:2] == (manifest_mtime, schema_mtime):
+        return copy.deepcopy(cached[2])
+
     manifest = _load_json(manifest_path)
-    schema = _load_json(manifest_schema_path)
-    jsonschema.validate(manifest, schema)
+    _raise_best_error(compiled_validator(manifest_schema_path), manifest)
+    with _CACHE_LOCK:
+        _MANIFESTS[key] = (manifest_mtime, schema_mtime, copy.deepcopy(manifest))
     return manifest
 
 
 def validate_against_schema(payload: Dict[str, Any], schema_path: Path) -> None:
-    schema = _load_json(schema_path)
-    jsonschema.validate(payload, schema)
+    _raise_best_error(compiled_validator(schema_path), payload)
+
+
+def validate_many(payloads: Iterable[Dict[str, Any]], schema_path: Path) -> List[ValidationError | None]:
+    """Validate many payloads against one schema; one entry per payload, None when valid."""
+    validator = compiled_validator(schema_path)
+    return [best_match(validator.iter_errors(payload)) for payload in payloads]
 
 
 def validate_inputs(inputs: Dict[str, Any], inputs_schema_path: Path) -> None:
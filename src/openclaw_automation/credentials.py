@@ -1,10 +1,36 @@
+"""Resolve ``credential_refs`` through pluggable providers with a short-lived cache.
+
+Providers are tried in order (``OPENCLAW_CREDENTIAL_PROVIDERS``, default
+``env,vault,keychain``) and each is asked for all still-missing refs in one
+call, so the keychain costs one subprocess per run instead of one per ref.
+Values from the vault and keychain are cached in memory for
+``OPENCLAW_CREDENTIAL_CACHE_TTL_SECONDS``; cached bytes are overwritten with
+zeros when they expire. Environment lookups are always live.
+
+The engine hands runners a ``DeferredCredentialResolution``: nothing is looked
+up until a runner reads ``context["credentials"]`` or
+``context["unresolved_credential_refs"]``.
+"""
 from __future__ import annotations
 
+import json
 import os
 import subprocess
 import sys
+import threading
+import time
+from collections.abc import Mapping
+from contextlib import nullcontext
 from dataclasses import dataclass
-from typing import Dict
+from pathlib import Path
+from typing import Any, Callable, ContextManager, Dict, Iterable, Iterator, List, Sequence, Tuple
+
+try:
+    from cryptography.fernet import Fernet
+except ImportError:  # pragma: no cover - optional dependency
+    Fernet = None  # type: ignore[assignment]
+
+DEFAULT_PROVIDERS = "env,vault,keychain"
 
 
 @dataclass(frozen=True)
@@ -18,42 +44,311 @@ def _env_name_from_ref(ref: str) -> str:
     return f"OPENCLAW_SECRET_{sanitized}"
 
 
-def _get_from_env(ref: str) -> str | None:
-    return os.getenv(_env_name_from_ref(ref))
+# ── Providers ────────────────────────────────────────────────────────
+
+
+class CredentialProvider:
+    """Looks up many refs at once; refs it does not know are left out of the result."""
+
+    name = "provider"
+    cacheable = True
+
+    def lookup_many(self, refs: Sequence[str]) -> Dict[str, str]:
+        raise NotImplementedError
+
+
+class EnvCredentialProvider(CredentialProvider):
+    name = "env"
+    cacheable = False  # already in memory, and may change between runs
+
+    def lookup_many(self, refs: Sequence[str]) -> Dict[str, str]:
+        found = {ref: os.getenv(_env_name_from_ref(ref)) for ref in refs}
+        return {ref: value for ref, value in found.items() if value is not None}
+
+
+# Runs ``security`` for every ref inside one shell, printing "1<value>" or "0"
+# per ref, NUL-separated. Refs are passed as arguments, never interpolated.
+_KEYCHAIN_BATCH_SCRIPT = (
+    'for ref in "$@"; do '
+    'if value=$(security find-generic-password -a "$OPENCLAW_KEYCHAIN_ACCOUNT" -s "$ref" -w 2>/dev/null); '
+    "then printf '1%s\\0' \"$value\"; else printf '0\\0'; fi; "
+    "done"
+)
+
+
+class KeychainCredentialProvider(CredentialProvider):
+    """macOS Keychain generic passwords, service = ref, account = ``$USER``."""
+
+    name = "keychain"
 
+    def __init__(self, account: str | None = None, enabled: bool | None = None, timeout_seconds: float = 30.0) -> None:
+        self.account = account if account is not None else os.getenv("USER", "")
+        self.enabled = sys.platform == "darwin" if enabled is None else enabled
+        self.timeout_seconds = timeout_seconds
 
-def _get_from_keychain(ref: str) -> str | None:
-    if sys.platform != "darwin":
-        return None
-    try:
+    def lookup_many(self, refs: Sequence[str]) -> Dict[str, str]:
+        if not self.enabled or not refs:
+            return {}
         result = subprocess.run(
-            ["security", "find-generic-password", "-a", os.getenv("USER", ""), "-s", ref, "-w"],
-            check=True,
+            ["/bin/sh", "-c", _KEYCHAIN_BATCH_SCRIPT, "keychain-lookup", *refs],
             capture_output=True,
             text=True,
+            timeout=self.timeout_seconds,
+            env={**os.environ, "OPENCLAW_KEYCHAIN_ACCOUNT": self.account},
         )
-        value = result.stdout.strip()
-        return value or None
-    except Exception:
-        return None
+        found: Dict[str, str] = {}
+        for ref, item in zip(refs, result.stdout.split("\0")):
+            value = item[1:].strip()
+            if item.startswith("1") and value:
+                found[ref] = value
+        return found
+
+
+class EncryptedFileCredentialProvider(CredentialProvider):
+    """A Fernet-encrypted JSON object mapping refs to values (needs ``cryptography``)."""
+
+    name = "vault"
+
+    def __init__(self, path: Path | str, key: str) -> None:
+        self.path = Path(path).expanduser()
+        self.key = key
+
+    def lookup_many(self, refs: Sequence[str]) -> Dict[str, str]:
+        if Fernet is None:
+            raise RuntimeError("Encrypted credential vault requires the 'cryptography' package")
+        secrets = json.loads(Fernet(self.key.encode()).decrypt(self.path.read_bytes()))
+        return {ref: str(secrets[ref]) for ref in refs if secrets.get(ref)}
+
+
+def default_providers() -> List[CredentialProvider]:
+    providers: List[CredentialProvider] = []
+    for name in os.getenv("OPENCLAW_CREDENTIAL_PROVIDERS", DEFAULT_PROVIDERS).split(","):
+        name = name.strip().lower()
+        if name == "env":
+            providers.append(EnvCredentialProvider())
+        elif name == "keychain":
+            providers.append(KeychainCredentialProvider())
+        elif name == "vault":
+            vault = os.getenv("OPENCLAW_CREDENTIAL_VAULT", "").strip()
+            if vault:
+                providers.append(
+                    EncryptedFileCredentialProvider(vault, os.getenv("OPENCLAW_CREDENTIAL_VAULT_KEY", ""))
+                )
+        elif name:
+            raise ValueError(f"Unknown credential provider: {name}")
+    return providers
+
+
+# ── Cache ────────────────────────────────────────────────────────────
+
+
+def _wipe(buffer: bytearray) -> None:
+    buffer[:] = bytes(len(buffer))
+
+
+class CredentialCache:
+    """TTL cache of provider values, held as bytearrays and zeroed when they expire.
+
+    Strings handed back to callers are copies Python cannot wipe; the cache only
+    guarantees its own copy does not outlive the TTL.
+    """
+
+    def __init__(self, ttl_seconds: float = 300.0, clock: Callable[[], float] = time.monotonic) -> None:
+        self.ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._entries: Dict[Tuple[str, str], Tuple[bytearray, float]] = {}
+        self._lock = threading.Lock()
+        self._timer: threading.Timer | None = None
+
+    def get(self, provider: str, ref: str) -> str | None:
+        with self._lock:
+            self._purge_locked()
+            entry = self._entries.get((provider, ref))
+            return entry[0].decode("utf-8") if entry else None
 
+    def put(self, provider: str, ref: str, value: str) -> None:
+        if self.ttl_seconds <= 0:
+            return
+        with self._lock:
+            old = self._entries.pop((provider, ref), None)
+            if old is not None:
+                _wipe(old[0])
+            self._entries[(provider, ref)] = (bytearray(value.encode("utf-8")), self._clock() + self.ttl_seconds)
+            self._schedule_locked()
 
-def resolve_credential_refs(credential_refs: Dict[str, str]) -> CredentialResolution:
+    def purge_expired(self) -> int:
+        with self._lock:
+            return self._purge_locked()
+
+    def clear(self) -> None:
+        with self._lock:
+            for buffer, _ in self._entries.values():
+                _wipe(buffer)
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+    def _purge_locked(self) -> int:
+        now = self._clock()
+        expired = [key for key, (_, expires_at) in self._entries.items() if expires_at <= now]
+        for key in expired:
+            _wipe(self._entries.pop(key)[0])
+        return len(expired)
+
+    def _schedule_locked(self) -> None:
+        """Keep one daemon timer armed for the earliest expiry so values don't linger."""
+        if self._timer is not None or not self._entries:
+            return
+        delay = min(expires_at for _, expires_at in self._entries.values()) - self._clock()
+        self._timer = threading.Timer(max(0.0, delay) + 0.05, self._on_timer)
+        self._timer.daemon = True
+        self._timer.start()
+
+    def _on_timer(self) -> None:
+        with self._lock:
+            self._timer = None
+            self._purge_locked()
+            self._schedule_locked()
+
+
+# ── Resolution ───────────────────────────────────────────────────────
+
+
+class CredentialResolver:
+    def __init__(
+        self,
+        providers: Sequence[CredentialProvider] | None = None,
+        cache: CredentialCache | None = None,
+    ) -> None:
+        self._providers = list(providers) if providers is not None else None
+        self.cache = cache
+        self._lock = threading.Lock()
+
+    @property
+    def providers(self) -> List[CredentialProvider]:
+        # Built on first lookup, so runs that never read credentials pay nothing.
+        with self._lock:
+            if self._providers is None:
+                self._providers = default_providers()
+            return self._providers
+
+    def resolve_many(self, refs: Iterable[str]) -> Dict[str, str]:
+        """Values for every ref some provider knows; one provider call per provider at most."""
+        pending = list(dict.fromkeys(refs))
+        found: Dict[str, str] = {}
+        for provider in self.providers:
+            if not pending:
+                break
+            if provider.cacheable and self.cache is not None:
+                for ref in pending:
+                    value = self.cache.get(provider.name, ref)
+                    if value is not None:
+                        found[ref] = value
+                pending = [ref for ref in pending if ref not in found]
+                if not pending:
+                    break
+            try:
+                values = provider.lookup_many(pending)
+            except Exception:
+                # A broken provider leaves its refs unresolved (fail closed).
+                values = {}
+            for ref in pending:
+                value = values.get(ref)
+                if not value:
+                    continue
+                found[ref] = value
+                if provider.cacheable and self.cache is not None:
+                    self.cache.put(provider.name, ref, value)
+            pending = [ref for ref in pending if ref not in found]
+        return found
+
+
+_SHARED_RESOLVER: CredentialResolver | None = None
+_SHARED_RESOLVER_LOCK = threading.Lock()
+
+
+def shared_credential_resolver() -> CredentialResolver:
+    """Process-wide resolver; ``OPENCLAW_CREDENTIAL_CACHE_TTL_SECONDS=0`` disables caching."""
+    global _SHARED_RESOLVER
+    with _SHARED_RESOLVER_LOCK:
+        if _SHARED_RESOLVER is None:
+            ttl = float(os.getenv("OPENCLAW_CREDENTIAL_CACHE_TTL_SECONDS", "300"))
+            _SHARED_RESOLVER = CredentialResolver(cache=CredentialCache(ttl) if ttl > 0 else None)
+        return _SHARED_RESOLVER
+
+
+def resolve_credential_refs(
+    credential_refs: Dict[str, str], resolver: CredentialResolver | None = None
+) -> CredentialResolution:
+    values = (resolver or shared_credential_resolver()).resolve_many(credential_refs.values())
     resolved: Dict[str, str] = {}
     unresolved: Dict[str, str] = {}
-
     for logical_name, ref in credential_refs.items():
-        value = _get_from_env(ref)
-        if value is None:
-            value = _get_from_keychain(ref)
-        if value is None:
+        if ref in values:
+            resolved[logical_name] = values[ref]
+        else:
             unresolved[logical_name] = ref
-            continue
-        resolved[logical_name] = value
-
     return CredentialResolution(resolved=resolved, unresolved=unresolved)
 
 
+class DeferredCredentialResolution:
+    """Resolves ``credential_refs`` on first read of ``resolved`` or ``unresolved``."""
+
+    def __init__(
+        self,
+        credential_refs: Dict[str, str],
+        resolver: CredentialResolver | None = None,
+        observe: Callable[[], ContextManager[Any]] | None = None,
+    ) -> None:
+        self.credential_refs = dict(credential_refs)
+        self._resolver = resolver
+        self._observe = observe  # wraps the lookup, e.g. a telemetry span
+        self._result: CredentialResolution | None = None
+        self._lock = threading.Lock()
+        self.resolved: Mapping[str, str] = _LazyView(self, "resolved")
+        self.unresolved: Mapping[str, str] = _LazyView(self, "unresolved")
+
+    @property
+    def looked_up(self) -> bool:
+        return self._result is not None
+
+    def result(self) -> CredentialResolution:
+        with self._lock:
+            if self._result is None:
+                with self._observe() if self._observe is not None else nullcontext():
+                    self._result = resolve_credential_refs(self.credential_refs, self._resolver)
+            return self._result
+
+
+class _LazyView(Mapping):
+    def __init__(self, owner: DeferredCredentialResolution, field: str) -> None:
+        self._owner = owner
+        self._field = field
+
+    def _data(self) -> Dict[str, str]:
+        return getattr(self._owner.result(), self._field)
+
+    def __getitem__(self, key: str) -> str:
+        return self._data()[key]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._data())
+
+    def __len__(self) -> int:
+        return len(self._data())
+
+    def __repr__(self) -> str:
+        # Keys only: a stray print of the context must not leak values.
+        state = sorted(self._data()) if self._owner.looked_up else "not looked up"
+        return f"<credentials {self._field}: {state}>"
+
+    def __reduce__(self):
+        # Process-mode runners get a plain dict, resolved in the parent.
+        return (dict, (dict(self),))
+
+
 def redacted_keys(credential_refs: Dict[str, str]) -> Dict[str, str]:
     # Keep refs visible but never reveal values in logs/responses.
     return {k: v for k, v in credential_refs.items()}
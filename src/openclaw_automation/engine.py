@@ -1,31 +1,113 @@
 from __future__ import annotations
 
-import importlib.util
+import asyncio
+import copy
 import json
 import os
-from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Any, Dict
+from types import ModuleType
+from typing import Any, Dict, Tuple
 
+from .award_store import shared_award_store
 from .contract import validate_inputs, validate_manifest, validate_output
-from .credentials import redacted_keys, resolve_credential_refs
-from .security_gate import evaluate_security_gate
+from .credentials import DeferredCredentialResolution, redacted_keys
+from .process_pool import RunnerProcessPool, shared_process_pool
+from .result_cache import ResultCache, cache_key, cache_policy, cacheable, shared_result_cache
+from .runner_registry import DEFAULT_RUNNER_REGISTRY, RunnerRegistry
+from .security_gate import SecurityGateDecision, evaluate_security_gate
+from .single_flight import SingleFlight, shared_single_flight
+from .telemetry import RunPhases, RunTrace, TelemetrySink, shared_telemetry_sink
 
 FRAMEWORK_INPUT_KEYS = {"security_assertion"}
 
+# Extra wait for process-mode runs so the pool's own kill-on-timeout fires first.
+_PROCESS_KILL_GRACE_SECONDS = 5
+
+_SHARED_EXECUTOR: ThreadPoolExecutor | None = None
+_SHARED_EXECUTOR_LOCK = threading.Lock()
+
+
+def _runner_timeout_seconds() -> int:
+    return int(os.getenv("OPENCLAW_RUNNER_TIMEOUT_SECONDS", "600"))
+
+
+def _award_store_enabled() -> bool:
+    return bool(os.getenv("OPENCLAW_AWARD_STORE_PATH", "").strip())
+
+
+def shared_executor() -> ThreadPoolExecutor:
+    """Process-wide bounded pool that runner calls execute on."""
+    global _SHARED_EXECUTOR
+    with _SHARED_EXECUTOR_LOCK:
+        if _SHARED_EXECUTOR is None:
+            _SHARED_EXECUTOR = ThreadPoolExecutor(
+                max_workers=max(1, int(os.getenv("OPENCLAW_ENGINE_MAX_WORKERS", "8"))),
+                thread_name_prefix="openclaw-runner",
+            )
+        return _SHARED_EXECUTOR
+
+
+@dataclass
+class _PreparedRun:
+    script_dir: Path
+    manifest: Dict[str, Any]
+    inputs: Dict[str, Any]
+    execution_inputs: Dict[str, Any]
+    runner_path: Path
+    module: ModuleType | None
+    context: Dict[str, Any]
+    cancel_event: threading.Event
+    credential_refs: Dict[str, str]
+    resolution: DeferredCredentialResolution
+    security_decision: SecurityGateDecision
+    trace: RunTrace
+
 
 class AutomationEngine:
-    def __init__(self, root_dir: Path) -> None:
+    def __init__(
+        self,
+        root_dir: Path,
+        runners: RunnerRegistry | None = None,
+        executor: ThreadPoolExecutor | None = None,
+        process_pool: RunnerProcessPool | None = None,
+        result_cache: ResultCache | None = None,
+        single_flight: SingleFlight | None = None,
+        telemetry: TelemetrySink | None = None,
+    ) -> None:
         self.root_dir = root_dir
         self.manifest_schema = root_dir / "schemas" / "manifest.schema.json"
+        self.runners = runners if runners is not None else DEFAULT_RUNNER_REGISTRY
+        self._executor = executor
+        self._process_pool = process_pool
+        self._result_cache = result_cache
+        self._single_flight = single_flight
+        self._telemetry = telemetry
+
+    @property
+    def executor(self) -> ThreadPoolExecutor:
+        return self._executor if self._executor is not None else shared_executor()
+
+    @property
+    def process_pool(self) -> RunnerProcessPool:
+        return self._process_pool if self._process_pool is not None else shared_process_pool()
+
+    @property
+    def result_cache(self) -> ResultCache | None:
+        return self._result_cache if self._result_cache is not None else shared_result_cache()
+
+    @property
+    def single_flight(self) -> SingleFlight | None:
+        return self._single_flight if self._single_flight is not None else shared_single_flight()
+
+    @property
+    def telemetry(self) -> TelemetrySink | None:
+        return self._telemetry if self._telemetry is not None else shared_telemetry_sink()
 
     def _load_runner_module(self, runner_path: Path):
-        spec = importlib.util.spec_from_file_location("automation_runner", runner_path)
-        if spec is None or spec.loader is None:
-            raise RuntimeError(f"failed loading runner: {runner_path}")
-        module = importlib.util.module_from_spec(spec)
-        spec.loader.exec_module(module)
-        return module
+        return self.runners.load(runner_path)
 
     def validate_script(self, script_dir: Path) -> Dict[str, Any]:
         manifest = validate_manifest(script_dir, self.manifest_schema)
@@ -40,11 +122,20 @@ class AutomationEngine:
 
         return manifest
 
-    def run(self, script_dir: Path, inputs: Dict[str, Any]) -> Dict[str, Any]:
-        manifest = self.validate_script(script_dir)
+    def _prepare(
+        self, script_dir: Path, inputs: Dict[str, Any], trace: RunTrace | None = None
+    ) -> _PreparedRun | Dict[str, Any]:
+        """Validate and resolve everything a run needs; returns an envelope on early rejection."""
+        trace = trace or RunTrace(None)
+        with trace.span("manifest.validate"):
+            manifest = self.validate_script(script_dir)
+        trace.annotate(script_id=manifest["id"], script_version=manifest["version"])
         execution_inputs = {k: v for k, v in inputs.items() if k not in FRAMEWORK_INPUT_KEYS}
 
-        security_decision = evaluate_security_gate(manifest=manifest, inputs=inputs)
+        with trace.span("security_gate") as span:
+            security_decision = evaluate_security_gate(manifest=manifest, inputs=inputs)
+            if span is not None:
+                span.attributes.update(risky=security_decision.risky, allowed=security_decision.allowed)
         if not security_decision.allowed:
             return {
                 "ok": False,
@@ -55,66 +146,84 @@ class AutomationEngine:
             }
 
         input_schema_path = script_dir / manifest["inputs_schema"]
-        output_schema_path = script_dir / manifest["outputs_schema"]
-        validate_inputs(execution_inputs, input_schema_path)
+        with trace.span("inputs.validate"):
+            validate_inputs(execution_inputs, input_schema_path)
 
         runner_path = script_dir / manifest["entrypoint"]
-        module = self._load_runner_module(runner_path)
-        if not hasattr(module, "run"):
-            raise AttributeError(f"runner has no run(context, inputs): {runner_path}")
+        module = None
+        if manifest.get("execution_mode") != "process":
+            # Process-mode runners are only ever imported inside pool workers.
+            with trace.span("module.load"):
+                module = self._load_runner_module(runner_path)
+            if not hasattr(module, "run"):
+                raise AttributeError(f"runner has no run(context, inputs): {runner_path}")
 
         credential_refs = (
             execution_inputs.get("credential_refs")
             if isinstance(execution_inputs.get("credential_refs"), dict)
             else {}
         )
-        resolution = resolve_credential_refs(credential_refs)
+        # Looked up only if the runner reads its credentials (or unresolved refs).
+        resolution = DeferredCredentialResolution(
+            credential_refs, observe=lambda: trace.span("credentials.resolve", refs=len(credential_refs))
+        )
 
+        cancel_event = threading.Event()
         context = {
             "script_id": manifest["id"],
             "script_version": manifest["version"],
             "script_dir": str(script_dir),
             "credentials": resolution.resolved,
             "unresolved_credential_refs": resolution.unresolved,
+            # Set when the engine gives up on the run (timeout or cancellation);
+            # long-running runners should poll it and stop early.
+            "cancel_event": cancel_event,
+            # Runner sub-phase spans: telemetry.phase(context, "login").
+            "telemetry": RunPhases(trace),
         }
+        return _PreparedRun(
+            script_dir=script_dir,
+            manifest=manifest,
+            inputs=inputs,
+            execution_inputs=execution_inputs,
+            runner_path=runner_path,
+            module=module,
+            context=context,
+            cancel_event=cancel_event,
+            credential_refs=credential_refs,
+            resolution=resolution,
+            security_decision=security_decision,
+            trace=trace,
+        )
 
-        timeout_seconds = int(os.getenv("OPENCLAW_RUNNER_TIMEOUT_SECONDS", "600"))
-        try:
-            with ThreadPoolExecutor(max_workers=1) as executor:
-                future = executor.submit(module.run, context, execution_inputs)
-                result = future.result(timeout=timeout_seconds)
-        except FutureTimeoutError:
-            return {
-                "ok": False,
-                "script_id": manifest["id"],
-                "script_version": manifest["version"],
-                "error": f"Runner exceeded timeout ({timeout_seconds}s)",
-            }
-        except Exception as exc:  # noqa: BLE001
-            return {
-                "ok": False,
-                "script_id": manifest["id"],
-                "script_version": manifest["version"],
-                "error": str(exc),
-            }
+    def _error(self, prepared: _PreparedRun, message: str) -> Dict[str, Any]:
+        return {
+            "ok": False,
+            "script_id": prepared.manifest["id"],
+            "script_version": prepared.manifest["version"],
+            "error": message,
+        }
 
+    def _abandon(self, prepared: _PreparedRun, future: Future, timeout_seconds: int) -> Dict[str, Any]:
+        prepared.cancel_event.set()
+        if future.cancel():
+            return self._error(
+                prepared,
+                f"Runner did not start within timeout ({timeout_seconds}s); engine executor is saturated",
+            )
+        return self._error(prepared, f"Runner exceeded timeout ({timeout_seconds}s)")
+
+    def _finish(self, prepared: _PreparedRun, result: Any) -> Dict[str, Any]:
+        manifest = prepared.manifest
         if not isinstance(result, dict):
-            return {
-                "ok": False,
-                "script_id": manifest["id"],
-                "script_version": manifest["version"],
-                "error": f"runner result must be a dict, got {type(result).__name__}",
-            }
+            return self._error(prepared, f"runner result must be a dict, got {type(result).__name__}")
 
+        output_schema_path = prepared.script_dir / manifest["outputs_schema"]
         try:
-            validate_output(result, output_schema_path)
+            with prepared.trace.span("output.validate"):
+                validate_output(result, output_schema_path)
         except Exception as exc:  # noqa: BLE001
-            return {
-                "ok": False,
-                "script_id": manifest["id"],
-                "script_version": manifest["version"],
-                "error": f"output schema validation failed: {exc}",
-            }
+            return self._error(prepared, f"output schema validation failed: {exc}")
 
         mode = str(result.get("mode", "live"))
         real_data = bool(result.get("real_data", mode != "placeholder"))
@@ -126,13 +235,9 @@ class AutomationEngine:
             "mode": mode,
             "real_data": real_data,
             "placeholder": mode == "placeholder",
-            "inputs": inputs,
-            "security_gate": security_decision.as_dict(),
-            "credential_status": {
-                "requested_refs": redacted_keys(credential_refs),
-                "resolved_keys": sorted(resolution.resolved.keys()),
-                "unresolved_refs": resolution.unresolved,
-            },
+            "inputs": prepared.inputs,
+            "security_gate": prepared.security_decision.as_dict(),
+            "credential_status": self._credential_status(prepared),
             "warnings": (
                 ["Runner returned placeholder data; BrowserAgent/live integration is not active."]
                 if mode == "placeholder"
@@ -140,8 +245,254 @@ class AutomationEngine:
             ),
             "result": result,
         }
+        if manifest["id"].endswith(".award_search") and _award_store_enabled():
+            try:
+                with prepared.trace.span("award_store.record"):
+                    shared_award_store().record_envelope(envelope)
+            except Exception as exc:  # noqa: BLE001
+                envelope["warnings"].append(f"award store write failed: {exc}")
         return envelope
 
+    def _credential_status(self, prepared: _PreparedRun) -> Dict[str, Any]:
+        resolution = prepared.resolution
+        # Whether the runner read credentials; the status below always covers
+        # every declared ref, looking them up now (after the run) if it did not.
+        looked_up = resolution.looked_up
+        result = resolution.result()
+        return {
+            "requested_refs": redacted_keys(prepared.credential_refs),
+            "looked_up": looked_up,
+            "resolved_keys": sorted(result.resolved.keys()),
+            "unresolved_refs": dict(result.unresolved),
+        }
+
+    def _run_in_process(self, prepared: _PreparedRun, timeout_seconds: int) -> Any:
+        # The cancel event stays in this process; the pool watches it instead.
+        context = {k: v for k, v in prepared.context.items() if k != "cancel_event"}
+        with prepared.trace.span("runner.run", execution_mode="process"):
+            return self.process_pool.run(
+                prepared.runner_path,
+                context,
+                prepared.execution_inputs,
+                timeout_seconds,
+                cancel_event=prepared.cancel_event,
+            )
+
+    def _run_module(self, prepared: _PreparedRun) -> Any:
+        with prepared.trace.span("runner.run", execution_mode="thread") as span:
+            if span is not None:
+                prepared.trace.runner_span_id = span.span_id
+            return prepared.module.run(prepared.context, prepared.execution_inputs)
+
+    def _submit(self, prepared: _PreparedRun, timeout_seconds: int) -> Tuple[Future, int]:
+        """Start the runner; returns its future and how long to wait for it."""
+        if prepared.manifest.get("execution_mode") == "process":
+            future = self.executor.submit(self._run_in_process, prepared, timeout_seconds)
+            return future, timeout_seconds + _PROCESS_KILL_GRACE_SECONDS
+        future = self.executor.submit(self._run_module, prepared)
+        return future, timeout_seconds
+
+    def _run_key(self, prepared: _PreparedRun) -> str:
+        return cache_key(prepared.manifest, prepared.execution_inputs)
+
+    def _rebind(self, prepared: _PreparedRun, envelope: Dict[str, Any]) -> Dict[str, Any]:
+        """Point a shared envelope at this caller's inputs and gate decision."""
+        if envelope.get("ok"):
+            envelope["inputs"] = prepared.inputs
+            envelope["security_gate"] = prepared.security_decision.as_dict()
+        return envelope
+
+    def _cache_lookup(self, prepared: _PreparedRun, key: str) -> Dict[str, Any] | None:
+        """Return the cached envelope for ``key``, if the manifest opts in.
+
+        Runs after the security gate and input validation, so a cache hit
+        never skips them. The first stale hit starts a background refresh.
+        """
+        policy = cache_policy(prepared.manifest)
+        cache = self.result_cache
+        if policy is None or cache is None:
+            return None
+        envelope, _state, refresh = cache.get(key)
+        if envelope is None:
+            return None
+        prepared.trace.annotate(cache_hit=True)
+        if refresh:
+            self._revalidate(prepared, cache, key, policy)
+        return self._rebind(prepared, envelope)
+
+    def _cache_store(self, prepared: _PreparedRun, key: str, envelope: Dict[str, Any]) -> None:
+        cache = self.result_cache
+        policy = cache_policy(prepared.manifest)
+        if cache is not None and policy is not None:
+            cache.put(key, envelope, *policy)
+
+    def _revalidate(self, prepared: _PreparedRun, cache: ResultCache, key: str, policy: Tuple[float, float]) -> None:
+        future, _wait_seconds = self._submit(prepared, _runner_timeout_seconds())
+
+        def _done(done: Future) -> None:
+            try:
+                envelope = self._finish(prepared, done.result())
+            except Exception:  # noqa: BLE001
+                envelope = None
+            if envelope is not None and cacheable(envelope):
+                cache.put(key, envelope, *policy)
+            else:
+                cache.refresh_failed(key)
+
+        future.add_done_callback(_done)
+
+    def _flights_for(self, prepared: _PreparedRun) -> SingleFlight | None:
+        """Coalescer for this run; state-changing scripts are never coalesced."""
+        security = prepared.manifest.get("security")
+        if isinstance(security, dict) and security.get("state_changing"):
+            return None
+        return self.single_flight
+
+    def _joined(self, prepared: _PreparedRun, shared: Dict[str, Any]) -> Dict[str, Any]:
+        prepared.trace.annotate(coalesced=True)
+        envelope = self._rebind(prepared, copy.deepcopy(shared))
+        envelope["coalesced"] = True
+        return envelope
+
+    @staticmethod
+    def _flight_error(exc: BaseException) -> Exception:
+        if isinstance(exc, Exception):
+            return exc
+        return RuntimeError(f"identical in-flight run was aborted: {exc!r}")
+
+    def _execute(self, prepared: _PreparedRun, key: str) -> Dict[str, Any]:
+        timeout_seconds = _runner_timeout_seconds()
+        future, wait_seconds = self._submit(prepared, timeout_seconds)
+        try:
+            result = future.result(timeout=wait_seconds)
+        except FutureTimeoutError:
+            return self._abandon(prepared, future, timeout_seconds)
+        except Exception as exc:  # noqa: BLE001
+            return self._error(prepared, str(exc))
+        envelope = self._finish(prepared, result)
+        self._cache_store(prepared, key, envelope)
+        return envelope
+
+    async def _aexecute(self, prepared: _PreparedRun, key: str) -> Dict[str, Any]:
+        timeout_seconds = _runner_timeout_seconds()
+        future, wait_seconds = self._submit(prepared, timeout_seconds)
+        try:
+            result = await asyncio.wait_for(asyncio.shield(asyncio.wrap_future(future)), wait_seconds)
+        except asyncio.TimeoutError:
+            return self._abandon(prepared, future, timeout_seconds)
+        except asyncio.CancelledError:
+            prepared.cancel_event.set()
+            future.cancel()
+            raise
+        except Exception as exc:  # noqa: BLE001
+            return self._error(prepared, str(exc))
+        envelope = self._finish(prepared, result)
+        self._cache_store(prepared, key, envelope)
+        return envelope
+
+    def _start_trace(self, script_dir: Path) -> RunTrace:
+        return RunTrace(self.telemetry, script_dir=str(script_dir))
+
+    def run(self, script_dir: Path, inputs: Dict[str, Any]) -> Dict[str, Any]:
+        trace = self._start_trace(script_dir)
+        try:
+            envelope = self._run(trace, script_dir, inputs)
+        except BaseException as exc:
+            trace.finish(error=exc)
+            raise
+        trace.finish(envelope)
+        return envelope
+
+    def _run(self, trace: RunTrace, script_dir: Path, inputs: Dict[str, Any]) -> Dict[str, Any]:
+        prepared = self._prepare(script_dir, inputs, trace)
+        if isinstance(prepared, dict):
+            return prepared
+        key = self._run_key(prepared)
+        cached = self._cache_lookup(prepared, key)
+        if cached is not None:
+            return cached
+
+        flights = self._flights_for(prepared)
+        if flights is None:
+            return self._execute(prepared, key)
+        flight, leader = flights.begin(key)
+        if not leader:
+            try:
+                shared = flight.result(timeout=_runner_timeout_seconds() + _PROCESS_KILL_GRACE_SECONDS)
+            except FutureTimeoutError:
+                return self._error(prepared, "Timed out waiting for an identical in-flight run")
+            except Exception as exc:  # noqa: BLE001
+                return self._error(prepared, str(exc))
+            return self._joined(prepared, shared)
+
+        envelope: Dict[str, Any] | None = None
+        error: BaseException | None = None
+        try:
+            envelope = self._execute(prepared, key)
+            return envelope
+        except BaseException as exc:
+            error = self._flight_error(exc)
+            raise
+        finally:
+            flights.finish(key, flight, envelope, error)
+
+    async def arun(self, script_dir: Path, inputs: Dict[str, Any]) -> Dict[str, Any]:
+        """Async counterpart of run() for running many automations from one event loop.
+
+        Preparation runs off the loop; the runner itself runs on the engine's
+        shared executor. On timeout or task cancellation the run's
+        ``cancel_event`` is set and a not-yet-started runner is dropped from
+        the executor queue; cancellation is then re-raised to the caller.
+        A cancelled caller that had joined an identical in-flight run leaves
+        that run going for the other callers.
+        """
+        trace = self._start_trace(script_dir)
+        try:
+            envelope = await self._arun(trace, script_dir, inputs)
+        except BaseException as exc:
+            trace.finish(error=exc)
+            raise
+        trace.finish(envelope)
+        return envelope
+
+    async def _arun(self, trace: RunTrace, script_dir: Path, inputs: Dict[str, Any]) -> Dict[str, Any]:
+        prepared = await asyncio.to_thread(self._prepare, script_dir, inputs, trace)
+        if isinstance(prepared, dict):
+            return prepared
+        key = self._run_key(prepared)
+        cached = self._cache_lookup(prepared, key)
+        if cached is not None:
+            return cached
+
+        flights = self._flights_for(prepared)
+        if flights is None:
+            return await self._aexecute(prepared, key)
+        flight, leader = flights.begin(key)
+        if not leader:
+            try:
+                shared = await asyncio.wait_for(
+                    asyncio.shield(asyncio.wrap_future(flight)),
+                    _runner_timeout_seconds() + _PROCESS_KILL_GRACE_SECONDS,
+                )
+            except asyncio.TimeoutError:
+                return self._error(prepared, "Timed out waiting for an identical in-flight run")
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:  # noqa: BLE001
+                return self._error(prepared, str(exc))
+            return self._joined(prepared, shared)
+
+        envelope: Dict[str, Any] | None = None
+        error: BaseException | None = None
+        try:
+            envelope = await self._aexecute(prepared, key)
+            return envelope
+        except BaseException as exc:
+            error = self._flight_error(exc)
+            raise
+        finally:
+            flights.finish(key, flight, envelope, error)
+
 
 def pretty_json(data: Dict[str, Any]) -> str:
     return json.dumps(data, indent=2, sort_keys=True)
@@ -0,0 +1,158 @@
+"""Fan multi-destination award searches out across pooled browser pages.
+
+Award runners receive ``inputs["to"]`` as a list, but one Playwright search
+covers one route and one departure date. ``split_searches`` turns a request
+into one ``SubSearch`` per (destination, days_ahead) pair, ``fan_out`` runs
+them concurrently -- each on its own browser-pool slot, i.e. its own tab
+in the signed-in browser -- and ``merge_matches`` folds the per-search
+match lists back into one.
+
+Concurrency is capped per site by a process-wide set of slot ids, so two
+runs for the same airline share the limit instead of doubling it. Sites
+that throttle rapid searches default to fewer slots than the rest.
+"""
+from __future__ import annotations
+
+import os
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, List, Sequence, Tuple
+
+from .cancellation import POLL_SECONDS
+
+DEFAULT_MAX_CONCURRENCY = 4
+
+# Sites that start challenging (CAPTCHA / "unusual activity") when several
+# searches land at once.
+SITE_CONCURRENCY: Dict[str, int] = {
+    "singaporeair.com": 2,
+}
+
+
+@dataclass(frozen=True)
+class SubSearch:
+    destination: str
+    days_ahead: int
+    inputs: Dict[str, Any]
+
+
+@dataclass
+class SubResult:
+    search: SubSearch
+    slot: int
+    value: Any = None
+    error: str | None = None
+    seconds: float = 0.0
+
+
+def _env_overrides() -> Dict[str, int]:
+    overrides: Dict[str, int] = {}
+    for item in os.getenv("OPENCLAW_FANOUT_SITE_CONCURRENCY", "").split(","):
+        site, _, limit = item.partition("=")
+        if site.strip() and limit.strip().isdigit():
+            overrides[site.strip().lower()] = int(limit)
+    return overrides
+
+
+def site_concurrency(site: str) -> int:
+    """Max concurrent sub-searches for ``site`` in this process."""
+    site = site.lower()
+    overrides = _env_overrides()
+    if site in overrides:
+        return max(1, overrides[site])
+    default = int(os.getenv("OPENCLAW_FANOUT_MAX_CONCURRENCY", str(DEFAULT_MAX_CONCURRENCY)))
+    return max(1, min(SITE_CONCURRENCY.get(site, default), default))
+
+
+_SITE_SLOTS: Dict[str, "queue.Queue[int]"] = {}
+_SITE_SLOTS_LOCK = threading.Lock()
+
+
+def _site_slots(site: str) -> "queue.Queue[int]":
+    with _SITE_SLOTS_LOCK:
+        slots = _SITE_SLOTS.get(site)
+        if slots is None:
+            slots = queue.Queue()
+            for slot in range(site_concurrency(site)):
+                slots.put(slot)
+            _SITE_SLOTS[site] = slots
+        return slots
+
+
+def split_searches(inputs: Dict[str, Any], *, days_ahead: Sequence[int] | None = None) -> List[SubSearch]:
+    """One sub-search per destination and departure offset, in input order."""
+    destinations = list(dict.fromkeys(str(d) for d in inputs["to"]))
+    offsets = list(dict.fromkeys(int(d) for d in (days_ahead or [inputs["days_ahead"]])))
+    searches = []
+    for dest in destinations:
+        for offset in offsets:
+            sub_inputs = dict(inputs)
+            sub_inputs["to"] = [dest]
+            sub_inputs["days_ahead"] = offset
+            searches.append(SubSearch(destination=dest, days_ahead=offset, inputs=sub_inputs))
+    return searches
+
+
+def fan_out(
+    search_fn: Callable[[SubSearch, int], Any],
+    searches: Sequence[SubSearch],
+    *,
+    site: str,
+    max_concurrency: int | None = None,
+    cancel_event: threading.Event | None = None,
+) -> List[SubResult]:
+    """Run ``search_fn(sub_search, slot)`` for every search; results keep input order.
+
+    ``slot`` is the browser-pool slot reserved for the call. A failing
+    sub-search is reported in its ``SubResult.error`` and does not cancel
+    the others. Once ``cancel_event`` is set, searches that have not started
+    are skipped with the error "cancelled".
+    """
+    if not searches:
+        return []
+    slots = _site_slots(site.lower())
+
+    def _one(search: SubSearch) -> SubResult:
+        while True:
+            if cancel_event is not None and cancel_event.is_set():
+                return SubResult(search, -1, error="cancelled")
+            try:
+                slot = slots.get(timeout=POLL_SECONDS if cancel_event is not None else None)
+                break
+            except queue.Empty:
+                continue
+        started = time.monotonic()
+        try:
+            value = search_fn(search, slot)
+        except Exception as exc:  # noqa: BLE001
+            return SubResult(search, slot, error=str(exc), seconds=time.monotonic() - started)
+        finally:
+            slots.put(slot)
+        return SubResult(search, slot, value=value, seconds=time.monotonic() - started)
+
+    workers = min(len(searches), site_concurrency(site), max_concurrency or len(searches))
+    if workers <= 1:
+        return [_one(search) for search in searches]
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix=f"openclaw-fanout-{site}") as pool:
+        return list(pool.map(_one, searches))
+
+
+def _match_key(match: Dict[str, Any]) -> Tuple[Any, ...]:
+    return (match.get("route"), match.get("date"), match.get("cabin"), match.get("miles"), match.get("notes"))
+
+
+def merge_matches(match_lists: Iterable[List[Dict[str, Any]]]) -> List[Dict[str, Any]]:
+    """Concatenate per-search matches in search order, dropping duplicates."""
+    merged: List[Dict[str, Any]] = []
+    seen = set()
+    for matches in match_lists:
+        for match in matches:
+            key = _match_key(match)
+            if key in seen:
+                continue
+            seen.add(key)
+            merged.append(match)
+    return merged
@@ -0,0 +1,248 @@
+"""Google Calendar/Gmail reads for workspace scripts, in as few round-trips as possible.
+
+- One pooled ``requests.Session`` per process (keep-alive across accounts)
+- Gmail message metadata for a whole listing in one batch HTTP request
+  (``BATCH_LIMIT`` per batch) instead of one GET per message, falling back
+  to bounded concurrent GETs if the batch endpoint fails
+- ``fields`` filters so responses carry only what the brief shows
+- ``for_accounts`` runs a per-account fetch for every account in parallel
+"""
+from __future__ import annotations
+
+import json
+import os
+import re
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Sequence, Tuple, TypeVar
+from urllib.parse import quote, urlencode
+
+import requests
+from requests.adapters import HTTPAdapter
+
+GMAIL_API = "https://gmail.googleapis.com/gmail/v1/users/me"
+GMAIL_BATCH_URL = "https://gmail.googleapis.com/batch/gmail/v1"
+CALENDAR_API = "https://www.googleapis.com/calendar/v3"
+BATCH_LIMIT = 50
+DEFAULT_TIMEOUT = 20
+METADATA_HEADERS = ("Subject", "From", "Date")
+
+T = TypeVar("T")
+
+
+def bearer_headers(access_token: str) -> Dict[str, str]:
+    return {
+        "Authorization": f"Bearer {access_token}",
+        "Accept": "application/json",
+        "User-Agent": "OpenClawAutomationKit/0.1",
+    }
+
+
+_SESSION: requests.Session | None = None
+_SESSION_LOCK = threading.Lock()
+
+
+def shared_session() -> requests.Session:
+    """Process-wide session whose pool is sized by ``OPENCLAW_GOOGLE_MAX_CONCURRENCY``."""
+    global _SESSION
+    with _SESSION_LOCK:
+        if _SESSION is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=4, pool_maxsize=max_concurrency())
+            session.mount("https://", adapter)
+            _SESSION = session
+        return _SESSION
+
+
+def max_concurrency() -> int:
+    return max(1, int(os.getenv("OPENCLAW_GOOGLE_MAX_CONCURRENCY", "8")))
+
+
+# ── Calendar ─────────────────────────────────────────────────────────
+
+
+def list_events(
+    access_token: str,
+    calendar_id: str,
+    time_min: str,
+    time_max: str,
+    max_results: int,
+    *,
+    session: requests.Session | None = None,
+) -> List[Dict[str, Any]]:
+    resp = (session or shared_session()).get(
+        f"{CALENDAR_API}/calendars/{quote(calendar_id, safe='')}/events",
+        headers=bearer_headers(access_token),
+        params={
+            "timeMin": time_min,
+            "timeMax": time_max,
+            "singleEvents": "true",
+            "orderBy": "startTime",
+            "maxResults": str(max_results),
+            "fields": "items(start,end,summary,location)",
+        },
+        timeout=DEFAULT_TIMEOUT,
+    )
+    if resp.status_code >= 400:
+        raise RuntimeError(f"Google Calendar API failed: HTTP {resp.status_code}")
+    return list(resp.json().get("items", []))
+
+
+# ── Gmail ────────────────────────────────────────────────────────────
+
+
+def list_message_ids(
+    access_token: str, max_results: int, query: str, *, session: requests.Session | None = None
+) -> List[str]:
+    resp = (session or shared_session()).get(
+        f"{GMAIL_API}/messages",
+        headers=bearer_headers(access_token),
+        params={"maxResults": str(max_results), "q": query, "fields": "messages/id"},
+        timeout=DEFAULT_TIMEOUT,
+    )
+    if resp.status_code >= 400:
+        raise RuntimeError(f"Gmail API list failed: HTTP {resp.status_code}")
+    return [str(m["id"]) for m in resp.json().get("messages", []) if m.get("id")]
+
+
+def _metadata_query(headers: Sequence[str]) -> List[Tuple[str, str]]:
+    return (
+        [("format", "metadata")]
+        + [("metadataHeaders", h) for h in headers]
+        + [("fields", "id,snippet,payload/headers")]
+    )
+
+
+def build_batch_body(paths: Sequence[str], boundary: str) -> str:
+    """multipart/mixed body with one ``application/http`` GET per path.
+
+    Each embedded request ends with a blank line, as in Google's batch format;
+    the CRLF before the next ``--boundary`` belongs to the delimiter, not to it.
+    """
+    parts = [
+        f"--{boundary}\r\nContent-Type: application/http\r\nContent-ID: <item{i}>\r\n\r\n"
+        f"GET {path} HTTP/1.1\r\n\r\n\r\n"
+        for i, path in enumerate(paths)
+    ]
+    return "".join(parts) + f"--{boundary}--\r\n"
+
+
+def _split_head(text: str) -> Tuple[str, str]:
+    """Split a header block from what follows the first blank line."""
+    pieces = re.split(r"\r?\n\r?\n", text, maxsplit=1)
+    return pieces[0], pieces[1] if len(pieces) > 1 else ""
+
+
+def parse_batch_response(content_type: str, body: str) -> Dict[int, Tuple[int, Any]]:
+    """Map each part's ``<response-itemN>`` index to ``(status, parsed JSON or None)``."""
+    match = re.search(r'boundary="?([^";]+)"?', content_type)
+    if not match:
+        raise ValueError("Batch response has no multipart boundary")
+    out: Dict[int, Tuple[int, Any]] = {}
+    for part in body.split(f"--{match.group(1)}"):
+        part = part.strip("\r\n")
+        if not part or part == "--":
+            continue
+        part_headers, http_response = _split_head(part)
+        cid = re.search(r"Content-ID:\s*<response-item(\d+)>", part_headers, flags=re.IGNORECASE)
+        status_line = re.match(r"HTTP/[\d.]+\s+(\d{3})", http_response)
+        if not cid or not status_line:
+            continue
+        payload_text = _split_head(http_response)[1]
+        try:
+            payload = json.loads(payload_text) if payload_text.strip() else None
+        except ValueError:
+            payload = None
+        out[int(cid.group(1))] = (int(status_line.group(1)), payload)
+    return out
+
+
+def _batch_get(
+    session: requests.Session, access_token: str, paths: Sequence[str]
+) -> Dict[int, Tuple[int, Any]]:
+    boundary = f"batch_{uuid.uuid4().hex}"
+    resp = session.post(
+        GMAIL_BATCH_URL,
+        # Outer headers (Authorization) apply to every request in the batch.
+        headers={**bearer_headers(access_token), "Content-Type": f"multipart/mixed; boundary={boundary}"},
+        data=build_batch_body(paths, boundary).encode("utf-8"),
+        timeout=DEFAULT_TIMEOUT * 2,
+    )
+    if resp.status_code >= 400:
+        raise RuntimeError(f"Gmail batch failed: HTTP {resp.status_code}")
+    return parse_batch_response(resp.headers.get("Content-Type", ""), resp.text)
+
+
+def get_messages_metadata(
+    access_token: str,
+    message_ids: Sequence[str],
+    headers: Sequence[str] = METADATA_HEADERS,
+    *,
+    session: requests.Session | None = None,
+) -> List[Dict[str, Any]]:
+    """Metadata for ``message_ids`` in listing order; messages that fail are skipped."""
+    session = session or shared_session()
+    query = urlencode(_metadata_query(headers))
+    found: Dict[str, Dict[str, Any]] = {}
+    for start in range(0, len(message_ids), BATCH_LIMIT):
+        chunk = list(message_ids[start:start + BATCH_LIMIT])
+        paths = [f"/gmail/v1/users/me/messages/{msg_id}?{query}" for msg_id in chunk]
+        try:
+            parts = _batch_get(session, access_token, paths)
+        except (requests.RequestException, RuntimeError, ValueError):
+            parts = {}
+        missing = []
+        for i, msg_id in enumerate(chunk):
+            status, payload = parts.get(i, (0, None))
+            if status == 200 and isinstance(payload, dict):
+                found[msg_id] = payload
+            elif status == 0 or status == 429 or status >= 500:
+                missing.append(msg_id)
+        # Parts the batch did not answer (or a failed batch) fall back to direct GETs.
+        for msg_id, payload in zip(missing, _get_each(session, access_token, missing, headers)):
+            if payload is not None:
+                found[msg_id] = payload
+    return [found[msg_id] for msg_id in message_ids if msg_id in found]
+
+
+def _get_each(
+    session: requests.Session, access_token: str, message_ids: Sequence[str], headers: Sequence[str]
+) -> List[Dict[str, Any] | None]:
+    def _get(msg_id: str) -> Dict[str, Any] | None:
+        try:
+            resp = session.get(
+                f"{GMAIL_API}/messages/{msg_id}",
+                headers=bearer_headers(access_token),
+                params=_metadata_query(headers),
+                timeout=DEFAULT_TIMEOUT,
+            )
+        except requests.RequestException:
+            return None
+        return resp.json() if resp.status_code < 400 else None
+
+    if not message_ids:
+        return []
+    with ThreadPoolExecutor(max_workers=min(max_concurrency(), len(message_ids))) as pool:
+        return list(pool.map(_get, message_ids))
+
+
+# ── Accounts ─────────────────────────────────────────────────────────
+
+
+def for_accounts(
+    accounts: Sequence[str], fetch: Callable[[str], T], max_workers: int | None = None
+) -> Dict[str, T | BaseException]:
+    """Run ``fetch(account)`` for all accounts at once; exceptions are returned, not raised."""
+    if not accounts:
+        return {}
+
+    def _one(account: str) -> T | BaseException:
+        try:
+            return fetch(account)
+        except Exception as exc:  # noqa: BLE001
+            return exc
+
+    workers = max_workers or min(max_concurrency(), len(accounts))
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        return dict(zip(accounts, pool.map(_one, accounts)))
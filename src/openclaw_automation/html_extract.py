@@ -0,0 +1,206 @@
+"""Single-pass HTML extraction for public page scripts.
+
+``PageExtractor`` is an ``html.parser`` subclass that builds the title,
+whitespace-collapsed visible text (script/style skipped), h1-h3 headlines
+in document order and keyword counts while the page is fed in chunks.
+Memory is bounded: visible text is kept up to ``max_text_chars`` while
+keyword counting continues over the whole page.
+
+``extract`` drives an extractor from a string or an iterable of text chunks
+(such as ``iter_text``, which streams from ``http_fetch``) and stops reading
+as soon as the extractor reports ``done``.
+"""
+from __future__ import annotations
+
+import codecs
+import re
+from html.parser import HTMLParser
+from typing import Dict, Iterable, Iterator, List, Sequence
+
+from .http_fetch import HttpFetcher, response_charset, shared_fetcher
+
+HEADING_TAGS = frozenset({"h1", "h2", "h3"})
+SKIP_TAGS = frozenset({"script", "style"})
+_WS = re.compile(r"\s+")
+
+
+class PageExtractor(HTMLParser):
+    def __init__(
+        self,
+        *,
+        keywords: Sequence[str] = (),
+        case_sensitive: bool = False,
+        max_headlines: int = 8,
+        min_headline_chars: int = 4,
+        max_text_chars: int = 200_000,
+        stop_after_headlines: bool = False,
+    ) -> None:
+        super().__init__(convert_charrefs=True)
+        self.case_sensitive = case_sensitive
+        self.max_headlines = max_headlines
+        self.min_headline_chars = min_headline_chars
+        self.max_text_chars = max_text_chars
+        self.stop_after_headlines = stop_after_headlines
+        self.title = ""
+        self.headlines: List[str] = []
+        self.text_truncated = False
+        self._keywords = [k for k in dict.fromkeys(keywords) if k]
+        self._counts: Dict[str, int] = {k: 0 for k in self._keywords}
+        self._carry: Dict[str, str] = {k: "" for k in self._keywords}
+        self._text: List[str] = []
+        self._text_len = 0
+        self._last_space = True
+        self._skip_depth = 0
+        self._in_title = False
+        self._title_parts: List[str] = []
+        self._heading: str | None = None
+        self._heading_parts: List[str] = []
+
+    # ── parser callbacks ─────────────────────────────────────────────
+
+    def handle_starttag(self, tag: str, attrs) -> None:
+        if tag in SKIP_TAGS:
+            self._skip_depth += 1
+            return
+        if tag == "title" and not self.title:
+            self._in_title = True
+        elif tag in HEADING_TAGS and self._heading is None:
+            self._heading = tag
+            self._heading_parts = []
+        elif self._heading is not None:
+            self._heading_parts.append(" ")
+        self._emit(" ")
+
+    def handle_endtag(self, tag: str) -> None:
+        if tag in SKIP_TAGS:
+            self._skip_depth = max(0, self._skip_depth - 1)
+            return
+        if tag == "title" and self._in_title:
+            self._in_title = False
+            self.title = _collapse("".join(self._title_parts))
+        elif tag == self._heading:
+            self._add_headline(_collapse("".join(self._heading_parts)))
+            self._heading = None
+        elif self._heading is not None:
+            self._heading_parts.append(" ")
+        self._emit(" ")
+
+    def handle_data(self, data: str) -> None:
+        if self._skip_depth:
+            return
+        if self._in_title:
+            self._title_parts.append(data)
+        if self._heading is not None:
+            self._heading_parts.append(data)
+        self._emit(data)
+
+    # ── state ────────────────────────────────────────────────────────
+
+    def _add_headline(self, text: str) -> None:
+        if len(text) < self.min_headline_chars or text in self.headlines:
+            return
+        if len(self.headlines) < self.max_headlines:
+            self.headlines.append(text)
+
+    def _emit(self, data: str) -> None:
+        piece = _WS.sub(" ", data)
+        if self._last_space and piece.startswith(" "):
+            piece = piece[1:]
+        if not piece:
+            return
+        self._last_space = piece.endswith(" ")
+        self._count(piece)
+        room = self.max_text_chars - self._text_len
+        if room <= 0:
+            self.text_truncated = self.text_truncated or bool(piece.strip())
+            return
+        if len(piece) > room:
+            piece = piece[:room]
+            self.text_truncated = True
+        self._text.append(piece)
+        self._text_len += len(piece)
+
+    def _count(self, piece: str) -> None:
+        if not self._keywords:
+            return
+        folded = piece if self.case_sensitive else piece.lower()
+        for keyword in self._keywords:
+            needle = keyword if self.case_sensitive else keyword.lower()
+            # Carry the tail of the previous piece so matches spanning chunks count once.
+            window = self._carry[keyword] + folded
+            start = 0
+            while (index := window.find(needle, start)) != -1:
+                self._counts[keyword] += 1
+                start = index + len(needle)
+            self._carry[keyword] = window[max(start, len(window) - len(needle) + 1):]
+
+    @property
+    def done(self) -> bool:
+        return self.stop_after_headlines and len(self.headlines) >= self.max_headlines
+
+    @property
+    def text(self) -> str:
+        return "".join(self._text).strip()
+
+    @property
+    def keyword_counts(self) -> Dict[str, int]:
+        return dict(self._counts)
+
+    def highlights(self, keyword: str, max_items: int = 3) -> List[str]:
+        """Sentences of the kept text that mention ``keyword``."""
+        key = keyword.lower()
+        out: List[str] = []
+        for piece in re.split(r"(?<=[.!?])\s+", self.text):
+            if key in piece.lower():
+                out.append(piece.strip())
+            if len(out) >= max_items:
+                break
+        return out
+
+
+def _collapse(text: str) -> str:
+    return _WS.sub(" ", text).strip()
+
+
+def iter_text(
+    url: str,
+    *,
+    fetcher: HttpFetcher | None = None,
+    headers: Dict[str, str] | None = None,
+    chunk_size: int = 64 * 1024,
+) -> Iterator[str]:
+    """Stream ``url`` as decoded text chunks; closing the generator closes the response."""
+    with (fetcher or shared_fetcher()).open(url, headers=headers) as stream:
+        decoder = codecs.getincrementaldecoder(_codec(response_charset(stream.headers)))(errors="ignore")
+        for chunk in stream.iter_bytes(chunk_size):
+            text = decoder.decode(chunk)
+            if text:
+                yield text
+        tail = decoder.decode(b"", final=True)
+        if tail:
+            yield tail
+
+
+def _codec(charset: str) -> str:
+    try:
+        return codecs.lookup(charset).name
+    except LookupError:
+        return "utf-8"
+
+
+def extract(source: str | Iterable[str], **options) -> PageExtractor:
+    """Feed ``source`` through a ``PageExtractor(**options)``, stopping early once it is done."""
+    parser = PageExtractor(**options)
+    chunks = [source] if isinstance(source, str) else source
+    try:
+        for chunk in chunks:
+            parser.feed(chunk)
+            if parser.done:
+                break
+        else:
+            parser.close()
+    finally:
+        close = getattr(chunks, "close", None)
+        if close is not None:
+            close()
+    return parser
@@ -0,0 +1,466 @@
+"""Pooled HTTP GET for public page scripts.
+
+``HttpFetcher`` keeps HTTP/1.1 keep-alive connections per (scheme, host,
+port), asks for compressed bodies (gzip/deflate, plus brotli when the
+``brotli`` module is installed), and bounds concurrent requests per host.
+With a cache directory, responses carrying ``ETag``/``Last-Modified`` are
+stored on disk and revalidated with conditional requests; a ``304`` returns
+the cached body. Proxies from the environment (``HTTPS_PROXY`` etc.) are
+honoured like ``urllib.request.urlopen``.
+"""
+from __future__ import annotations
+
+import hashlib
+import http.client
+import json
+import os
+import re
+import threading
+import time
+import urllib.request
+import zlib
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Tuple
+from urllib.parse import urljoin, urlsplit
+
+DEFAULT_USER_AGENT = "OpenClawAutomationKit/0.1 (+https://github.com/marcosathanasoulis/openclaw-automation-kit)"
+DEFAULT_CACHE_DIR = Path.home() / ".openclaw" / "http_cache"
+DEFAULT_MAX_PER_HOST = 4
+MAX_REDIRECTS = 5
+
+_ConnKey = Tuple[str, str, int]
+
+
+def _brotli_module():
+    try:
+        import brotli  # type: ignore[import-not-found]
+    except ImportError:
+        return None
+    return brotli
+
+
+_BROTLI = _brotli_module()
+ACCEPT_ENCODING = "gzip, deflate, br" if _BROTLI else "gzip, deflate"
+
+
+class _Inflate:
+    """Incremental deflate that accepts zlib-wrapped or raw streams."""
+
+    def __init__(self) -> None:
+        self._obj = None
+
+    def __call__(self, chunk: bytes) -> bytes:
+        if self._obj is None:
+            # zlib streams start with a CMF byte whose low nibble is 8 (deflate).
+            raw = not chunk or (chunk[0] & 0x0F) != 8
+            self._obj = zlib.decompressobj(-zlib.MAX_WBITS if raw else zlib.MAX_WBITS)
+        return self._obj.decompress(chunk)
+
+
+def _stream_decoder(content_encoding: str) -> Callable[[bytes], bytes] | None:
+    encoding = content_encoding.strip().lower()
+    if encoding in ("", "identity"):
+        return None
+    if encoding in ("gzip", "x-gzip"):
+        return zlib.decompressobj(16 + zlib.MAX_WBITS).decompress
+    if encoding == "deflate":
+        return _Inflate()
+    if encoding == "br" and _BROTLI:
+        return _BROTLI.Decompressor().process
+    raise ValueError(f"Unsupported Content-Encoding: {content_encoding}")
+
+
+def decode_body(body: bytes, content_encoding: str) -> bytes:
+    decoder = _stream_decoder(content_encoding)
+    return decoder(body) if decoder else body
+
+
+def response_charset(headers: Dict[str, str], default: str = "utf-8") -> str:
+    match = re.search(r"charset=([\w.-]+)", headers.get("content-type", ""), flags=re.IGNORECASE)
+    return match.group(1) if match else default
+
+
+def _proxy_for(scheme: str, host: str) -> Tuple[str, int] | None:
+    proxy = urllib.request.getproxies().get(scheme)
+    if not proxy or urllib.request.proxy_bypass(host):
+        return None
+    parts = urlsplit(proxy if "://" in proxy else f"http://{proxy}")
+    return parts.hostname or "", parts.port or 80
+
+
+class HTTPError(Exception):
+    def __init__(self, url: str, status: int, detail: str = "") -> None:
+        super().__init__(f"HTTP {status} for {url}" + (f": {detail}" if detail else ""))
+        self.url = url
+        self.status = status
+
+
+@dataclass
+class FetchResult:
+    url: str
+    status: int
+    headers: Dict[str, str]
+    body: bytes
+    from_cache: bool = False
+    elapsed_seconds: float = 0.0
+    redirects: List[str] = field(default_factory=list)
+
+    @property
+    def charset(self) -> str:
+        return response_charset(self.headers)
+
+    def text(self) -> str:
+        try:
+            return self.body.decode(self.charset, errors="ignore")
+        except LookupError:
+            return self.body.decode("utf-8", errors="ignore")
+
+
+@dataclass
+class _Exchange:
+    key: _ConnKey
+    conn: http.client.HTTPConnection
+    response: http.client.HTTPResponse
+    slots: threading.BoundedSemaphore
+
+
+class _CacheWriter:
+    """Tees a streamed body to a temp file; commits only once fully read."""
+
+    def __init__(self, url: str, headers: Dict[str, str], meta_path: Path, body_path: Path) -> None:
+        self.url = url
+        self.headers = headers
+        self.meta_path = meta_path
+        self.body_path = body_path
+        self.tmp_path = body_path.with_name(f"{body_path.name}.{threading.get_ident()}.tmp")
+        self._fh = self.tmp_path.open("wb")
+
+    def write(self, chunk: bytes) -> None:
+        self._fh.write(chunk)
+
+    def commit(self) -> None:
+        try:
+            self._fh.close()
+            self.tmp_path.replace(self.body_path)
+            self.meta_path.write_text(json.dumps({"url": self.url, "headers": self.headers, "stored_at": time.time()}))
+        except OSError:
+            self.discard()
+
+    def discard(self) -> None:
+        self._fh.close()
+        self.tmp_path.unlink(missing_ok=True)
+
+
+class FetchStream:
+    """An open response body; iterate ``iter_bytes`` then ``close`` (or use ``with``)."""
+
+    def __init__(
+        self,
+        fetcher: HttpFetcher,
+        url: str,
+        status: int,
+        headers: Dict[str, str],
+        redirects: List[str],
+        started: float,
+        *,
+        exchange: _Exchange | None = None,
+        decoder: Callable[[bytes], bytes] | None = None,
+        cached_path: Path | None = None,
+        cache: bool = False,
+    ) -> None:
+        self.url = url
+        self.status = status
+        self.headers = headers
+        self.redirects = redirects
+        self.started = started
+        self._fetcher = fetcher
+        self._exchange = exchange
+        self._decoder = decoder
+        self._cached_path = cached_path
+        self._writer = fetcher._cache_writer(url, headers) if cache and exchange is not None else None
+        self._drained = exchange is None
+        self._closed = False
+
+    @property
+    def from_cache(self) -> bool:
+        return self._cached_path is not None
+
+    @property
+    def charset(self) -> str:
+        return response_charset(self.headers)
+
+    def iter_bytes(self, chunk_size: int = 64 * 1024) -> Iterator[bytes]:
+        """Decoded body chunks, read from the socket (or cache file) as consumed."""
+        if self._cached_path is not None:
+            with self._cached_path.open("rb") as fh:
+                while chunk := fh.read(chunk_size):
+                    yield chunk
+            return
+        if self._exchange is None or self._drained:
+            return
+        response = self._exchange.response
+        while True:
+            raw = response.read(chunk_size)
+            if not raw:
+                break
+            chunk = self._decoder(raw) if self._decoder else raw
+            if self._writer is not None:
+                self._writer.write(chunk)
+            if chunk:
+                yield chunk
+        self._drained = True
+
+    def close(self) -> None:
+        if self._closed:
+            return
+        self._closed = True
+        if self._writer is not None:
+            if self._drained:
+                self._writer.commit()
+            else:
+                self._writer.discard()
+        if self._exchange is not None:
+            self._fetcher._release(self._exchange, drained=self._drained)
+
+    def __enter__(self) -> FetchStream:
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+class HttpFetcher:
+    def __init__(
+        self,
+        *,
+        cache_dir: Path | str | None = None,
+        max_per_host: int = DEFAULT_MAX_PER_HOST,
+        max_idle_per_host: int = 4,
+        timeout_seconds: float = 20.0,
+        user_agent: str = DEFAULT_USER_AGENT,
+    ) -> None:
+        self.cache_dir = Path(cache_dir).expanduser() if cache_dir else None
+        if self.cache_dir is not None:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.max_per_host = max(1, max_per_host)
+        self.max_idle_per_host = max_idle_per_host
+        self.timeout_seconds = timeout_seconds
+        self.user_agent = user_agent
+        self._lock = threading.Lock()
+        self._idle: Dict[_ConnKey, List[http.client.HTTPConnection]] = {}
+        self._host_slots: Dict[str, threading.BoundedSemaphore] = {}
+        self._stats = {"requests": 0, "reused": 0, "not_modified": 0}
+
+    # ── connections ──────────────────────────────────────────────────
+
+    def _slots(self, host: str) -> threading.BoundedSemaphore:
+        with self._lock:
+            slots = self._host_slots.get(host)
+            if slots is None:
+                slots = self._host_slots[host] = threading.BoundedSemaphore(self.max_per_host)
+            return slots
+
+    def _new_connection(self, key: _ConnKey) -> http.client.HTTPConnection:
+        scheme, host, port = key
+        proxy = _proxy_for(scheme, host)
+        if proxy is not None:
+            if scheme == "https":
+                conn = http.client.HTTPSConnection(*proxy, timeout=self.timeout_seconds)
+                conn.set_tunnel(host, port)
+                return conn
+            return http.client.HTTPConnection(*proxy, timeout=self.timeout_seconds)
+        if scheme == "https":
+            return http.client.HTTPSConnection(host, port, timeout=self.timeout_seconds)
+        return http.client.HTTPConnection(host, port, timeout=self.timeout_seconds)
+
+    def _checkout(self, key: _ConnKey) -> Tuple[http.client.HTTPConnection, bool]:
+        with self._lock:
+            idle = self._idle.get(key)
+            if idle:
+                return idle.pop(), True
+        return self._new_connection(key), False
+
+    def _checkin(self, key: _ConnKey, conn: http.client.HTTPConnection) -> None:
+        with self._lock:
+            idle = self._idle.setdefault(key, [])
+            if len(idle) < self.max_idle_per_host:
+                idle.append(conn)
+                return
+        conn.close()
+
+    def close(self) -> None:
+        with self._lock:
+            pools, self._idle = self._idle, {}
+        for idle in pools.values():
+            for conn in idle:
+                conn.close()
+
+    # ── disk cache ───────────────────────────────────────────────────
+
+    def _cache_paths(self, url: str) -> Tuple[Path, Path] | None:
+        if self.cache_dir is None:
+            return None
+        digest = hashlib.sha256(url.encode("utf-8")).hexdigest()
+        return self.cache_dir / f"{digest}.json", self.cache_dir / f"{digest}.body"
+
+    def _cached(self, url: str) -> Tuple[Dict[str, str], Path] | None:
+        paths = self._cache_paths(url)
+        if paths is None or not paths[0].exists() or not paths[1].exists():
+            return None
+        try:
+            return json.loads(paths[0].read_text())["headers"], paths[1]
+        except (OSError, ValueError, KeyError):
+            return None
+
+    def _cache_writer(self, url: str, headers: Dict[str, str]) -> _CacheWriter | None:
+        """A writer for a cacheable response (validators present, not ``no-store``)."""
+        paths = self._cache_paths(url)
+        if paths is None or not (headers.get("etag") or headers.get("last-modified")):
+            return None
+        if "no-store" in headers.get("cache-control", "").lower():
+            return None
+        try:
+            return _CacheWriter(url, headers, *paths)
+        except OSError:
+            return None
+
+    # ── requests ─────────────────────────────────────────────────────
+
+    def _send(self, url: str, headers: Dict[str, str]) -> _Exchange:
+        """Send a GET holding a per-host slot; the caller must ``_release`` it."""
+        parts = urlsplit(url)
+        if parts.scheme not in ("http", "https") or not parts.hostname:
+            raise ValueError(f"Unsupported URL: {url}")
+        port = parts.port or (443 if parts.scheme == "https" else 80)
+        key = (parts.scheme, parts.hostname, port)
+        path = parts.path or "/"
+        if parts.query:
+            path += f"?{parts.query}"
+        if parts.scheme == "http" and _proxy_for("http", parts.hostname) is not None:
+            path = url  # plain HTTP proxies take the absolute URI
+        slots = self._slots(parts.hostname)
+        slots.acquire()
+        for attempt in range(2):
+            conn, reused = self._checkout(key)
+            try:
+                conn.request("GET", path, headers=headers)
+                response = conn.getresponse()
+            except (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError):
+                conn.close()
+                # The server dropped an idle keep-alive connection; retry once on a fresh one.
+                if reused and attempt == 0:
+                    continue
+                slots.release()
+                raise
+            except BaseException:
+                conn.close()
+                slots.release()
+                raise
+            with self._lock:
+                self._stats["requests"] += 1
+                self._stats["reused"] += int(reused)
+            return _Exchange(key, conn, response, slots)
+        raise RuntimeError("unreachable")
+
+    def _release(self, exchange: _Exchange, drained: bool) -> None:
+        try:
+            if drained and not exchange.response.will_close:
+                self._checkin(exchange.key, exchange.conn)
+            else:
+                exchange.conn.close()
+        finally:
+            exchange.slots.release()
+
+    def open(self, url: str, headers: Dict[str, str] | None = None, use_cache: bool = True) -> FetchStream:
+        """GET ``url`` following redirects and return a stream of the decoded body.
+
+        Use as a context manager; closing before the end of the body drops
+        the connection instead of returning it to the pool. Raises
+        ``HTTPError`` on 4xx/5xx.
+        """
+        started = time.monotonic()
+        redirects: List[str] = []
+        current = url
+        while True:
+            request_headers = {
+                "Host": urlsplit(current).netloc,
+                "User-Agent": self.user_agent,
+                "Accept-Encoding": ACCEPT_ENCODING,
+                "Connection": "keep-alive",
+                **(headers or {}),
+            }
+            cached = self._cached(current) if use_cache else None
+            if cached is not None:
+                if cached[0].get("etag"):
+                    request_headers["If-None-Match"] = cached[0]["etag"]
+                if cached[0].get("last-modified"):
+                    request_headers["If-Modified-Since"] = cached[0]["last-modified"]
+
+            exchange = self._send(current, request_headers)
+            status = exchange.response.status
+            response_headers = {k.lower(): v for k, v in exchange.response.getheaders()}
+            if status in (301, 302, 303, 307, 308) and response_headers.get("location"):
+                exchange.response.read()
+                self._release(exchange, drained=True)
+                if len(redirects) >= MAX_REDIRECTS:
+                    raise HTTPError(current, status, "Too many redirects")
+                redirects.append(current)
+                current = urljoin(current, response_headers["location"])
+                continue
+            if status == 304 and cached is not None:
+                exchange.response.read()
+                self._release(exchange, drained=True)
+                with self._lock:
+                    self._stats["not_modified"] += 1
+                return FetchStream(self, current, 304, cached[0], redirects, started, cached_path=cached[1])
+            if status >= 400:
+                detail = exchange.response.read(200).decode("utf-8", errors="ignore")
+                self._release(exchange, drained=False)
+                raise HTTPError(current, status, detail)
+            try:
+                decoder = _stream_decoder(response_headers.pop("content-encoding", ""))
+            except ValueError:
+                self._release(exchange, drained=False)
+                raise
+            return FetchStream(
+                self, current, status, response_headers, redirects, started,
+                exchange=exchange, decoder=decoder, cache=use_cache,
+            )
+
+    def fetch(self, url: str, headers: Dict[str, str] | None = None, use_cache: bool = True) -> FetchResult:
+        """GET ``url`` following redirects; raises ``HTTPError`` on 4xx/5xx."""
+        with self.open(url, headers=headers, use_cache=use_cache) as stream:
+            body = b"".join(stream.iter_bytes())
+        return FetchResult(
+            url=stream.url,
+            status=stream.status,
+            headers=stream.headers,
+            body=body,
+            from_cache=stream.from_cache,
+            elapsed_seconds=time.monotonic() - stream.started,
+            redirects=stream.redirects,
+        )
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {**self._stats, "idle": sum(len(v) for v in self._idle.values())}
+
+
+_SHARED_FETCHER: HttpFetcher | None = None
+_SHARED_FETCHER_LOCK = threading.Lock()
+
+
+def shared_fetcher() -> HttpFetcher:
+    """Process-wide fetcher configured from ``OPENCLAW_HTTP_*`` env vars."""
+    global _SHARED_FETCHER
+    with _SHARED_FETCHER_LOCK:
+        if _SHARED_FETCHER is None:
+            cache_dir: Path | str | None = os.getenv("OPENCLAW_HTTP_CACHE_DIR", "").strip() or DEFAULT_CACHE_DIR
+            if str(cache_dir).lower() in ("0", "off", "none", "false"):
+                cache_dir = None
+            _SHARED_FETCHER = HttpFetcher(
+                cache_dir=cache_dir,
+                max_per_host=int(os.getenv("OPENCLAW_HTTP_MAX_PER_HOST", str(DEFAULT_MAX_PER_HOST))),
+            )
+        return _SHARED_FETCHER
@@ -1,10 +1,11 @@
 from __future__ import annotations
 
+import copy
 import re
 from dataclasses import dataclass
 from datetime import date, timedelta
 from pathlib import Path
-from typing import Dict, List
+from typing import Dict, FrozenSet, Iterable, List
 
 
 @dataclass(frozen=True)
@@ -63,83 +64,183 @@ MONTH_NAMES = {
     "oct": 10, "nov": 11, "dec": 12,
 }
 
+_WORKSPACE_TOKENS = ("meeting", "meetings", "calendar", "gmail", "email", "emails", "inbox")
+_MEETING_TOKENS = ("meeting", "meetings", "calendar", "schedule")
+_EMAIL_TOKENS = ("email", "emails", "gmail", "inbox")
+_HEADLINE_TOKENS = ("headline", "headlines", "top stories", "top news")
+_SUMMARY_TOKENS = ("summarize", "summary", "what is this page about")
+_WEEKDAYS = {
+    "monday": 0,
+    "tuesday": 1,
+    "wednesday": 2,
+    "thursday": 3,
+    "friday": 4,
+    "saturday": 5,
+    "sunday": 6,
+}
+_MONTH_PHRASES = {
+    month_name: tuple(f"{prefix} {month_name}" for prefix in ("in", "for", "during"))
+    for month_name in MONTH_NAMES
+}
+# Earlier table entries win when several match, as in the original loops.
+_AIRLINE_PRIORITY = {token: i for i, token in enumerate(AIRLINE_TO_SCRIPT)}
+_MONTH_PHRASE_PRIORITY = {
+    phrase: i for i, phrases in enumerate(_MONTH_PHRASES.values()) for phrase in phrases
+}
+_MONTH_BY_PHRASE = {phrase: name for name, phrases in _MONTH_PHRASES.items() for phrase in phrases}
+
+# Every literal the parser tests with ``token in query.lower()``.
+_VOCABULARY = tuple(dict.fromkeys([
+    *AIRLINE_TO_SCRIPT,
+    *_WORKSPACE_TOKENS, *_MEETING_TOKENS, *_EMAIL_TOKENS,
+    *_HEADLINE_TOKENS, *_SUMMARY_TOKENS,
+    "weather", "home page", "homepage", "celsius", "centigrade", "last time",
+    "tomorrow", "today", "next week", "europe", "delta", "two",
+    "economy", "business", "first", "premium",
+    *_WEEKDAYS, *(f"next {day}" for day in _WEEKDAYS),
+    *(phrase for phrases in _MONTH_PHRASES.values() for phrase in phrases),
+]))
+
+
+def _trie_pattern(words: Iterable[str]) -> str:
+    trie: Dict[str, dict] = {}
+    for word in words:
+        node = trie
+        for ch in word:
+            node = node.setdefault(ch, {})
+        node[""] = {}
+
+    def _build(node: Dict[str, dict]) -> str:
+        branches = [re.escape(ch) + _build(child) for ch, child in sorted(node.items()) if ch]
+        if not branches:
+            return ""
+        body = "(?:" + "|".join(branches) + ")"
+        return body + "?" if "" in node else body
+
+    return _build(trie)
+
+
+# One pass finds every vocabulary token in the query, overlaps included:
+# the lookahead tries each position, the trie makes the longest token
+# there win, and shorter tokens it starts with are added from _PREFIXES.
+_VOCABULARY_SCAN = re.compile("(?=(" + _trie_pattern(_VOCABULARY) + "))")
+_PREFIXES: Dict[str, FrozenSet[str]] = {
+    word: frozenset(v for v in _VOCABULARY if word.startswith(v)) for word in _VOCABULARY
+}
+
 
-def _detect_script_dir(query: str) -> str:
-    q = query.lower()
-    has_url = re.search(r"https?://", query) is not None
-    if not has_url and any(token in q for token in ["meeting", "meetings", "calendar", "gmail", "email", "emails", "inbox"]):
+@dataclass(frozen=True)
+class _Scan:
+    text: str
+    lower: str
+    hits: FrozenSet[str]
+    today: date
+
+    def has_any(self, tokens: Iterable[str]) -> bool:
+        return not self.hits.isdisjoint(tokens)
+
+    def first_hit(self, priority: Dict[str, int]) -> str | None:
+        """The hit that comes first in ``priority`` (dict order of the source table)."""
+        found = [token for token in self.hits if token in priority]
+        return min(found, key=priority.__getitem__) if found else None
+
+
+def _scan(query: str, today: date | None = None) -> _Scan:
+    lower = query.lower()
+    longest = set(_VOCABULARY_SCAN.findall(lower))
+    hits = frozenset().union(*map(_PREFIXES.__getitem__, longest))
+    return _Scan(text=query, lower=lower, hits=hits, today=today or date.today())
+
+
+_HAS_URL = re.compile(r"https?://")
+_URL = re.compile(r"https?://[^\s\"']+")
+_QUOTED = re.compile(r"\"([^\"]{2,80})\"")
+_KEYWORD_PATTERNS = tuple(
+    re.compile(pattern, re.IGNORECASE)
+    for pattern in (
+        r"(?:mentions?|count|times?)\s+of\s+([a-zA-Z][a-zA-Z0-9_\-\s]{1,60})",
+        r"check\s+(?:if\s+)?([a-zA-Z][a-zA-Z0-9_\-\s]{1,60})\s+(?:is|exists|appears)",
+        r"contains?\s+([a-zA-Z][a-zA-Z0-9_\-\s]{1,60})",
+        r"about\s+([a-zA-Z][a-zA-Z0-9_\-\s]{1,60})",
+    )
+)
+_WHITESPACE = re.compile(r"\s+")
+_WEATHER_LOCATION = re.compile(r"\bweather\s+(?:in|for)\s+([a-zA-Z0-9,\-\s]{2,80})", re.IGNORECASE)
+_TEMPERATURE_SUFFIX = re.compile(r"\b(in\s+)?(celsius|fahrenheit|centigrade)\b$", re.IGNORECASE)
+_EXPLICIT_FROM = re.compile(r"\bfrom\s+([a-z0-9._%+\-@]+)\b")
+_LAST_TIME_SENDER = re.compile(r"last time\s+([a-z0-9._%+\-\s]+?)\s+email(?:ed)?\s+me")
+_LAST_N_EMAILS = re.compile(r"\b(last|latest)\s+(\d+)\s+(emails?|messages?)\b")
+_ISO_DATE = re.compile(r"\b(20\d{2}-\d{2}-\d{2})\b")
+_THREE_LETTER_CODE = re.compile(r"\b[A-Z]{3}\b")
+_TRAVELERS = re.compile(r"\b(\d+)\s*(people|traveler|travelers|adults?|pax|passengers?)\b")
+_NEXT_N_DAYS = re.compile(r"(next|within)\s+(\d+)\s+days")
+_MAX_MILES = re.compile(r"(?:<=|under|below|max|at)\s*(\d+)\s*k?\s*miles")
+
+
+def _detect_script_dir(scan: _Scan) -> str:
+    has_url = _HAS_URL.search(scan.text) is not None
+    if not has_url and scan.has_any(_WORKSPACE_TOKENS):
         return "examples/google_workspace_brief"
-    if "weather" in q and not has_url:
+    if "weather" in scan.hits and not has_url:
         return "examples/weather_check"
     if has_url:
         return "examples/public_page_check"
-    if "home page" in q or "homepage" in q:
+    if scan.has_any(("home page", "homepage")):
         return "examples/public_page_check"
-    for token, script_dir in AIRLINE_TO_SCRIPT.items():
-        if token in q:
-            return script_dir
+    token = scan.first_hit(_AIRLINE_PRIORITY)
+    if token is not None:
+        return AIRLINE_TO_SCRIPT[token]
     return "examples/public_page_check"
 
 
 def _extract_url(query: str) -> str | None:
-    url_match = re.search(r"https?://[^\s\"']+", query)
+    url_match = _URL.search(query)
     if not url_match:
         return None
     return url_match.group(0).rstrip(".,;:!?")
 
 
 def _extract_keyword(query: str, default: str = "news") -> str:
-    quoted = re.search(r"\"([^\"]{2,80})\"", query)
+    quoted = _QUOTED.search(query)
     if quoted:
         return quoted.group(1).strip()
 
-    patterns = [
-        r"(?:mentions?|count|times?)\s+of\s+([a-zA-Z][a-zA-Z0-9_\-\s]{1,60})",
-        r"check\s+(?:if\s+)?([a-zA-Z][a-zA-Z0-9_\-\s]{1,60})\s+(?:is|exists|appears)",
-        r"contains?\s+([a-zA-Z][a-zA-Z0-9_\-\s]{1,60})",
-        r"about\s+([a-zA-Z][a-zA-Z0-9_\-\s]{1,60})",
-    ]
-    for pattern in patterns:
-        match = re.search(pattern, query, flags=re.IGNORECASE)
+    for pattern in _KEYWORD_PATTERNS:
+        match = pattern.search(query)
         if match:
-            candidate = re.sub(r"\s+", " ", match.group(1)).strip(" .,:;!?")
+            candidate = _WHITESPACE.sub(" ", match.group(1)).strip(" .,:;!?")
             if candidate:
                 return candidate
     return default
 
 
-def _extract_public_task(query: str) -> str:
-    q = query.lower()
-    if any(token in q for token in ["headline", "headlines", "top stories", "top news"]):
+def _extract_public_task(scan: _Scan) -> str:
+    if scan.has_any(_HEADLINE_TOKENS):
         return "headlines"
-    if any(token in q for token in ["summarize", "summary", "what is this page about"]):
+    if scan.has_any(_SUMMARY_TOKENS):
         return "summary"
     return "keyword_count"
 
 
 def _extract_weather_location(query: str) -> str:
-    match = re.search(r"\bweather\s+(?:in|for)\s+([a-zA-Z0-9,\-\s]{2,80})", query, flags=re.IGNORECASE)
+    match = _WEATHER_LOCATION.search(query)
     if match:
-        location = re.sub(r"\s+", " ", match.group(1)).strip(" .,:;!?")
-        location = re.sub(
-            r"\b(in\s+)?(celsius|fahrenheit|centigrade)\b$", "", location, flags=re.IGNORECASE
-        ).strip(" .,:;!?")
+        location = _WHITESPACE.sub(" ", match.group(1)).strip(" .,:;!?")
+        location = _TEMPERATURE_SUFFIX.sub("", location).strip(" .,:;!?")
         if location:
             return location
     return "San Francisco, CA"
 
 
-def _extract_weather_unit(query: str) -> str:
-    q = query.lower()
-    if "celsius" in q or "centigrade" in q:
+def _extract_weather_unit(scan: _Scan) -> str:
+    if scan.has_any(("celsius", "centigrade")):
         return "celsius"
     return "fahrenheit"
 
 
-def _extract_workspace_task(query: str) -> str:
-    q = query.lower()
-    wants_meetings = any(token in q for token in ["meeting", "meetings", "calendar", "schedule"])
-    wants_emails = any(token in q for token in ["email", "emails", "gmail", "inbox"])
+def _extract_workspace_task(scan: _Scan) -> str:
+    wants_meetings = scan.has_any(_MEETING_TOKENS)
+    wants_emails = scan.has_any(_EMAIL_TOKENS)
     if wants_meetings and wants_emails:
         return "brief"
     if wants_emails:
@@ -147,125 +248,115 @@ def _extract_workspace_task(query: str) -> str:
     return "meetings"
 
 
-def _extract_workspace_email_query(query: str) -> str:
-    q = query.lower().strip()
+def _extract_workspace_email_query(scan: _Scan) -> str:
+    q = scan.lower.strip()
     skip_sender_terms = {"gmail", "email", "emails", "inbox", "mail"}
 
-    explicit_from = re.search(r"\bfrom\s+([a-z0-9._%+\-@]+)\b", q)
+    explicit_from = _EXPLICIT_FROM.search(q)
     if explicit_from:
         sender = explicit_from.group(1).strip(" .,:;!?")
         if sender and sender not in skip_sender_terms:
             return f"from:{sender}"
 
-    last_time = re.search(r"last time\s+([a-z0-9._%+\-\s]+?)\s+email(?:ed)?\s+me", q)
+    last_time = _LAST_TIME_SENDER.search(q)
     if last_time:
-        sender = re.sub(r"\s+", " ", last_time.group(1)).strip(" .,:;!?")
+        sender = _WHITESPACE.sub(" ", last_time.group(1)).strip(" .,:;!?")
         if sender and sender not in skip_sender_terms:
             return f"from:{sender}"
 
     return "newer_than:7d"
 
 
-def _extract_workspace_max_results(query: str, task: str) -> int:
-    q = query.lower()
-    if task == "emails" and "last time" in q:
+def _extract_workspace_max_results(scan: _Scan, task: str) -> int:
+    if task == "emails" and "last time" in scan.hits:
         return 1
-    m = re.search(r"\b(last|latest)\s+(\d+)\s+(emails?|messages?)\b", q)
+    m = _LAST_N_EMAILS.search(scan.lower)
     if m:
         return max(1, min(int(m.group(2)), 50))
     return 10
 
 
-def _next_or_same_weekday(target_weekday: int) -> date:
-    today = date.today()
+def _next_or_same_weekday(target_weekday: int, today: date | None = None) -> date:
+    today = today or date.today()
     delta = (target_weekday - today.weekday()) % 7
     return today + timedelta(days=delta)
 
 
-def _next_weekday(target_weekday: int) -> date:
-    today = date.today()
+def _next_weekday(target_weekday: int, today: date | None = None) -> date:
+    today = today or date.today()
     delta = (target_weekday - today.weekday()) % 7
     if delta == 0:
         delta = 7
     return today + timedelta(days=delta)
 
 
-def _extract_workspace_date(query: str) -> str:
-    q = query.lower()
-    if "tomorrow" in q:
-        return (date.today() + timedelta(days=1)).isoformat()
-    if "today" in q:
-        return date.today().isoformat()
+def _extract_workspace_date(scan: _Scan) -> str:
+    today = scan.today
+    if "tomorrow" in scan.hits:
+        return (today + timedelta(days=1)).isoformat()
+    if "today" in scan.hits:
+        return today.isoformat()
 
-    explicit = re.search(r"\b(20\d{2}-\d{2}-\d{2})\b", q)
+    explicit = _ISO_DATE.search(scan.lower)
     if explicit:
         return explicit.group(1)
 
-    weekdays = {
-        "monday": 0,
-        "tuesday": 1,
-        "wednesday": 2,
-        "thursday": 3,
-        "friday": 4,
-        "saturday": 5,
-        "sunday": 6,
-    }
-    for day_name, weekday_num in weekdays.items():
-        if f"next {day_name}" in q:
-            return _next_weekday(weekday_num).isoformat()
-        if day_name in q:
-            return _next_or_same_weekday(weekday_num).isoformat()
+    for day_name, weekday_num in _WEEKDAYS.items():
+        if f"next {day_name}" in scan.hits:
+            return _next_weekday(weekday_num, today).isoformat()
+        if day_name in scan.hits:
+            return _next_or_same_weekday(weekday_num, today).isoformat()
 
-    return date.today().isoformat()
+    return today.isoformat()
 
 
 def _extract_airport_codes(query: str) -> List[str]:
-    codes = re.findall(r"\b[A-Z]{3}\b", query)
+    codes = _THREE_LETTER_CODE.findall(query)
     known = [code for code in codes if code in KNOWN_AIRPORT_CODES]
     if known:
         return known
     return [code for code in codes if code not in COMMON_THREE_LETTER_WORDS]
 
 
-def _extract_travelers(query: str) -> int:
-    match = re.search(r"\b(\d+)\s*(people|traveler|travelers|adults?|pax|passengers?)\b", query.lower())
+def _extract_travelers(scan: _Scan) -> int:
+    match = _TRAVELERS.search(scan.lower)
     if match:
         return int(match.group(1))
-    if "two" in query.lower():
+    if "two" in scan.hits:
         return 2
     return 1
 
 
-def _extract_days_ahead(query: str) -> int:
+def _extract_days_ahead(scan: _Scan) -> int:
     # "next N days"
-    m = re.search(r"(next|within)\s+(\d+)\s+days", query.lower())
+    m = _NEXT_N_DAYS.search(scan.lower)
     if m:
         return max(1, min(int(m.group(2)), 365))
 
     # "in June", "in March", month names
-    q = query.lower()
-    for month_name, month_num in MONTH_NAMES.items():
-        if f"in {month_name}" in q or f"for {month_name}" in q or f"during {month_name}" in q:
-            today = date.today()
-            target_year = today.year
-            # If the month is in the past, assume next year
-            if month_num < today.month:
-                target_year += 1
-            elif month_num == today.month and today.day > 15:
-                target_year += 1
-            target_date = date(target_year, month_num, 15)
-            days = (target_date - today).days
-            return max(1, min(days + 15, 365))  # cover the whole month
+    phrase = scan.first_hit(_MONTH_PHRASE_PRIORITY)
+    if phrase is not None:
+        month_num = MONTH_NAMES[_MONTH_BY_PHRASE[phrase]]
+        today = scan.today
+        target_year = today.year
+        # If the month is in the past, assume next year
+        if month_num < today.month:
+            target_year += 1
+        elif month_num == today.month and today.day > 15:
+            target_year += 1
+        target_date = date(target_year, month_num, 15)
+        days = (target_date - today).days
+        return max(1, min(days + 15, 365))  # cover the whole month
 
     # "next week"
-    if "next week" in q:
+    if "next week" in scan.hits:
         return 14
 
     return 30
 
 
-def _extract_max_miles(query: str) -> int:
-    m = re.search(r"(?:<=|under|below|max|at)\s*(\d+)\s*k?\s*miles", query.lower())
+def _extract_max_miles(scan: _Scan) -> int:
+    m = _MAX_MILES.search(scan.lower)
     if m:
         value = int(m.group(1))
         if value < 1000:
@@ -286,16 +377,11 @@ _AIRLINE_DEFAULT_CABIN: Dict[str, str] = {
 _DELTA_EUROPE_AIRPORTS = ["CDG", "LHR", "AMS", "FCO", "ZRH", "ATH", "LIS"]
 
 
-def _extract_cabin(query: str, script_dir: str = "") -> str:
-    q = query.lower()
-    if "economy" in q:
-        return "economy"
-    if "business" in q:
-        return "business"
-    if "first" in q:
-        return "first"
-    if "premium" in q:
-        return "premium_economy"
+def _extract_cabin(scan: _Scan, script_dir: str = "") -> str:
+    for token, cabin in (("economy", "economy"), ("business", "business"),
+                         ("first", "first"), ("premium", "premium_economy")):
+        if token in scan.hits:
+            return cabin
     # Airline-specific defaults when no cabin specified
     for key, default in _AIRLINE_DEFAULT_CABIN.items():
         if key in script_dir:
@@ -304,18 +390,42 @@ def _extract_cabin(query: str, script_dir: str = "") -> str:
 
 
 def parse_query_to_run(query: str) -> ParsedQuery:
-    script_dir = _detect_script_dir(query)
+    return _parse(_scan(query))
+
+
+def parse_queries(queries: Iterable[str]) -> List[ParsedQuery]:
+    """Parse many queries, e.g. when replaying chat logs for routing analytics.
+
+    Relative dates are resolved against one ``date.today()`` for the whole
+    batch, and repeated query strings are parsed once; each repeat gets its
+    own copy, so callers can edit one result's inputs without touching another.
+    """
+    today = date.today()
+    parsed: Dict[str, ParsedQuery] = {}
+    results: List[ParsedQuery] = []
+    for query in queries:
+        result = parsed.get(query)
+        if result is None:
+            result = parsed[query] = _parse(_scan(query, today))
+        else:
+            result = copy.deepcopy(result)
+        results.append(result)
+    return results
+
+
+def _parse(scan: _Scan) -> ParsedQuery:
+    query = scan.text
+    script_dir = _detect_script_dir(scan)
     airports = _extract_airport_codes(query)
-    travelers = _extract_travelers(query)
-    days_ahead = _extract_days_ahead(query)
-    max_miles = _extract_max_miles(query)
-    cabin = _extract_cabin(query, script_dir)
+    travelers = _extract_travelers(scan)
+    days_ahead = _extract_days_ahead(scan)
+    max_miles = _extract_max_miles(scan)
+    cabin = _extract_cabin(scan, script_dir)
 
     from_code = airports[0] if airports else "SFO"
-    q_lower = query.lower()
     if len(airports) > 1:
         to_codes = airports[1:]
-    elif "europe" in q_lower and "delta" in q_lower:
+    elif "europe" in scan.hits and "delta" in scan.hits:
         to_codes = _DELTA_EUROPE_AIRPORTS
     else:
         to_codes = ["AMS"]
@@ -325,19 +435,19 @@ def parse_query_to_run(query: str) -> ParsedQuery:
     if script_dir == "examples/public_page_check":
         url = _extract_url(query) or "https://www.yahoo.com"
         keyword = _extract_keyword(query, default="news")
-        task = _extract_public_task(query)
+        task = _extract_public_task(scan)
         inputs = {"url": url, "keyword": keyword, "task": task}
         notes = [f"script={script_dir}", f"url={url}", f"keyword={keyword}", f"task={task}"]
     elif script_dir == "examples/weather_check":
         location = _extract_weather_location(query)
-        temperature_unit = _extract_weather_unit(query)
+        temperature_unit = _extract_weather_unit(scan)
         inputs = {"location": location, "temperature_unit": temperature_unit}
         notes = [f"script={script_dir}", f"location={location}", f"temperature_unit={temperature_unit}"]
     elif script_dir == "examples/google_workspace_brief":
-        task = _extract_workspace_task(query)
-        target_date = _extract_workspace_date(query)
-        gmail_query = _extract_workspace_email_query(query)
-        max_results = _extract_workspace_max_results(query, task)
+        task = _extract_workspace_task(scan)
+        target_date = _extract_workspace_date(scan)
+        gmail_query = _extract_workspace_email_query(scan)
+        max_results = _extract_workspace_max_results(scan, task)
         inputs = {
             "task": task,
             "date": target_date,
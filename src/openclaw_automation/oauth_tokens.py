@@ -0,0 +1,224 @@
+"""Access tokens cached in memory and on disk, refreshed ahead of expiry.
+
+``TokenManager.get(token_file, refresh)`` returns the access token stored
+in a JSON token file (``token`` + RFC 3339 ``expiry``, the google-auth
+layout). Tokens stay in memory between runs. A token within
+``refresh_ahead_seconds`` of expiry is still returned, and one refresh is
+started in the background. Once a token has been used, a timer also
+refreshes it ahead of expiry for ``keep_warm_seconds``, so runs rarely wait
+on the token endpoint. Only tokens that are expired (or within
+``min_valid_seconds``) are refreshed on the caller's thread.
+
+Refreshes are serialized per file, within the process by a lock and across
+processes by an ``flock`` on ``<token_file>.lock``. A refresh first re-reads
+the file, in case another process already refreshed it, and writes the file
+atomically.
+"""
+from __future__ import annotations
+
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - non-POSIX
+    fcntl = None  # type: ignore[assignment]
+
+# refresh(token_data) -> token_data with a new "token" and "expiry".
+RefreshFn = Callable[[Dict[str, Any]], Dict[str, Any]]
+
+
+def parse_expiry(raw: Any) -> float:
+    """Epoch seconds for an RFC 3339 expiry; 0 when missing or malformed."""
+    text = str(raw or "").strip()
+    if not text:
+        return 0.0
+    if text.endswith("Z"):
+        text = text[:-1] + "+00:00"
+    try:
+        parsed = datetime.fromisoformat(text)
+    except ValueError:
+        return 0.0
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.timestamp()
+
+
+@dataclass
+class _Entry:
+    token: str
+    expires_at: float
+    refresh: RefreshFn
+    last_used: float
+    timer: threading.Timer | None = None
+    refreshing: bool = False
+
+
+@contextmanager
+def _file_lock(token_file: Path) -> Iterator[None]:
+    if fcntl is None:
+        yield
+        return
+    fd = os.open(f"{token_file}.lock", os.O_RDWR | os.O_CREAT, 0o600)
+    try:
+        fcntl.flock(fd, fcntl.LOCK_EX)
+        yield
+    finally:
+        fcntl.flock(fd, fcntl.LOCK_UN)
+        os.close(fd)
+
+
+class TokenManager:
+    def __init__(
+        self,
+        *,
+        refresh_ahead_seconds: float = 300.0,
+        min_valid_seconds: float = 60.0,
+        keep_warm_seconds: float = 6 * 3600.0,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self.refresh_ahead_seconds = refresh_ahead_seconds
+        self.min_valid_seconds = min_valid_seconds
+        self.keep_warm_seconds = keep_warm_seconds
+        self._clock = clock
+        self._entries: Dict[Path, _Entry] = {}
+        self._locks: Dict[Path, threading.Lock] = {}
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="token-refresh")
+        self._stats = {"memory_hits": 0, "disk_loads": 0, "refreshes": 0, "background_refreshes": 0}
+
+    def _key_lock(self, key: Path) -> threading.Lock:
+        with self._lock:
+            return self._locks.setdefault(key, threading.Lock())
+
+    def get(self, token_file: Path | str, refresh: RefreshFn) -> str:
+        key = Path(token_file).expanduser().resolve()
+        now = self._clock()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry.expires_at - now > self.min_valid_seconds:
+                entry.last_used = now
+                entry.refresh = refresh
+                self._stats["memory_hits"] += 1
+                if entry.expires_at - now <= self.refresh_ahead_seconds:
+                    self._start_background(key, entry)
+                return entry.token
+        with self._key_lock(key):
+            # Another caller may have refreshed while we waited for the lock.
+            with self._lock:
+                entry = self._entries.get(key)
+                if entry is not None and entry.expires_at - self._clock() > self.min_valid_seconds:
+                    entry.last_used = self._clock()
+                    return entry.token
+            token, expires_at = self._load_or_refresh(key, refresh, force=False)
+            self._remember(key, token, expires_at, refresh)
+            with self._lock:
+                entry = self._entries[key]
+                if expires_at - self._clock() <= self.refresh_ahead_seconds:
+                    self._start_background(key, entry)
+            return token
+
+    def invalidate(self, token_file: Path | str) -> None:
+        key = Path(token_file).expanduser().resolve()
+        with self._lock:
+            entry = self._entries.pop(key, None)
+        if entry is not None and entry.timer is not None:
+            entry.timer.cancel()
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {**self._stats, "cached": len(self._entries)}
+
+    # ── internals ────────────────────────────────────────────────────
+
+    def _load_or_refresh(self, key: Path, refresh: RefreshFn, *, force: bool) -> tuple[str, float]:
+        """Token from disk if still good enough, else refresh and write back (under flock)."""
+        if not key.exists():
+            raise FileNotFoundError(f"Token file not found: {key}")
+        with _file_lock(key):
+            data = json.loads(key.read_text())
+            token = str(data.get("token") or "")
+            if not token:
+                raise RuntimeError("Token file does not contain an access token")
+            expires_at = parse_expiry(data.get("expiry"))
+            threshold = self.refresh_ahead_seconds if force else self.min_valid_seconds
+            if expires_at - self._clock() > threshold:
+                with self._lock:
+                    self._stats["disk_loads"] += 1
+                return token, expires_at
+            data = refresh(data)
+            tmp = key.with_name(f"{key.name}.{os.getpid()}.tmp")
+            # Private from creation: the file holds the new access and refresh token.
+            try:
+                fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+            except FileExistsError:  # left behind by a crashed refresh in this pid
+                tmp.unlink()
+                fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+            with os.fdopen(fd, "w") as fh:
+                fh.write(json.dumps(data, indent=2))
+            os.replace(tmp, key)
+            with self._lock:
+                self._stats["refreshes"] += 1
+            return str(data["token"]), parse_expiry(data.get("expiry"))
+
+    def _remember(self, key: Path, token: str, expires_at: float, refresh: RefreshFn) -> None:
+        with self._lock:
+            old = self._entries.get(key)
+            if old is not None and old.timer is not None:
+                old.timer.cancel()
+            entry = _Entry(token, expires_at, refresh, last_used=old.last_used if old else self._clock())
+            self._entries[key] = entry
+            delay = expires_at - self.refresh_ahead_seconds - self._clock()
+            if delay > 0:
+                entry.timer = threading.Timer(delay, self._on_timer, args=(key, entry))
+                entry.timer.daemon = True
+                entry.timer.start()
+
+    def _on_timer(self, key: Path, entry: _Entry) -> None:
+        with self._lock:
+            if self._entries.get(key) is not entry:
+                return
+            if self._clock() - entry.last_used > self.keep_warm_seconds:
+                return  # not used lately; the next get() refreshes on demand
+            self._start_background(key, entry)
+
+    def _start_background(self, key: Path, entry: _Entry) -> None:
+        """Queue one refresh for ``key``; caller holds ``self._lock``."""
+        if entry.refreshing:
+            return
+        entry.refreshing = True
+        self._stats["background_refreshes"] += 1
+        self._executor.submit(self._background_refresh, key, entry)
+
+    def _background_refresh(self, key: Path, entry: _Entry) -> None:
+        try:
+            with self._key_lock(key):
+                token, expires_at = self._load_or_refresh(key, entry.refresh, force=True)
+                self._remember(key, token, expires_at, entry.refresh)
+        except Exception:
+            # The cached token stays usable until it expires; get() retries then.
+            with self._lock:
+                entry.refreshing = False
+
+
+_SHARED_MANAGER: TokenManager | None = None
+_SHARED_MANAGER_LOCK = threading.Lock()
+
+
+def shared_token_manager() -> TokenManager:
+    """Process-wide manager; ``OPENCLAW_TOKEN_REFRESH_AHEAD_SECONDS`` sets the lead time."""
+    global _SHARED_MANAGER
+    with _SHARED_MANAGER_LOCK:
+        if _SHARED_MANAGER is None:
+            _SHARED_MANAGER = TokenManager(
+                refresh_ahead_seconds=float(os.getenv("OPENCLAW_TOKEN_REFRESH_AHEAD_SECONDS", "300")),
+            )
+        return _SHARED_MANAGER
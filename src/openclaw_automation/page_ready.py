@@ -1,29 +1,80 @@
 """Page readiness utilities for browser automation.
 
-Prefer polling for explicit DOM-ready signals over fixed sleeps.
-Falls back gracefully when networkidle is not achievable.
+Prefer waiting on explicit signals over fixed sleeps, so a wait ends as soon
+as the page is ready:
+
+- ``wait_for_network_quiet``: no requests in flight for ``quiet_ms``
+  (tracked over a CDP session, page events when CDP is unavailable)
+- ``wait_for_dom_quiet``: no DOM mutations for ``quiet_ms``
+- ``wait_for_any``: first of several selectors or text snippets to appear
+
+All waits return False/None on timeout instead of raising.
 """
 from __future__ import annotations
 
 import time
+from typing import Iterable, Sequence
+
+# Long-lived connections never "finish" and would keep the network busy.
+_STREAMING_TYPES = frozenset({"eventsource", "websocket"})
+
+# Stands in for the document's own load when a wait starts mid-navigation.
+_DOCUMENT_LOAD = "document-load"
+_LOADING_JS = "() => document.readyState !== 'complete'"
+
+_DOM_QUIET_JS = """([quietMs, timeoutMs, selector]) => new Promise((resolve) => {
+    const root = (selector && document.querySelector(selector)) || document.documentElement;
+    if (!root) { resolve(false); return; }
+    let quietTimer = null;
+    const finish = (value) => {
+        observer.disconnect();
+        clearTimeout(quietTimer);
+        clearTimeout(deadline);
+        resolve(value);
+    };
+    const arm = () => {
+        clearTimeout(quietTimer);
+        quietTimer = setTimeout(() => finish(true), quietMs);
+    };
+    const observer = new MutationObserver(arm);
+    observer.observe(root, {childList: true, subtree: true, attributes: true, characterData: true});
+    const deadline = setTimeout(() => finish(false), timeoutMs);
+    arm();
+})"""
+
+_ANY_JS = """([selectors, texts, visibleOnly]) => {
+    const visible = (el) => !visibleOnly || !!(el.offsetWidth || el.offsetHeight || el.getClientRects().length);
+    for (const sel of selectors) {
+        let els = [];
+        try { els = document.querySelectorAll(sel); } catch (e) { continue; }
+        for (const el of els) { if (visible(el)) return sel; }
+    }
+    if (texts.length) {
+        const body = ((document.body && document.body.innerText) || '').toLowerCase();
+        for (const text of texts) { if (body.includes(text.toLowerCase())) return text; }
+    }
+    return null;
+}"""
 
 
 def wait_ready(page, timeout_ms: int = 5000, settle_ms: int = 300) -> None:
-    """Wait for page readiness: networkidle -> domcontentloaded fallback -> settle.
+    """Wait for page readiness: networkidle -> domcontentloaded + DOM quiet fallback.
 
     Args:
         page: Playwright Page object.
         timeout_ms: Max time to wait for networkidle (ms).
-        settle_ms: Additional settle time after load state resolves (ms).
+        settle_ms: DOM quiet period required when networkidle is not reached (ms).
     """
     try:
         page.wait_for_load_state("networkidle", timeout=timeout_ms)
+        return
     except Exception:
-        try:
-            page.wait_for_load_state("domcontentloaded", timeout=2000)
-        except Exception:
-            pass
-    time.sleep(settle_ms / 1000)
+        pass
+    try:
+        page.wait_for_load_state("domcontentloaded", timeout=2000)
+    except Exception:
+        pass
+    wait_for_dom_quiet(page, quiet_ms=settle_ms, timeout_ms=max(settle_ms * 4, 2000))
 
 
 def wait_for_selector(page, selector: str, timeout_ms: int = 10000, state: str = "visible") -> bool:
@@ -43,3 +94,174 @@ def wait_for_selector(page, selector: str, timeout_ms: int = 10000, state: str =
         return True
     except Exception:
         return False
+
+
+def wait_for_any(
+    page,
+    selectors: Sequence[str] = (),
+    texts: Sequence[str] = (),
+    timeout_ms: int = 10000,
+    visible: bool = True,
+) -> str | None:
+    """Wait until any CSS selector matches or any text appears in the page body.
+
+    Args:
+        page: Playwright Page object.
+        selectors: Plain CSS selectors (no Playwright ``:has-text`` extensions).
+        texts: Case-insensitive snippets searched in ``document.body.innerText``.
+        timeout_ms: Max wait time (ms).
+        visible: Only count selector matches that are rendered.
+
+    Returns:
+        The selector or text that matched first, or None on timeout.
+    """
+    deadline = time.monotonic() + timeout_ms / 1000
+    while True:
+        remaining_ms = int((deadline - time.monotonic()) * 1000)
+        if remaining_ms <= 0:
+            return None
+        try:
+            handle = page.wait_for_function(
+                _ANY_JS, arg=[list(selectors), list(texts), visible], timeout=remaining_ms, polling=100,
+            )
+            return handle.json_value()
+        except Exception as exc:
+            # A form post or redirect mid-wait destroys the context; keep waiting on the new page.
+            if "context was destroyed" not in str(exc) and "navigat" not in str(exc).lower():
+                return None
+
+
+def wait_for_dom_quiet(page, quiet_ms: int = 500, timeout_ms: int = 5000, selector: str | None = None) -> bool:
+    """Wait until the DOM (or the subtree at ``selector``) stops mutating.
+
+    Args:
+        page: Playwright Page object.
+        quiet_ms: How long the DOM must be unchanged (ms).
+        timeout_ms: Max wait time (ms).
+        selector: Optional root element to watch instead of the whole document.
+
+    Returns:
+        True once quiet, False on timeout or evaluation error.
+    """
+    try:
+        return bool(page.evaluate(_DOM_QUIET_JS, [quiet_ms, timeout_ms, selector]))
+    except Exception:
+        return False
+
+
+class _InflightTracker:
+    """Counts in-flight requests from CDP ``Network`` events or page events."""
+
+    def __init__(self, page, ignored: Iterable[str] = ()) -> None:
+        self.page = page
+        self.ignored = _STREAMING_TYPES | {kind.lower() for kind in ignored}
+        self.inflight: set = set()
+        self.last_change = time.monotonic()
+        self._session = None
+        self._page_handlers: list = []
+
+    def _started(self, request_id, resource_type: str | None = None) -> None:
+        if (resource_type or "").lower() in self.ignored:
+            return
+        self.inflight.add(request_id)
+        self.last_change = time.monotonic()
+
+    def _done(self, request_id) -> None:
+        if request_id in self.inflight:
+            self.inflight.discard(request_id)
+            self.last_change = time.monotonic()
+
+    def _page_loading(self) -> bool:
+        try:
+            return bool(self.page.evaluate(_LOADING_JS))
+        except Exception:
+            return False
+
+    def poll(self) -> None:
+        """Clear the seeded document load once the page reports it complete."""
+        if _DOCUMENT_LOAD in self.inflight and not self._page_loading():
+            self._done(_DOCUMENT_LOAD)
+
+    def start(self) -> None:
+        # Network events only cover requests that start from here on; a
+        # document still loading is the one earlier request we can see.
+        if self._page_loading():
+            self._started(_DOCUMENT_LOAD)
+        try:
+            session = self.page.context.new_cdp_session(self.page)
+            session.on("Network.requestWillBeSent", lambda e: self._started(e.get("requestId"), e.get("type")))
+            session.on("Network.loadingFinished", lambda e: self._done(e.get("requestId")))
+            session.on("Network.loadingFailed", lambda e: self._done(e.get("requestId")))
+            session.send("Network.enable")
+            self._session = session
+            return
+        except Exception:
+            self._session = None
+        # Non-Chromium browsers: same bookkeeping from Playwright's page events.
+        handlers = [
+            ("request", lambda r: self._started(id(r), getattr(r, "resource_type", None))),
+            ("requestfinished", lambda r: self._done(id(r))),
+            ("requestfailed", lambda r: self._done(id(r))),
+        ]
+        for event, handler in handlers:
+            self.page.on(event, handler)
+        self._page_handlers = handlers
+
+    def stop(self) -> None:
+        if self._session is not None:
+            try:
+                self._session.detach()
+            except Exception:
+                pass
+        for event, handler in self._page_handlers:
+            try:
+                self.page.remove_listener(event, handler)
+            except Exception:
+                pass
+
+
+def wait_for_network_quiet(
+    page,
+    quiet_ms: int = 500,
+    timeout_ms: int = 10000,
+    max_inflight: int = 0,
+    poll_ms: int = 50,
+    ignore: Iterable[str] = (),
+) -> bool:
+    """Wait until at most ``max_inflight`` requests are pending for ``quiet_ms``.
+
+    Unlike ``networkidle`` this works after the load event (XHR-driven result
+    pages) and can tolerate a few background requests via ``max_inflight``.
+
+    Only requests that start after the call are tracked: neither CDP nor
+    Playwright lists requests already in flight. A document that is still
+    loading counts as one pending request until ``readyState`` is
+    ``complete``; XHRs started earlier are not seen, so call this right after
+    the action that triggers them.
+
+    Args:
+        page: Playwright Page object.
+        quiet_ms: How long the network must stay quiet (ms).
+        timeout_ms: Max wait time (ms).
+        max_inflight: Pending requests still counted as quiet (analytics beacons).
+        poll_ms: Event pump interval (ms).
+        ignore: Extra resource types to ignore, any case (e.g. ``"ping"``).
+
+    Returns:
+        True once quiet, False on timeout.
+    """
+    tracker = _InflightTracker(page, ignore)
+    tracker.start()
+    deadline = time.monotonic() + timeout_ms / 1000
+    try:
+        while True:
+            tracker.poll()
+            now = time.monotonic()
+            if len(tracker.inflight) <= max_inflight and (now - tracker.last_change) * 1000 >= quiet_ms:
+                return True
+            if now >= deadline:
+                return False
+            # page.wait_for_timeout (unlike time.sleep) lets Playwright dispatch events.
+            page.wait_for_timeout(poll_ms)
+    finally:
+        tracker.stop()
@@ -0,0 +1,235 @@
+"""Pre-started worker processes for runners with ``execution_mode: "process"``.
+
+Each runner call is sent to an idle worker over a pipe. Unlike the thread
+path, a worker that overruns its timeout (or whose run is cancelled) is
+killed and replaced, so a stuck runner cannot keep burning CPU, memory or
+a browser session inside the engine process. Workers are recycled after a
+fixed number of runs and can be given an address-space limit.
+"""
+from __future__ import annotations
+
+import multiprocessing
+import os
+import queue
+import threading
+import time
+from dataclasses import dataclass
+from multiprocessing.connection import Connection
+from pathlib import Path
+from typing import Any, Dict
+
+_POLL_SECONDS = 0.1
+
+
+# Deliberately not a TimeoutError subclass: concurrent.futures.TimeoutError
+# is the builtin on 3.11+, and the engine must tell its own wait timing out
+# apart from a worker that was killed for overrunning.
+class RunnerTimeoutError(RuntimeError):
+    pass
+
+
+class RunnerCancelledError(RuntimeError):
+    pass
+
+
+def _apply_memory_limit(memory_limit_mb: int) -> None:
+    if memory_limit_mb <= 0:
+        return
+    try:
+        import resource
+    except ImportError:  # Windows
+        return
+    limit = memory_limit_mb * 1024 * 1024
+    try:
+        resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+    except (ValueError, OSError):
+        pass
+
+
+def _worker_main(conn: Connection, memory_limit_mb: int) -> None:
+    from .runner_registry import RunnerRegistry
+
+    _apply_memory_limit(memory_limit_mb)
+    registry = RunnerRegistry()
+    while True:
+        try:
+            job = conn.recv()
+        except EOFError:
+            return
+        if job is None:
+            return
+        runner_path, context, inputs = job
+        try:
+            module = registry.load(Path(runner_path))
+            if not hasattr(module, "run"):
+                raise AttributeError(f"runner has no run(context, inputs): {runner_path}")
+            conn.send(("ok", module.run(context, inputs)))
+        except BaseException as exc:  # noqa: BLE001
+            conn.send(("error", str(exc) or type(exc).__name__))
+
+
+@dataclass
+class _Worker:
+    process: Any
+    conn: Connection
+    runs: int = 0
+
+
+class RunnerProcessPool:
+    def __init__(
+        self,
+        size: int = 2,
+        max_runs_per_worker: int = 20,
+        memory_limit_mb: int = 0,
+        start_method: str | None = None,
+    ) -> None:
+        if size < 1:
+            raise ValueError("size must be >= 1")
+        if max_runs_per_worker < 1:
+            raise ValueError("max_runs_per_worker must be >= 1")
+        self.size = size
+        self.max_runs_per_worker = max_runs_per_worker
+        self.memory_limit_mb = memory_limit_mb
+        if start_method is None:
+            methods = multiprocessing.get_all_start_methods()
+            # Never plain fork: the engine process is multi-threaded.
+            start_method = "forkserver" if "forkserver" in methods else "spawn"
+        self._ctx = multiprocessing.get_context(start_method)
+        self._idle: queue.Queue[_Worker] = queue.Queue()
+        self._lock = threading.Lock()
+        self._started = False
+        self._closed = False
+
+    def _spawn(self) -> _Worker:
+        parent_conn, child_conn = self._ctx.Pipe()
+        process = self._ctx.Process(
+            target=_worker_main,
+            args=(child_conn, self.memory_limit_mb),
+            name="openclaw-runner-worker",
+            daemon=True,
+        )
+        process.start()
+        child_conn.close()
+        return _Worker(process=process, conn=parent_conn)
+
+    def start(self) -> None:
+        with self._lock:
+            if self._started:
+                return
+            self._started = True
+            for _ in range(self.size):
+                self._idle.put(self._spawn())
+
+    def _kill(self, worker: _Worker) -> None:
+        worker.conn.close()
+        if worker.process.is_alive():
+            worker.process.kill()
+        worker.process.join(timeout=5)
+
+    def _retire(self, worker: _Worker) -> None:
+        try:
+            worker.conn.send(None)
+        except (OSError, ValueError):
+            pass
+        worker.process.join(timeout=2)
+        self._kill(worker)
+
+    def _checkin(self, worker: _Worker | None) -> None:
+        if self._closed:
+            if worker is not None:
+                self._retire(worker)
+            return
+        if worker is None or not worker.process.is_alive():
+            worker = self._spawn()
+        self._idle.put(worker)
+
+    def _checkout(
+        self, deadline: float, timeout_seconds: float, cancel_event: threading.Event | None
+    ) -> _Worker:
+        while True:
+            if cancel_event is not None and cancel_event.is_set():
+                raise RunnerCancelledError("Runner cancelled while waiting for a worker process")
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise RunnerTimeoutError(f"Runner did not get a worker within timeout ({timeout_seconds:g}s)")
+            try:
+                return self._idle.get(timeout=min(_POLL_SECONDS, remaining))
+            except queue.Empty:
+                continue
+
+    def run(
+        self,
+        runner_path: Path,
+        context: Dict[str, Any],
+        inputs: Dict[str, Any],
+        timeout_seconds: float,
+        cancel_event: threading.Event | None = None,
+    ) -> Any:
+        """Run ``runner_path``'s ``run(context, inputs)`` in a worker process.
+
+        ``context`` must be picklable. Raises RunnerTimeoutError or
+        RunnerCancelledError after killing the worker; the timeout also
+        covers waiting for an idle worker, and a run that never gets one
+        leaves the pool untouched.
+        """
+        if self._closed:
+            raise RuntimeError("process pool is closed")
+        self.start()
+        deadline = time.monotonic() + timeout_seconds
+        worker = self._checkout(deadline, timeout_seconds, cancel_event)
+        keep: _Worker | None = None
+        try:
+            worker.conn.send((str(runner_path), context, inputs))
+            worker.runs += 1
+            while not worker.conn.poll(_POLL_SECONDS):
+                if cancel_event is not None and cancel_event.is_set():
+                    self._kill(worker)
+                    raise RunnerCancelledError("Runner cancelled; worker process killed")
+                if time.monotonic() >= deadline:
+                    self._kill(worker)
+                    raise RunnerTimeoutError(
+                        f"Runner exceeded timeout ({timeout_seconds:g}s); worker process killed"
+                    )
+                if not worker.process.is_alive():
+                    break
+            try:
+                status, payload = worker.conn.recv()
+            except (EOFError, OSError):
+                self._kill(worker)
+                raise RuntimeError(
+                    f"runner worker exited unexpectedly (exitcode={worker.process.exitcode})"
+                ) from None
+            if worker.runs >= self.max_runs_per_worker:
+                self._retire(worker)
+            else:
+                keep = worker
+            if status == "error":
+                raise RuntimeError(payload)
+            return payload
+        finally:
+            self._checkin(keep)
+
+    def close(self) -> None:
+        self._closed = True
+        while True:
+            try:
+                worker = self._idle.get_nowait()
+            except queue.Empty:
+                return
+            self._retire(worker)
+
+
+_SHARED_POOL: RunnerProcessPool | None = None
+_SHARED_POOL_LOCK = threading.Lock()
+
+
+def shared_process_pool() -> RunnerProcessPool:
+    global _SHARED_POOL
+    with _SHARED_POOL_LOCK:
+        if _SHARED_POOL is None:
+            _SHARED_POOL = RunnerProcessPool(
+                size=max(1, int(os.getenv("OPENCLAW_PROCESS_POOL_SIZE", "2"))),
+                max_runs_per_worker=max(1, int(os.getenv("OPENCLAW_PROCESS_MAX_RUNS_PER_WORKER", "20"))),
+                memory_limit_mb=int(os.getenv("OPENCLAW_PROCESS_MEMORY_LIMIT_MB", "0")),
+            )
+        return _SHARED_POOL
@@ -0,0 +1,169 @@
+"""LRU cache of run envelopes for scripts that opt in via their manifest.
+
+A manifest enables caching with::
+
+    "cache": {"ttl_seconds": 900, "stale_while_revalidate_seconds": 3600}
+
+Entries are keyed by script id, version and the normalized execution
+inputs, so "SFO to NRT" asked twice returns the first envelope. Within
+``ttl_seconds`` an entry is fresh. For ``stale_while_revalidate_seconds``
+after that it is still served, but the first stale hit also starts one
+background refresh. Only successful, non-placeholder envelopes are stored.
+"""
+from __future__ import annotations
+
+import copy
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, Tuple
+
+
+@dataclass
+class _Entry:
+    envelope: Dict[str, Any]
+    stored_at: float
+    ttl_seconds: float
+    stale_seconds: float
+    refreshing: bool = False
+
+
+def cache_policy(manifest: Dict[str, Any]) -> Tuple[float, float] | None:
+    """``(ttl, stale_while_revalidate)`` from the manifest, or None if uncached."""
+    config = manifest.get("cache")
+    if not isinstance(config, dict):
+        return None
+    ttl = float(config.get("ttl_seconds", 0))
+    stale = float(config.get("stale_while_revalidate_seconds", 0))
+    if ttl <= 0 and stale <= 0:
+        return None
+    return max(0.0, ttl), max(0.0, stale)
+
+
+def _normalize(value: Any) -> Any:
+    if isinstance(value, str):
+        return value.strip()
+    if isinstance(value, dict):
+        return {str(k): _normalize(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_normalize(v) for v in value]
+    return value
+
+
+def cache_key(manifest: Dict[str, Any], inputs: Dict[str, Any]) -> str:
+    return json.dumps(
+        [manifest["id"], manifest.get("version"), _normalize(inputs)],
+        sort_keys=True,
+        separators=(",", ":"),
+        default=str,
+    )
+
+
+def cacheable(envelope: Dict[str, Any]) -> bool:
+    """Only real results are stored.
+
+    Award runners report a failed search as ``ok`` with ``real_data: False``,
+    or with ``errors`` and no ``matches``; caching those would serve the
+    failure for the whole TTL and stale window.
+    """
+    if not envelope.get("ok") or envelope.get("placeholder"):
+        return False
+    result = envelope.get("result")
+    if not isinstance(result, dict) or not result.get("real_data"):
+        return False
+    return not (result.get("errors") and not result.get("matches"))
+
+
+class ResultCache:
+    def __init__(self, max_entries: int = 256) -> None:
+        self.max_entries = max(1, max_entries)
+        self._entries: "OrderedDict[str, _Entry]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._stale_hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def get(self, key: str) -> Tuple[Dict[str, Any] | None, str, bool]:
+        """Return ``(envelope copy, state, should_refresh)``; state is fresh/stale/miss.
+
+        ``should_refresh`` is True for exactly one caller per stale entry.
+        """
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                age = now - entry.stored_at
+                if age <= entry.ttl_seconds:
+                    self._entries.move_to_end(key)
+                    self._hits += 1
+                    return self._annotate(entry, age, stale=False), "fresh", False
+                if age <= entry.ttl_seconds + entry.stale_seconds:
+                    self._entries.move_to_end(key)
+                    self._stale_hits += 1
+                    refresh = not entry.refreshing
+                    entry.refreshing = True
+                    return self._annotate(entry, age, stale=True), "stale", refresh
+                del self._entries[key]
+            self._misses += 1
+            return None, "miss", False
+
+    @staticmethod
+    def _annotate(entry: _Entry, age: float, stale: bool) -> Dict[str, Any]:
+        envelope = copy.deepcopy(entry.envelope)
+        envelope["cache"] = {"hit": True, "stale": stale, "age_seconds": round(age, 1)}
+        return envelope
+
+    def put(self, key: str, envelope: Dict[str, Any], ttl_seconds: float, stale_seconds: float = 0.0) -> None:
+        if not cacheable(envelope):
+            return
+        stored = copy.deepcopy({k: v for k, v in envelope.items() if k != "cache"})
+        with self._lock:
+            self._entries[key] = _Entry(stored, time.monotonic(), ttl_seconds, stale_seconds)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._evictions += 1
+
+    def refresh_failed(self, key: str) -> None:
+        """Let the next stale hit try again."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                entry.refreshing = False
+
+    def invalidate(self, key: str | None = None) -> None:
+        with self._lock:
+            if key is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(key, None)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "hits": self._hits,
+                "stale_hits": self._stale_hits,
+                "misses": self._misses,
+                "evictions": self._evictions,
+            }
+
+
+_SHARED_CACHE: ResultCache | None = None
+_SHARED_CACHE_LOCK = threading.Lock()
+
+
+def shared_result_cache() -> ResultCache | None:
+    """Process-wide cache; None when ``OPENCLAW_RESULT_CACHE=0``."""
+    global _SHARED_CACHE
+    if os.getenv("OPENCLAW_RESULT_CACHE", "1").strip().lower() in ("0", "false", "no", "off"):
+        return None
+    with _SHARED_CACHE_LOCK:
+        if _SHARED_CACHE is None:
+            _SHARED_CACHE = ResultCache(int(os.getenv("OPENCLAW_RESULT_CACHE_MAX_ENTRIES", "256")))
+        return _SHARED_CACHE
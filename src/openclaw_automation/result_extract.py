@@ -2,7 +2,8 @@ from __future__ import annotations
 
 import re
 from datetime import datetime
-from typing import Any, Dict, List
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, List, Pattern, Tuple
 
 _MATCH_LINE = re.compile(
     r"^MATCH\|(?P<date>\d{4}-\d{2}-\d{2}|unknown)\|(?P<miles>\d{2,6})\|(?P<taxes>[0-9.]+|unknown)"
@@ -65,6 +66,236 @@ def _normalize_miles(raw: str) -> int:
     return int(val)
 
 
+# ── fallback rules ───────────────────────────────────────────────────
+#
+# Rules are tried in priority order and the first one that yields at least
+# one row under max_miles wins, exactly like the original cascade. All
+# patterns are compiled once at import, and each rule lists literals that
+# must occur in the lower-cased text before its regex is run at all, so
+# transcripts without prices cost a couple of substring checks.
+
+_MONTH_DAY = re.compile(r"(\d{1,2})/(\d{1,2})")
+
+_MONTH_NUMS = {"jan": 1, "feb": 2, "mar": 3, "apr": 4, "may": 5, "jun": 6,
+               "jul": 7, "aug": 8, "sep": 9, "oct": 10, "nov": 11, "dec": 12}
+
+# "Fri 2/20: 39.8k miles + $5.60" or "2/20: 55k miles + $24.80"
+_DATE_MILES_TAXES = re.compile(
+    r"(?P<label>[A-Za-z]{3}\s+\d{1,2}/\d{1,2}|\d{1,2}/\d{1,2})[:\-\s]+"
+    r"(?P<miles>\d+(?:\.\d+)?)k?\s*miles?\s*\+\s*\$(?P<taxes>\d+(?:\.\d{1,2})?)",
+    re.IGNORECASE,
+)
+
+# "Fri 2/20: 39.8k miles", "- Fri 2/20: 39.8k miles", "Mon 2/23: 47.1k miles (selected date)"
+_DATE_STRIP = re.compile(
+    r"(?:^|\n)\s*[-•*]?\s*"
+    r"(?:(?:Mon|Tue|Wed|Thu|Fri|Sat|Sun)\w*\s+)?"
+    r"(?P<month>\d{1,2})/(?P<day>\d{1,2})"
+    r"[:\s]+(?P<miles>[\d,.]+)k?\s*miles",
+    re.IGNORECASE | re.MULTILINE,
+)
+
+# "Mar 1: 300,400 miles" or "Fri Mar 1: 499,900 miles" (Delta results calendar)
+_MONTH_NAME_DATE = re.compile(
+    r"(?:(?:Mon|Tue|Wed|Thu|Fri|Sat|Sun)\w*[\s,]+)?"
+    r"(?P<month_name>Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)\w*\s+"
+    r"(?P<day>\d{1,2})"
+    r"[:\s,]+(?P<miles>[\d,.]+)k?\s*miles?",
+    re.IGNORECASE,
+)
+
+# "Economy: 39.8k miles + $5.60" or "Business: 250k miles + $21.50 (mixed cabin)"
+_CABIN_LINE = re.compile(
+    r"(?P<cabin_name>Economy|Premium\s*Economy|Business|First|Polaris)"
+    r"[^:]*:\s*(?P<miles>[\d,.]+)k?\s*miles"
+    r"(?:\s*\+\s*\$(?P<taxes>\d+(?:\.\d{1,2})?))?",
+    re.IGNORECASE,
+)
+
+# United Money+Miles: "$320 + 15k miles", "Basic Economy: $250 + 9k miles"
+_MONEY_PLUS_MILES = re.compile(
+    r"(?:(?P<cabin_prefix>Basic\s*Economy|Economy|Premium\s*Economy|Business|First|Polaris)"
+    r"[^:]*:\s*)?"
+    r"\$[\d,]+(?:\.\d{1,2})?\s*\+\s*(?P<miles>[\d,.]+)k?\s*miles",
+    re.IGNORECASE,
+)
+
+# "Cheapest economy: 39.8k miles on Feb 22"
+_SUMMARY_LINE = re.compile(
+    r"(?:cheapest|best|lowest)\s+(?P<cabin_name>[\w\s]*?):\s*"
+    r"(?:\$[\d,]+(?:\.\d{1,2})?\s*\+\s*)?"
+    r"(?P<miles>[\d,.]+)k?\s*miles"
+    r"(?:\s+on\s+(?P<date_text>[A-Za-z]+\s+\d{1,2}))?",
+    re.IGNORECASE,
+)
+
+_MILES_ONLY = re.compile(r"(?P<miles>\d{2,3}(?:,\d{3})?)\s*miles", re.IGNORECASE)
+
+
+@dataclass(frozen=True)
+class _Ctx:
+    text: str
+    route: str
+    cabin: str
+    travelers: int
+    year: int
+
+
+def _row(ctx: _Ctx, **fields: Any) -> Dict[str, Any]:
+    row: Dict[str, Any] = {
+        "route": ctx.route,
+        "date": "unknown",
+        "date_label": "",
+        "miles": 0,
+        "taxes": "",
+        "travelers": ctx.travelers,
+        "cabin": ctx.cabin,
+        "mixed_cabin": False,
+    }
+    row.update(fields)
+    return row
+
+
+def _from_date_miles_taxes(m: re.Match, miles: int, ctx: _Ctx) -> Dict[str, Any]:
+    label = m.group("label").strip()
+    date_iso = ""
+    month_day = _MONTH_DAY.search(label)
+    if month_day:
+        date_iso = f"{ctx.year:04d}-{int(month_day.group(1)):02d}-{int(month_day.group(2)):02d}"
+    return _row(ctx, date=date_iso or label, date_label=label, miles=miles,
+                taxes=m.group("taxes"), source="parsed_from_agent_text")
+
+
+def _from_date_strip(m: re.Match, miles: int, ctx: _Ctx) -> Dict[str, Any]:
+    month = int(m.group("month"))
+    day = int(m.group("day"))
+    return _row(ctx, date=f"{ctx.year:04d}-{month:02d}-{day:02d}", date_label=f"{month}/{day}",
+                miles=miles, source="parsed_date_strip")
+
+
+def _from_month_name_date(m: re.Match, miles: int, ctx: _Ctx) -> Dict[str, Any]:
+    month_num = _MONTH_NUMS.get(m.group("month_name")[:3].lower(), 0)
+    day = int(m.group("day"))
+    date_iso = f"{ctx.year:04d}-{month_num:02d}-{day:02d}" if month_num else ""
+    label = f"{m.group('month_name')[:3]} {day}"
+    return _row(ctx, date=date_iso or label, date_label=label, miles=miles,
+                source="parsed_month_name_date")
+
+
+def _from_cabin_line(m: re.Match, miles: int, ctx: _Ctx) -> Dict[str, Any]:
+    detected_cabin = m.group("cabin_name").strip().lower()
+    if "polaris" in detected_cabin:
+        detected_cabin = "business"
+    elif "premium" in detected_cabin:
+        detected_cabin = "premium_economy"
+    mixed = "mixed" in ctx.text[max(0, m.start() - 20):m.end() + 30].lower()
+    return _row(ctx, miles=miles, taxes=m.group("taxes") or "", cabin=detected_cabin,
+                mixed_cabin=mixed, source="parsed_cabin_line")
+
+
+def _from_money_plus_miles(m: re.Match, miles: int, ctx: _Ctx) -> Dict[str, Any]:
+    detected_cabin = ctx.cabin
+    prefix = (m.group("cabin_prefix") or "").strip().lower()
+    if prefix:
+        if "polaris" in prefix:
+            detected_cabin = "business"
+        elif "premium" in prefix:
+            detected_cabin = "premium_economy"
+        elif "basic" in prefix:
+            detected_cabin = "economy"
+        elif "business" in prefix:
+            detected_cabin = "business"
+        elif "first" in prefix:
+            detected_cabin = "first"
+        else:
+            detected_cabin = prefix
+    return _row(ctx, miles=miles, cabin=detected_cabin, source="parsed_money_plus_miles")
+
+
+def _from_summary_line(m: re.Match, miles: int, ctx: _Ctx) -> Dict[str, Any]:
+    date_text = m.group("date_text") or ""
+    return _row(ctx, date=date_text or "unknown", date_label=date_text, miles=miles,
+                cabin=m.group("cabin_name").strip().lower(), source="parsed_summary_line")
+
+
+def _from_miles_only(m: re.Match, miles: int, ctx: _Ctx) -> Dict[str, Any]:
+    return _row(ctx, miles=miles, source="parsed_miles_only")
+
+
+def _plain_miles(raw: str) -> int:
+    return int(raw.replace(",", ""))
+
+
+@dataclass(frozen=True)
+class _Rule:
+    name: str
+    pattern: Pattern[str]
+    requires: Tuple[str, ...]
+    build: Callable[[re.Match, int, _Ctx], Dict[str, Any]]
+    miles: Callable[[str], int] = _normalize_miles
+
+    def applies(self, lowered: str) -> bool:
+        return all(literal in lowered for literal in self.requires)
+
+
+_RULES: Tuple[_Rule, ...] = (
+    _Rule("date_miles_taxes", _DATE_MILES_TAXES, ("mile", "$", "+", "/"), _from_date_miles_taxes),
+    _Rule("date_strip", _DATE_STRIP, ("miles", "/"), _from_date_strip),
+    _Rule("month_name_date", _MONTH_NAME_DATE, ("mile",), _from_month_name_date),
+    _Rule("cabin_line", _CABIN_LINE, ("miles", ":"), _from_cabin_line),
+    _Rule("money_plus_miles", _MONEY_PLUS_MILES, ("miles", "$", "+"), _from_money_plus_miles),
+    _Rule("summary_line", _SUMMARY_LINE, ("miles", ":"), _from_summary_line),
+    _Rule("miles_only", _MILES_ONLY, ("miles",), _from_miles_only, miles=_plain_miles),
+)
+
+#: Rule names in priority order; ``match_line`` always comes first.
+RULE_NAMES: Tuple[str, ...] = ("match_line",) + tuple(rule.name for rule in _RULES)
+
+
+def extract_award_matches_with_rule(
+    text: str,
+    *,
+    route: str,
+    cabin: str,
+    travelers: int,
+    max_miles: int,
+    year: int | None = None,
+) -> Tuple[str | None, List[Dict[str, Any]]]:
+    """Like extract_award_matches_from_text, also returning the rule that fired."""
+    if not text:
+        return None, []
+
+    lowered = text.lower()
+    if "match|" in lowered:
+        structured = _parse_match_lines(
+            text,
+            route=route,
+            cabin=cabin,
+            travelers=travelers,
+            max_miles=max_miles,
+        )
+        if structured:
+            return "match_line", structured
+
+    if "mile" not in lowered:
+        return None, []
+
+    ctx = _Ctx(text=text, route=route, cabin=cabin, travelers=travelers,
+               year=year if year is not None else datetime.now().year)
+    for rule in _RULES:
+        if not rule.applies(lowered):
+            continue
+        matches: List[Dict[str, Any]] = []
+        for parsed in rule.pattern.finditer(text):
+            miles = rule.miles(parsed.group("miles"))
+            if miles > max_miles:
+                continue
+            matches.append(rule.build(parsed, miles, ctx))
+        if matches:
+            return rule.name, matches
+    return None, []
+
+
 def extract_award_matches_from_text(
     text: str,
     *,
@@ -74,247 +305,33 @@ def extract_award_matches_from_text(
     max_miles: int,
 ) -> List[Dict[str, Any]]:
     """Best-effort parse of miles/tax rows from freeform agent text."""
-    if not text:
-        return []
-
-    # Try structured MATCH| lines first
-    structured = _parse_match_lines(
+    return extract_award_matches_with_rule(
         text,
         route=route,
         cabin=cabin,
         travelers=travelers,
         max_miles=max_miles,
-    )
-    if structured:
-        return structured
-
-    current_year = datetime.now().year
-    matches: List[Dict[str, Any]] = []
-
-    # Pattern 1: "Xk miles + $Y.ZZ" with optional date label
-    # e.g. "Fri 2/20: 39.8k miles + $5.60" or "2/20: 55k miles + $24.80"
-    pattern1 = re.compile(
-        r"(?P<label>[A-Za-z]{3}\s+\d{1,2}/\d{1,2}|\d{1,2}/\d{1,2})[:\-\s]+"
-        r"(?P<miles>\d+(?:\.\d+)?)k?\s*miles?\s*\+\s*\$(?P<taxes>\d+(?:\.\d{1,2})?)",
-        re.IGNORECASE,
-    )
-
-    for parsed in pattern1.finditer(text):
-        label = parsed.group("label").strip()
-        miles = _normalize_miles(parsed.group("miles"))
-        if miles > max_miles:
-            continue
-        date_iso = ""
-        month_day = re.search(r"(\d{1,2})/(\d{1,2})", label)
-        if month_day:
-            month = int(month_day.group(1))
-            day = int(month_day.group(2))
-            date_iso = f"{current_year:04d}-{month:02d}-{day:02d}"
-        matches.append({
-            "route": route,
-            "date": date_iso or label,
-            "date_label": label,
-            "miles": miles,
-            "taxes": parsed.group("taxes"),
-            "travelers": travelers,
-            "cabin": cabin,
-            "mixed_cabin": False,
-            "source": "parsed_from_agent_text",
-        })
-
-    if matches:
-        return matches
-
-    # Pattern 2: Date strip without taxes — "Fri 2/20: 39.8k miles"
-    # Also matches "- Fri 2/20: 39.8k miles" and "Mon 2/23: 47.1k miles (selected date)"
-    pattern2 = re.compile(
-        r"(?:^|\n)\s*[-•*]?\s*"
-        r"(?:(?:Mon|Tue|Wed|Thu|Fri|Sat|Sun)\w*\s+)?"
-        r"(?P<month>\d{1,2})/(?P<day>\d{1,2})"
-        r"[:\s]+(?P<miles>[\d,.]+)k?\s*miles",
-        re.IGNORECASE | re.MULTILINE,
-    )
-
-    for parsed in pattern2.finditer(text):
-        miles = _normalize_miles(parsed.group("miles"))
-        if miles > max_miles:
-            continue
-        month = int(parsed.group("month"))
-        day = int(parsed.group("day"))
-        date_iso = f"{current_year:04d}-{month:02d}-{day:02d}"
-        matches.append({
-            "route": route,
-            "date": date_iso,
-            "date_label": f"{month}/{day}",
-            "miles": miles,
-            "taxes": "",
-            "travelers": travelers,
-            "cabin": cabin,
-            "mixed_cabin": False,
-            "source": "parsed_date_strip",
-        })
-
-    if matches:
-        return matches
-
-    # Pattern 2b: Month-name date strip — "Mar 1: 300,400 miles" or "Fri Mar 1: 499,900 miles"
-    # Delta shows dates in this format on its award search results calendar
-    _MONTH_NUMS = {"jan": 1, "feb": 2, "mar": 3, "apr": 4, "may": 5, "jun": 6,
-                   "jul": 7, "aug": 8, "sep": 9, "oct": 10, "nov": 11, "dec": 12}
-    pattern2b = re.compile(
-        r"(?:(?:Mon|Tue|Wed|Thu|Fri|Sat|Sun)\w*[\s,]+)?"
-        r"(?P<month_name>Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)\w*\s+"
-        r"(?P<day>\d{1,2})"
-        r"[:\s,]+(?P<miles>[\d,.]+)k?\s*miles?",
-        re.IGNORECASE,
-    )
-    for parsed in pattern2b.finditer(text):
-        miles = _normalize_miles(parsed.group("miles"))
-        if miles > max_miles:
-            continue
-        month_key = parsed.group("month_name")[:3].lower()
-        month_num = _MONTH_NUMS.get(month_key, 0)
-        day = int(parsed.group("day"))
-        date_iso = f"{current_year:04d}-{month_num:02d}-{day:02d}" if month_num else ""
-        label = f"{parsed.group('month_name')[:3]} {day}"
-        matches.append({
-            "route": route,
-            "date": date_iso or label,
-            "date_label": label,
-            "miles": miles,
-            "taxes": "",
-            "travelers": travelers,
-            "cabin": cabin,
-            "mixed_cabin": False,
-            "source": "parsed_month_name_date",
-        })
-
-    if matches:
-        return matches
-
-    # Pattern 3: Multi-line cabin entries — "Economy: 39.8k miles + $5.60"
-    # or "Business: 250k miles + $21.50 (mixed cabin)"
-    pattern3 = re.compile(
-        r"(?P<cabin_name>Economy|Premium\s*Economy|Business|First|Polaris)"
-        r"[^:]*:\s*(?P<miles>[\d,.]+)k?\s*miles"
-        r"(?:\s*\+\s*\$(?P<taxes>\d+(?:\.\d{1,2})?))?",
-        re.IGNORECASE,
-    )
-
-    for parsed in pattern3.finditer(text):
-        miles = _normalize_miles(parsed.group("miles"))
-        if miles > max_miles:
-            continue
-        detected_cabin = parsed.group("cabin_name").strip().lower()
-        if "polaris" in detected_cabin:
-            detected_cabin = "business"
-        elif "premium" in detected_cabin:
-            detected_cabin = "premium_economy"
-        taxes = parsed.group("taxes") or ""
-        matches.append({
-            "route": route,
-            "date": "unknown",
-            "date_label": "",
-            "miles": miles,
-            "taxes": taxes,
-            "travelers": travelers,
-            "cabin": detected_cabin,
-            "mixed_cabin": "mixed" in text[max(0, parsed.start() - 20):parsed.end() + 30].lower(),
-            "source": "parsed_cabin_line",
-        })
-
-    if matches:
-        return matches
-
-    # Pattern 3b: Money+Miles format — "$320 + 15k miles" or "$1,760 + 192k miles"
-    # United shows this in Money+Miles pricing mode. Cabin may be on same line or nearby.
-    # Also matches "Basic Economy: $250 + 9k miles" or "$984 + 96k miles (Economy)"
-    pattern3b = re.compile(
-        r"(?:(?P<cabin_prefix>Basic\s*Economy|Economy|Premium\s*Economy|Business|First|Polaris)"
-        r"[^:]*:\s*)?"
-        r"\$[\d,]+(?:\.\d{1,2})?\s*\+\s*(?P<miles>[\d,.]+)k?\s*miles",
-        re.IGNORECASE,
-    )
-
-    for parsed in pattern3b.finditer(text):
-        miles = _normalize_miles(parsed.group("miles"))
-        if miles > max_miles:
-            continue
-        detected_cabin = cabin
-        prefix = (parsed.group("cabin_prefix") or "").strip().lower()
-        if prefix:
-            if "polaris" in prefix:
-                detected_cabin = "business"
-            elif "premium" in prefix:
-                detected_cabin = "premium_economy"
-            elif "basic" in prefix:
-                detected_cabin = "economy"
-            elif "business" in prefix:
-                detected_cabin = "business"
-            elif "first" in prefix:
-                detected_cabin = "first"
-            else:
-                detected_cabin = prefix
-        matches.append({
-            "route": route,
-            "date": "unknown",
-            "date_label": "",
-            "miles": miles,
-            "taxes": "",
-            "travelers": travelers,
-            "cabin": detected_cabin,
-            "mixed_cabin": False,
-            "source": "parsed_money_plus_miles",
-        })
-
-    if matches:
-        return matches
-
-    # Pattern 4: Summary lines — "Cheapest economy: 39.8k miles on Feb 22"
-    pattern4 = re.compile(
-        r"(?:cheapest|best|lowest)\s+(?P<cabin_name>[\w\s]*?):\s*"
-        r"(?:\$[\d,]+(?:\.\d{1,2})?\s*\+\s*)?"
-        r"(?P<miles>[\d,.]+)k?\s*miles"
-        r"(?:\s+on\s+(?P<date_text>[A-Za-z]+\s+\d{1,2}))?",
-        re.IGNORECASE,
-    )
-
-    for parsed in pattern4.finditer(text):
-        miles = _normalize_miles(parsed.group("miles"))
-        if miles > max_miles:
-            continue
-        detected_cabin = parsed.group("cabin_name").strip().lower()
-        date_text = parsed.group("date_text") or ""
-        matches.append({
-            "route": route,
-            "date": date_text or "unknown",
-            "date_label": date_text,
-            "miles": miles,
-            "taxes": "",
-            "travelers": travelers,
-            "cabin": detected_cabin,
-            "mixed_cabin": False,
-            "source": "parsed_summary_line",
-        })
+    )[1]
 
-    if matches:
-        return matches
 
-    # Last resort: standalone miles values
-    for parsed in re.finditer(r"(?P<miles>\d{2,3}(?:,\d{3})?)\s*miles", text, re.IGNORECASE):
-        miles = int(parsed.group("miles").replace(",", ""))
-        if miles > max_miles:
-            continue
-        matches.append({
-            "route": route,
-            "date": "unknown",
-            "date_label": "",
-            "miles": miles,
-            "taxes": "",
-            "travelers": travelers,
-            "cabin": cabin,
-            "mixed_cabin": False,
-            "source": "parsed_miles_only",
-        })
-
-    return matches
+def extract_award_matches_batch(
+    texts: Iterable[str],
+    *,
+    route: str,
+    cabin: str,
+    travelers: int,
+    max_miles: int,
+) -> List[List[Dict[str, Any]]]:
+    """Parse many stored transcripts with shared settings, one result per text."""
+    year = datetime.now().year
+    return [
+        extract_award_matches_with_rule(
+            text,
+            route=route,
+            cabin=cabin,
+            travelers=travelers,
+            max_miles=max_miles,
+            year=year,
+        )[1]
+        for text in texts
+    ]
@@ -0,0 +1,93 @@
+"""Long-lived cache of loaded runner modules.
+
+Each runner file is imported once and reused until its contents change.
+A cheap stat (mtime + size) is checked on every lookup; the file is only
+re-hashed when the stat changes, and only re-imported when the hash does.
+"""
+from __future__ import annotations
+
+import hashlib
+import importlib.util
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from types import ModuleType
+from typing import Dict
+
+
+@dataclass
+class _RunnerEntry:
+    module: ModuleType
+    mtime_ns: int
+    size: int
+    sha256: str
+    loads: int = 1
+
+
+def _file_digest(path: Path) -> str:
+    return hashlib.sha256(path.read_bytes()).hexdigest()
+
+
+def _module_name(path: Path) -> str:
+    # Unique per runner file so concurrently cached runners never share a name.
+    suffix = hashlib.sha1(str(path).encode("utf-8")).hexdigest()[:12]
+    return f"automation_runner_{suffix}"
+
+
+class RunnerRegistry:
+    def __init__(self) -> None:
+        self._entries: Dict[Path, _RunnerEntry] = {}
+        self._lock = threading.Lock()
+
+    def _exec_module(self, runner_path: Path) -> ModuleType:
+        spec = importlib.util.spec_from_file_location(_module_name(runner_path), runner_path)
+        if spec is None or spec.loader is None:
+            raise RuntimeError(f"failed loading runner: {runner_path}")
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        return module
+
+    def load(self, runner_path: Path) -> ModuleType:
+        """Return the runner module, importing it only on first use or change."""
+        path = runner_path.resolve()
+        stat = path.stat()
+        with self._lock:
+            entry = self._entries.get(path)
+            if entry is not None and entry.mtime_ns == stat.st_mtime_ns and entry.size == stat.st_size:
+                return entry.module
+
+            digest = _file_digest(path)
+            if entry is not None and entry.sha256 == digest:
+                # Touched but not edited: keep the loaded module.
+                entry.mtime_ns = stat.st_mtime_ns
+                entry.size = stat.st_size
+                return entry.module
+
+            module = self._exec_module(path)
+            loads = entry.loads + 1 if entry is not None else 1
+            self._entries[path] = _RunnerEntry(
+                module=module,
+                mtime_ns=stat.st_mtime_ns,
+                size=stat.st_size,
+                sha256=digest,
+                loads=loads,
+            )
+            return module
+
+    def invalidate(self, runner_path: Path | None = None) -> None:
+        with self._lock:
+            if runner_path is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(runner_path.resolve(), None)
+
+    def snapshot(self) -> Dict[str, Dict[str, object]]:
+        with self._lock:
+            return {
+                str(path): {"sha256": entry.sha256, "loads": entry.loads}
+                for path, entry in self._entries.items()
+            }
+
+
+# Shared by every AutomationEngine in the process unless one is passed explicitly.
+DEFAULT_RUNNER_REGISTRY = RunnerRegistry()
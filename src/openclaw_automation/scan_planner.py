@@ -0,0 +1,113 @@
+"""Choose which award search windows to re-check, from stored observations.
+
+A window is one search (airline, route, cabin, travelers) aimed at one
+departure date. ``IncrementalPlanner.plan`` looks at the window's previous
+scans in the ``AwardStore``. It marks the window due when any of these hold:
+
+- it was never scanned, or its last scan failed (no real data, or errors
+  and no matches)
+- the departure is near-term (``near_days`` or closer)
+- its availability changed between its last two successful scans
+- it is stable but older than its refresh interval, which grows with
+  distance (``mid_interval_days`` up to ``mid_days`` out,
+  ``far_interval_days`` beyond)
+
+Due windows come back first, nearest departure first, so scanners can run
+them in order and skip the rest.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, FrozenSet, List, Sequence, Tuple
+
+from .award_store import AwardStore, airline_for_script, search_key
+
+_ObsKey = Tuple[str, str, str, int]
+
+
+@dataclass(frozen=True)
+class WindowPlan:
+    airline: str
+    inputs: Dict[str, Any]
+    depart_date: date
+    due: bool
+    reason: str
+    last_scanned_at: datetime | None = None
+    next_due: date | None = None
+
+
+class IncrementalPlanner:
+    def __init__(
+        self,
+        store: AwardStore,
+        *,
+        near_days: int = 14,
+        mid_days: int = 60,
+        mid_interval_days: int = 2,
+        far_interval_days: int = 7,
+        history: int = 60,
+    ) -> None:
+        self.store = store
+        self.near_days = near_days
+        self.mid_days = mid_days
+        self.mid_interval_days = mid_interval_days
+        self.far_interval_days = far_interval_days
+        self.history = history
+
+    def _window_scans(self, airline: str, inputs: Dict[str, Any], depart: date) -> List[Tuple[datetime, Dict[str, Any]]]:
+        """Previous scans of this search that targeted ``depart``, newest first."""
+        return [
+            (datetime.fromisoformat(scan["observed_at"]).astimezone(), scan)
+            for scan in self.store.latest_scans(airline, search_key(inputs, depart.isoformat()), limit=self.history)
+        ]
+
+    def _observed(self, scan_id: int) -> FrozenSet[_ObsKey]:
+        return frozenset(
+            (row["route"], row["date"], row["cabin"], row["miles"])
+            for row in self.store.scan_observations(scan_id)
+        )
+
+    def plan_window(self, script_id: str, inputs: Dict[str, Any], now: datetime | None = None) -> WindowPlan:
+        now = (now or datetime.now()).astimezone()
+        airline = airline_for_script(script_id)
+        depart = now.date() + timedelta(days=int(inputs["days_ahead"]))
+        days_out = (depart - now.date()).days
+        scans = self._window_scans(airline, inputs, depart)
+
+        def _plan(due: bool, reason: str, next_due: date | None = None) -> WindowPlan:
+            return WindowPlan(
+                airline=airline,
+                inputs=dict(inputs),
+                depart_date=depart,
+                due=due,
+                reason=reason,
+                last_scanned_at=scans[0][0] if scans else None,
+                next_due=next_due,
+            )
+
+        if not scans:
+            return _plan(True, "never scanned")
+        last_at, last = scans[0]
+        if last["failed"]:
+            return _plan(True, "last scan failed")
+        if days_out <= self.near_days:
+            return _plan(True, f"near-term ({days_out}d out)")
+        ok = [scan for _, scan in scans if not scan["failed"]]
+        if len(ok) > 1 and self._observed(ok[0]["id"]) != self._observed(ok[1]["id"]):
+            return _plan(True, "availability changed since the previous scan")
+        # Whole calendar days, so a daily cron that fires a little early still counts.
+        interval = self.mid_interval_days if days_out <= self.mid_days else self.far_interval_days
+        age_days = (now.date() - last_at.date()).days
+        if age_days >= interval:
+            return _plan(True, f"stable, last checked {age_days}d ago")
+        return _plan(False, "stable", next_due=last_at.date() + timedelta(days=interval))
+
+    def plan(
+        self,
+        windows: Sequence[Tuple[str, Dict[str, Any]]],
+        now: datetime | None = None,
+    ) -> List[WindowPlan]:
+        """Plan ``(script_id, inputs)`` windows; due ones first, nearest first."""
+        plans = [self.plan_window(script_id, inputs, now=now) for script_id, inputs in windows]
+        return sorted(plans, key=lambda p: (not p.due, p.depart_date))
@@ -0,0 +1,113 @@
+"""Run award scan jobs concurrently with per-airline cooldowns.
+
+Jobs are grouped by ``key`` (the airline). Different airlines run at the
+same time, up to ``max_workers`` (normally one per browser slot); jobs for
+the same airline run one at a time with a cooldown between them. A job
+whose result looks rate limited pushes only that airline back, doubling
+the cooldown on each consecutive strike up to ``max_backoff_seconds``.
+
+``run`` is a generator that yields each ``ScanOutcome`` as soon as its job
+finishes, so callers can stream results into a report.
+"""
+from __future__ import annotations
+
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from typing import Any, Callable, Deque, Dict, Iterable, Iterator, Tuple
+
+COOLDOWN_NORMAL = 120
+COOLDOWN_RATE_LIMITED = 600
+
+
+@dataclass(frozen=True)
+class ScanJob:
+    key: str
+    payload: Any = None
+
+
+@dataclass
+class ScanOutcome:
+    job: ScanJob
+    result: Dict[str, Any]
+    elapsed_seconds: float
+    rate_limited: bool
+    cooldown_seconds: float
+
+
+class ScanScheduler:
+    def __init__(
+        self,
+        run_job: Callable[[ScanJob], Dict[str, Any]],
+        *,
+        max_workers: int = 1,
+        cooldown_seconds: float = COOLDOWN_NORMAL,
+        rate_limited_cooldown_seconds: float = COOLDOWN_RATE_LIMITED,
+        max_backoff_seconds: float = 3600,
+        is_rate_limited: Callable[[Dict[str, Any]], bool] = lambda result: False,
+    ) -> None:
+        self.run_job = run_job
+        self.max_workers = max(1, max_workers)
+        self.cooldown_seconds = cooldown_seconds
+        self.rate_limited_cooldown_seconds = rate_limited_cooldown_seconds
+        self.max_backoff_seconds = max_backoff_seconds
+        self.is_rate_limited = is_rate_limited
+        self._strikes: Dict[str, int] = {}
+
+    def cooldown_for(self, key: str) -> float:
+        strikes = self._strikes.get(key, 0)
+        if not strikes:
+            return self.cooldown_seconds
+        return min(self.rate_limited_cooldown_seconds * 2 ** (strikes - 1), self.max_backoff_seconds)
+
+    def _execute(self, job: ScanJob) -> Dict[str, Any]:
+        try:
+            return self.run_job(job)
+        except Exception as exc:  # noqa: BLE001
+            return {"mode": "error", "matches": [], "summary": f"Runner error: {exc}", "errors": [str(exc)]}
+
+    def run(self, jobs: Iterable[ScanJob]) -> Iterator[ScanOutcome]:
+        pending: "OrderedDict[str, Deque[ScanJob]]" = OrderedDict()
+        for job in jobs:
+            pending.setdefault(job.key, deque()).append(job)
+        ready_at: Dict[str, float] = {}
+        in_flight: Dict[Future, Tuple[ScanJob, float]] = {}
+
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="openclaw-scan") as pool:
+            while pending or in_flight:
+                now = time.monotonic()
+                busy = {job.key for job, _ in in_flight.values()}
+                for key in list(pending):
+                    if len(in_flight) >= self.max_workers:
+                        break
+                    if key in busy or ready_at.get(key, 0.0) > now:
+                        continue
+                    job = pending[key].popleft()
+                    if not pending[key]:
+                        del pending[key]
+                    busy.add(key)
+                    in_flight[pool.submit(self._execute, job)] = (job, now)
+
+                # Wake for the next finished job or the next cooldown expiry.
+                waiting = [ready_at[key] for key in pending if key not in busy and key in ready_at]
+                timeout = max(0.0, min(waiting) - now) if waiting else None
+                if not in_flight:
+                    time.sleep(timeout or 0.0)
+                    continue
+                done, _ = wait(in_flight, timeout=timeout, return_when=FIRST_COMPLETED)
+                for future in done:
+                    job, started = in_flight.pop(future)
+                    result = future.result()
+                    rate_limited = bool(self.is_rate_limited(result))
+                    self._strikes[job.key] = self._strikes.get(job.key, 0) + 1 if rate_limited else 0
+                    cooldown = self.cooldown_for(job.key)
+                    finished = time.monotonic()
+                    ready_at[job.key] = finished + cooldown
+                    yield ScanOutcome(
+                        job=job,
+                        result=result,
+                        elapsed_seconds=finished - started,
+                        rate_limited=rate_limited,
+                        cooldown_seconds=cooldown if job.key in pending else 0.0,
+                    )
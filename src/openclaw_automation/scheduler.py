@@ -1,8 +1,10 @@
 from __future__ import annotations
 
-from collections import deque
+import heapq
+import itertools
+import time
 from dataclasses import dataclass, field
-from typing import Deque, Dict, List
+from typing import Callable, Dict, List, Set, Tuple
 
 
 @dataclass
@@ -10,69 +12,168 @@ class RunRequest:
     run_id: str
     script_id: str
     required_locks: List[str] = field(default_factory=list)
+    # Higher runs first; equal priorities run in arrival order.
+    priority: int = 0
 
 
 class LockManager:
     def __init__(self) -> None:
         self._held: Dict[str, str] = {}
+        self._by_run: Dict[str, Set[str]] = {}
 
-    def try_acquire(self, run_id: str, locks: List[str]) -> bool:
+    def conflict(self, run_id: str, locks: List[str]) -> str | None:
+        """Return the first lock held by another run, or None if all are free."""
         for lock in locks:
             owner = self._held.get(lock)
             if owner is not None and owner != run_id:
-                return False
+                return lock
+        return None
+
+    def try_acquire(self, run_id: str, locks: List[str]) -> bool:
+        if self.conflict(run_id, locks) is not None:
+            return False
         for lock in locks:
             self._held[lock] = run_id
+        if locks:
+            self._by_run.setdefault(run_id, set()).update(locks)
         return True
 
-    def release(self, run_id: str) -> None:
-        to_delete = [k for k, v in self._held.items() if v == run_id]
-        for key in to_delete:
+    def release(self, run_id: str) -> List[str]:
+        released = self._by_run.pop(run_id, set())
+        for key in released:
             del self._held[key]
+        return sorted(released)
+
+    def is_held(self, lock: str) -> bool:
+        return lock in self._held
 
     def held_locks(self) -> Dict[str, str]:
         return dict(self._held)
 
 
+@dataclass(order=True)
+class _QueuedRun:
+    sort_key: Tuple[float, int]
+    req: RunRequest = field(compare=False)
+    # "ready", the lock name it is parked on, or "cancelled".
+    location: str = field(default="ready", compare=False)
+
+
 class RunQueue:
-    def __init__(self, max_concurrent_runs: int = 1) -> None:
+    """Lock-aware run queue.
+
+    Runs that may be able to start sit in one priority heap. A run that hits
+    a held lock is parked on that lock's own heap and is only woken when the
+    lock is released, so ``tick`` never rescans blocked runs and
+    ``complete`` only touches the released locks' waiters.
+
+    With ``aging_seconds`` set, each ``aging_seconds`` spent waiting raises a
+    run's effective priority by one, so low-priority runs cannot starve.
+    Because every waiting run ages at the same rate this ordering is fixed
+    at enqueue time and the heaps never need re-sorting.
+    """
+
+    def __init__(
+        self,
+        max_concurrent_runs: int = 1,
+        aging_seconds: float | None = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
         if max_concurrent_runs < 1:
             raise ValueError("max_concurrent_runs must be >= 1")
+        if aging_seconds is not None and aging_seconds <= 0:
+            raise ValueError("aging_seconds must be > 0")
         self.max_concurrent_runs = max_concurrent_runs
-        self.queue: Deque[RunRequest] = deque()
+        self.aging_seconds = aging_seconds
+        self._clock = clock
+        self._seq = itertools.count()
+        self._ready: List[_QueuedRun] = []
+        self._waiters: Dict[str, List[_QueuedRun]] = {}
+        self._queued: Dict[str, _QueuedRun] = {}
         self.running: Dict[str, RunRequest] = {}
         self.locks = LockManager()
 
+    def _sort_key(self, req: RunRequest) -> Tuple[float, int]:
+        if self.aging_seconds is None:
+            rank = -float(req.priority)
+        else:
+            rank = self._clock() / self.aging_seconds - req.priority
+        return (rank, next(self._seq))
+
     def enqueue(self, req: RunRequest) -> None:
-        self.queue.append(req)
+        if req.run_id in self._queued or req.run_id in self.running:
+            raise ValueError(f"run already queued or running: {req.run_id}")
+        entry = _QueuedRun(sort_key=self._sort_key(req), req=req)
+        self._queued[req.run_id] = entry
+        heapq.heappush(self._ready, entry)
+
+    def cancel(self, run_id: str) -> bool:
+        entry = self._queued.pop(run_id, None)
+        if entry is None:
+            return False
+        # Lazily dropped when it reaches the top of whichever heap holds it.
+        was_ready = entry.location == "ready"
+        entry.location = "cancelled"
+        if was_ready:
+            # It may hold the wake-up for locks released by complete(); pass it on.
+            self._hand_on(entry.req)
+        return True
+
+    def _park(self, entry: _QueuedRun, lock: str) -> None:
+        entry.location = lock
+        heapq.heappush(self._waiters.setdefault(lock, []), entry)
+
+    def _wake_one(self, lock: str) -> None:
+        waiters = self._waiters.get(lock)
+        while waiters:
+            entry = heapq.heappop(waiters)
+            if entry.location == lock:
+                entry.location = "ready"
+                heapq.heappush(self._ready, entry)
+                break
+        if not waiters:
+            self._waiters.pop(lock, None)
+
+    def _hand_on(self, req: RunRequest, skip: str | None = None) -> None:
+        """Wake the next waiter on each of ``req``'s locks that is free."""
+        for lock in req.required_locks:
+            if lock != skip and not self.locks.is_held(lock) and lock in self._waiters:
+                self._wake_one(lock)
 
     def tick(self) -> List[RunRequest]:
         started: List[RunRequest] = []
-        if len(self.running) >= self.max_concurrent_runs:
-            return started
-
-        remaining: Deque[RunRequest] = deque()
-        while self.queue and len(self.running) < self.max_concurrent_runs:
-            req = self.queue.popleft()
-            if self.locks.try_acquire(req.run_id, req.required_locks):
+        while self._ready and len(self.running) < self.max_concurrent_runs:
+            entry = heapq.heappop(self._ready)
+            if entry.location != "ready":
+                continue
+            req = entry.req
+            blocking = self.locks.conflict(req.run_id, req.required_locks)
+            if blocking is None:
+                self.locks.try_acquire(req.run_id, req.required_locks)
+                del self._queued[req.run_id]
+                entry.location = "running"
                 self.running[req.run_id] = req
                 started.append(req)
-            else:
-                remaining.append(req)
-
-        while self.queue:
-            remaining.append(self.queue.popleft())
-        self.queue = remaining
+                continue
+            self._park(entry, blocking)
+            # This run may have been the one woken for a lock that is still
+            # free; hand that wake-up on so its other waiters are not stranded.
+            self._hand_on(req, skip=blocking)
         return started
 
     def complete(self, run_id: str) -> None:
         if run_id in self.running:
             del self.running[run_id]
-        self.locks.release(run_id)
+        for lock in self.locks.release(run_id):
+            self._wake_one(lock)
+
+    def __len__(self) -> int:
+        return len(self._queued)
 
     def snapshot(self) -> Dict[str, object]:
+        queued = sorted(self._queued.values())
         return {
-            "queued": [r.run_id for r in self.queue],
+            "queued": [entry.req.run_id for entry in queued],
             "running": list(self.running.keys()),
             "held_locks": self.locks.held_locks(),
             "max_concurrent_runs": self.max_concurrent_runs,
@@ -6,9 +6,11 @@ import hmac
 import json
 import os
 import secrets
+import threading
 import time
+from collections import OrderedDict
 from dataclasses import dataclass
-from typing import Any, Dict, Mapping
+from typing import Any, Dict, Mapping, Tuple
 
 
 def _env_truthy(name: str, default: bool = False) -> bool:
@@ -138,8 +140,136 @@ class SecurityGateDecision:
         }
 
 
-def _is_risky_run(manifest: Mapping[str, Any], inputs: Mapping[str, Any]) -> bool:
-    if _env_truthy("OPENCLAW_SECURITY_REQUIRE_FOR_ALL_RUNS", default=False):
+@dataclass(frozen=True)
+class SecurityPolicy:
+    """Gate settings, parsed from ``OPENCLAW_SECURITY_*`` env vars."""
+
+    enabled: bool = False
+    require_for_all_runs: bool = False
+    signing_key: str = ""
+    max_age_seconds: int = 7 * 24 * 60 * 60
+    expected_user: str = ""
+    required_method: str = "totp"
+    expected_binding: str = ""
+    confirm_contact: str = ""
+
+    @classmethod
+    def from_env(cls) -> "SecurityPolicy":
+        return cls(
+            enabled=_env_truthy("OPENCLAW_SECURITY_GATE_ENABLED", default=False),
+            require_for_all_runs=_env_truthy("OPENCLAW_SECURITY_REQUIRE_FOR_ALL_RUNS", default=False),
+            signing_key=os.getenv("OPENCLAW_SECURITY_SIGNING_KEY", "").strip(),
+            max_age_seconds=int(os.getenv("OPENCLAW_SECURITY_MAX_AGE_SECONDS", str(7 * 24 * 60 * 60))),
+            expected_user=_normalize_user_id(os.getenv("OPENCLAW_SECURITY_EXPECTED_USER_ID", "")),
+            required_method=os.getenv("OPENCLAW_SECURITY_REQUIRED_METHOD", "totp").strip().lower(),
+            expected_binding=_normalize_binding(os.getenv("OPENCLAW_SECURITY_EXPECTED_SESSION_BINDING", "")),
+            confirm_contact=os.getenv("OPENCLAW_SECURITY_CONFIRM_IMESSAGE", "").strip(),
+        )
+
+
+_POLICY_ENV = (
+    "OPENCLAW_SECURITY_GATE_ENABLED",
+    "OPENCLAW_SECURITY_REQUIRE_FOR_ALL_RUNS",
+    "OPENCLAW_SECURITY_SIGNING_KEY",
+    "OPENCLAW_SECURITY_MAX_AGE_SECONDS",
+    "OPENCLAW_SECURITY_EXPECTED_USER_ID",
+    "OPENCLAW_SECURITY_REQUIRED_METHOD",
+    "OPENCLAW_SECURITY_EXPECTED_SESSION_BINDING",
+    "OPENCLAW_SECURITY_CONFIRM_IMESSAGE",
+)
+_POLICY: Tuple[Tuple[str | None, ...], SecurityPolicy] | None = None
+_POLICY_LOCK = threading.Lock()
+
+
+def current_security_policy() -> SecurityPolicy:
+    """The env policy, re-parsed only when one of its variables changes."""
+    global _POLICY
+    raw = tuple(os.environ.get(name) for name in _POLICY_ENV)
+    with _POLICY_LOCK:
+        if _POLICY is None or _POLICY[0] != raw:
+            _POLICY = (raw, SecurityPolicy.from_env())
+        return _POLICY[1]
+
+
+def _same_payload(cached: Mapping[str, Any], payload: Mapping[str, Any]) -> bool:
+    # Type-strict: 1, 1.0 and True compare equal but sign differently.
+    return len(cached) == len(payload) and all(
+        key in payload and type(payload[key]) is type(value) and payload[key] == value
+        for key, value in cached.items()
+    )
+
+
+class VerifiedAssertionCache:
+    """Bounded LRU of assertions whose signature already checked out.
+
+    Keyed by signature; a hit also requires the same payload and signing key,
+    so a tampered assertion reusing a known signature is still rejected. Entries
+    are dropped once the assertion's ``expires_at`` has passed. Only the HMAC is
+    skipped on a hit; time, user, method and binding checks always run.
+    """
+
+    def __init__(self, max_entries: int = 256) -> None:
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[Dict[str, Any], str, int]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def contains(self, signature: str, payload: Mapping[str, Any], signing_key: str, now: int) -> bool:
+        with self._lock:
+            entry = self._entries.get(signature)
+            if entry is not None and now > entry[2]:
+                del self._entries[signature]
+                entry = None
+            if entry is None or entry[1] != signing_key or not _same_payload(entry[0], payload):
+                self.misses += 1
+                return False
+            self._entries.move_to_end(signature)
+            self.hits += 1
+            return True
+
+    def add(self, signature: str, payload: Mapping[str, Any], signing_key: str, expires_at: int) -> None:
+        if self.max_entries <= 0:
+            return
+        with self._lock:
+            self._entries[signature] = (dict(payload), signing_key, expires_at)
+            self._entries.move_to_end(signature)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+
+_SHARED_ASSERTION_CACHE: VerifiedAssertionCache | None = None
+_SHARED_ASSERTION_CACHE_LOCK = threading.Lock()
+
+
+def shared_assertion_cache() -> VerifiedAssertionCache:
+    """Process-wide cache sized by ``OPENCLAW_SECURITY_ASSERTION_CACHE_SIZE`` (``0`` disables)."""
+    global _SHARED_ASSERTION_CACHE
+    with _SHARED_ASSERTION_CACHE_LOCK:
+        if _SHARED_ASSERTION_CACHE is None:
+            _SHARED_ASSERTION_CACHE = VerifiedAssertionCache(
+                max_entries=int(os.getenv("OPENCLAW_SECURITY_ASSERTION_CACHE_SIZE", "256"))
+            )
+        return _SHARED_ASSERTION_CACHE
+
+
+def _int_field(assertion: Mapping[str, Any], name: str) -> int:
+    try:
+        return int(assertion.get(name, 0))
+    except (TypeError, ValueError):
+        return 0
+
+
+def _is_risky_run(manifest: Mapping[str, Any], inputs: Mapping[str, Any], policy: SecurityPolicy) -> bool:
+    if policy.require_for_all_runs:
         return True
     if isinstance(inputs.get("credential_refs"), dict) and bool(inputs.get("credential_refs")):
         return True
@@ -168,17 +298,19 @@ def evaluate_security_gate(
     manifest: Mapping[str, Any],
     inputs: Mapping[str, Any],
     now_ts: int | None = None,
+    policy: SecurityPolicy | None = None,
+    assertion_cache: VerifiedAssertionCache | None = None,
 ) -> SecurityGateDecision:
-    enabled = _env_truthy("OPENCLAW_SECURITY_GATE_ENABLED", default=False)
-    risky = _is_risky_run(manifest, inputs)
-    if not enabled:
+    policy = policy or current_security_policy()
+    risky = _is_risky_run(manifest, inputs, policy)
+    if not policy.enabled:
         return SecurityGateDecision(enabled=False, risky=risky, allowed=True, required=False)
     if not risky:
         return SecurityGateDecision(enabled=True, risky=False, allowed=True, required=False)
 
     assertion = inputs.get("security_assertion")
     if not isinstance(assertion, dict):
-        contact = os.getenv("OPENCLAW_SECURITY_CONFIRM_IMESSAGE", "").strip()
+        contact = policy.confirm_contact
         hint = " Provide a fresh verified security_assertion before running risky automations."
         if contact:
             hint += f" If in doubt, request confirmation via iMessage ({contact})."
@@ -190,7 +322,7 @@ def evaluate_security_gate(
             reason="Security gate blocked run: missing security_assertion." + hint,
         )
 
-    signing_key = os.getenv("OPENCLAW_SECURITY_SIGNING_KEY", "").strip()
+    signing_key = policy.signing_key
     if not signing_key:
         return SecurityGateDecision(
             enabled=True,
@@ -202,21 +334,25 @@ def evaluate_security_gate(
             ),
         )
 
+    now = int(now_ts if now_ts is not None else time.time())
+    cache = assertion_cache if assertion_cache is not None else shared_assertion_cache()
     signed_payload = {k: v for k, v in assertion.items() if k != "signature"}
-    expected_sig = sign_assertion_payload(signed_payload, signing_key)
     provided_sig = str(assertion.get("signature", ""))
-    if not hmac.compare_digest(expected_sig, provided_sig):
-        return SecurityGateDecision(
-            enabled=True,
-            risky=True,
-            allowed=False,
-            required=True,
-            reason="Security gate blocked run: invalid security_assertion signature.",
-        )
+    if not cache.contains(provided_sig, signed_payload, signing_key, now):
+        expected_sig = sign_assertion_payload(signed_payload, signing_key)
+        if not hmac.compare_digest(expected_sig, provided_sig):
+            return SecurityGateDecision(
+                enabled=True,
+                risky=True,
+                allowed=False,
+                required=True,
+                reason="Security gate blocked run: invalid security_assertion signature.",
+            )
+        if _int_field(assertion, "expires_at") >= now:
+            cache.add(provided_sig, signed_payload, signing_key, _int_field(assertion, "expires_at"))
 
-    now = int(now_ts if now_ts is not None else time.time())
-    verified_at = int(assertion.get("verified_at", 0))
-    expires_at = int(assertion.get("expires_at", 0))
+    verified_at = _int_field(assertion, "verified_at")
+    expires_at = _int_field(assertion, "expires_at")
     if verified_at <= 0 or expires_at <= 0:
         return SecurityGateDecision(
             enabled=True,
@@ -234,7 +370,7 @@ def evaluate_security_gate(
             reason="Security gate blocked run: verification assertion expired.",
         )
 
-    max_age = int(os.getenv("OPENCLAW_SECURITY_MAX_AGE_SECONDS", str(7 * 24 * 60 * 60)))
+    max_age = policy.max_age_seconds
     if now - verified_at > max_age:
         return SecurityGateDecision(
             enabled=True,
@@ -247,7 +383,7 @@ def evaluate_security_gate(
             ),
         )
 
-    expected_user = _normalize_user_id(os.getenv("OPENCLAW_SECURITY_EXPECTED_USER_ID", ""))
+    expected_user = policy.expected_user
     assertion_user = _normalize_user_id(str(assertion.get("user_id", "")))
     if expected_user and assertion_user != expected_user:
         return SecurityGateDecision(
@@ -261,7 +397,7 @@ def evaluate_security_gate(
             ),
         )
 
-    required_method = os.getenv("OPENCLAW_SECURITY_REQUIRED_METHOD", "totp").strip().lower()
+    required_method = policy.required_method
     method = str(assertion.get("verification_method", "")).strip().lower()
     if required_method and method != required_method:
         return SecurityGateDecision(
@@ -275,7 +411,7 @@ def evaluate_security_gate(
             ),
         )
 
-    expected_binding = _normalize_binding(os.getenv("OPENCLAW_SECURITY_EXPECTED_SESSION_BINDING", ""))
+    expected_binding = policy.expected_binding
     if expected_binding:
         actual_binding = _normalize_binding(str(assertion.get("session_binding", "")))
         if actual_binding != expected_binding:
@@ -0,0 +1,269 @@
+"""Resident engine server.
+
+Keeps one AutomationEngine (with its compiled schemas and loaded runners)
+warm in memory and accepts run / run-query requests as JSON over localhost
+HTTP, so callers skip interpreter startup and imports on every request.
+
+Endpoints:
+- ``GET /healthz``
+- ``POST /run``        body: ``{"script_dir": str, "inputs": {...}}``
+- ``POST /run-query``  body: ``{"query": str, "credential_refs": {...}, "security_assertion": {...}}``
+
+Responses carry the same JSON the CLI prints for ``run`` / ``run-query``.
+
+Any web page the user has open can reach localhost, so POSTs always need the
+bearer token (``OPENCLAW_ENGINE_SERVER_TOKEN``, else one generated into a
+0600 token file that local clients read), an ``application/json`` body, and
+a loopback ``Host`` header, which stops DNS-rebinding pages.
+"""
+from __future__ import annotations
+
+import hmac
+import json
+import os
+import secrets
+import sys
+import urllib.error
+import urllib.request
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Dict, Tuple
+from urllib.parse import urlsplit
+
+from .contract import compiled_validator
+from .engine import AutomationEngine
+from .nl import parse_query_to_run, resolve_script_dir
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+SCRIPT_PARENTS = ("library", "examples", "skills")
+DEFAULT_TOKEN_PATH = "~/.openclaw/engine_server.token"
+LOOPBACK_HOSTS = frozenset({"localhost", "127.0.0.1", "::1"})
+
+
+def _token_path() -> Path:
+    return Path(os.getenv("OPENCLAW_ENGINE_SERVER_TOKEN_FILE", DEFAULT_TOKEN_PATH)).expanduser()
+
+
+def _server_token() -> str:
+    """``OPENCLAW_ENGINE_SERVER_TOKEN``, else the token file's contents; "" if neither exists."""
+    token = os.getenv("OPENCLAW_ENGINE_SERVER_TOKEN", "").strip()
+    if token:
+        return token
+    try:
+        return _token_path().read_text(encoding="utf-8").strip()
+    except OSError:
+        return ""
+
+
+def ensure_server_token() -> str:
+    """The server's token, generating one into a 0600 token file when none is configured."""
+    token = _server_token()
+    if token:
+        return token
+    path = _token_path()
+    path.parent.mkdir(parents=True, exist_ok=True)
+    token = secrets.token_urlsafe(32)
+    try:
+        fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+    except FileExistsError:
+        # Another server wrote it first (or it is empty, which we won't overwrite).
+        token = _server_token()
+        if not token:
+            raise RuntimeError(f"Engine server token file is empty: {path}") from None
+        return token
+    with os.fdopen(fd, "w", encoding="utf-8") as fh:
+        fh.write(token + "\n")
+    return token
+
+
+def warm_up(engine: AutomationEngine, *, load_runners: bool = False) -> int:
+    """Validate every script under the repo and compile its schemas.
+
+    With ``load_runners`` the runner modules are imported too. Returns the
+    number of scripts warmed; broken scripts are reported and skipped.
+    """
+    warmed = 0
+    for parent in SCRIPT_PARENTS:
+        for manifest_path in sorted((engine.root_dir / parent).glob("*/manifest.json")):
+            script_dir = manifest_path.parent
+            try:
+                manifest = engine.validate_script(script_dir)
+                compiled_validator(script_dir / manifest["inputs_schema"])
+                compiled_validator(script_dir / manifest["outputs_schema"])
+                if load_runners:
+                    engine.runners.load(script_dir / manifest["entrypoint"])
+            except Exception as exc:  # noqa: BLE001
+                print(f"[engine_server] skipping {script_dir}: {exc}", file=sys.stderr)
+                continue
+            warmed += 1
+    return warmed
+
+
+class EngineServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(
+        self,
+        engine: AutomationEngine,
+        host: str = DEFAULT_HOST,
+        port: int = DEFAULT_PORT,
+        token: str | None = None,
+    ) -> None:
+        self.engine = engine
+        self.token = token or ensure_server_token()
+        # A non-wildcard bind address is also a legitimate Host (e.g. a LAN IP).
+        self.allowed_hosts = LOOPBACK_HOSTS | ({host.lower()} if host not in ("", "0.0.0.0", "::") else set())
+        super().__init__((host, port), _EngineRequestHandler)
+
+    def _script_dir(self, raw: Any) -> Path:
+        if not isinstance(raw, str) or not raw.strip():
+            raise ValueError("script_dir must be a non-empty string")
+        root = self.engine.root_dir.resolve()
+        script_dir = resolve_script_dir(root, raw)
+        if not script_dir.is_relative_to(root):
+            raise ValueError(f"script_dir must be inside {root}")
+        return script_dir
+
+    def handle_run(self, body: Dict[str, Any]) -> Dict[str, Any]:
+        inputs = body.get("inputs", {})
+        if not isinstance(inputs, dict):
+            raise ValueError("inputs must be a JSON object")
+        return self.engine.run(self._script_dir(body.get("script_dir")), inputs)
+
+    def handle_run_query(self, body: Dict[str, Any]) -> Dict[str, Any]:
+        query = body.get("query")
+        if not isinstance(query, str) or not query.strip():
+            raise ValueError("query must be a non-empty string")
+        parsed = parse_query_to_run(query)
+        for key in ("credential_refs", "security_assertion"):
+            value = body.get(key) or {}
+            if not isinstance(value, dict):
+                raise ValueError(f"{key} must be a JSON object")
+            if value:
+                parsed.inputs[key] = value
+        result = self.engine.run(self._script_dir(parsed.script_dir), parsed.inputs)
+        return {"parsed_notes": parsed.notes, **result}
+
+
+class _EngineRequestHandler(BaseHTTPRequestHandler):
+    server: EngineServer
+
+    def log_message(self, format: str, *args: Any) -> None:  # noqa: A002
+        print(f"[engine_server] {format % args}", file=sys.stderr)
+
+    def _send_json(self, status: int, payload: Dict[str, Any]) -> None:
+        body = json.dumps(payload, sort_keys=True).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _authorized(self) -> bool:
+        provided = self.headers.get("Authorization", "").removeprefix("Bearer ").strip()
+        return hmac.compare_digest(provided, self.server.token)
+
+    def _host_allowed(self) -> bool:
+        try:
+            hostname = urlsplit("//" + self.headers.get("Host", "")).hostname
+        except ValueError:
+            return False
+        return hostname is not None and hostname in self.server.allowed_hosts
+
+    def do_GET(self) -> None:  # noqa: N802
+        if not self._host_allowed():
+            self._send_json(403, {"ok": False, "error": "Host not allowed"})
+            return
+        if self.path != "/healthz":
+            self._send_json(404, {"ok": False, "error": "Not found"})
+            return
+        self._send_json(200, {"ok": True, "root": str(self.server.engine.root_dir)})
+
+    def do_POST(self) -> None:  # noqa: N802
+        handlers = {"/run": self.server.handle_run, "/run-query": self.server.handle_run_query}
+        handler = handlers.get(self.path)
+        if handler is None:
+            self._send_json(404, {"ok": False, "error": "Not found"})
+            return
+        if not self._host_allowed():
+            self._send_json(403, {"ok": False, "error": "Host not allowed"})
+            return
+        if not self._authorized():
+            self._send_json(401, {"ok": False, "error": "Unauthorized"})
+            return
+        if self.headers.get_content_type() != "application/json":
+            self._send_json(415, {"ok": False, "error": "Content-Type must be application/json"})
+            return
+        try:
+            length = int(self.headers.get("Content-Length", "0"))
+            body = json.loads(self.rfile.read(length) or b"{}")
+            if not isinstance(body, dict):
+                raise ValueError("request body must be a JSON object")
+        except (ValueError, json.JSONDecodeError) as exc:
+            self._send_json(400, {"ok": False, "error": str(exc)})
+            return
+        try:
+            result = handler(body)
+        except ValueError as exc:
+            self._send_json(400, {"ok": False, "error": str(exc)})
+            return
+        except Exception as exc:  # noqa: BLE001
+            self._send_json(500, {"ok": False, "error": str(exc)})
+            return
+        self._send_json(200, result)
+
+
+def serve(root: Path, *, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT, preload: bool = False) -> None:
+    engine = AutomationEngine(root)
+    warmed = warm_up(engine, load_runners=preload)
+    server = EngineServer(engine, host=host, port=port)
+    if not os.getenv("OPENCLAW_ENGINE_SERVER_TOKEN", "").strip():
+        print(f"[engine_server] bearer token in {_token_path()}", file=sys.stderr)
+    print(
+        f"[engine_server] listening on http://{host}:{server.server_port} ({warmed} scripts warm)",
+        file=sys.stderr,
+    )
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+def request_server(
+    server_url: str,
+    path: str,
+    payload: Dict[str, Any],
+    timeout_seconds: float | None = None,
+) -> Tuple[int, Dict[str, Any]]:
+    """POST ``payload`` to a running engine server; returns (status, JSON body).
+
+    An unreachable server comes back as status 503 with an error envelope.
+    """
+    if timeout_seconds is None:
+        # Leave headroom over the server-side runner timeout.
+        timeout_seconds = int(os.getenv("OPENCLAW_RUNNER_TIMEOUT_SECONDS", "600")) + 60
+    headers = {"Content-Type": "application/json"}
+    token = _server_token()
+    if token:
+        headers["Authorization"] = f"Bearer {token}"
+    req = urllib.request.Request(
+        url=server_url.rstrip("/") + path,
+        data=json.dumps(payload).encode("utf-8"),
+        headers=headers,
+        method="POST",
+    )
+    try:
+        with urllib.request.urlopen(req, timeout=timeout_seconds) as response:
+            return response.status, json.loads(response.read())
+    except urllib.error.HTTPError as exc:
+        try:
+            body = json.loads(exc.read())
+        except Exception:  # noqa: BLE001
+            body = {"ok": False, "error": f"HTTP {exc.code}"}
+        return exc.code, body
+    except (urllib.error.URLError, OSError) as exc:
+        reason = getattr(exc, "reason", exc)
+        return 503, {"ok": False, "error": f"Engine server unreachable at {server_url}: {reason}"}
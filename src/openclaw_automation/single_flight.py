@@ -0,0 +1,68 @@
+"""Coalesce concurrent identical runs onto one in-flight execution.
+
+The first caller for a key becomes the leader and runs the script; callers
+that arrive with the same key before it finishes join its future and get a
+copy of the leader's envelope instead of queueing a second browser session.
+"""
+from __future__ import annotations
+
+import copy
+import os
+import threading
+from concurrent.futures import Future
+from typing import Any, Dict, Tuple
+
+
+class SingleFlight:
+    def __init__(self) -> None:
+        self._calls: Dict[str, Future] = {}
+        self._lock = threading.Lock()
+        self._leaders = 0
+        self._joined = 0
+
+    def begin(self, key: str) -> Tuple[Future, bool]:
+        """Return ``(future, is_leader)``; only the leader must call ``finish``."""
+        with self._lock:
+            future = self._calls.get(key)
+            if future is not None:
+                self._joined += 1
+                return future, False
+            future = Future()
+            future.set_running_or_notify_cancel()
+            self._calls[key] = future
+            self._leaders += 1
+            return future, True
+
+    def finish(self, key: str, future: Future, result: Any = None, error: BaseException | None = None) -> None:
+        with self._lock:
+            if self._calls.get(key) is future:
+                del self._calls[key]
+        if error is not None:
+            future.set_exception(error)
+        else:
+            # Joiners each copy this snapshot, so later edits by the leader's
+            # caller never leak into their envelopes.
+            future.set_result(copy.deepcopy(result))
+
+    def in_flight(self) -> int:
+        with self._lock:
+            return len(self._calls)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"in_flight": len(self._calls), "leaders": self._leaders, "joined": self._joined}
+
+
+_SHARED_FLIGHTS: SingleFlight | None = None
+_SHARED_FLIGHTS_LOCK = threading.Lock()
+
+
+def shared_single_flight() -> SingleFlight | None:
+    """Process-wide coalescer; None when ``OPENCLAW_SINGLE_FLIGHT=0``."""
+    global _SHARED_FLIGHTS
+    if os.getenv("OPENCLAW_SINGLE_FLIGHT", "1").strip().lower() in ("0", "false", "no", "off"):
+        return None
+    with _SHARED_FLIGHTS_LOCK:
+        if _SHARED_FLIGHTS is None:
+            _SHARED_FLIGHTS = SingleFlight()
+        return _SHARED_FLIGHTS
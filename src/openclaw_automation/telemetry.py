@@ -0,0 +1,280 @@
+"""Per-run spans: where the time in an engine run goes.
+
+Each ``AutomationEngine`` run gets a ``RunTrace`` whose root span
+(``engine.run``) has a child per phase: manifest and input validation,
+security gate, module load, credential lookup, runner execution and output
+validation. Runners add their own sub-phases through ``context["telemetry"]``::
+
+    from openclaw_automation.telemetry import phase
+
+    with phase(context, "login"):
+        ...
+
+Spans are exported as they end to a ``TelemetrySink``: ``JsonlSink`` writes
+one OTLP/JSON-shaped span per line, ``OtelSink`` re-emits them through the
+OpenTelemetry API. ``OPENCLAW_TELEMETRY`` picks the process-wide sink
+(``off`` by default).
+"""
+from __future__ import annotations
+
+import json
+import logging
+import os
+import secrets
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager, nullcontext
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, ContextManager, Dict, Iterator, List, Mapping
+
+try:
+    from opentelemetry import trace as otel_trace
+except ImportError:  # pragma: no cover - optional dependency
+    otel_trace = None  # type: ignore[assignment]
+
+DEFAULT_JSONL_PATH = "~/.openclaw/telemetry/spans.jsonl"
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class Span:
+    name: str
+    trace_id: str
+    span_id: str
+    parent_id: str | None
+    start_ns: int
+    end_ns: int = 0
+    attributes: Dict[str, Any] = field(default_factory=dict)
+    error: str = ""
+
+    @property
+    def duration_ms(self) -> float:
+        return max(0, self.end_ns - self.start_ns) / 1e6
+
+    def as_dict(self) -> Dict[str, Any]:
+        """OTLP/JSON field names, so collectors and ``jq`` read the same records."""
+        return {
+            "traceId": self.trace_id,
+            "spanId": self.span_id,
+            "parentSpanId": self.parent_id or "",
+            "name": self.name,
+            "kind": "SPAN_KIND_INTERNAL",
+            "startTimeUnixNano": str(self.start_ns),
+            "endTimeUnixNano": str(self.end_ns),
+            "attributes": [{"key": k, "value": _otlp_value(v)} for k, v in self.attributes.items()],
+            "status": (
+                {"code": "STATUS_CODE_ERROR", "message": self.error}
+                if self.error
+                else {"code": "STATUS_CODE_OK"}
+            ),
+        }
+
+
+def _otlp_value(value: Any) -> Dict[str, Any]:
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+# ── Sinks ────────────────────────────────────────────────────────────
+
+
+class TelemetrySink:
+    def export(self, span: Span) -> None:
+        raise NotImplementedError
+
+
+class JsonlSink(TelemetrySink):
+    def __init__(self, path: Path | str) -> None:
+        self.path = Path(path).expanduser()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+
+    def export(self, span: Span) -> None:
+        line = json.dumps(span.as_dict(), separators=(",", ":")) + "\n"
+        with self._lock, self.path.open("a", encoding="utf-8") as fh:
+            fh.write(line)
+
+
+class OtelSink(TelemetrySink):
+    """Replays each finished run through the OpenTelemetry API (``opentelemetry-api``).
+
+    Spans are buffered until their root ends so parents can be started
+    before children; exporters come from the application's SDK setup.
+    Spans that end after their root (background cache refreshes) are
+    emitted on their own.
+    """
+
+    def __init__(self, tracer_name: str = "openclaw_automation") -> None:
+        if otel_trace is None:
+            raise RuntimeError("OtelSink requires the 'opentelemetry-api' package")
+        self._tracer = otel_trace.get_tracer(tracer_name)
+        self._pending: Dict[str, List[Span]] = {}
+        self._flushed: "OrderedDict[str, None]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def export(self, span: Span) -> None:
+        with self._lock:
+            if span.parent_id is not None and span.trace_id not in self._flushed:
+                self._pending.setdefault(span.trace_id, []).append(span)
+                return
+            spans = self._pending.pop(span.trace_id, []) + [span]
+            if span.parent_id is None:
+                self._flushed[span.trace_id] = None
+                while len(self._flushed) > 1024:
+                    self._flushed.popitem(last=False)
+        self._replay(spans)
+
+    def _replay(self, spans: List[Span]) -> None:
+        by_id = {s.span_id: s for s in spans}
+
+        def _depth(s: Span) -> int:
+            depth = 0
+            while s.parent_id in by_id:
+                s, depth = by_id[s.parent_id], depth + 1
+            return depth
+
+        started: Dict[str, Any] = {}
+        for s in sorted(spans, key=lambda s: (s.start_ns, _depth(s))):
+            parent = started.get(s.parent_id or "")
+            started[s.span_id] = self._tracer.start_span(
+                s.name,
+                context=otel_trace.set_span_in_context(parent) if parent is not None else None,
+                start_time=s.start_ns,
+                attributes={k: v if isinstance(v, (str, bool, int, float)) else str(v) for k, v in s.attributes.items()},
+            )
+        for s in spans:
+            otel_span = started[s.span_id]
+            if s.error:
+                otel_span.set_status(otel_trace.Status(otel_trace.StatusCode.ERROR, s.error))
+            otel_span.end(end_time=s.end_ns)
+
+
+_SHARED_SINK: tuple[tuple[str, str], TelemetrySink | None] | None = None
+_SHARED_SINK_LOCK = threading.Lock()
+
+
+def _build_sink(mode: str, path: str) -> TelemetrySink | None:
+    if mode == "jsonl":
+        return JsonlSink(path)
+    if mode == "otel":
+        return OtelSink()
+    if mode in ("", "0", "off", "false", "no"):
+        return None
+    raise ValueError(f"Unknown OPENCLAW_TELEMETRY sink: {mode}")
+
+
+def shared_telemetry_sink() -> TelemetrySink | None:
+    """Process-wide sink from ``OPENCLAW_TELEMETRY`` (``off``/``jsonl``/``otel``); None when off.
+
+    A bad mode or an unusable path turns telemetry off with a warning rather
+    than failing runs.
+    """
+    global _SHARED_SINK
+    mode = os.getenv("OPENCLAW_TELEMETRY", "off").strip().lower()
+    path = os.getenv("OPENCLAW_TELEMETRY_PATH", DEFAULT_JSONL_PATH)
+    with _SHARED_SINK_LOCK:
+        if _SHARED_SINK is None or _SHARED_SINK[0] != (mode, path):
+            try:
+                sink = _build_sink(mode, path)
+            except Exception as exc:  # noqa: BLE001
+                logger.warning("Telemetry disabled: cannot set up OPENCLAW_TELEMETRY=%s: %s", mode, exc)
+                sink = None
+            _SHARED_SINK = ((mode, path), sink)
+        return _SHARED_SINK[1]
+
+
+# ── Traces ───────────────────────────────────────────────────────────
+
+
+class RunTrace:
+    """Spans for one run; a no-op when ``sink`` is None."""
+
+    def __init__(self, sink: TelemetrySink | None, name: str = "engine.run", **attributes: Any) -> None:
+        self.sink = sink
+        self.trace_id = secrets.token_hex(16)
+        self.root = Span(name, self.trace_id, secrets.token_hex(8), None, time.time_ns(), attributes=dict(attributes))
+        # Parent for runner phases opened on threads the runner starts itself.
+        self.runner_span_id: str | None = None
+        self._local = threading.local()
+        self._finished = False
+
+    @property
+    def enabled(self) -> bool:
+        return self.sink is not None
+
+    def annotate(self, **attributes: Any) -> None:
+        self.root.attributes.update(attributes)
+
+    @contextmanager
+    def span(self, name: str, *, fallback_parent: str | None = None, **attributes: Any) -> Iterator[Span | None]:
+        """Child of the innermost open span on this thread, else ``fallback_parent`` or the root."""
+        if self.sink is None:
+            yield None
+            return
+        stack: List[str] = self._local.__dict__.setdefault("stack", [])
+        parent = stack[-1] if stack else (fallback_parent or self.root.span_id)
+        span = Span(name, self.trace_id, secrets.token_hex(8), parent, time.time_ns(), attributes=dict(attributes))
+        stack.append(span.span_id)
+        try:
+            yield span
+        except BaseException as exc:
+            span.error = f"{type(exc).__name__}: {exc}"
+            raise
+        finally:
+            stack.pop()
+            span.end_ns = time.time_ns()
+            self._export(span)
+
+    def finish(self, envelope: Mapping[str, Any] | None = None, error: BaseException | None = None) -> None:
+        if self._finished:
+            return
+        self._finished = True
+        if envelope is not None:
+            self.root.attributes["ok"] = bool(envelope.get("ok"))
+            if not envelope.get("ok"):
+                self.root.error = str(envelope.get("error", ""))
+        if error is not None:
+            self.root.error = f"{type(error).__name__}: {error}"
+        self.root.end_ns = time.time_ns()
+        self._export(self.root)
+
+    def _export(self, span: Span) -> None:
+        if self.sink is None:
+            return
+        try:
+            self.sink.export(span)
+        except Exception:  # noqa: BLE001
+            pass  # telemetry must never fail a run
+
+
+class RunPhases:
+    """``context["telemetry"]``: ``with phases.phase("login"):`` records a runner sub-span."""
+
+    def __init__(self, trace: RunTrace | None) -> None:
+        self._trace = trace
+
+    def phase(self, name: str, **attributes: Any) -> ContextManager[Any]:
+        if self._trace is None:
+            return nullcontext()
+        # Phases on threads the runner starts itself still nest under runner.run.
+        return self._trace.span(f"runner.{name}", fallback_parent=self._trace.runner_span_id, **attributes)
+
+    def __reduce__(self):
+        # Process-mode runners get a recorder that drops spans.
+        return (RunPhases, (None,))
+
+
+def phase(context: Mapping[str, Any] | None, name: str, **attributes: Any) -> ContextManager[Any]:
+    """Runner sub-phase span; a no-op when the caller passed no telemetry."""
+    phases = context.get("telemetry") if isinstance(context, Mapping) else None
+    if isinstance(phases, RunPhases):
+        return phases.phase(name, **attributes)
+    return nullcontext()
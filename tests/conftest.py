@@ -0,0 +1,35 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+from typing import Any, Callable
+
+import pytest
+
+
+def _write_script(script_dir: Path, runner_body: str, **manifest: Any) -> Path:
+    """Minimal script directory around ``runner_body``; ``manifest`` adds or overrides fields."""
+    script_dir.mkdir()
+    fields = {
+        "id": f"test.{script_dir.name}",
+        "version": "0.1.0",
+        "entrypoint": "runner.py",
+        "inputs_schema": "schemas/input.json",
+        "outputs_schema": "schemas/output.json",
+        "permissions": {"browser": False, "network_domains": []},
+        "requires_human_steps": [],
+        **manifest,
+    }
+    (script_dir / "manifest.json").write_text(json.dumps(fields))
+    schemas = script_dir / "schemas"
+    schemas.mkdir()
+    (schemas / "input.json").write_text('{"type":"object"}')
+    (schemas / "output.json").write_text('{"type":"object"}')
+    (script_dir / "runner.py").write_text(runner_body)
+    return script_dir
+
+
+@pytest.fixture()
+def write_script() -> Callable[..., Path]:
+    """``write_script(script_dir, runner_body, **manifest)`` builds a throwaway automation script."""
+    return _write_script
@@ -0,0 +1,126 @@
+import json
+import sqlite3
+
+from openclaw_automation.award_store import AwardStore, search_key
+
+
+def _inputs(cabin: str = "business", days_ahead: int = 60) -> dict:
+    return {"from": "SFO", "to": ["NRT"], "days_ahead": days_ahead, "max_miles": 200000, "travelers": 2, "cabin": cabin}
+
+
+def _result(*rows, mode: str = "live") -> dict:
+    return {
+        "mode": mode,
+        "real_data": mode != "placeholder",
+        "matches": [
+            {"route": "SFO-NRT", "date": date, "miles": miles, "cabin": "business", "travelers": 2}
+            for date, miles in rows
+        ],
+        "errors": [],
+    }
+
+
+def test_store_uses_wal_and_indexes(tmp_path) -> None:
+    store = AwardStore(tmp_path / "awards.sqlite3")
+    store.record_result("ana.award_search", _inputs(), _result(("2026-06-01", 90000)))
+    store.close()
+    conn = sqlite3.connect(tmp_path / "awards.sqlite3")
+    assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+    plan = " ".join(
+        str(row) for row in conn.execute(
+            "EXPLAIN QUERY PLAN SELECT * FROM observations WHERE airline='ana' AND route='SFO-NRT'"
+            " AND date='2026-06-01' AND cabin='business'"
+        )
+    )
+    assert "idx_observations_key" in plan
+
+
+def test_placeholder_results_are_not_recorded(tmp_path) -> None:
+    store = AwardStore(tmp_path / "awards.sqlite3")
+    assert store.record_result("ana.award_search", _inputs(), _result(("2026-06-01", 1), mode="placeholder")) is None
+    assert store.latest_scans("ana") == []
+
+
+def test_cheapest_per_date_and_price_history(tmp_path) -> None:
+    store = AwardStore(tmp_path / "awards.sqlite3")
+    store.record_result("ana.award_search", _inputs(), _result(("2026-06-01", 95000), ("2026-06-02", 88000)),
+                        observed_at="2026-05-01T00:00:00+00:00")
+    store.record_result("ana.award_search", _inputs(), _result(("2026-06-01", 90000)),
+                        observed_at="2026-05-02T00:00:00+00:00")
+
+    cheapest = store.cheapest_per_date("ana", "SFO-NRT", "business")
+    assert [(r["date"], r["miles"], r["sightings"]) for r in cheapest] == [
+        ("2026-06-01", 90000, 2),
+        ("2026-06-02", 88000, 1),
+    ]
+    recent = store.cheapest_per_date("ana", "SFO-NRT", since="2026-05-02")
+    assert [(r["date"], r["miles"], r["sightings"]) for r in recent] == [("2026-06-01", 90000, 1)]
+
+    history = store.price_history("ana", "SFO-NRT", "2026-06-01")
+    assert [(r["observed_at"][:10], r["miles"]) for r in history] == [("2026-05-01", 95000), ("2026-05-02", 90000)]
+
+
+def test_new_availability_compares_with_previous_scan_of_same_search(tmp_path) -> None:
+    store = AwardStore(tmp_path / "awards.sqlite3")
+    store.record_result("ana.award_search", _inputs(), _result(("2026-06-01", 90000)))
+    assert [r["date"] for r in store.new_availability("ana", _inputs())] == ["2026-06-01"]
+
+    # A different search in between does not count as the previous scan.
+    store.record_result("ana.award_search", _inputs("economy"), _result())
+    store.record_result("ana.award_search", _inputs(), _result(("2026-06-01", 85000), ("2026-06-03", 70000)))
+    new = store.new_availability("ana", _inputs())
+    assert [(r["date"], r["miles"]) for r in new] == [("2026-06-03", 70000)]
+
+
+def test_new_availability_compares_within_one_departure_window(tmp_path) -> None:
+    store = AwardStore(tmp_path / "awards.sqlite3")
+    store.record_result("ana.award_search", _inputs(days_ahead=60), _result(("2026-06-01", 90000)))
+    # Another departure date of the same route is a different window.
+    store.record_result("ana.award_search", _inputs(days_ahead=61), _result(("2026-06-02", 90000)))
+    store.record_result("ana.award_search", _inputs(days_ahead=60), _result(("2026-06-01", 90000)))
+    assert store.new_availability("ana", _inputs(days_ahead=60)) == []
+
+
+def test_failed_scans_are_recorded_without_observations(tmp_path) -> None:
+    store = AwardStore(tmp_path / "awards.sqlite3")
+    store.record_result("ana.award_search", _inputs(), _result(("2026-06-01", 90000)))
+    failed = {**_result(("2026-06-03", 1)), "real_data": False, "errors": ["Form not found"]}
+    scan_id = store.record_result("ana.award_search", _inputs(), failed)
+    assert scan_id is not None
+    assert store.latest_scans("ana", limit=1)[0]["failed"] == 1
+    assert store.scan_observations(scan_id) == []
+    assert store.new_availability("ana", _inputs()) == []
+
+    # The next good scan is compared with the last good one, not the failure.
+    store.record_result("ana.award_search", _inputs(), _result(("2026-06-01", 90000), ("2026-06-03", 70000)))
+    assert [r["date"] for r in store.new_availability("ana", _inputs())] == ["2026-06-03"]
+
+
+def test_old_stores_are_migrated(tmp_path) -> None:
+    path = tmp_path / "awards.sqlite3"
+    conn = sqlite3.connect(path)
+    conn.execute(
+        "CREATE TABLE scans (id INTEGER PRIMARY KEY, airline TEXT NOT NULL, script_id TEXT NOT NULL,"
+        " search_key TEXT NOT NULL, inputs TEXT NOT NULL, mode TEXT NOT NULL, match_count INTEGER NOT NULL,"
+        " errors TEXT NOT NULL, observed_at TEXT NOT NULL)"
+    )
+    conn.execute(
+        "INSERT INTO scans VALUES (1, 'ana', 'ana.award_search', 'old', ?, 'live', 0, '[\"timeout\"]',"
+        " '2026-05-01T12:00:00+00:00')",
+        (json.dumps(_inputs()),),
+    )
+    conn.commit()
+    conn.close()
+
+    scan = AwardStore(path).latest_scans("ana")[0]
+    assert scan["failed"] == 1
+    assert json.loads(scan["search_key"])["depart"] == "2026-06-30"
+    assert scan["search_key"] == search_key(_inputs(), "2026-06-30")
+
+
+def test_record_envelope_uses_script_id_prefix_as_airline(tmp_path) -> None:
+    store = AwardStore(tmp_path / "awards.sqlite3")
+    envelope = {"ok": True, "script_id": "delta.award_search", "inputs": _inputs(), "result": _result(("2026-06-05", 30000))}
+    assert store.record_envelope(envelope) is not None
+    assert store.record_envelope({"ok": False, "script_id": "delta.award_search", "error": "boom"}) is None
+    assert store.latest_scans("delta")[0]["match_count"] == 1
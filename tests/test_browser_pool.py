@@ -0,0 +1,161 @@
+from __future__ import annotations
+
+import threading
+from pathlib import Path
+
+import pytest
+
+from openclaw_automation import browser_pool
+from openclaw_automation.browser_pool import BrowserPool
+from openclaw_automation.cancellation import RunCancelled
+
+
+class _FakePage:
+    def __init__(self) -> None:
+        self.closed = False
+        self.thread = threading.get_ident()
+        self.visits: list = []
+
+    def is_closed(self) -> bool:
+        return self.closed
+
+    def evaluate(self, _expr: str) -> int:
+        return 1
+
+
+class _FakeContext:
+    def __init__(self, storage_state=None) -> None:
+        self.storage_state_in = storage_state
+        self.pages: list = []
+
+    def new_page(self) -> _FakePage:
+        page = _FakePage()
+        self.pages.append(page)
+        return page
+
+    def storage_state(self, path: str) -> None:
+        Path(path).write_text('{"cookies": []}')
+
+    def close(self) -> None:
+        pass
+
+
+class _FakeBrowser:
+    def __init__(self) -> None:
+        self.connected = True
+        self.contexts = [_FakeContext()]
+        self.new_contexts: list = []
+
+    def is_connected(self) -> bool:
+        return self.connected
+
+    def new_context(self, storage_state=None) -> _FakeContext:
+        ctx = _FakeContext(storage_state)
+        self.new_contexts.append(ctx)
+        return ctx
+
+    def close(self) -> None:
+        self.connected = False
+
+
+class _FakeConnector:
+    def __init__(self) -> None:
+        self.browsers: list = []
+
+    def __call__(self, cdp_url: str):
+        browser = _FakeBrowser()
+        self.browsers.append(browser)
+        return object(), browser
+
+
+@pytest.fixture()
+def pool(tmp_path: Path):
+    connector = _FakeConnector()
+    pool = BrowserPool("http://127.0.0.1:9222", connector=connector, storage_dir=tmp_path, health_interval_seconds=0.05)
+    pool.connector_calls = connector
+    yield pool
+    pool.close()
+
+
+def test_back_to_back_runs_reuse_connection_and_page(pool: BrowserPool) -> None:
+    first = pool.run_on_page("delta.com", lambda page: page, timeout_seconds=5)
+    second = pool.run_on_page("delta.com", lambda page: page, timeout_seconds=5)
+    assert first is second
+    assert len(pool.connector_calls.browsers) == 1
+    # Pages are only ever touched on the lane thread that created them.
+    assert first.thread != threading.get_ident()
+
+
+def test_sites_get_separate_lanes(pool: BrowserPool) -> None:
+    delta = pool.run_on_page("delta.com", lambda page: page, timeout_seconds=5)
+    sia = pool.run_on_page("singaporeair.com", lambda page: page, timeout_seconds=5)
+    assert delta is not sia
+    assert set(pool.stats()) == {"delta.com#0", "singaporeair.com#0"}
+
+
+def test_lease_keeps_same_page_across_calls(pool: BrowserPool) -> None:
+    with pool.lease("ana.co.jp") as lease:
+        lease.run(lambda page: page.visits.append("login"), timeout_seconds=5)
+        visits = lease.run(lambda page: list(page.visits), timeout_seconds=5)
+    assert visits == ["login"]
+
+
+def test_health_check_drops_dead_connection(pool: BrowserPool) -> None:
+    pool.run_on_page("delta.com", lambda page: None, timeout_seconds=5)
+    pool.connector_calls.browsers[0].connected = False
+    pool.run_on_page("delta.com", lambda page: None, timeout_seconds=5)
+    assert len(pool.connector_calls.browsers) == 2
+
+
+def test_isolated_context_persists_storage(pool: BrowserPool, tmp_path: Path) -> None:
+    pool.run_on_page("united.com", lambda page: None, isolated=True, timeout_seconds=5)
+    assert (tmp_path / "united.com.json").exists()
+
+
+def test_errors_propagate_to_caller(pool: BrowserPool) -> None:
+    def _boom(page):
+        raise ValueError("page blew up")
+
+    with pytest.raises(ValueError, match="page blew up"):
+        pool.run_on_page("delta.com", _boom, timeout_seconds=5)
+
+
+def test_login_tracking(pool: BrowserPool) -> None:
+    assert pool.logged_in_recently("delta.com") is False
+    pool.mark_logged_in("delta.com")
+    assert pool.logged_in_recently("delta.com") is True
+    pool.invalidate_login("delta.com")
+    assert pool.logged_in_recently("delta.com") is False
+
+
+def test_shared_pools_are_per_browser(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(browser_pool, "_SHARED_POOLS", {})
+    monkeypatch.setenv("OPENCLAW_CDP_URL", "http://127.0.0.1:9222")
+    default = browser_pool.shared_browser_pool()
+    other = browser_pool.shared_browser_pool("http://127.0.0.1:9223")
+    assert default is browser_pool.shared_browser_pool("http://127.0.0.1:9222")
+    assert other is not default and other.cdp_url == "http://127.0.0.1:9223"
+    # Logins are per browser: each Chrome has its own cookies.
+    default.mark_logged_in("delta.com")
+    assert other.logged_in_recently("delta.com") is False
+
+
+def test_on_login_page_spots_sign_in_redirects() -> None:
+    class _Page:
+        def __init__(self, url: str) -> None:
+            self.url = url
+
+    assert browser_pool.on_login_page(_Page("https://www.delta.com/login/loginPage?redirect=x"))
+    assert browser_pool.on_login_page(_Page("https://www.singaporeair.com/en_UK/us/ppsclub-krisflyer/login/"))
+    assert not browser_pool.on_login_page(_Page("https://www.singaporeair.com/en_UK/us/home#/book/redeemflight"))
+
+
+def test_run_on_page_stops_waiting_once_cancelled(pool: BrowserPool) -> None:
+    cancel = threading.Event()
+    release = threading.Event()
+    threading.Timer(0.1, cancel.set).start()
+    try:
+        with pytest.raises(RunCancelled):
+            pool.run_on_page("delta.com", lambda page: release.wait(5), timeout_seconds=5, cancel_event=cancel)
+    finally:
+        release.set()
@@ -0,0 +1,43 @@
+import threading
+import time
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
+
+import pytest
+
+from openclaw_automation.cancellation import RunCancelled, cancel_event_of, join_thread, wait_future
+
+
+def test_cancel_event_of_ignores_missing_or_foreign_values() -> None:
+    event = threading.Event()
+    assert cancel_event_of({"cancel_event": event}) is event
+    assert cancel_event_of({"cancel_event": "nope"}) is None
+    assert cancel_event_of(None) is None
+
+
+def test_wait_future_raises_once_cancelled() -> None:
+    cancel = threading.Event()
+    threading.Timer(0.1, cancel.set).start()
+    future: Future = Future()
+    started = time.monotonic()
+    with pytest.raises(RunCancelled):
+        wait_future(future, timeout_seconds=10, cancel_event=cancel)
+    assert time.monotonic() - started < 2
+    assert future.cancelled()
+
+
+def test_wait_future_still_times_out() -> None:
+    with pytest.raises(FutureTimeoutError):
+        wait_future(Future(), timeout_seconds=0.3, cancel_event=threading.Event())
+
+
+def test_join_thread_returns_early_once_cancelled() -> None:
+    release = threading.Event()
+    thread = threading.Thread(target=release.wait, args=(10,), daemon=True)
+    thread.start()
+    cancel = threading.Event()
+    threading.Timer(0.1, cancel.set).start()
+    started = time.monotonic()
+    assert join_thread(thread, 10, cancel) is False
+    assert time.monotonic() - started < 2
+    release.set()
+    assert join_thread(thread, 5) is True
@@ -0,0 +1,119 @@
+from __future__ import annotations
+
+import base64
+import hashlib
+import json
+import socket
+import socketserver
+import threading
+
+import pytest
+
+from openclaw_automation.cdp_health import CdpHealthProbe, _recv_frame
+
+
+class _FakeCdpHandler(socketserver.BaseRequestHandler):
+    def handle(self) -> None:
+        sock = self.request
+        head = b""
+        while b"\r\n\r\n" not in head:
+            chunk = sock.recv(1024)
+            if not chunk:
+                return
+            head += chunk
+        lines = head.decode("latin-1").split("\r\n")
+        path = lines[0].split(" ")[1]
+        headers = {k.strip().lower(): v.strip() for k, _, v in (line.partition(":") for line in lines[1:] if line)}
+        server = self.server
+        server.requests.append(path)
+        if path == "/json/version":
+            port = server.server_address[1]
+            body = json.dumps({
+                "Browser": "Chrome/130.0",
+                "webSocketDebuggerUrl": f"ws://127.0.0.1:{port}/devtools/browser/abc",
+            }).encode()
+            sock.sendall(
+                b"HTTP/1.1 200 OK\r\nContent-Type: application/json\r\n"
+                + f"Content-Length: {len(body)}\r\nConnection: close\r\n\r\n".encode()
+                + body
+            )
+            return
+        if server.reject_websocket:
+            sock.sendall(b"HTTP/1.1 403 Forbidden\r\nContent-Length: 0\r\n\r\n")
+            return
+        accept = base64.b64encode(
+            hashlib.sha1((headers["sec-websocket-key"] + "258EAFA5-E914-47DA-95CA-C5AB0DC85B11").encode()).digest()
+        ).decode()
+        sock.sendall(
+            "HTTP/1.1 101 Switching Protocols\r\nUpgrade: websocket\r\nConnection: Upgrade\r\n"
+            f"Sec-WebSocket-Accept: {accept}\r\n\r\n".encode()
+        )
+        _opcode, payload = _recv_frame(sock)
+        request = json.loads(payload)
+        server.commands.append(request["method"])
+        for message in (
+            {"method": "Target.targetCreated", "params": {}},
+            {"id": request["id"], "result": {"product": "Chrome/130.0.1"}},
+        ):
+            data = json.dumps(message).encode()
+            sock.sendall(bytes([0x81, len(data)]) + data)
+
+
+@pytest.fixture()
+def fake_cdp():
+    server = socketserver.ThreadingTCPServer(("127.0.0.1", 0), _FakeCdpHandler)
+    server.daemon_threads = True
+    server.requests = []
+    server.commands = []
+    server.reject_websocket = False
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def _url(server) -> str:
+    return f"http://127.0.0.1:{server.server_address[1]}"
+
+
+def test_probe_round_trips_browser_get_version(fake_cdp) -> None:
+    probe = CdpHealthProbe(ttl_seconds=60)
+    result = probe.check(_url(fake_cdp))
+    assert result.healthy is True
+    assert result.browser == "Chrome/130.0.1"
+    assert result.version_ms is not None and result.websocket_ms is not None
+    assert fake_cdp.commands == ["Browser.getVersion"]
+
+
+def test_healthy_results_are_cached(fake_cdp) -> None:
+    probe = CdpHealthProbe(ttl_seconds=60)
+    probe.check(_url(fake_cdp))
+    second = probe.check(_url(fake_cdp) + "/")
+    assert second.cached is True
+    assert fake_cdp.commands == ["Browser.getVersion"]
+    stats = probe.stats()
+    assert stats["probes"] == 1 and stats["cache_hits"] == 1
+    assert stats["avg_latency_ms"] is not None
+
+    probe.invalidate(_url(fake_cdp))
+    assert probe.check(_url(fake_cdp)).cached is False
+
+
+def test_rejected_websocket_is_unhealthy_and_not_cached(fake_cdp) -> None:
+    fake_cdp.reject_websocket = True
+    probe = CdpHealthProbe(ttl_seconds=60)
+    result = probe.check(_url(fake_cdp))
+    assert result.healthy is False
+    assert "403" in result.error
+    probe.check(_url(fake_cdp))
+    assert probe.stats()["failures"] == 2
+
+
+def test_unreachable_endpoint_fails_fast() -> None:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    result = CdpHealthProbe(timeout_seconds=1).check(f"http://127.0.0.1:{port}")
+    assert result.healthy is False
+    assert "/json/version" in result.error
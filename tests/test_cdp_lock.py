@@ -2,8 +2,13 @@ from __future__ import annotations
 
 import json
 import os
+import threading
+import time
 from pathlib import Path
 
+import pytest
+
+from openclaw_automation import cdp_lock
 from openclaw_automation.cdp_lock import CDPLock
 
 
@@ -27,3 +32,116 @@ def test_cdp_lock_reaps_stale_pid(tmp_path: Path) -> None:
     owner = json.loads(lock_file.read_text())["pid"]
     assert owner == os.getpid()
     lock.release()
+
+
+def test_cdp_lock_wakes_next_waiter_immediately(tmp_path: Path) -> None:
+    lock_file = tmp_path / "browser_cdp.lock"
+    holder = CDPLock(lock_file=lock_file, timeout_seconds=5, retry_seconds=5)
+    holder.acquire()
+    acquired_at: list = []
+
+    def _wait() -> None:
+        with CDPLock(lock_file=lock_file, timeout_seconds=5, retry_seconds=5):
+            acquired_at.append(time.monotonic())
+
+    waiter = threading.Thread(target=_wait)
+    waiter.start()
+    time.sleep(0.3)
+    released_at = time.monotonic()
+    holder.release()
+    waiter.join(5)
+    assert acquired_at and acquired_at[0] - released_at < 1.0
+
+
+def test_cdp_lock_serves_waiters_in_arrival_order(tmp_path: Path) -> None:
+    lock_file = tmp_path / "browser_cdp.lock"
+    holder = CDPLock(lock_file=lock_file, timeout_seconds=10)
+    holder.acquire()
+    order: list = []
+
+    def _wait(n: int) -> None:
+        with CDPLock(lock_file=lock_file, timeout_seconds=10):
+            order.append(n)
+            time.sleep(0.02)
+
+    threads = []
+    for n in range(5):
+        t = threading.Thread(target=_wait, args=(n,))
+        t.start()
+        threads.append(t)
+        time.sleep(0.1)  # make arrival order deterministic
+    holder.release()
+    for t in threads:
+        t.join(10)
+    assert order == [0, 1, 2, 3, 4]
+
+
+def test_cdp_lock_abandoned_waiter_does_not_break_queue(tmp_path: Path) -> None:
+    lock_file = tmp_path / "browser_cdp.lock"
+    holder = CDPLock(lock_file=lock_file, timeout_seconds=10)
+    holder.acquire()
+    results: dict = {}
+
+    def _impatient() -> None:
+        try:
+            CDPLock(lock_file=lock_file, timeout_seconds=1).acquire()
+        except TimeoutError:
+            results["impatient"] = "timeout"
+
+    def _patient() -> None:
+        lock = CDPLock(lock_file=lock_file, timeout_seconds=10)
+        lock.acquire()
+        results["patient_holds_while_holder"] = holder.slot is not None
+        lock.release()
+
+    first = threading.Thread(target=_impatient)
+    first.start()
+    time.sleep(0.1)
+    second = threading.Thread(target=_patient)
+    second.start()
+    first.join(5)
+    assert results["impatient"] == "timeout"
+    time.sleep(0.3)
+    assert "patient_holds_while_holder" not in results  # still excluded by holder
+    holder.release()
+    second.join(5)
+    assert results["patient_holds_while_holder"] is False
+
+
+def test_cdp_lock_hands_out_browser_slots(tmp_path: Path) -> None:
+    lock_file = tmp_path / "browser_cdp.lock"
+    urls = ["http://127.0.0.1:9222", "http://127.0.0.1:9223"]
+    first = CDPLock(lock_file=lock_file, timeout_seconds=2, cdp_urls=urls)
+    second = CDPLock(lock_file=lock_file, timeout_seconds=2, cdp_urls=urls)
+    first.acquire()
+    second.acquire()
+    assert {first.cdp_url, second.cdp_url} == set(urls)
+    assert (tmp_path / "browser_cdp.1.lock").exists()
+
+    third = CDPLock(lock_file=lock_file, timeout_seconds=1, cdp_urls=urls)
+    with pytest.raises(TimeoutError):
+        third.acquire()
+    second.release()
+    third.acquire()
+    assert third.slot == 1
+    third.release()
+    first.release()
+    assert not lock_file.exists()
+
+
+@pytest.mark.skipif(cdp_lock.fcntl is None, reason="flock queue is POSIX-only")
+def test_repeated_waits_share_one_watcher_thread(tmp_path: Path) -> None:
+    path = tmp_path / "slot0.flock"
+    held = cdp_lock._try_flock(path)
+    assert held is not None
+
+    def _watchers() -> int:
+        return sum(t.name == "openclaw-cdp-lock-wait" and t.is_alive() for t in threading.enumerate())
+
+    before = _watchers()
+    for _ in range(10):
+        assert cdp_lock._wait_for_release([path], 0.02) is False
+    assert _watchers() - before == 1
+
+    threading.Timer(0.1, cdp_lock._unlock, args=(held,)).start()
+    assert cdp_lock._wait_for_release([path], 5) is True
@@ -1,5 +1,10 @@
+import os
 from pathlib import Path
 
+import jsonschema
+import pytest
+
+from openclaw_automation.contract import compiled_validator, validate_against_schema, validate_many
 from openclaw_automation.engine import AutomationEngine
 
 
@@ -20,3 +25,27 @@ def test_library_and_example_manifests_validate() -> None:
         manifest = engine.validate_script(script_dir)
         assert manifest["id"]
         assert manifest["entrypoint"] == "runner.py"
+
+
+def test_compiled_validator_is_cached_until_schema_changes(tmp_path: Path) -> None:
+    schema_path = tmp_path / "input.json"
+    schema_path.write_text('{"type":"object","required":["url"]}')
+    first = compiled_validator(schema_path)
+    assert compiled_validator(schema_path) is first
+
+    schema_path.write_text('{"type":"object","required":["query"]}')
+    stat = schema_path.stat()
+    os.utime(schema_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    assert compiled_validator(schema_path) is not first
+    validate_against_schema({"query": "x"}, schema_path)
+    with pytest.raises(jsonschema.ValidationError):
+        validate_against_schema({"url": "x"}, schema_path)
+
+
+def test_validate_many_reports_per_payload(tmp_path: Path) -> None:
+    schema_path = tmp_path / "input.json"
+    schema_path.write_text('{"type":"object","required":["url"]}')
+    errors = validate_many([{"url": "a"}, {}, {"url": "b"}], schema_path)
+    assert errors[0] is None and errors[2] is None
+    assert errors[1] is not None
+    assert "url" in errors[1].message
@@ -1,5 +1,17 @@
+import os
+import pickle
+import subprocess
 from pathlib import Path
 
+from openclaw_automation.credentials import (
+    CredentialCache,
+    CredentialProvider,
+    CredentialResolver,
+    DeferredCredentialResolution,
+    EnvCredentialProvider,
+    KeychainCredentialProvider,
+    resolve_credential_refs,
+)
 from openclaw_automation.engine import AutomationEngine
 
 
@@ -27,3 +39,81 @@ def test_credential_refs_resolution_from_env(monkeypatch) -> None:
     status = result["credential_status"]
     assert status["resolved_keys"] == ["airline_password", "airline_username"]
     assert status["unresolved_refs"] == {}
+
+
+def test_credential_status_covers_refs_the_runner_never_read(tmp_path, monkeypatch, write_script) -> None:
+    monkeypatch.setenv("OPENCLAW_CREDENTIAL_PROVIDERS", "env")
+    monkeypatch.setenv("OPENCLAW_SECRET_SVC_USER", "someone")
+    monkeypatch.delenv("OPENCLAW_SECRET_SVC_PASS", raising=False)
+    script_dir = write_script(tmp_path / "nocreds", "def run(context, inputs):\n    return {}\n")
+    engine = AutomationEngine(Path(__file__).resolve().parents[1])
+    refs = {"user": "svc/user", "password": "svc/pass"}
+    status = engine.run(script_dir, {"credential_refs": refs})["credential_status"]
+    assert status["looked_up"] is False
+    assert status["resolved_keys"] == ["user"]
+    assert status["unresolved_refs"] == {"password": "svc/pass"}
+
+
+class _CountingProvider(CredentialProvider):
+    name = "counting"
+
+    def __init__(self, values) -> None:
+        self.values = values
+        self.calls = []
+
+    def lookup_many(self, refs):
+        self.calls.append(list(refs))
+        return {ref: self.values[ref] for ref in refs if ref in self.values}
+
+
+class _Clock:
+    now = 100.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_keychain_refs_are_looked_up_in_one_subprocess(tmp_path, monkeypatch) -> None:
+    fake = tmp_path / "security"
+    fake.write_text('#!/bin/sh\n[ "$5" = "svc/missing" ] && exit 44\necho "secret-for-$5"\n')
+    fake.chmod(0o755)
+    monkeypatch.setenv("PATH", f"{tmp_path}:{os.environ['PATH']}")
+    spawned = []
+    real_run = subprocess.run
+    monkeypatch.setattr(subprocess, "run", lambda *a, **k: spawned.append(a) or real_run(*a, **k))
+
+    resolver = CredentialResolver([KeychainCredentialProvider(account="me", enabled=True)], CredentialCache(60))
+    refs = {"user": "svc/user", "password": "svc/pass", "otp": "svc/missing"}
+    first = resolve_credential_refs(refs, resolver)
+    second = resolve_credential_refs({"user": "svc/user", "password": "svc/pass"}, resolver)
+
+    assert first.resolved == {"user": "secret-for-svc/user", "password": "secret-for-svc/pass"}
+    assert first.unresolved == {"otp": "svc/missing"}
+    assert second.resolved == first.resolved
+    assert len(spawned) == 1  # the second run is served from the cache
+
+
+def test_cached_values_are_zeroed_on_expiry() -> None:
+    clock = _Clock()
+    cache = CredentialCache(ttl_seconds=30, clock=clock)
+    cache.put("keychain", "svc/pass", "hunter2")
+    buffer = cache._entries[("keychain", "svc/pass")][0]
+    assert cache.get("keychain", "svc/pass") == "hunter2"
+
+    clock.now += 31
+    assert cache.get("keychain", "svc/pass") is None
+    assert buffer == bytearray(7) and len(cache) == 0
+
+
+def test_env_wins_and_lookup_waits_until_credentials_are_read(monkeypatch) -> None:
+    monkeypatch.setenv("OPENCLAW_SECRET_SVC_USER", "from-env")
+    slow = _CountingProvider({"svc/user": "from-vault", "svc/pass": "p"})
+    resolver = CredentialResolver([EnvCredentialProvider(), slow], CredentialCache(60))
+    deferred = DeferredCredentialResolution({"user": "svc/user", "password": "svc/pass"}, resolver)
+
+    assert not deferred.looked_up and slow.calls == []
+    assert "not looked up" in repr(deferred.resolved)
+    assert dict(deferred.resolved) == {"user": "from-env", "password": "p"}
+    assert slow.calls == [["svc/pass"]]
+    # Process-mode runners receive a plain dict.
+    assert pickle.loads(pickle.dumps(deferred.resolved)) == {"user": "from-env", "password": "p"}
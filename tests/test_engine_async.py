@@ -0,0 +1,86 @@
+"""Tests for AutomationEngine.arun and the shared runner executor."""
+from __future__ import annotations
+
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import pytest
+
+from openclaw_automation.engine import AutomationEngine
+
+ROOT = Path(__file__).resolve().parents[1]
+
+
+def test_arun_runs_concurrently(tmp_path: Path, write_script) -> None:
+    script_dir = write_script(
+        tmp_path / "sleepy",
+        "import time\n\ndef run(context, inputs):\n    time.sleep(0.3)\n    return {'n': inputs['n']}\n",
+    )
+    engine = AutomationEngine(ROOT, executor=ThreadPoolExecutor(max_workers=8))
+
+    async def _main():
+        return await asyncio.gather(*(engine.arun(script_dir, {"n": i}) for i in range(8)))
+
+    started = time.monotonic()
+    results = asyncio.run(_main())
+    assert time.monotonic() - started < 1.5
+    assert [r["result"]["n"] for r in results] == list(range(8))
+    assert all(r["ok"] for r in results)
+
+
+def test_arun_timeout_signals_cancel_event(tmp_path: Path, monkeypatch, write_script) -> None:
+    script_dir = write_script(
+        tmp_path / "stuck",
+        "STOPPED = []\n\ndef run(context, inputs):\n"
+        "    STOPPED.append(context['cancel_event'].wait(10))\n    return {}\n",
+    )
+    monkeypatch.setenv("OPENCLAW_RUNNER_TIMEOUT_SECONDS", "1")
+    engine = AutomationEngine(ROOT, executor=ThreadPoolExecutor(max_workers=1))
+
+    result = asyncio.run(engine.arun(script_dir, {}))
+    assert result["ok"] is False
+    assert "exceeded timeout" in result["error"]
+
+    module = engine.runners.load(script_dir / "runner.py")
+    engine.executor.shutdown(wait=True)
+    assert module.STOPPED == [True]
+
+
+def test_run_timeout_drops_queued_runner(tmp_path: Path, monkeypatch, write_script) -> None:
+    script_dir = write_script(
+        tmp_path / "busy",
+        "def run(context, inputs):\n    context['cancel_event'].wait(10)\n    return {}\n",
+    )
+    monkeypatch.setenv("OPENCLAW_RUNNER_TIMEOUT_SECONDS", "1")
+    executor = ThreadPoolExecutor(max_workers=1)
+    engine = AutomationEngine(ROOT, executor=executor)
+    blocker = executor.submit(time.sleep, 2)
+
+    result = engine.run(script_dir, {})
+    assert result["ok"] is False
+    assert "did not start" in result["error"]
+    blocker.result()
+
+
+def test_arun_cancellation_propagates(tmp_path: Path, write_script) -> None:
+    script_dir = write_script(
+        tmp_path / "cancelled",
+        "import threading\n\nSTARTED = threading.Event()\nCANCELLED = []\n\n"
+        "def run(context, inputs):\n    STARTED.set()\n"
+        "    CANCELLED.append(context['cancel_event'].wait(10))\n    return {}\n",
+    )
+    engine = AutomationEngine(ROOT, executor=ThreadPoolExecutor(max_workers=1))
+    module = engine.runners.load(script_dir / "runner.py")
+
+    async def _main():
+        task = asyncio.ensure_future(engine.arun(script_dir, {}))
+        assert await asyncio.to_thread(module.STARTED.wait, 5)
+        task.cancel()
+        await task
+
+    with pytest.raises(asyncio.CancelledError):
+        asyncio.run(_main())
+    engine.executor.shutdown(wait=True)
+    assert module.CANCELLED == [True]
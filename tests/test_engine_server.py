@@ -0,0 +1,94 @@
+from __future__ import annotations
+
+import json
+import threading
+import urllib.error
+import urllib.request
+from pathlib import Path
+
+import pytest
+
+from openclaw_automation.engine import AutomationEngine
+from openclaw_automation.server import EngineServer, request_server, warm_up
+
+
+@pytest.fixture()
+def server_url(tmp_path: Path, monkeypatch):
+    monkeypatch.delenv("OPENCLAW_ENGINE_SERVER_TOKEN", raising=False)
+    monkeypatch.setenv("OPENCLAW_ENGINE_SERVER_TOKEN_FILE", str(tmp_path / "engine_server.token"))
+    root = Path(__file__).resolve().parents[1]
+    server = EngineServer(AutomationEngine(root), port=0)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield f"http://127.0.0.1:{server.server_port}"
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def test_server_runs_script(server_url: str) -> None:
+    status, result = request_server(
+        server_url,
+        "/run",
+        {"script_dir": "examples/calculator", "inputs": {"num1": 2, "num2": 3, "operation": "add"}},
+    )
+    assert status == 200
+    assert result["ok"] is True
+    assert result["script_id"] == "examples.calculator"
+    assert result["result"]["result"] == 5
+
+
+def test_server_rejects_script_outside_root(server_url: str, tmp_path: Path) -> None:
+    status, result = request_server(server_url, "/run", {"script_dir": str(tmp_path), "inputs": {}})
+    assert status == 400
+    assert "inside" in result["error"]
+
+
+def _post(url: str, headers: dict, body: bytes = b"{}") -> int:
+    req = urllib.request.Request(url=url, data=body, headers=headers, method="POST")
+    try:
+        with urllib.request.urlopen(req, timeout=10) as response:
+            return response.status
+    except urllib.error.HTTPError as exc:
+        return exc.code
+
+
+def test_server_generates_a_private_token_and_requires_it(server_url: str, tmp_path: Path) -> None:
+    token_file = tmp_path / "engine_server.token"
+    assert token_file.stat().st_mode & 0o777 == 0o600
+    token = token_file.read_text().strip()
+    payload = {"script_dir": "examples/calculator", "inputs": {"num1": 1, "num2": 1, "operation": "add"}}
+    status, _ = request_server(server_url, "/run", payload)  # reads the token file
+    assert status == 200
+
+    body = json.dumps(payload).encode("utf-8")
+    assert _post(server_url + "/run", {"Content-Type": "application/json"}, body) == 401
+    wrong = {"Content-Type": "application/json", "Authorization": "Bearer wrong"}
+    assert _post(server_url + "/run", wrong, body) == 401
+    auth = {"Content-Type": "application/json", "Authorization": f"Bearer {token}"}
+    # Cross-site form posts cannot send JSON; DNS-rebound pages carry their own Host.
+    assert _post(server_url + "/run", {**auth, "Content-Type": "text/plain"}, body) == 415
+    assert _post(server_url + "/run", {**auth, "Host": "evil.example:8765"}, body) == 403
+
+
+def test_server_prefers_the_configured_token(tmp_path: Path, monkeypatch) -> None:
+    monkeypatch.setenv("OPENCLAW_ENGINE_SERVER_TOKEN", "s3cret")
+    monkeypatch.setenv("OPENCLAW_ENGINE_SERVER_TOKEN_FILE", str(tmp_path / "engine_server.token"))
+    server = EngineServer(AutomationEngine(Path(__file__).resolve().parents[1]), port=0)
+    try:
+        assert server.token == "s3cret"
+        assert not (tmp_path / "engine_server.token").exists()
+    finally:
+        server.server_close()
+
+
+def test_request_server_reports_an_unreachable_server() -> None:
+    status, result = request_server("http://127.0.0.1:9", "/run", {}, timeout_seconds=5)
+    assert status == 503
+    assert result["ok"] is False and "unreachable" in result["error"]
+
+
+def test_warm_up_compiles_repo_scripts() -> None:
+    root = Path(__file__).resolve().parents[1]
+    assert warm_up(AutomationEngine(root)) >= 10
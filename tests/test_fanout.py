@@ -0,0 +1,192 @@
+import importlib.util
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+from openclaw_automation.browser_pool import BrowserPool
+from openclaw_automation.fanout import fan_out, merge_matches, site_concurrency, split_searches
+
+
+def _inputs(to) -> dict:
+    return {
+        "from": "ATL",
+        "to": to,
+        "days_ahead": 60,
+        "max_miles": 120000,
+        "travelers": 2,
+        "cabin": "economy",
+    }
+
+
+def test_split_searches_per_destination_and_date() -> None:
+    searches = split_searches(_inputs(["CDG", "FCO", "CDG"]), days_ahead=[30, 60])
+    assert [(s.destination, s.days_ahead) for s in searches] == [
+        ("CDG", 30), ("CDG", 60), ("FCO", 30), ("FCO", 60),
+    ]
+    assert searches[0].inputs["to"] == ["CDG"]
+    assert searches[0].inputs["from"] == "ATL"
+
+
+def test_site_concurrency_defaults_and_overrides(monkeypatch) -> None:
+    monkeypatch.setenv("OPENCLAW_FANOUT_MAX_CONCURRENCY", "6")
+    monkeypatch.setenv("OPENCLAW_FANOUT_SITE_CONCURRENCY", "delta.com=3")
+    assert site_concurrency("delta.com") == 3
+    assert site_concurrency("singaporeair.com") == 2
+    assert site_concurrency("united.com") == 6
+
+
+def test_fan_out_runs_in_parallel_within_site_limit(monkeypatch) -> None:
+    monkeypatch.setenv("OPENCLAW_FANOUT_SITE_CONCURRENCY", "test-parallel.example=3")
+    searches = split_searches(_inputs(["LHR", "CDG", "FRA", "AMS", "FCO", "MAD"]))
+    lock = threading.Lock()
+    active = set()
+    peak = [0]
+
+    def _search(sub, slot):
+        with lock:
+            assert slot not in active
+            active.add(slot)
+            peak[0] = max(peak[0], len(active))
+        time.sleep(0.1)
+        with lock:
+            active.discard(slot)
+        return sub.destination
+
+    started = time.monotonic()
+    results = fan_out(_search, searches, site="test-parallel.example")
+    elapsed = time.monotonic() - started
+    assert [r.value for r in results] == ["LHR", "CDG", "FRA", "AMS", "FCO", "MAD"]
+    assert peak[0] == 3
+    assert elapsed < 0.45
+
+
+def test_fan_out_isolates_failures() -> None:
+    def _search(sub, slot):
+        if sub.destination == "FRA":
+            raise RuntimeError("page crashed")
+        return sub.destination
+
+    results = fan_out(_search, split_searches(_inputs(["LHR", "FRA"])), site="test-errors.example")
+    assert results[0].value == "LHR" and results[0].error is None
+    assert results[1].value is None and results[1].error == "page crashed"
+
+
+
+def test_fan_out_skips_queued_searches_once_cancelled(monkeypatch) -> None:
+    monkeypatch.setenv("OPENCLAW_FANOUT_SITE_CONCURRENCY", "test-cancel.example=1")
+    searches = split_searches(_inputs(["LHR", "CDG", "FRA"]))
+    cancel = threading.Event()
+
+    def _search(sub, slot):
+        cancel.set()
+        return sub.destination
+
+    results = fan_out(_search, searches, site="test-cancel.example", cancel_event=cancel)
+    assert [r.value for r in results] == ["LHR", None, None]
+    assert [r.error for r in results] == [None, "cancelled", "cancelled"]
+
+def test_merge_matches_keeps_order_and_drops_duplicates() -> None:
+    a = {"route": "ATL-CDG", "date": "2026-06-01", "cabin": "economy", "miles": 30000}
+    b = {"route": "ATL-FCO", "date": "2026-06-01", "cabin": "economy", "miles": 28000}
+    assert merge_matches([[a], [b, dict(a)]]) == [a, b]
+
+
+def test_singapore_hybrid_searches_every_destination(monkeypatch) -> None:
+    runner_path = Path(__file__).resolve().parents[1] / "library/singapore_award/runner.py"
+    spec = importlib.util.spec_from_file_location("runner_singapore_fanout", runner_path)
+    runner = importlib.util.module_from_spec(spec)
+    assert spec and spec.loader
+    spec.loader.exec_module(runner)
+
+    class _Pool:
+        def logged_in_recently(self, site):
+            return True
+
+    def _search_destination(pool, sub, slot, tag=False, context=None):
+        match = {"route": f"SFO-{sub.destination}", "date": "2026-03-01", "cabin": "business", "miles": 90000}
+        return {"matches": [match], "errors": [], "observations": [f"[{sub.destination}] searched"]}
+
+    monkeypatch.setattr(runner, "shared_browser_pool", lambda cdp_url=None: _Pool())
+    monkeypatch.setattr(runner, "playwright_available", lambda: True)
+    monkeypatch.setattr(runner, "_search_destination", _search_destination)
+
+    result = runner._run_hybrid(_inputs(["SIN", "NRT"]) | {"from": "SFO"}, [])
+    assert [m["route"] for m in result["matches"]] == ["SFO-SIN", "SFO-NRT"]
+    assert "SFO-SIN/NRT" in result["summary"]
+    assert "[NRT] searched" in result["raw_observations"]
+
+
+
+def test_delta_fans_out_multi_destination_runs(monkeypatch) -> None:
+    runner_path = Path(__file__).resolve().parents[1] / "library/delta_award/runner.py"
+    spec = importlib.util.spec_from_file_location("runner_delta_route", runner_path)
+    runner = importlib.util.module_from_spec(spec)
+    assert spec and spec.loader
+    spec.loader.exec_module(runner)
+
+    calls = []
+
+    def _run_hybrid(inputs, observations, context=None):
+        calls.append(("hybrid", tuple(inputs["to"])))
+        return {"matches": [{"route": "ATL-CDG"}] if "CDG" in inputs["to"] else []}
+
+    def _run_agent_only(inputs, observations, context=None):
+        calls.append(("agent", tuple(inputs["to"])))
+        return {"matches": []}
+
+    monkeypatch.setattr(runner, "browser_agent_enabled", lambda: True)
+    monkeypatch.setattr(runner, "playwright_available", lambda: True)
+    monkeypatch.setattr(runner, "_run_hybrid", _run_hybrid)
+    monkeypatch.setattr(runner, "_run_agent_only", _run_agent_only)
+    pool = BrowserPool(connector=lambda url: (None, None))
+    monkeypatch.setattr(runner, "shared_browser_pool", lambda cdp_url=None: pool)
+
+    assert runner.run({}, _inputs(["CDG", "FCO"]))["matches"] == [{"route": "ATL-CDG"}]
+    runner.run({}, _inputs(["LHR", "AMS"]))  # nothing found: falls back to the agent
+    runner.run({}, _inputs(["FCO"]))
+    # A fresh pooled login lets single-destination runs skip the agent too.
+    pool.mark_logged_in("delta.com")
+    runner.run({}, _inputs(["CDG"]))
+    assert calls == [
+        ("hybrid", ("CDG", "FCO")),
+        ("hybrid", ("LHR", "AMS")),
+        ("agent", ("LHR", "AMS")),
+        ("agent", ("FCO",)),
+        ("hybrid", ("CDG",)),
+    ]
+
+@pytest.mark.parametrize("airline, site", [("singapore", "singaporeair.com"), ("delta", "delta.com")])
+def test_hybrid_logs_in_again_when_pooled_session_expired(monkeypatch, airline, site) -> None:
+    runner_path = Path(__file__).resolve().parents[1] / f"library/{airline}_award/runner.py"
+    spec = importlib.util.spec_from_file_location(f"runner_{airline}_relogin", runner_path)
+    runner = importlib.util.module_from_spec(spec)
+    assert spec and spec.loader
+    spec.loader.exec_module(runner)
+
+    pool = BrowserPool(connector=lambda url: (None, None))
+    pool.mark_logged_in(site)
+    logins = []
+    searches = []
+
+    def _adaptive_run(**kwargs):
+        logins.append(kwargs["url"])
+        return {"ok": True, "error": None, "result": {"status": "logged in"}}
+
+    def _search_destination(pool, sub, slot, tag=False, **kwargs):
+        searches.append(sub.destination)
+        if len(searches) == 1:
+            return {"matches": [], "errors": ["login page"], "observations": [], "session_expired": True}
+        match = {"route": f"SFO-{sub.destination}", "date": "2026-03-01", "cabin": "business", "miles": 90000}
+        return {"matches": [match], "errors": [], "observations": [], "session_expired": False}
+
+    monkeypatch.setattr(runner, "shared_browser_pool", lambda cdp_url=None: pool)
+    monkeypatch.setattr(runner, "playwright_available", lambda: True)
+    monkeypatch.setattr(runner, "adaptive_run", _adaptive_run)
+    monkeypatch.setattr(runner, "_search_destination", _search_destination)
+
+    result = runner._run_hybrid(_inputs(["SIN"]) | {"from": "SFO"}, [])
+    assert len(logins) == 1 and searches == ["SIN", "SIN"]
+    assert [m["route"] for m in result["matches"]] == ["SFO-SIN"]
+    assert pool.logged_in_recently(site)
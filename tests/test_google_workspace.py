@@ -0,0 +1,102 @@
+import email
+import importlib.util
+import json
+import threading
+from pathlib import Path
+
+from openclaw_automation import google_workspace as workspace
+
+
+def _load_runner():
+    path = Path(__file__).resolve().parents[1] / "examples/google_workspace_brief/runner.py"
+    spec = importlib.util.spec_from_file_location("runner_google_workspace_brief", path)
+    module = importlib.util.module_from_spec(spec)
+    assert spec and spec.loader
+    spec.loader.exec_module(module)
+    return module
+
+
+class _Response:
+    def __init__(self, status_code: int, payload=None, text: str = "", headers=None) -> None:
+        self.status_code = status_code
+        self._payload = payload
+        self.text = text
+        self.headers = headers or {}
+
+    def json(self):
+        return self._payload
+
+
+def _message(msg_id: str) -> dict:
+    return {"id": msg_id, "snippet": f"snippet {msg_id}", "payload": {"headers": [{"name": "Subject", "value": msg_id}]}}
+
+
+class _FakeSession:
+    def __init__(self) -> None:
+        self.posts = []
+        self.gets = []
+
+    def post(self, url, headers=None, data=None, timeout=None):
+        self.posts.append(data.decode())
+        parts = [
+            ("0", "HTTP/1.1 200 OK", json.dumps(_message("m1"))),
+            ("1", "HTTP/1.1 500 Internal Server Error", "{}"),
+            ("2", "HTTP/1.1 404 Not Found", '{"error": {}}'),
+        ]
+        body = "".join(
+            f"--resp\r\nContent-Type: application/http\r\nContent-ID: <response-item{cid}>\r\n\r\n"
+            f"{status}\r\nContent-Type: application/json\r\n\r\n{payload}\r\n"
+            for cid, status, payload in parts
+        ) + "--resp--\r\n"
+        return _Response(200, text=body, headers={"Content-Type": "multipart/mixed; boundary=resp"})
+
+    def get(self, url, headers=None, params=None, timeout=None):
+        self.gets.append(url)
+        return _Response(200, _message(url.rsplit("/", 1)[1]))
+
+
+def test_metadata_comes_from_one_batch_with_retry_of_failed_parts() -> None:
+    session = _FakeSession()
+    messages = workspace.get_messages_metadata("tok", ["m1", "m2", "m3"], session=session)
+
+    assert [m["id"] for m in messages] == ["m1", "m2"]
+    assert len(session.posts) == 1
+    assert session.posts[0].count("GET /gmail/v1/users/me/messages/") == 3
+    assert "format=metadata" in session.posts[0] and "metadataHeaders=Subject" in session.posts[0]
+    assert session.gets == [f"{workspace.GMAIL_API}/messages/m2"]
+
+
+def test_batch_body_parts_are_complete_http_requests() -> None:
+    body = workspace.build_batch_body(["/gmail/v1/users/me/messages/m1?format=metadata", "/x"], "b1")
+    assert body.startswith(
+        "--b1\r\nContent-Type: application/http\r\nContent-ID: <item0>\r\n\r\n"
+        "GET /gmail/v1/users/me/messages/m1?format=metadata HTTP/1.1\r\n\r\n\r\n--b1\r\n"
+    )
+    # Read back with the stdlib MIME parser, not the module's own: once the
+    # delimiter takes its CRLF, each part must still be a request line plus a
+    # blank line ending the (empty) header block.
+    message = email.message_from_bytes(b"Content-Type: multipart/mixed; boundary=b1\r\n\r\n" + body.encode())
+    payloads = [part.get_payload() for part in message.get_payload()]
+    assert payloads == [
+        "GET /gmail/v1/users/me/messages/m1?format=metadata HTTP/1.1\r\n\r\n",
+        "GET /x HTTP/1.1\r\n\r\n",
+    ]
+
+def test_brief_fetches_accounts_in_parallel(monkeypatch) -> None:
+    runner = _load_runner()
+    monkeypatch.setenv("OPENCLAW_GOOGLE_ALLOWED_ACCOUNTS", "a@example.com,b@example.com,c@example.com")
+    barrier = threading.Barrier(3, timeout=5)
+
+    def _token(config):
+        barrier.wait()  # only passes if all three accounts are in flight at once
+        if config.account_email == "c@example.com":
+            raise RuntimeError("token revoked")
+        return f"token-{config.account_email}"
+
+    monkeypatch.setattr(runner, "_access_token", _token)
+    monkeypatch.setattr(runner, "_list_meetings", lambda token, *a, **k: [{"start": token, "account_email": ""}])
+    monkeypatch.setattr(runner, "_list_emails", lambda token, **k: [])
+
+    out = runner.run({}, {"task": "meetings", "date": "2026-03-02"})
+    assert sorted(m["account_email"] for m in out["meetings"]) == ["a@example.com", "b@example.com"]
+    assert out["errors"] == ["c@example.com: token revoked"]
@@ -0,0 +1,50 @@
+from openclaw_automation.html_extract import PageExtractor, extract
+
+PAGE = """<html><head><title>Daily  &amp; News</title><style>h1 { color: red }</style></head>
+<body><h1>Top <b>Story</b></h1><script>var news = "<h2>fake</h2>";</script>
+<p>Mental health matters. The news about MENTAL health is good!</p>
+<h2>Second Story</h2><h3>Top Story</h3><h3>ok</h3><h2>Third Story</h2></body></html>"""
+
+
+def _chunks(text: str, size: int):
+    for i in range(0, len(text), size):
+        yield text[i:i + size]
+
+
+def test_single_pass_matches_whole_page_extraction() -> None:
+    page = extract(PAGE, keywords=["mental", "news"])
+    assert page.title == "Daily & News"
+    assert page.headlines == ["Top Story", "Second Story", "Third Story"]
+    assert page.keyword_counts == {"mental": 2, "news": 2}
+    assert "var news" not in page.text and "color: red" not in page.text
+    assert page.highlights("mental") == ["Daily & News Top Story Mental health matters.", "The news about MENTAL health is good!"]
+
+
+def test_chunked_feed_counts_keywords_across_boundaries() -> None:
+    whole = extract(PAGE, keywords=["mental health", "Story"], case_sensitive=True)
+    for size in (1, 3, 7):
+        chunked = extract(_chunks(PAGE, size), keywords=["mental health", "Story"], case_sensitive=True)
+        assert chunked.keyword_counts == whole.keyword_counts == {"mental health": 0, "Story": 4}
+        assert chunked.headlines == whole.headlines
+        assert chunked.text == whole.text
+
+
+def test_stops_reading_once_headlines_are_found() -> None:
+    consumed = []
+
+    def _source():
+        yield "<title>Portal</title><h1>First headline</h1><h2>Second headline</h2>"
+        consumed.append("more")
+        yield "<p>" + "x " * 1_000_000 + "</p>"
+
+    page = extract(_source(), max_headlines=2, stop_after_headlines=True)
+    assert page.headlines == ["First headline", "Second headline"]
+    assert consumed == []
+
+
+def test_visible_text_is_bounded_but_counting_continues() -> None:
+    parser = PageExtractor(keywords=["needle"], max_text_chars=50)
+    parser.feed("<p>" + "hay " * 100 + "</p><p>needle</p>")
+    parser.close()
+    assert len(parser.text) <= 50 and parser.text_truncated
+    assert parser.keyword_counts == {"needle": 1}
@@ -0,0 +1,107 @@
+"""Tests for the pooled HTTP fetcher against a local keep-alive server."""
+from __future__ import annotations
+
+import gzip
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from openclaw_automation.http_fetch import HttpFetcher, HTTPError
+
+PAGE = b"<html><head><title>Status</title></head><body>All systems operational</body></html>"
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    hits: list = []
+    active = 0
+    peak = 0
+    lock = threading.Lock()
+
+    def log_message(self, *args) -> None:
+        pass
+
+    def _send(self, status: int, body: bytes = b"", headers: dict | None = None) -> None:
+        self.send_response(status)
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self) -> None:  # noqa: N802
+        type(self).hits.append((self.path, self.headers.get("If-None-Match")))
+        if self.path == "/page":
+            if self.headers.get("If-None-Match") == '"v1"':
+                self._send(304, headers={"ETag": '"v1"'})
+                return
+            body, headers = PAGE, {"ETag": '"v1"', "Content-Type": "text/html; charset=utf-8"}
+            if "gzip" in self.headers.get("Accept-Encoding", ""):
+                body, headers["Content-Encoding"] = gzip.compress(PAGE), "gzip"
+            self._send(200, body, headers)
+        elif self.path == "/old":
+            self._send(301, headers={"Location": "/page"})
+        elif self.path == "/slow":
+            with type(self).lock:
+                type(self).active += 1
+                type(self).peak = max(type(self).peak, type(self).active)
+            time.sleep(0.1)
+            with type(self).lock:
+                type(self).active -= 1
+            self._send(200, b"ok")
+        else:
+            self._send(404, b"missing")
+
+
+@pytest.fixture()
+def server():
+    _Handler.hits, _Handler.active, _Handler.peak = [], 0, 0
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{httpd.server_address[1]}"
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def test_gzip_keep_alive_and_conditional_get(server, tmp_path) -> None:
+    fetcher = HttpFetcher(cache_dir=tmp_path)
+    first = fetcher.fetch(f"{server}/page")
+    second = fetcher.fetch(f"{server}/page")
+
+    assert first.status == 200 and "All systems operational" in first.text()
+    assert second.status == 304 and second.from_cache and second.body == PAGE
+    assert _Handler.hits == [("/page", None), ("/page", '"v1"')]
+    assert fetcher.stats()["reused"] == 1
+    assert fetcher.stats()["not_modified"] == 1
+
+    # A new fetcher (next process) revalidates from the on-disk cache.
+    assert HttpFetcher(cache_dir=tmp_path).fetch(f"{server}/page").from_cache
+
+
+def test_redirects_and_errors(server) -> None:
+    fetcher = HttpFetcher()
+    result = fetcher.fetch(f"{server}/old")
+    assert result.url.endswith("/page") and result.redirects == [f"{server}/old"]
+    with pytest.raises(HTTPError) as err:
+        fetcher.fetch(f"{server}/nope")
+    assert err.value.status == 404
+
+
+def test_per_host_concurrency_limit(server) -> None:
+    fetcher = HttpFetcher(max_per_host=2)
+    with ThreadPoolExecutor(max_workers=6) as pool:
+        list(pool.map(lambda _: fetcher.fetch(f"{server}/slow"), range(6)))
+    assert _Handler.peak == 2
+
+
+def test_closing_a_stream_early_drops_the_connection(server, tmp_path) -> None:
+    fetcher = HttpFetcher(cache_dir=tmp_path)
+    with fetcher.open(f"{server}/page") as stream:
+        next(stream.iter_bytes(chunk_size=8))
+    assert fetcher.stats()["idle"] == 0
+    assert list(tmp_path.iterdir()) == []
+    assert fetcher.fetch(f"{server}/page").body == PAGE
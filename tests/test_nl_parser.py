@@ -1,5 +1,13 @@
 """Tests for NL parser improvements."""
-from openclaw_automation.nl import parse_query_to_run, _extract_airport_codes
+from datetime import date
+
+from openclaw_automation.nl import (
+    _extract_airport_codes,
+    _extract_days_ahead,
+    _scan,
+    parse_queries,
+    parse_query_to_run,
+)
 
 
 def test_singapore_airlines_full_name() -> None:
@@ -44,3 +52,26 @@ def test_ana_excluded_from_airport_codes() -> None:
     assert "ANA" not in codes
     assert "SFO" in codes
     assert "HND" in codes
+
+
+def test_parse_queries_matches_single_parses() -> None:
+    queries = [
+        "Search Singapore Airlines business SFO to SIN in March for 2 travelers",
+        "what meetings do I have tomorrow",
+        "weather in Paris in celsius",
+        "Search Singapore Airlines business SFO to SIN in March for 2 travelers",
+    ]
+    batch = parse_queries(queries)
+    assert batch == [parse_query_to_run(q) for q in queries]
+    assert batch[0] == batch[3] and batch[0] is not batch[3]
+    batch[3].inputs["to"].append("NRT")
+    assert batch[0].inputs["to"] == ["SIN"]
+
+
+def test_month_and_airline_priority_follow_table_order() -> None:
+    today = date(2026, 1, 1)
+    # "june" is listed before "jan" in MONTH_NAMES, so it wins wherever it appears.
+    assert _extract_days_ahead(_scan("United SFO AMS for jan or in june", today)) == 180
+    assert _extract_days_ahead(_scan("United SFO AMS for jan", today)) == 29
+    # "united" precedes "delta" in AIRLINE_TO_SCRIPT even when delta comes first.
+    assert parse_query_to_run("delta or united to AMS").script_dir == "library/united_award"
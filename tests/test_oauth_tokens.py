@@ -0,0 +1,112 @@
+import json
+import os
+import threading
+import time
+from datetime import datetime, timezone
+
+from openclaw_automation.oauth_tokens import TokenManager, parse_expiry
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = time.time()
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _iso(epoch: float) -> str:
+    return datetime.fromtimestamp(epoch, tz=timezone.utc).isoformat()
+
+
+def _write(path, token: str, expires_at: float) -> None:
+    path.write_text(json.dumps({"token": token, "expiry": _iso(expires_at), "refresh_token": "r"}))
+
+
+def _refresher(clock, calls, lifetime: float = 3600.0):
+    def _refresh(data):
+        calls.append(data["token"])
+        time.sleep(0.05)
+        return {**data, "token": f"fresh-{len(calls)}", "expiry": _iso(clock() + lifetime)}
+
+    return _refresh
+
+
+def test_valid_token_is_served_from_memory(tmp_path) -> None:
+    clock, calls = _Clock(), []
+    token_file = tmp_path / "token.json"
+    _write(token_file, "cached", clock() + 3600)
+    manager = TokenManager(clock=clock)
+
+    assert manager.get(token_file, _refresher(clock, calls)) == "cached"
+    token_file.unlink()  # later runs no longer touch the file
+    assert manager.get(token_file, _refresher(clock, calls)) == "cached"
+    assert calls == []
+    assert manager.stats()["disk_loads"] == 1 and manager.stats()["memory_hits"] == 1
+
+
+def test_expired_token_is_refreshed_once_for_concurrent_callers(tmp_path) -> None:
+    clock, calls = _Clock(), []
+    token_file = tmp_path / "token.json"
+    _write(token_file, "stale", clock() - 10)
+    token_file.chmod(0o600)
+    manager = TokenManager(clock=clock)
+    refresh = _refresher(clock, calls)
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(manager.get(token_file, refresh))) for _ in range(5)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert results == ["fresh-1"] * 5 and calls == ["stale"]
+    assert json.loads(token_file.read_text())["token"] == "fresh-1"
+    assert token_file.stat().st_mode & 0o777 == 0o600
+    # A second manager (another run) picks the refreshed token up from disk.
+    assert TokenManager(clock=clock).get(token_file, refresh) == "fresh-1"
+
+
+def test_refreshed_token_is_never_written_world_readable(tmp_path, monkeypatch) -> None:
+    clock, calls = _Clock(), []
+    token_file = tmp_path / "token.json"
+    _write(token_file, "stale", clock() - 10)
+    modes = []
+    real_replace = os.replace
+
+    def _replace(src, dst):
+        modes.append(os.stat(src).st_mode & 0o777)
+        real_replace(src, dst)
+
+    monkeypatch.setattr(os, "replace", _replace)
+    old_umask = os.umask(0o022)
+    try:
+        assert TokenManager(clock=clock).get(token_file, _refresher(clock, calls)) == "fresh-1"
+    finally:
+        os.umask(old_umask)
+    assert modes == [0o600]
+    assert token_file.stat().st_mode & 0o777 == 0o600
+
+def test_token_near_expiry_is_returned_and_refreshed_in_background(tmp_path) -> None:
+    clock, calls = _Clock(), []
+    token_file = tmp_path / "token.json"
+    _write(token_file, "old", clock() + 3600)
+    manager = TokenManager(refresh_ahead_seconds=300, clock=clock)
+    refresh = _refresher(clock, calls)
+    assert manager.get(token_file, refresh) == "old"
+
+    clock.now += 3400  # 200s left: inside the refresh-ahead window
+    assert manager.get(token_file, refresh) == "old"
+    assert manager.get(token_file, refresh) == "old"
+    deadline = time.time() + 5
+    while manager.get(token_file, refresh) == "old" and time.time() < deadline:
+        time.sleep(0.01)
+
+    assert manager.get(token_file, refresh) == "fresh-1"
+    assert calls == ["old"]
+    assert manager.stats()["background_refreshes"] == 1
+
+
+def test_parse_expiry() -> None:
+    assert parse_expiry("2026-03-02T10:00:00Z") == datetime(2026, 3, 2, 10, tzinfo=timezone.utc).timestamp()
+    assert parse_expiry("") == 0.0 and parse_expiry("soon") == 0.0
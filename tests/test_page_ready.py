@@ -0,0 +1,117 @@
+"""Tests for event-driven page readiness, using fake Playwright pages."""
+from __future__ import annotations
+
+import time
+
+from openclaw_automation.page_ready import wait_for_any, wait_for_network_quiet, wait_ready
+
+
+class _FakeSession:
+    def __init__(self) -> None:
+        self.handlers: dict = {}
+        self.detached = False
+
+    def on(self, event, handler) -> None:
+        self.handlers[event] = handler
+
+    def send(self, method) -> None:
+        pass
+
+    def emit(self, event, **params) -> None:
+        self.handlers[event](params)
+
+    def detach(self) -> None:
+        self.detached = True
+
+
+class _FakeContext:
+    def __init__(self, session: _FakeSession) -> None:
+        self.session = session
+
+    def new_cdp_session(self, page) -> _FakeSession:
+        return self.session
+
+
+class _FakePage:
+    """Replays scripted CDP events, one batch per ``wait_for_timeout`` pump."""
+
+    def __init__(self, batches=()) -> None:
+        self.session = _FakeSession()
+        self.context = _FakeContext(self.session)
+        self.batches = list(batches)
+        self.evaluated: list = []
+        self.load_states: list = []
+        self.networkidle_ok = True
+        self.function_results: list = []
+        self.loading_polls = 0  # readyState checks that still report "loading"
+
+    def wait_for_timeout(self, ms) -> None:
+        if self.batches:
+            for event, params in self.batches.pop(0):
+                self.session.emit(event, **params)
+        time.sleep(ms / 1000)
+
+    def wait_for_load_state(self, state, timeout=None) -> None:
+        self.load_states.append(state)
+        if state == "networkidle" and not self.networkidle_ok:
+            raise TimeoutError("networkidle")
+
+    def evaluate(self, script, arg=None):
+        if "readyState" in script:
+            self.loading_polls -= 1
+            return self.loading_polls >= 0
+        self.evaluated.append(arg)
+        return True
+
+    def wait_for_function(self, script, arg=None, timeout=None, polling=None):
+        outcome = self.function_results.pop(0)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return type("Handle", (), {"json_value": lambda self: outcome})()
+
+
+def test_network_quiet_waits_for_requests_but_ignores_streams() -> None:
+    page = _FakePage([
+        [("Network.requestWillBeSent", {"requestId": "1", "type": "XHR"}),
+         ("Network.requestWillBeSent", {"requestId": "sse", "type": "EventSource"})],
+        [],
+        [("Network.loadingFinished", {"requestId": "1"})],
+    ])
+    started = time.monotonic()
+    assert wait_for_network_quiet(page, quiet_ms=100, timeout_ms=2000, poll_ms=20) is True
+    assert time.monotonic() - started >= 0.1
+    assert page.session.detached
+
+
+def test_network_quiet_times_out_on_a_hanging_request() -> None:
+    page = _FakePage([[("Network.requestWillBeSent", {"requestId": "1", "type": "Fetch"})]])
+    assert wait_for_network_quiet(page, quiet_ms=50, timeout_ms=300, poll_ms=20) is False
+    page = _FakePage([[("Network.requestWillBeSent", {"requestId": "1", "type": "Fetch"})]])
+    assert wait_for_network_quiet(page, quiet_ms=50, timeout_ms=300, max_inflight=1, poll_ms=20) is True
+
+
+def test_network_quiet_counts_a_document_still_loading() -> None:
+    page = _FakePage()
+    page.loading_polls = 5
+    started = time.monotonic()
+    assert wait_for_network_quiet(page, quiet_ms=50, timeout_ms=2000, poll_ms=20) is True
+    # Not quiet until the load that began before the call finished (~4 polls).
+    assert time.monotonic() - started >= 0.08 + 0.05
+    assert page.loading_polls < 0
+
+def test_wait_for_any_survives_navigation_and_reports_the_match() -> None:
+    page = _FakePage()
+    page.function_results = [RuntimeError("Execution context was destroyed"), ".FlightDisplay"]
+    assert wait_for_any(page, selectors=[".FlightDisplay"], timeout_ms=1000) == ".FlightDisplay"
+    page.function_results = [TimeoutError("Timeout 1000ms exceeded")]
+    assert wait_for_any(page, texts=["no flights"], timeout_ms=1000) is None
+
+
+def test_wait_ready_only_settles_when_networkidle_fails() -> None:
+    page = _FakePage()
+    wait_ready(page)
+    assert page.evaluated == []
+    page.networkidle_ok = False
+    wait_ready(page, settle_ms=250)
+    assert page.load_states[-1] == "domcontentloaded"
+    assert page.evaluated == [[250, 2000, None]]
@@ -0,0 +1,106 @@
+"""Tests for execution_mode=process runners."""
+from __future__ import annotations
+
+import os
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+from openclaw_automation.engine import AutomationEngine
+from openclaw_automation.process_pool import RunnerProcessPool, RunnerTimeoutError
+
+ROOT = Path(__file__).resolve().parents[1]
+
+
+@pytest.fixture()
+def pool():
+    pool = RunnerProcessPool(size=1, max_runs_per_worker=2)
+    yield pool
+    pool.close()
+
+
+def test_process_mode_runs_outside_engine_process(tmp_path: Path, pool: RunnerProcessPool, write_script) -> None:
+    script_dir = write_script(
+        tmp_path / "pid",
+        "import os\n\ndef run(context, inputs):\n"
+        "    return {'pid': os.getpid(), 'has_cancel_event': 'cancel_event' in context}\n",
+        execution_mode="process",
+    )
+    engine = AutomationEngine(ROOT, process_pool=pool)
+    result = engine.run(script_dir, {})
+    assert result["ok"] is True
+    assert result["result"]["pid"] != os.getpid()
+    assert result["result"]["has_cancel_event"] is False
+
+
+def test_process_mode_kills_worker_on_timeout(
+    tmp_path: Path, pool: RunnerProcessPool, monkeypatch, write_script
+) -> None:
+    script_dir = write_script(
+        tmp_path / "hang",
+        "import time\n\ndef run(context, inputs):\n    time.sleep(60)\n    return {}\n",
+        execution_mode="process",
+    )
+    monkeypatch.setenv("OPENCLAW_RUNNER_TIMEOUT_SECONDS", "1")
+    engine = AutomationEngine(ROOT, process_pool=pool)
+
+    started = time.monotonic()
+    result = engine.run(script_dir, {})
+    assert time.monotonic() - started < 10
+    assert result["ok"] is False
+    assert "exceeded timeout" in result["error"]
+    assert "killed" in result["error"]
+
+
+def test_pool_recycles_workers_after_max_runs(tmp_path: Path, pool: RunnerProcessPool) -> None:
+    runner = tmp_path / "runner.py"
+    runner.write_text("import os\n\ndef run(context, inputs):\n    return os.getpid()\n")
+    pids = [pool.run(runner, {}, {}, timeout_seconds=30) for _ in range(3)]
+    assert pids[0] == pids[1]
+    assert pids[2] != pids[0]
+
+
+def test_pool_reports_runner_errors_and_keeps_worker(tmp_path: Path, pool: RunnerProcessPool) -> None:
+    runner = tmp_path / "runner.py"
+    runner.write_text("def run(context, inputs):\n    raise ValueError('boom in worker')\n")
+    with pytest.raises(RuntimeError, match="boom in worker"):
+        pool.run(runner, {}, {}, timeout_seconds=30)
+
+    hang = tmp_path / "hang.py"
+    hang.write_text("import time\n\ndef run(context, inputs):\n    time.sleep(60)\n")
+    with pytest.raises(RunnerTimeoutError):
+        pool.run(hang, {}, {}, timeout_seconds=0.5)
+    # Replacement worker is usable.
+    with pytest.raises(RuntimeError, match="boom in worker"):
+        pool.run(runner, {}, {}, timeout_seconds=30)
+
+
+def test_pool_times_out_waiting_for_a_busy_worker(tmp_path: Path, pool: RunnerProcessPool) -> None:
+    hang = tmp_path / "hang.py"
+    hang.write_text("import time\n\ndef run(context, inputs):\n    time.sleep(60)\n")
+    runner = tmp_path / "runner.py"
+    runner.write_text("import os\n\ndef run(context, inputs):\n    return os.getpid()\n")
+    pid = pool.run(runner, {}, {}, timeout_seconds=30)
+
+    errors: list = []
+
+    def _occupy() -> None:
+        try:
+            pool.run(hang, {}, {}, timeout_seconds=3)
+        except RunnerTimeoutError as exc:
+            errors.append(exc)
+
+    busy = threading.Thread(target=_occupy, daemon=True)
+    busy.start()
+    time.sleep(0.3)
+    started = time.monotonic()
+    with pytest.raises(RunnerTimeoutError, match="did not get a worker"):
+        pool.run(runner, {}, {}, timeout_seconds=0.5)
+    assert time.monotonic() - started < 2
+    busy.join(timeout=10)
+    assert errors and "killed" in str(errors[0])
+    # Only the overrunning worker was replaced; the pool did not grow.
+    assert pool._idle.qsize() == 1
+    assert pool.run(runner, {}, {}, timeout_seconds=30) != pid
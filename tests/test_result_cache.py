@@ -0,0 +1,112 @@
+"""Tests for the manifest-driven result cache in front of AutomationEngine.run."""
+from __future__ import annotations
+
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from openclaw_automation.engine import AutomationEngine
+from openclaw_automation.result_cache import ResultCache
+
+ROOT = Path(__file__).resolve().parents[1]
+
+RUNNER = """
+from pathlib import Path
+
+def run(context, inputs):
+    counter = Path(context["script_dir"]) / "calls.txt"
+    calls = len(counter.read_text().splitlines()) + 1 if counter.exists() else 1
+    with counter.open("a") as fh:
+        fh.write("x\\n")
+    if inputs.get("fail"):
+        raise RuntimeError("boom")
+    return {"mode": "live", "real_data": True, "route": inputs["route"], "call": calls}
+"""
+
+
+def _engine(cache: ResultCache) -> AutomationEngine:
+    return AutomationEngine(ROOT, executor=ThreadPoolExecutor(max_workers=4), result_cache=cache)
+
+
+def _calls(script_dir: Path) -> int:
+    counter = script_dir / "calls.txt"
+    return len(counter.read_text().splitlines()) if counter.exists() else 0
+
+
+def test_identical_runs_hit_the_cache(tmp_path: Path, write_script) -> None:
+    script_dir = write_script(tmp_path / "cached", RUNNER, cache={"ttl_seconds": 60})
+    cache = ResultCache()
+    engine = _engine(cache)
+
+    first = engine.run(script_dir, {"route": "SFO-NRT"})
+    second = engine.run(script_dir, {"route": " SFO-NRT "})
+    other = engine.run(script_dir, {"route": "SFO-HND"})
+
+    assert "cache" not in first
+    assert second["cache"]["hit"] is True and second["cache"]["stale"] is False
+    assert second["result"]["call"] == 1
+    assert second["inputs"] == {"route": " SFO-NRT "}
+    assert other["result"]["call"] == 2
+    assert _calls(script_dir) == 2
+    assert cache.stats()["hits"] == 1
+
+
+def test_stale_entries_are_served_while_one_refresh_runs(tmp_path: Path, write_script) -> None:
+    script_dir = write_script(
+        tmp_path / "swr", RUNNER, cache={"ttl_seconds": 0.1, "stale_while_revalidate_seconds": 30}
+    )
+    engine = _engine(ResultCache())
+
+    engine.run(script_dir, {"route": "SFO-NRT"})
+    time.sleep(0.15)
+    stale = engine.run(script_dir, {"route": "SFO-NRT"})
+    assert stale["cache"]["stale"] is True and stale["result"]["call"] == 1
+    for _ in range(3):
+        engine.run(script_dir, {"route": "SFO-NRT"})
+
+    deadline = time.monotonic() + 5
+    while _calls(script_dir) < 2 and time.monotonic() < deadline:
+        time.sleep(0.02)
+    time.sleep(0.05)
+    refreshed = engine.run(script_dir, {"route": "SFO-NRT"})
+    assert refreshed["cache"]["stale"] is False
+    assert refreshed["result"]["call"] == 2
+    assert _calls(script_dir) == 2
+
+
+def test_failures_and_uncached_manifests_are_not_stored(tmp_path: Path, write_script) -> None:
+    cached_dir = write_script(tmp_path / "cached", RUNNER, cache={"ttl_seconds": 60})
+    plain_dir = write_script(tmp_path / "plain", RUNNER)
+    engine = _engine(ResultCache())
+
+    assert engine.run(cached_dir, {"route": "X", "fail": True})["ok"] is False
+    assert engine.run(cached_dir, {"route": "X", "fail": True})["ok"] is False
+    engine.run(plain_dir, {"route": "X"})
+    engine.run(plain_dir, {"route": "X"})
+    assert _calls(cached_dir) == 2
+    assert _calls(plain_dir) == 2
+
+
+def _live(value: str, **result) -> dict:
+    return {"ok": True, "result": {"mode": "live", "real_data": True, "value": value, **result}}
+
+
+def test_failed_live_searches_are_not_stored() -> None:
+    cache = ResultCache()
+    cache.put("login", {"ok": True, "result": {"mode": "live", "real_data": False, "matches": []}}, 60)
+    cache.put("errors", _live("errors", matches=[], errors=["SIA login failed"]), 60)
+    cache.put("partial", _live("partial", matches=[{"miles": 1}], errors=["NRT: timeout"]), 60)
+    assert cache.get("login")[1] == "miss"
+    assert cache.get("errors")[1] == "miss"
+    assert cache.get("partial")[1] == "fresh"
+
+
+def test_lru_bound_evicts_least_recently_used() -> None:
+    cache = ResultCache(max_entries=2)
+    for key in ("a", "b"):
+        cache.put(key, _live(key), 60)
+    cache.get("a")
+    cache.put("c", _live("c"), 60)
+    assert cache.get("b")[1] == "miss"
+    assert cache.get("a")[1] == "fresh"
+    assert cache.stats()["evictions"] == 1
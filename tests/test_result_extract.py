@@ -1,6 +1,10 @@
 from __future__ import annotations
 
-from openclaw_automation.result_extract import extract_award_matches_from_text
+from openclaw_automation.result_extract import (
+    extract_award_matches_batch,
+    extract_award_matches_from_text,
+    extract_award_matches_with_rule,
+)
 
 
 def test_extract_award_matches_from_text_filters_by_max_miles() -> None:
@@ -37,3 +41,32 @@ def test_extract_award_matches_from_match_line_format() -> None:
     assert matches[0]["date"] == "2026-03-02"
     assert matches[0]["miles"] == 80000
     assert matches[0]["source"] == "match_line"
+
+
+def test_extract_with_rule_reports_which_rule_fired() -> None:
+    settings = dict(route="SFO-ATL", cabin="economy", travelers=1, max_miles=600000, year=2026)
+    assert extract_award_matches_with_rule("Fri Mar 1: 499,900 miles", **settings)[0] == "month_name_date"
+    assert extract_award_matches_with_rule("Business: 250k miles + $21.50", **settings)[0] == "cabin_line"
+    assert extract_award_matches_with_rule("$1,760 + 192k miles", **settings)[0] == "money_plus_miles"
+    rule, matches = extract_award_matches_with_rule("Mon 2/23: 47.1k miles (selected date)", **settings)
+    assert rule == "date_strip"
+    assert matches[0]["date"] == "2026-02-23"
+    assert extract_award_matches_with_rule("No flights found.", **settings) == (None, [])
+
+
+def test_extract_falls_through_when_rule_rows_exceed_budget() -> None:
+    text = "Fri 2/27: 200k miles + $5.60\nEconomy: 50k miles"
+    rule, matches = extract_award_matches_with_rule(
+        text, route="SFO-CDG", cabin="business", travelers=1, max_miles=100000
+    )
+    assert rule == "cabin_line"
+    assert [m["miles"] for m in matches] == [50000]
+
+
+def test_extract_batch_returns_one_result_per_text() -> None:
+    texts = ["MATCH|2026-03-02|80000|29.50", "nothing here", "Economy: 39.8k miles + $5.60"]
+    results = extract_award_matches_batch(
+        texts, route="SFO-AMS", cabin="business", travelers=2, max_miles=120000
+    )
+    assert [len(r) for r in results] == [1, 0, 1]
+    assert results[2][0]["taxes"] == "5.60"
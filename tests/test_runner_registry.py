@@ -0,0 +1,43 @@
+from __future__ import annotations
+
+import os
+from pathlib import Path
+
+from openclaw_automation.engine import AutomationEngine
+from openclaw_automation.runner_registry import RunnerRegistry
+
+
+def test_registry_loads_runner_once(tmp_path: Path, write_script) -> None:
+    script_dir = tmp_path / "counter"
+    write_script(
+        script_dir,
+        "IMPORTS = []\nIMPORTS.append(1)\n\ndef run(context, inputs):\n    return {'imports': len(IMPORTS)}\n",
+    )
+    registry = RunnerRegistry()
+    engine = AutomationEngine(Path(__file__).resolve().parents[1], runners=registry)
+
+    first = engine.run(script_dir, {})
+    second = engine.run(script_dir, {})
+    assert first["ok"] is True and second["ok"] is True
+    assert registry.load(script_dir / "runner.py") is registry.load(script_dir / "runner.py")
+    assert list(registry.snapshot().values())[0]["loads"] == 1
+
+
+def test_registry_reloads_only_on_content_change(tmp_path: Path) -> None:
+    runner = tmp_path / "runner.py"
+    runner.write_text("VALUE = 1\n")
+    registry = RunnerRegistry()
+    first = registry.load(runner)
+    assert first.VALUE == 1
+
+    # Touch without editing: same module is kept.
+    stat = runner.stat()
+    os.utime(runner, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    assert registry.load(runner) is first
+
+    runner.write_text("VALUE = 22\n")
+    os.utime(runner, ns=(stat.st_atime_ns, stat.st_mtime_ns + 2_000_000))
+    reloaded = registry.load(runner)
+    assert reloaded is not first
+    assert reloaded.VALUE == 22
+    assert registry.snapshot()[str(runner.resolve())]["loads"] == 2
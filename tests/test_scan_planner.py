@@ -0,0 +1,82 @@
+from datetime import datetime, timedelta, timezone
+
+from openclaw_automation.award_store import AwardStore
+from openclaw_automation.scan_planner import IncrementalPlanner
+
+NOW = datetime(2026, 3, 1, 12, 0, tzinfo=timezone.utc)
+
+
+def _inputs(days_ahead: int) -> dict:
+    return {"from": "SFO", "to": ["NRT"], "days_ahead": days_ahead, "travelers": 2, "cabin": "business"}
+
+
+def _record(store: AwardStore, depart_in: int, days_ago: int, *miles: int, errors=(), real_data=True) -> None:
+    """Record a scan run ``days_ago`` before NOW for the departure ``depart_in`` days after NOW."""
+    scanned = NOW - timedelta(days=days_ago)
+    result = {
+        "mode": "live",
+        "real_data": real_data,
+        "matches": [{"route": "SFO-NRT", "date": "2026-06-15", "miles": m, "cabin": "business"} for m in miles],
+        "errors": list(errors),
+    }
+    store.record_result(
+        "ana.award_search", _inputs(depart_in + days_ago), result, observed_at=scanned.isoformat()
+    )
+
+
+def _plan(store: AwardStore, days_ahead: int):
+    return IncrementalPlanner(store).plan_window("ana.award_search", _inputs(days_ahead), now=NOW)
+
+
+def test_new_failed_and_near_term_windows_are_due(tmp_path) -> None:
+    store = AwardStore(tmp_path / "awards.sqlite3")
+    _record(store, 100, 1, errors=["timeout"])
+    _record(store, 7, 1, 90000)
+    _record(store, 7, 2, 90000)
+
+    assert _plan(store, 30).reason == "never scanned"
+    assert _plan(store, 100).reason == "last scan failed"
+    near = _plan(store, 7)
+    assert near.due and near.reason.startswith("near-term")
+
+
+def test_changed_windows_are_due_and_stable_ones_wait(tmp_path) -> None:
+    store = AwardStore(tmp_path / "awards.sqlite3")
+    _record(store, 30, 2, 90000)
+    _record(store, 30, 1, 75000)
+    _record(store, 100, 2, 90000)
+    _record(store, 100, 1, 90000)
+
+    assert _plan(store, 30).reason == "availability changed since the previous scan"
+    stable = _plan(store, 100)
+    assert not stable.due
+    assert stable.next_due == (NOW - timedelta(days=1)).astimezone().date() + timedelta(days=7)
+
+
+def test_stable_windows_refresh_by_distance(tmp_path) -> None:
+    store = AwardStore(tmp_path / "awards.sqlite3")
+    _record(store, 30, 3, 90000)
+    _record(store, 30, 2, 90000)
+    _record(store, 100, 3, 90000)
+    _record(store, 100, 2, 90000)
+
+    planner = IncrementalPlanner(store)
+    plans = planner.plan(
+        [("ana.award_search", _inputs(100)), ("ana.award_search", _inputs(30)), ("ana.award_search", _inputs(5))],
+        now=NOW,
+    )
+    assert [(p.due, (p.depart_date - NOW.astimezone().date()).days) for p in plans] == [
+        (True, 5), (True, 30), (False, 100),
+    ]
+    assert plans[1].reason == "stable, last checked 2d ago"
+
+
+def test_scans_without_real_data_count_as_failed(tmp_path) -> None:
+    store = AwardStore(tmp_path / "awards.sqlite3")
+    _record(store, 100, 3, 90000)
+    _record(store, 100, 2, real_data=False)
+    assert _plan(store, 100).reason == "last scan failed"
+
+    # Once a good scan follows, it is compared with the previous good one.
+    _record(store, 100, 1, 90000)
+    assert not _plan(store, 100).due
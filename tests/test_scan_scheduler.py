@@ -0,0 +1,63 @@
+import threading
+import time
+
+from openclaw_automation.scan_scheduler import ScanJob, ScanScheduler
+
+
+def test_airlines_run_concurrently_and_stream_in_finish_order() -> None:
+    durations = {"delta": 0.3, "ana": 0.05, "united": 0.15}
+
+    def _run(job):
+        time.sleep(durations[job.key])
+        return {"matches": [job.key]}
+
+    scheduler = ScanScheduler(_run, max_workers=3, cooldown_seconds=5)
+    started = time.monotonic()
+    order = [outcome.job.key for outcome in scheduler.run(ScanJob(key) for key in durations)]
+    assert order == ["ana", "united", "delta"]
+    # No cooldown between different airlines.
+    assert time.monotonic() - started < 0.6
+
+
+def test_cooldown_only_applies_within_an_airline() -> None:
+    starts = {}
+    lock = threading.Lock()
+
+    def _run(job):
+        with lock:
+            starts.setdefault(job.key, []).append(time.monotonic())
+        return {}
+
+    scheduler = ScanScheduler(_run, max_workers=1, cooldown_seconds=0.3)
+    jobs = [ScanJob("delta", 1), ScanJob("delta", 2), ScanJob("sia", 1)]
+    outcomes = list(scheduler.run(jobs))
+    assert [(o.job.key, o.job.payload) for o in outcomes] == [("delta", 1), ("sia", 1), ("delta", 2)]
+    # SIA ran while Delta was cooling down; Delta's second job waited.
+    assert starts["sia"][0] - starts["delta"][0] < 0.2
+    assert starts["delta"][1] - starts["delta"][0] >= 0.3
+    assert outcomes[0].cooldown_seconds == 0.3 and outcomes[2].cooldown_seconds == 0.0
+
+
+def test_rate_limit_backoff_is_per_airline_and_doubles() -> None:
+    scheduler = ScanScheduler(
+        lambda job: {"blocked": job.key == "united"},
+        cooldown_seconds=1,
+        rate_limited_cooldown_seconds=10,
+        max_backoff_seconds=25,
+        is_rate_limited=lambda result: result["blocked"],
+    )
+    outcomes = list(scheduler.run([ScanJob("united"), ScanJob("delta")]))
+    assert {o.job.key: o.rate_limited for o in outcomes} == {"united": True, "delta": False}
+    assert scheduler.cooldown_for("united") == 10
+    assert scheduler.cooldown_for("delta") == 1
+    scheduler._strikes["united"] = 3
+    assert scheduler.cooldown_for("united") == 25
+
+
+def test_runner_exceptions_become_error_results() -> None:
+    def _run(job):
+        raise RuntimeError("browser crashed")
+
+    (outcome,) = list(ScanScheduler(_run).run([ScanJob("aeromexico")]))
+    assert outcome.result["mode"] == "error"
+    assert outcome.result["errors"] == ["browser crashed"]
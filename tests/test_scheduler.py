@@ -33,3 +33,88 @@ def test_lock_conflict_blocks_second_run() -> None:
     assert [r.run_id for r in started] == ["r1"]
     assert q.snapshot()["queued"] == ["r2"]
 
+
+
+def test_priority_runs_first() -> None:
+    q = RunQueue(max_concurrent_runs=1)
+    q.enqueue(RunRequest(run_id="low", script_id="a"))
+    q.enqueue(RunRequest(run_id="high", script_id="b", priority=5))
+
+    assert [r.run_id for r in q.tick()] == ["high"]
+    q.complete("high")
+    assert [r.run_id for r in q.tick()] == ["low"]
+
+
+def test_aging_prevents_starvation() -> None:
+    now = [0.0]
+    q = RunQueue(max_concurrent_runs=1, aging_seconds=10, clock=lambda: now[0])
+    q.enqueue(RunRequest(run_id="old_low", script_id="a", priority=0))
+    now[0] = 25.0
+    # Waited 25s -> effective priority 2.5, which beats a fresh priority-2 run.
+    q.enqueue(RunRequest(run_id="new_high", script_id="b", priority=2))
+
+    assert [r.run_id for r in q.tick()] == ["old_low"]
+
+
+def test_release_wakes_only_runs_blocked_on_that_lock() -> None:
+    q = RunQueue(max_concurrent_runs=10)
+    q.enqueue(RunRequest(run_id="u1", script_id="a", required_locks=["site:united.com"]))
+    q.enqueue(RunRequest(run_id="s1", script_id="b", required_locks=["site:singaporeair.com"]))
+    for i in range(50):
+        q.enqueue(RunRequest(run_id=f"u{i + 2}", script_id="a", required_locks=["site:united.com"]))
+    q.enqueue(RunRequest(run_id="s2", script_id="b", required_locks=["site:singaporeair.com"]))
+
+    assert {r.run_id for r in q.tick()} == {"u1", "s1"}
+    assert q.tick() == []
+
+    q.complete("s1")
+    assert [r.run_id for r in q.tick()] == ["s2"]
+    assert len(q) == 50
+
+    q.complete("u1")
+    assert [r.run_id for r in q.tick()] == ["u2"]
+
+
+def test_multi_lock_waiter_does_not_strand_others() -> None:
+    q = RunQueue(max_concurrent_runs=10)
+    q.enqueue(RunRequest(run_id="profile", script_id="a", required_locks=["browser_profile:default"]))
+    q.enqueue(RunRequest(run_id="site", script_id="b", required_locks=["site:united.com"]))
+    q.enqueue(
+        RunRequest(
+            run_id="both",
+            script_id="c",
+            required_locks=["site:united.com", "browser_profile:default"],
+        )
+    )
+    q.enqueue(RunRequest(run_id="site2", script_id="d", required_locks=["site:united.com"]))
+    assert {r.run_id for r in q.tick()} == {"profile", "site"}
+
+    # "both" wakes for the site lock but is still blocked on the profile lock;
+    # the next site waiter must still get the freed site lock.
+    q.complete("site")
+    assert [r.run_id for r in q.tick()] == ["site2"]
+
+    q.complete("site2")
+    q.complete("profile")
+    assert [r.run_id for r in q.tick()] == ["both"]
+
+
+def test_cancel_removes_queued_run() -> None:
+    q = RunQueue(max_concurrent_runs=1)
+    q.enqueue(RunRequest(run_id="r1", script_id="a"))
+    q.enqueue(RunRequest(run_id="r2", script_id="a"))
+    assert q.cancel("r1") is True
+    assert q.snapshot()["queued"] == ["r2"]
+    assert [r.run_id for r in q.tick()] == ["r2"]
+
+
+def test_cancelling_a_woken_run_wakes_the_next_waiter() -> None:
+    q = RunQueue(max_concurrent_runs=10)
+    for run_id in ("u1", "u2", "u3"):
+        q.enqueue(RunRequest(run_id=run_id, script_id="a", required_locks=["L"]))
+    assert [r.run_id for r in q.tick()] == ["u1"]
+
+    q.complete("u1")  # wakes u2
+    assert q.cancel("u2") is True
+    assert [r.run_id for r in q.tick()] == ["u3"]
+    assert q.snapshot()["held_locks"] == {"L": "u3"}
@@ -5,7 +5,10 @@ from pathlib import Path
 
 from openclaw_automation.engine import AutomationEngine
 from openclaw_automation.security_gate import (
+    VerifiedAssertionCache,
     create_signed_assertion,
+    current_security_policy,
+    evaluate_security_gate,
     generate_totp_code,
     verify_totp_code,
 )
@@ -135,3 +138,32 @@ def test_security_gate_rejects_session_binding_mismatch(monkeypatch) -> None:
     inputs["security_assertion"] = ok_binding
     allowed = engine.run(root / "library" / "github_signin_check", inputs)
     assert allowed["ok"] is True
+
+
+def test_verified_assertions_are_cached_by_signature(monkeypatch) -> None:
+    signing_key = "unit-test-signing-key"
+    monkeypatch.setenv("OPENCLAW_SECURITY_GATE_ENABLED", "true")
+    monkeypatch.setenv("OPENCLAW_SECURITY_SIGNING_KEY", signing_key)
+    monkeypatch.setenv("OPENCLAW_SECURITY_EXPECTED_USER_ID", "+14152268266")
+    manifest = {"security": {"risk_level": "high"}}
+    now = int(time.time())
+    assertion = create_signed_assertion(user_id="+14152268266", signing_key=signing_key, verified_at=now, ttl_seconds=60)
+    cache = VerifiedAssertionCache(max_entries=2)
+
+    def _gate(candidate, at=now):
+        inputs = {"security_assertion": candidate}
+        return evaluate_security_gate(manifest=manifest, inputs=inputs, now_ts=at, assertion_cache=cache)
+
+    assert _gate(assertion).allowed and _gate(assertion).allowed
+    assert (cache.misses, cache.hits) == (1, 1)
+    assert current_security_policy() is current_security_policy()
+
+    # Same signature, altered payload: not served from the cache.
+    tampered = {**assertion, "user_id": "+14150001111"}
+    assert "invalid security_assertion signature" in _gate(tampered).reason
+    retyped = {**assertion, "expires_at": float(assertion["expires_at"])}
+    assert "invalid security_assertion signature" in _gate(retyped).reason
+
+    # Past expires_at the entry is dropped and the run is blocked.
+    assert "expired" in _gate(assertion, at=now + 120).reason
+    assert len(cache) == 0
@@ -0,0 +1,80 @@
+"""Tests for coalescing concurrent identical engine runs."""
+from __future__ import annotations
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from openclaw_automation.engine import AutomationEngine
+from openclaw_automation.result_cache import ResultCache
+from openclaw_automation.single_flight import SingleFlight
+
+ROOT = Path(__file__).resolve().parents[1]
+
+RUNNER = """
+import time
+from pathlib import Path
+
+def run(context, inputs):
+    with (Path(context["script_dir"]) / "calls.txt").open("a") as fh:
+        fh.write("x\\n")
+    time.sleep(0.3)
+    return {"route": inputs["route"]}
+"""
+
+
+def _engine(flights: SingleFlight) -> AutomationEngine:
+    return AutomationEngine(
+        ROOT,
+        executor=ThreadPoolExecutor(max_workers=8),
+        result_cache=ResultCache(),
+        single_flight=flights,
+    )
+
+
+def _calls(script_dir: Path) -> int:
+    return len((script_dir / "calls.txt").read_text().splitlines())
+
+
+def test_concurrent_identical_runs_share_one_execution(tmp_path: Path, write_script) -> None:
+    script_dir = write_script(tmp_path / "shared", RUNNER)
+    flights = SingleFlight()
+    engine = _engine(flights)
+
+    with ThreadPoolExecutor(max_workers=5) as callers:
+        envelopes = list(callers.map(
+            lambda i: engine.run(script_dir, {"route": "SFO-NRT", "security_assertion": {"n": i}}), range(5)
+        ))
+
+    assert _calls(script_dir) == 1
+    assert all(e["ok"] and e["result"] == {"route": "SFO-NRT"} for e in envelopes)
+    assert sum(1 for e in envelopes if e.get("coalesced")) == 4
+    assert sorted(e["inputs"]["security_assertion"]["n"] for e in envelopes) == [0, 1, 2, 3, 4]
+    assert flights.stats() == {"in_flight": 0, "leaders": 1, "joined": 4}
+
+
+def test_arun_coalesces_and_distinct_inputs_do_not(tmp_path: Path, write_script) -> None:
+    script_dir = write_script(tmp_path / "async", RUNNER)
+    engine = _engine(SingleFlight())
+
+    async def _main():
+        return await asyncio.gather(
+            engine.arun(script_dir, {"route": "SFO-NRT"}),
+            engine.arun(script_dir, {"route": "SFO-NRT"}),
+            engine.arun(script_dir, {"route": "SFO-HND"}),
+        )
+
+    envelopes = asyncio.run(_main())
+    assert [e["result"]["route"] for e in envelopes] == ["SFO-NRT", "SFO-NRT", "SFO-HND"]
+    assert _calls(script_dir) == 2
+
+
+def test_state_changing_scripts_are_never_coalesced(tmp_path: Path, write_script) -> None:
+    script_dir = write_script(tmp_path / "writes", RUNNER, security={"state_changing": True})
+    engine = _engine(SingleFlight())
+
+    with ThreadPoolExecutor(max_workers=3) as callers:
+        envelopes = list(callers.map(lambda _: engine.run(script_dir, {"route": "SFO-NRT"}), range(3)))
+
+    assert _calls(script_dir) == 3
+    assert not any(e.get("coalesced") for e in envelopes)
@@ -0,0 +1,95 @@
+import json
+from pathlib import Path
+
+from openclaw_automation.engine import AutomationEngine
+from openclaw_automation.telemetry import JsonlSink, RunTrace, TelemetrySink, phase
+
+ROOT = Path(__file__).resolve().parents[1]
+
+RUNNER = """import threading
+
+from openclaw_automation.telemetry import phase
+
+
+def run(context, inputs):
+    missing = bool(context.get("unresolved_credential_refs"))
+    with phase(context, "login", site="example.com"):
+        with phase(context, "form_fill"):
+            pass
+    def _scrape():
+        with phase(context, "scrape"):
+            pass
+
+    worker = threading.Thread(target=_scrape)
+    worker.start()
+    worker.join()
+    return {"missing": missing}
+"""
+
+
+class _ListSink(TelemetrySink):
+    def __init__(self) -> None:
+        self.spans = []
+
+    def export(self, span) -> None:
+        self.spans.append(span)
+
+
+def test_engine_run_emits_phase_and_runner_spans(tmp_path, write_script) -> None:
+    sink = _ListSink()
+    engine = AutomationEngine(ROOT, telemetry=sink)
+    script_dir = write_script(tmp_path / "telemetry", RUNNER)
+    result = engine.run(script_dir, {"credential_refs": {"password": "openclaw/telemetry/none"}})
+    assert result["ok"] is True
+
+    spans = {s.name: s for s in sink.spans}
+    root = spans["engine.run"]
+    assert sink.spans[-1] is root and root.attributes["script_id"] == "test.telemetry"
+    assert root.attributes["ok"] is True and root.parent_id is None
+    assert {s.trace_id for s in sink.spans} == {root.trace_id}
+    for name in ("manifest.validate", "security_gate", "inputs.validate", "module.load", "runner.run", "output.validate"):
+        assert spans[name].parent_id == root.span_id, name
+
+    runner_span = spans["runner.run"]
+    assert spans["credentials.resolve"].parent_id == runner_span.span_id
+    assert spans["runner.login"].parent_id == runner_span.span_id
+    assert spans["runner.login"].attributes == {"site": "example.com"}
+    assert spans["runner.form_fill"].parent_id == spans["runner.login"].span_id
+    # Spans from threads the runner starts hang off the runner span.
+    assert spans["runner.scrape"].parent_id == runner_span.span_id
+    assert all(s.end_ns >= s.start_ns > 0 for s in sink.spans)
+
+
+def test_failed_run_marks_root_span_and_jsonl_is_otlp_shaped(tmp_path, write_script) -> None:
+    path = tmp_path / "spans.jsonl"
+    engine = AutomationEngine(ROOT, telemetry=JsonlSink(path))
+    script_dir = write_script(tmp_path / "telemetry", "def run(context, inputs):\n    raise ValueError('boom')\n")
+    result = engine.run(script_dir, {})
+    assert result["ok"] is False
+
+    records = {r["name"]: r for r in map(json.loads, path.read_text().splitlines())}
+    assert records["runner.run"]["status"] == {"code": "STATUS_CODE_ERROR", "message": "ValueError: boom"}
+    assert records["engine.run"]["status"]["code"] == "STATUS_CODE_ERROR"
+    assert records["engine.run"]["parentSpanId"] == ""
+    assert {"key": "ok", "value": {"boolValue": False}} in records["engine.run"]["attributes"]
+    assert int(records["engine.run"]["endTimeUnixNano"]) >= int(records["engine.run"]["startTimeUnixNano"])
+
+
+def test_phase_is_a_no_op_without_telemetry() -> None:
+    with phase({}, "login") as span:
+        assert span is None
+    trace = RunTrace(None)
+    with trace.span("runner.run") as span:
+        assert span is None
+
+
+def test_bad_sink_config_does_not_fail_runs(tmp_path, monkeypatch, caplog, write_script) -> None:
+    script_dir = write_script(tmp_path / "telemetry", "def run(context, inputs):\n    return {}\n")
+    blocker = tmp_path / "not-a-dir"
+    blocker.write_text("")
+    engine = AutomationEngine(ROOT)
+    for mode, path in (("otlp", str(tmp_path / "spans.jsonl")), ("jsonl", str(blocker / "spans.jsonl"))):
+        monkeypatch.setenv("OPENCLAW_TELEMETRY", mode)
+        monkeypatch.setenv("OPENCLAW_TELEMETRY_PATH", path)
+        assert engine.run(script_dir, {})["ok"] is True
+    assert caplog.text.count("Telemetry disabled") == 2